@@ -24,7 +24,12 @@ from .processing import FileProcessor
 from .rest import AzureSearchClient, SearchOperations
 
 # Core functionality
-from .embedding_provider import IEmbeddingProvider, AzureOpenAIEmbeddingProvider, NullEmbeddingProvider
+from .embedding_provider import (
+    IEmbeddingProvider,
+    AzureOpenAIEmbeddingProvider,
+    NullEmbeddingProvider,
+    EmbeddingRateLimitError,
+)
 
 # Automation components (consolidated)
 from .automation import (
@@ -52,6 +57,7 @@ __all__ = [
     'IEmbeddingProvider',
     'AzureOpenAIEmbeddingProvider',
     'NullEmbeddingProvider',
+    'EmbeddingRateLimitError',
     
     # Automation managers
     'IndexAutomation',
@@ -15,12 +15,14 @@ from ..rest import SearchOperations
 from ..embedding_provider import IEmbeddingProvider
 from ..processing import (
     FileProcessor, 
+    IndexingStats,
     find_repository_root,
     validate_repo_name,
     validate_repo_path
 )
+from ..manifest import IncrementalSync, incremental_enabled
 from .data_manager import DataAutomation
-from .embedding_manager import EmbeddingAutomation
+from .embedding_manager import EmbeddingAutomation, embedding_identity
 from .reindex_manager import ReindexAutomation
 
 logger = logging.getLogger(__name__)
@@ -132,55 +134,78 @@ class CLIAutomation:
         else:
             processor = self.file_processor
 
-        # Process entire repository
-        all_documents = processor.process_repository(repo_path, repo_name)
-        
+        # Stream the repository into the uploader; documents are parsed in a
+        # process pool and uploaded batch by batch as they become ready
+        index_stats = IndexingStats()
+        context_fields = ['function_name', 'class_name', 'signature', 'docstring']
+        sync = None
+        if incremental_enabled():
+            sync = IncrementalSync.open(
+                repo_path, index_name, repo_name,
+                embedding=(
+                    embedding_identity(self.embedding_automation.provider, context_fields)
+                    if generate_embeddings else None
+                ),
+            )
+            await sync.check_index(self.ops)
+            # Skip unchanged files and pass on only new or changed chunks
+            documents = sync.diff_stream(processor.aiter_repository_files(
+                repo_path, repo_name, stats=index_stats, file_filter=sync.needs_processing
+            ))
+        else:
+            documents = processor.aiter_repository(repo_path, repo_name, stats=index_stats)
+
         # Generate embeddings if requested
-        if generate_embeddings and all_documents:
-            context_fields = ['function_name', 'class_name', 'signature', 'docstring']
-            all_documents, stats = await self.embedding_automation.enrich_documents_with_embeddings(
-                documents=all_documents,
+        embedding_stats: Dict[str, Any] = {}
+        if generate_embeddings:
+            documents = self.embedding_automation.enrich_document_stream(
+                documents,
                 text_field='content',
                 embedding_field='content_vector',
                 context_fields=context_fields,
-                batch_size=batch_size
+                batch_size=batch_size,
+                stats=embedding_stats
             )
-            logger.info(f"Embedding stats for repository: {stats}")
-            
+            if sync is not None:
+                documents = sync.embedded_stream(documents)
+
+        logger.info(f"Streaming documents from {repo_name} to index {index_name}")
+
+        try:
+            upload_result = await self.data_automation.bulk_upload(
+                index_name=index_name,
+                documents=documents,
+                batch_size=batch_size,
+                progress_callback=progress_callback
+            )
+            if sync is not None:
+                await sync.apply_deletions(self.ops, include_vanished=not index_stats.truncated)
+                sync.commit(upload_result)
+        finally:
+            if sync is not None:
+                sync.close()
+        if embedding_stats:
+            logger.info(f"Embedding stats for repository: {embedding_stats}")
+
         # Progress callback
         if progress_callback:
             await progress_callback({
-                "files_processed": "completed",
-                "total_files": "all",
-                "documents_created": len(all_documents)
+                "files_processed": index_stats.files_processed,
+                "total_files": index_stats.files_processed + index_stats.files_failed,
+                "documents_created": index_stats.chunks
             })
         
-        # Upload documents
-        logger.info(f"Uploading {len(all_documents)} documents to index {index_name}")
-        
-        async def document_generator():
-            for doc in all_documents:
-                yield doc
-        
-        upload_result = await self.data_automation.bulk_upload(
-            index_name=index_name,
-            documents=document_generator(),
-            batch_size=batch_size,
-            progress_callback=progress_callback
-        )
-        
         elapsed = (datetime.utcnow() - start_time).total_seconds()
         
-        # Calculate processed files from processor results
-        processed_files = len(set(doc.get('file_path', 'unknown') for doc in all_documents))
-        
         return {
             "repository": repo_name,
-            "files_processed": processed_files,
-            "documents_created": len(all_documents),
+            "files_processed": index_stats.files_processed,
+            "documents_created": index_stats.chunks,
             "upload_result": upload_result,
             "elapsed_seconds": round(elapsed, 2),
-            "files_per_second": round(processed_files / elapsed, 2) if elapsed > 0 else 0
+            "files_per_second": round(index_stats.files_processed / elapsed, 2) if elapsed > 0 else 0,
+            "processing": index_stats.to_dict(),
+            "incremental": sync.summary() if sync is not None else None
         }
     
     async def index_changed_files(
@@ -217,29 +242,65 @@ class CLIAutomation:
         if guard_msg:
             raise ValueError(guard_msg)
 
+        context_fields = ['function_name', 'class_name', 'signature', 'docstring']
+        sync = None
+        if incremental_enabled():
+            sync = IncrementalSync.open(
+                repo_path, index_name, repo_name,
+                embedding=(
+                    embedding_identity(self.embedding_automation.provider, context_fields)
+                    if generate_embeddings else None
+                ),
+            )
+            await sync.check_index(self.ops)
+
         # Process files
         all_documents = []
         processed_files = 0
         
         for file_path in file_paths:
+            if sync is not None:
+                await sync.load_indexed_chunks(self.ops, file_path)
             if os.path.exists(file_path) and os.path.isfile(file_path):
-                docs = await self.process_file(file_path, repo_path, repo_name, generate_embeddings)
+                docs = self.file_processor.process_file(file_path, repo_path, repo_name)
+                if sync is not None:
+                    docs = sync.diff_file(file_path, docs)
+                if generate_embeddings and docs:
+                    docs, stats = await self.embedding_automation.enrich_documents_with_embeddings(
+                        documents=docs,
+                        text_field='content',
+                        embedding_field='content_vector',
+                        context_fields=context_fields
+                    )
+                    if sync is not None:
+                        for doc in docs:
+                            sync.note_embedding(doc)
                 all_documents.extend(docs)
                 processed_files += 1
                 
                 if docs:
                     logger.info(f"Processed {file_path} ({len(docs)} chunks)")
+            elif sync is not None:
+                # Removed from the working tree: drop its chunks from the index
+                sync.mark_deleted(file_path)
         
         # Upload documents
         async def document_generator():
             for doc in all_documents:
                 yield doc
         
-        upload_result = await self.data_automation.bulk_upload(
-            index_name=index_name,
-            documents=document_generator(),
-            batch_size=100
-        )
+        try:
+            upload_result = await self.data_automation.bulk_upload(
+                index_name=index_name,
+                documents=document_generator(),
+                batch_size=100
+            )
+            if sync is not None:
+                await sync.apply_deletions(self.ops, include_vanished=False)
+                sync.commit(upload_result)
+        finally:
+            if sync is not None:
+                sync.close()
         
         elapsed = (datetime.utcnow() - start_time).total_seconds()
         
@@ -248,7 +309,8 @@ class CLIAutomation:
             "files_processed": processed_files,
             "documents_created": len(all_documents),
             "upload_result": upload_result,
-            "elapsed_seconds": round(elapsed, 2)
+            "elapsed_seconds": round(elapsed, 2),
+            "incremental": sync.summary() if sync is not None else None
         }
     
     async def create_indexing_report(
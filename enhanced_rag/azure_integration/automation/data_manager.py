@@ -1,14 +1,115 @@
 """Automated document management for Azure AI Search."""
 
+import json
 import logging
-from typing import List, Dict, Any, AsyncIterator, Optional, Union
+import os
+import time
+from dataclasses import dataclass, field as dataclass_field
+from typing import List, Dict, Any, AsyncIterator, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
 
+import httpx
+
 from ..rest import SearchOperations
+from ..manifest import odata_literal
+from enhanced_rag.utils.adaptive_limiter import AdaptiveConcurrencyLimiter
+from enhanced_rag.utils.error_handler import StructuredError, ErrorCode
 
 logger = logging.getLogger(__name__)
 
+# Azure AI Search rejects index requests over 16MB or 1000 actions; stay under
+# the byte limit to leave room for the action envelope and sanitization
+MAX_BATCH_DOCUMENTS = 1000
+DEFAULT_MAX_BATCH_BYTES = 12 * 1024 * 1024
+DEFAULT_UPLOAD_CONCURRENCY = 4
+DEFAULT_UPLOAD_RETRIES = 5
+
+_THROTTLE_STATUS = {429, 503}
+# Per-item status codes Azure Search documents as transient
+_RETRIABLE_ITEM_STATUS = {409, 422, 429, 500, 503}
+# Search requests return at most 1000 documents per page
+MAX_EXPORT_PAGE = 1000
+# Largest skip the service accepts
+MAX_EXPORT_SKIP = 100000
+DEFAULT_EXPORT_CONCURRENCY = 4
+# Document keys are hex digests (see processing and remote_indexer), so these
+# boundaries split the key space into 16 ranges of similar size
+DEFAULT_KEY_BOUNDARIES = "123456789abcdef"
+
+_BATCH_ENVELOPE_BYTES = len('{"value":[]}')
+_ACTION_BYTES = len('"@search.action":"upload",')
+
+
+def _document_bytes(doc: Dict[str, Any]) -> int:
+    """Serialized size of a document inside an index request"""
+    return len(json.dumps(doc, ensure_ascii=False, default=str).encode("utf-8")) + _ACTION_BYTES + 1
+
+
+def _key(doc: Dict[str, Any]) -> Optional[str]:
+    return doc.get("id")
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return min(30.0, 0.5 * (2 ** attempt))
+
+
+def _and_filters(*filters: Optional[str]) -> Optional[str]:
+    parts = [f"({f})" for f in filters if f]
+    return " and ".join(parts) if parts else None
+
+
+def key_range_partitions(boundaries: str = DEFAULT_KEY_BOUNDARIES, key_field: str = "id") -> List[str]:
+    """Filters splitting the key space at the given boundary characters.
+
+    The ranges are contiguous and together cover every key.
+    """
+    bounds = sorted(set(boundaries))
+    filters = []
+    lower: Optional[str] = None
+    for bound in bounds:
+        upper = f"{key_field} lt {odata_literal(bound)}"
+        filters.append(_and_filters(f"{key_field} ge {odata_literal(lower)}" if lower else None, upper))
+        lower = bound
+    filters.append(f"{key_field} ge {odata_literal(lower)}" if lower else None)
+    return [f for f in filters if f] or [None]
+
+
+@dataclass
+class _UploadStats:
+    """Counters and request latencies for one bulk upload"""
+    processed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    throttled: int = 0
+    retried_documents: int = 0
+    splits: int = 0
+    latencies: List[float] = dataclass_field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+        return {
+            "requests": len(ordered),
+            "throttled": self.throttled,
+            "retried_documents": self.retried_documents,
+            "split_batches": self.splits,
+            "batch_latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+        }
+
 
 class DataAutomation:
     """Automate document management tasks."""
@@ -20,6 +121,8 @@ class DataAutomation:
             operations: SearchOperations instance
         """
         self.ops = operations
+        # (index, key field) -> whether the key can be ordered on
+        self._sortable_keys: Dict[Tuple[str, str], bool] = {}
     
     async def bulk_upload(
         self, 
@@ -27,9 +130,17 @@ class DataAutomation:
         documents: AsyncIterator[Dict[str, Any]], 
         batch_size: int = 1000,
         merge: bool = False,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        max_batch_bytes: Optional[int] = None,
+        max_concurrency: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Upload documents in batches.
+        """Upload documents in pipelined batches.
+        
+        Batches close at batch_size documents or max_batch_bytes of
+        serialized JSON, whichever comes first, and up to max_concurrency
+        batches are in flight while the next one is being filled. Keys that
+        fail with a retriable per-item status are resent on their own;
+        throttled requests (429/503) cut the concurrency and back off.
         
         Args:
             index_name: Target index name
@@ -37,111 +148,197 @@ class DataAutomation:
             batch_size: Documents per batch (max 1000)
             merge: Whether to merge with existing documents
             progress_callback: Optional callback for progress updates
+            max_batch_bytes: Payload budget per request (MCP_UPLOAD_MAX_BATCH_BYTES)
+            max_concurrency: Batches in flight (MCP_UPLOAD_CONCURRENCY)
             
         Returns:
-            Upload summary with success/failure counts
+            Upload summary with success/failure counts and batch latencies
         """
-        batch = []
-        total_processed = 0
-        total_succeeded = 0
-        total_failed = 0
-        failed_documents = []
+        batch_size = max(1, min(batch_size, MAX_BATCH_DOCUMENTS))
+        max_batch_bytes = max_batch_bytes or int(os.getenv("MCP_UPLOAD_MAX_BATCH_BYTES", DEFAULT_MAX_BATCH_BYTES))
+        limiter = AdaptiveConcurrencyLimiter(
+            max_concurrency or int(os.getenv("MCP_UPLOAD_CONCURRENCY", DEFAULT_UPLOAD_CONCURRENCY))
+        )
+        stats = _UploadStats()
+        failed_documents: List[Dict[str, Any]] = []
+        in_flight: Set[asyncio.Task] = set()
         
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
-        async for doc in documents:
-            batch.append(doc)
-            
-            if len(batch) >= batch_size:
-                result = await self._upload_batch(index_name, batch, merge)
-                
-                total_processed += len(batch)
-                total_succeeded += result["succeeded"]
-                total_failed += result["failed"]
-                
-                if result["failed_items"]:
-                    failed_documents.extend(result["failed_items"])
-                
-                if progress_callback:
-                    await progress_callback({
-                        "processed": total_processed,
-                        "succeeded": total_succeeded,
-                        "failed": total_failed
-                    })
-                
-                batch = []
-        
-        # Upload remaining documents
-        if batch:
-            result = await self._upload_batch(index_name, batch, merge)
-            total_processed += len(batch)
-            total_succeeded += result["succeeded"]
-            total_failed += result["failed"]
+        async def upload(batch: List[Dict[str, Any]]) -> None:
+            result = await self._upload_batch(index_name, batch, merge, limiter=limiter, stats=stats)
+            stats.processed += len(batch)
+            stats.succeeded += result["succeeded"]
+            stats.failed += result["failed"]
+            failed_documents.extend(result["failed_items"])
+            if progress_callback:
+                await progress_callback({
+                    "processed": stats.processed,
+                    "succeeded": stats.succeeded,
+                    "failed": stats.failed
+                })
+        
+        async def launch(batch: List[Dict[str, Any]]) -> None:
+            # Bound buffered batches so memory stays proportional to concurrency
+            while len(in_flight) >= limiter.max_concurrency * 2:
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            task = asyncio.create_task(upload(batch))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = _BATCH_ENVELOPE_BYTES
+        try:
+            async for doc in documents:
+                doc_bytes = _document_bytes(doc)
+                if batch and (len(batch) >= batch_size or batch_bytes + doc_bytes > max_batch_bytes):
+                    await launch(batch)
+                    batch, batch_bytes = [], _BATCH_ENVELOPE_BYTES
+                batch.append(doc)
+                batch_bytes += doc_bytes
             
-            if result["failed_items"]:
-                failed_documents.extend(result["failed_items"])
+            # Upload remaining documents
+            if batch:
+                await launch(batch)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            for task in in_flight:
+                task.cancel()
         
-        elapsed_time = (datetime.utcnow() - start_time).total_seconds()
+        elapsed_time = time.perf_counter() - start_time
         
         return {
-            "total_processed": total_processed,
-            "succeeded": total_succeeded,
-            "failed": total_failed,
+            "total_processed": stats.processed,
+            "succeeded": stats.succeeded,
+            "failed": stats.failed,
             "elapsed_seconds": round(elapsed_time, 2),
-            "documents_per_second": round(total_processed / elapsed_time, 2) if elapsed_time > 0 else 0,
-            "failed_documents": failed_documents[:100]  # Limit to first 100 failures
+            "documents_per_second": round(stats.processed / elapsed_time, 2) if elapsed_time > 0 else 0,
+            "failed_documents": failed_documents[:100],  # Limit to first 100 failures
+            **stats.to_dict(),
+            "peak_in_flight": limiter.peak_in_flight,
+            "final_concurrency": limiter.limit
         }
     
     async def _upload_batch(
         self, 
         index_name: str, 
         documents: List[Dict[str, Any]],
-        merge: bool = False
+        merge: bool = False,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        stats: Optional[_UploadStats] = None
     ) -> Dict[str, Any]:
-        """Upload a single batch with error handling.
+        """Upload a single batch, resending failed keys and backing off on throttling.
         
         Args:
             index_name: Target index name
             documents: Batch of documents
             merge: Whether to merge with existing
+            limiter: Concurrency limiter shared by a bulk upload
+            stats: Accumulator for request latencies and retry counts
             
         Returns:
             Batch result with counts and failed items
         """
-        try:
-            result = await self.ops.upload_documents(index_name, documents, merge)
+        limiter = limiter or AdaptiveConcurrencyLimiter(1)
+        stats = stats or _UploadStats()
+        max_retries = int(os.getenv("MCP_UPLOAD_MAX_RETRIES", DEFAULT_UPLOAD_RETRIES))
+        
+        succeeded = 0
+        failed_items: List[Dict[str, Any]] = []
+        # Pending sub-batches; a 413 splits a batch in half
+        pending: List[Tuple[List[Dict[str, Any]], int]] = [(documents, 0)]
+        
+        while pending:
+            docs, attempt = pending.pop()
+            await limiter.acquire()
+            started = time.perf_counter()
+            try:
+                result = await self.ops.upload_documents(index_name, docs, merge, retry=False)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status == 413 and len(docs) > 1:
+                    await limiter.release()
+                    stats.splits += 1
+                    half = len(docs) // 2
+                    pending.extend([(docs[:half], attempt), (docs[half:], attempt)])
+                    continue
+                if status in _THROTTLE_STATUS and attempt < max_retries:
+                    stats.throttled += 1
+                    delay = _retry_after(e.response)
+                    if delay is None:
+                        delay = _backoff(attempt)
+                    await limiter.release(rate_limited=True, retry_after=delay)
+                    pending.append((docs, attempt + 1))
+                    continue
+                await limiter.release()
+                logger.error(f"Batch upload failed entirely: {e}")
+                failed_items.extend({"key": _key(d), "error": str(e)} for d in docs)
+                continue
+            except httpx.TransportError as e:
+                await limiter.release()
+                if attempt < max_retries:
+                    await asyncio.sleep(_backoff(attempt))
+                    pending.append((docs, attempt + 1))
+                    continue
+                logger.error(f"Batch upload failed entirely: {e}")
+                failed_items.extend({"key": _key(d), "error": str(e)} for d in docs)
+                continue
+            except StructuredError as e:
+                await limiter.release()
+                # The client's circuit breaker closes again after its reset window
+                if e.code == ErrorCode.CIRCUIT_OPEN and attempt < max_retries:
+                    await asyncio.sleep(_backoff(attempt))
+                    pending.append((docs, attempt + 1))
+                    continue
+                logger.error(f"Batch upload failed entirely: {e}")
+                failed_items.extend({"key": _key(d), "error": str(e)} for d in docs)
+                continue
+            except Exception as e:
+                await limiter.release()
+                logger.error(f"Batch upload failed entirely: {e}")
+                failed_items.extend({"key": _key(d), "error": str(e)} for d in docs)
+                continue
             
-            succeeded = 0
-            failed = 0
-            failed_items = []
+            stats.latencies.append(time.perf_counter() - started)
             
-            # Process results
+            # Process per-item results; retriable keys are resent on their own
+            by_key = {_key(d): d for d in docs}
+            retry_docs = []
+            throttled = False
             for item in result.get("value", []):
                 if item.get("status", False):
                     succeeded += 1
+                    continue
+                code = item.get("statusCode")
+                doc = by_key.get(item.get("key"))
+                if doc is not None and code in _RETRIABLE_ITEM_STATUS and attempt < max_retries:
+                    retry_docs.append(doc)
+                    throttled = throttled or code in _THROTTLE_STATUS
                 else:
-                    failed += 1
                     failed_items.append({
                         "key": item.get("key"),
                         "error": item.get("errorMessage", "Unknown error")
                     })
             
-            if failed > 0:
-                logger.warning(f"Batch upload: {failed} documents failed out of {len(documents)}")
-            
-            return {
-                "succeeded": succeeded,
-                "failed": failed,
-                "failed_items": failed_items
-            }
-            
-        except Exception as e:
-            logger.error(f"Batch upload failed entirely: {e}")
-            return {
-                "succeeded": 0,
-                "failed": len(documents),
-                "failed_items": [{"error": str(e)}]
-            }
+            if retry_docs:
+                stats.retried_documents += len(retry_docs)
+                delay = _backoff(attempt)
+                await limiter.release(rate_limited=throttled, retry_after=delay if throttled else None)
+                if not throttled:
+                    await asyncio.sleep(delay)
+                pending.append((retry_docs, attempt + 1))
+            else:
+                await limiter.release()
+        
+        if failed_items:
+            logger.warning(f"Batch upload: {len(failed_items)} documents failed out of {len(documents)}")
+        
+        return {
+            "succeeded": succeeded,
+            "failed": len(failed_items),
+            "failed_items": failed_items
+        }
     
     async def cleanup_old_documents(
         self, 
@@ -312,13 +509,11 @@ class DataAutomation:
         total_count = await self.ops.count_documents(index_name)
         
         # Sample documents
-        results = await self.ops.search(
-            index_name,
-            query="*",
-            top=min(sample_size, total_count)
-        )
-        
-        documents = results.get("value", [])
+        documents = [
+            doc async for doc in self.export_documents_iterator(
+                index_name, max_documents=min(sample_size, total_count)
+            )
+        ]
         issues = []
         field_stats = {}
         
@@ -369,35 +564,78 @@ class DataAutomation:
         index_name: str,
         filter_query: Optional[str] = None,
         select_fields: Optional[List[str]] = None,
-        batch_size: int = 100
+        batch_size: int = MAX_EXPORT_PAGE,
+        key_field: str = "id",
+        max_documents: Optional[int] = None
     ) -> AsyncIterator[Dict[str, Any]]:
         """Export documents from an index as an async iterator.
         
+        Pages by key instead of skip: each request orders on key_field and
+        filters past the last key seen, so exports aren't capped by the
+        service's 100,000 skip limit and pages stay stable while documents
+        are merged into the index.
+        
+        Indexes created before the key was marked sortable can't order on
+        it; those fall back to skip paging, which stops with an error past
+        100,000 documents (narrow the export with filter_query or use
+        export_documents_partitioned).
+        
         Args:
             index_name: Source index name
             filter_query: Optional filter query
             select_fields: Fields to include in export
-            batch_size: Batch size for retrieval
+            batch_size: Documents per page (max 1000)
+            key_field: Sortable, filterable key field
+            max_documents: Stop after this many documents
             
         Yields:
             Documents from the index
         """
-        skip = 0
+        top = max(1, min(batch_size, MAX_EXPORT_PAGE))
+        select = list(select_fields) if select_fields else None
+        if select is not None and key_field not in select:
+            select.append(key_field)
+        last_key: Optional[str] = None
+        exported = 0
+        keyset = await self._key_sortable(index_name, key_field)
         
-        while True:
-            search_params = {
-                "query": "*",
-                "top": batch_size,
-                "skip": skip
-            }
-            
-            if filter_query:
-                search_params["filter"] = filter_query
-            
-            if select_fields:
-                search_params["select"] = select_fields
-            
-            results = await self.ops.search(index_name, **search_params)
+        while max_documents is None or exported < max_documents:
+            page_top = top if max_documents is None else min(top, max_documents - exported)
+            if keyset:
+                page_filter = _and_filters(
+                    filter_query,
+                    f"{key_field} gt {odata_literal(last_key)}" if last_key is not None else None
+                )
+                try:
+                    results = await self.ops.search(
+                        index_name,
+                        query="*",
+                        filter=page_filter,
+                        select=select,
+                        orderby=f"{key_field} asc",
+                        top=page_top
+                    )
+                except httpx.HTTPStatusError as e:
+                    if last_key is not None or e.response.status_code != 400:
+                        raise
+                    # The definition didn't say, but the service won't order on the key
+                    logger.warning(f"Cannot order {index_name} on {key_field}; using skip paging: {e}")
+                    self._sortable_keys[(index_name, key_field)] = keyset = False
+                    continue
+            else:
+                if exported > MAX_EXPORT_SKIP:
+                    raise ValueError(
+                        f"{index_name} has more than {MAX_EXPORT_SKIP} matching documents and its key "
+                        f"{key_field} is not sortable; export it in filtered partitions"
+                    )
+                results = await self.ops.search(
+                    index_name,
+                    query="*",
+                    filter=filter_query,
+                    select=select,
+                    skip=exported,
+                    top=page_top
+                )
             documents = results.get("value", [])
             
             if not documents:
@@ -405,12 +643,179 @@ class DataAutomation:
             
             for doc in documents:
                 yield doc
+            exported += len(documents)
+            last_key = documents[-1][key_field]
             
-            if len(documents) < batch_size:
+            if len(documents) < top:
                 break
-                
-            skip += batch_size
-            await asyncio.sleep(0.1)  # Rate limiting
+
+    async def _key_sortable(self, index_name: str, key_field: str) -> bool:
+        """Whether key_field can be ordered on, from the index definition (cached)"""
+        cache_key = (index_name, key_field)
+        if cache_key not in self._sortable_keys:
+            sortable = True
+            try:
+                definition = await self.ops.get_index(index_name)
+                for f in definition.get("fields", []):
+                    if f.get("name") == key_field:
+                        # Simple fields are sortable unless the definition says otherwise
+                        sortable = f.get("sortable") is not False
+                        break
+            except Exception as e:
+                # Aliases and partial clients: try ordering and fall back on a 400
+                logger.debug(f"Could not read {index_name} definition: {e}")
+            self._sortable_keys[cache_key] = sortable
+        return self._sortable_keys[cache_key]
+
+    async def export_documents_partitioned(
+        self,
+        index_name: str,
+        partitions: Union[str, List[Optional[str]]] = "key_range",
+        filter_query: Optional[str] = None,
+        select_fields: Optional[List[str]] = None,
+        batch_size: int = MAX_EXPORT_PAGE,
+        concurrency: Optional[int] = None,
+        key_field: str = "id"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Export partitions of an index concurrently into one stream.
+        
+        Each partition is a filter exported with keyset paging; up to
+        ``concurrency`` partitions run at once. Documents are handed over
+        through a bounded queue, so memory stays at a few pages regardless
+        of index size. Order across partitions is not preserved.
+        
+        Args:
+            index_name: Source index name
+            partitions: "key_range", "repository", or explicit partition filters
+            filter_query: Optional filter applied to every partition
+            select_fields: Fields to include in export
+            batch_size: Documents per page (max 1000)
+            concurrency: Partitions exported at once (MCP_EXPORT_CONCURRENCY)
+            key_field: Sortable, filterable key field
+            
+        Yields:
+            Documents from the index
+        """
+        if partitions == "key_range":
+            partition_filters = key_range_partitions(key_field=key_field)
+        elif partitions == "repository":
+            partition_filters = await self.repository_partitions(index_name, filter_query)
+        elif isinstance(partitions, str):
+            raise ValueError(f"Unknown partition scheme: {partitions}")
+        else:
+            partition_filters = list(partitions) or [None]
+        concurrency = max(1, concurrency or int(os.getenv("MCP_EXPORT_CONCURRENCY", DEFAULT_EXPORT_CONCURRENCY)))
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, min(batch_size, MAX_EXPORT_PAGE)) * 2)
+        pending = list(partition_filters)
+        done = object()
+        
+        async def worker() -> None:
+            try:
+                while pending:
+                    partition = pending.pop(0)
+                    async for doc in self.export_documents_iterator(
+                        index_name,
+                        filter_query=_and_filters(filter_query, partition),
+                        select_fields=select_fields,
+                        batch_size=batch_size,
+                        key_field=key_field
+                    ):
+                        await queue.put(doc)
+            except Exception:
+                await queue.put(done)
+                raise
+            await queue.put(done)
+        
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(pending)))]
+        remaining = len(workers)
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+            # Surface the first partition failure, if any
+            for task in workers:
+                task.result()
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def repository_partitions(self, index_name: str, filter_query: Optional[str] = None) -> List[Optional[str]]:
+        """One filter per repository facet value, plus documents without one"""
+        results = await self.ops.search(
+            index_name,
+            query="*",
+            filter=filter_query,
+            facets=["repository,count:10000"],
+            top=0
+        )
+        values = [
+            facet.get("value")
+            for facet in results.get("@search.facets", {}).get("repository", [])
+            if facet.get("value") is not None
+        ]
+        return [f"repository eq {odata_literal(v)}" for v in values] + ["repository eq null"]
+
+    async def export_to_ndjson(
+        self,
+        index_name: str,
+        output_path: str,
+        partitions: Union[None, str, List[Optional[str]]] = None,
+        filter_query: Optional[str] = None,
+        select_fields: Optional[List[str]] = None,
+        batch_size: int = MAX_EXPORT_PAGE,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Stream an index export to a newline-delimited JSON file.
+        
+        Args:
+            index_name: Source index name
+            output_path: File to write, one document per line
+            partitions: None for a single keyset scan, else as export_documents_partitioned
+            filter_query: Optional filter query
+            select_fields: Fields to include in export
+            batch_size: Documents per page (max 1000)
+            concurrency: Partitions exported at once
+            
+        Returns:
+            Export summary
+        """
+        if partitions is None:
+            documents = self.export_documents_iterator(
+                index_name, filter_query, select_fields, batch_size
+            )
+        else:
+            documents = self.export_documents_partitioned(
+                index_name, partitions, filter_query, select_fields, batch_size, concurrency
+            )
+        
+        start_time = time.perf_counter()
+        count = 0
+        lines: List[str] = []
+        with open(output_path, "w", encoding="utf-8") as f:
+            async for doc in documents:
+                doc.pop("@search.score", None)
+                lines.append(json.dumps(doc, ensure_ascii=False, default=str))
+                count += 1
+                if len(lines) >= MAX_EXPORT_PAGE:
+                    await asyncio.to_thread(f.write, "\n".join(lines) + "\n")
+                    lines = []
+            if lines:
+                await asyncio.to_thread(f.write, "\n".join(lines) + "\n")
+            size = f.tell()
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            "index_name": index_name,
+            "output_path": output_path,
+            "documents": count,
+            "bytes": size,
+            "elapsed_seconds": round(elapsed, 2),
+            "documents_per_second": round(count / elapsed, 2) if elapsed > 0 else 0
+        }
 
     async def export_documents(
         self,
@@ -418,7 +823,7 @@ class DataAutomation:
         output_async_iterator: bool = True,
         filter_query: Optional[str] = None,
         select_fields: Optional[List[str]] = None,
-        batch_size: int = 100
+        batch_size: int = MAX_EXPORT_PAGE
     ) -> Union[AsyncIterator[Dict[str, Any]], List[Dict[str, Any]]]:
         """Export documents from an index.
         
@@ -443,4 +848,4 @@ class DataAutomation:
                 index_name, filter_query, select_fields, batch_size
             ):
                 all_documents.append(doc)
-            return all_documents
\ No newline at end of file
+            return all_documents
@@ -5,17 +5,102 @@ providing batch processing, caching, and quality monitoring capabilities.
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Sequence, Callable, Awaitable
+import os
+from typing import Dict, Any, List, Optional, Tuple, Sequence, Callable, Awaitable, AsyncIterator
 from datetime import datetime, timedelta
 import hashlib
 import asyncio
-from collections import defaultdict
+from array import array
+from collections import OrderedDict, defaultdict
 
 from ..rest import SearchOperations
-from ..embedding_provider import IEmbeddingProvider, AzureOpenAIEmbeddingProvider, NullEmbeddingProvider
+from ..embedding_provider import (
+    IEmbeddingProvider,
+    AzureOpenAIEmbeddingProvider,
+    NullEmbeddingProvider,
+    EmbeddingRateLimitError,
+    format_code_input,
+)
+from ..embedding_store import ChunkEmbeddingStore, get_chunk_embedding_store
+from enhanced_rag.utils.adaptive_limiter import AdaptiveConcurrencyLimiter
+
+# Optional dependency: tiktoken gives exact token counts for batch planning
+try:
+    import tiktoken  # type: ignore
+except ImportError:
+    tiktoken = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+# Code tokenizes densely; without tiktoken assume ~3 characters per token
+_CHARS_PER_TOKEN = 3
+_encoding: Any = None
+_encoding_loaded = False
+
+
+def _get_encoding() -> Any:
+    """Load the embedding models' tokenizer once (None if unavailable)."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.debug("tiktoken encoding unavailable, estimating tokens: %s", e)
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens the embedding model sees for text."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def plan_token_batches(
+    token_counts: Sequence[int],
+    max_batch_tokens: int,
+    max_batch_items: int
+) -> List[List[int]]:
+    """Group input positions into request batches.
+
+    Each batch holds at most max_batch_items inputs whose token counts sum
+    to at most max_batch_tokens; an input that alone exceeds the budget gets
+    a batch of its own.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if current and (
+            current_tokens + tokens > max_batch_tokens or len(current) >= max_batch_items
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def embedding_identity(
+    provider: IEmbeddingProvider,
+    context_fields: Optional[Sequence[str]] = None
+) -> str:
+    """Model, dimensions and context fields that determine a document's vector.
+
+    The incremental manifest tags chunks with it, so a change of any of them
+    re-embeds chunks whose content did not change.
+    """
+    model = getattr(provider, "model_name", None) or type(provider).__name__
+    dimensions = getattr(provider, "dimensions", None)
+    return f"{model}:{dimensions or ''}:{','.join(context_fields or ())}"
+
 
 class EmbeddingAutomation:
     """Automate embedding generation and management tasks."""
@@ -23,19 +108,40 @@ class EmbeddingAutomation:
     def __init__(self,
                  operations: SearchOperations,
                  embedding_provider: Optional[IEmbeddingProvider] = None,
-                 cache_ttl_seconds: int = 3600):
+                 cache_ttl_seconds: int = 3600,
+                 max_cache_entries: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 max_batch_tokens: Optional[int] = None,
+                 max_input_tokens: Optional[int] = None,
+                 max_retries: Optional[int] = None,
+                 embedding_store: Optional[ChunkEmbeddingStore] = None):
         """Initialize embedding automation.
 
         Args:
             operations: SearchOperations instance
             embedding_provider: Embedding provider (auto-created if None)
             cache_ttl_seconds: Cache TTL in seconds
+            max_cache_entries: Cache size bound (MCP_EMBEDDING_CACHE_ENTRIES)
+            max_concurrency: Concurrent embedding requests (MCP_EMBEDDING_CONCURRENCY)
+            max_batch_tokens: Token budget per request (MCP_EMBEDDING_BATCH_TOKENS)
+            max_input_tokens: Per-input token limit of the model (MCP_EMBEDDING_INPUT_TOKENS)
+            max_retries: Retries of a rate-limited batch (MCP_EMBEDDING_MAX_RETRIES)
+            embedding_store: Persistent chunk embedding store (process-wide store if None)
         """
         self.ops = operations
         self.provider = embedding_provider or self._create_default_provider()
         self.cache_ttl = cache_ttl_seconds
-        self._embedding_cache: Dict[str, Tuple[List[float], datetime]] = {}
+        self.max_cache_entries = max(1, max_cache_entries or int(os.getenv("MCP_EMBEDDING_CACHE_ENTRIES", "10000")))
+        self.max_concurrency = max(1, max_concurrency or int(os.getenv("MCP_EMBEDDING_CONCURRENCY", "4")))
+        self.max_batch_tokens = max(1, max_batch_tokens or int(os.getenv("MCP_EMBEDDING_BATCH_TOKENS", "100000")))
+        self.max_input_tokens = max(1, max_input_tokens or int(os.getenv("MCP_EMBEDDING_INPUT_TOKENS", "8191")))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("MCP_EMBEDDING_MAX_RETRIES", "6"))
+        # float32 vectors keep the bounded cache a quarter the size of lists
+        self._embedding_cache: "OrderedDict[str, Tuple[array, datetime]]" = OrderedDict()
         self._stats = defaultdict(int)
+        self._limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        self._limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.store = embedding_store if embedding_store is not None else get_chunk_embedding_store()
 
     def _create_default_provider(self) -> IEmbeddingProvider:
         """Create default embedding provider."""
@@ -53,6 +159,53 @@ class EmbeddingAutomation:
         """Check if cached entry is still valid."""
         return (datetime.utcnow() - cached_time).total_seconds() < self.cache_ttl
 
+    def _cache_get(self, cache_key: str) -> Optional[List[float]]:
+        """Return a fresh cached embedding, dropping expired entries."""
+        entry = self._embedding_cache.get(cache_key)
+        if entry is None:
+            return None
+        vector, cached_time = entry
+        if not self._is_cache_valid(cached_time):
+            del self._embedding_cache[cache_key]
+            return None
+        self._embedding_cache.move_to_end(cache_key)
+        return vector.tolist()
+
+    def _cache_put(self, cache_key: str, embedding: List[float]) -> None:
+        """Store an embedding, evicting least recently used entries."""
+        self._embedding_cache[cache_key] = (array("f", embedding), datetime.utcnow())
+        self._embedding_cache.move_to_end(cache_key)
+        while len(self._embedding_cache) > self.max_cache_entries:
+            self._embedding_cache.popitem(last=False)
+            self._stats["cache_evictions"] += 1
+
+    def _store_identity(self) -> Optional[Tuple[str, Optional[int]]]:
+        """(model, dimensions) keying the persistent store, None if it can't be used."""
+        model = getattr(self.provider, "model_name", None)
+        if self.store is None or not model:
+            return None
+        return model, getattr(self.provider, "dimensions", None)
+
+    def _get_limiter(self) -> AdaptiveConcurrencyLimiter:
+        """Limiter shared by all batch calls so 429s throttle the whole client."""
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._limiter_loop is not loop:
+            self._limiter = AdaptiveConcurrencyLimiter(self.max_concurrency)
+            self._limiter_loop = loop
+        return self._limiter
+
+    def _fit_input(self, text: str) -> Tuple[str, int]:
+        """Truncate text to the model's per-input limit; return it with its token count."""
+        tokens = estimate_tokens(text)
+        if tokens <= self.max_input_tokens:
+            return text, tokens
+        self._stats["inputs_truncated"] += 1
+        encoding = _get_encoding()
+        if encoding is not None:
+            ids = encoding.encode(text, disallowed_special=())[:self.max_input_tokens]
+            return encoding.decode(ids), self.max_input_tokens
+        return text[:self.max_input_tokens * _CHARS_PER_TOKEN], self.max_input_tokens
+
     async def generate_embedding(
         self,
         text: str,
@@ -74,14 +227,23 @@ class EmbeddingAutomation:
 
         # Check cache
         if use_cache and cache_key:
-            if cache_key in self._embedding_cache:
-                embedding, cached_time = self._embedding_cache[cache_key]
-                if self._is_cache_valid(cached_time):
-                    self._stats["cache_hits"] += 1
-                    return embedding
+            embedding = self._cache_get(cache_key)
+            if embedding is not None:
+                self._stats["cache_hits"] += 1
+                return embedding
 
-        # Generate embedding
         self._stats["cache_misses"] += 1
+        identity = self._store_identity() if use_cache else None
+        store_text = format_code_input(text, context) if context else text
+        if identity:
+            embedding = await asyncio.to_thread(self.store.get, *identity, store_text)
+            if embedding is not None:
+                self._stats["store_hits"] += 1
+                self._cache_put(cache_key, embedding)
+                return embedding
+            self._stats["store_misses"] += 1
+
+        # Generate embedding
         if context:
             embedding = self.provider.generate_code_embedding(text, context)
         else:
@@ -89,11 +251,48 @@ class EmbeddingAutomation:
 
         # Cache result
         if embedding and use_cache and cache_key:
-            self._embedding_cache[cache_key] = (embedding, datetime.utcnow())
+            self._cache_put(cache_key, embedding)
             self._stats["embeddings_generated"] += 1
+            if identity:
+                await asyncio.to_thread(self.store.put, *identity, store_text, embedding)
 
         return embedding
 
+    async def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Send one batch under the shared limiter, retrying on rate limits."""
+        limiter = self._get_limiter()
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            released = False
+            try:
+                embeddings = await self.provider.agenerate_embeddings_batch(texts)
+            except EmbeddingRateLimitError as e:
+                self._stats["rate_limited"] += 1
+                delay = e.retry_after if e.retry_after is not None else min(30.0, 0.5 * (2 ** attempt))
+                await limiter.release(rate_limited=True, retry_after=delay)
+                released = True
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.warning("Embedding batch of %d inputs still rate limited after %d retries",
+                                   len(texts), self.max_retries)
+                    return [None] * len(texts)
+                continue
+            except Exception as e:
+                await limiter.release()
+                released = True
+                logger.warning("Embedding batch of %d inputs failed: %s", len(texts), e)
+                return [None] * len(texts)
+            else:
+                await limiter.release()
+                released = True
+            finally:
+                if not released:
+                    # Cancelled mid-request (timeout, shutdown): free the slot, report nothing
+                    await limiter.abandon()
+            self._stats["requests"] += 1
+            return embeddings
+
     async def generate_embeddings_batch(
         self,
         texts: Sequence[str],
@@ -103,69 +302,92 @@ class EmbeddingAutomation:
     ) -> List[Optional[List[float]]]:
         """Generate embeddings for multiple texts efficiently.
 
+        Texts missing from the in-memory cache are looked up in the
+        persistent store; the rest are packed into requests up to max_batch_tokens (and
+        at most batch_size inputs), which run concurrently under an adaptive
+        limit that backs off on 429 responses.
+
         Args:
             texts: Texts to embed
-            batch_size: Batch size for API calls
+            batch_size: Maximum inputs per API call
             use_cache: Whether to use cache
             progress_callback: Optional progress callback
 
         Returns:
             List of embeddings (None for failures)
         """
-        results = [None] * len(texts)
-        uncached_indices = []
-        uncached_texts = []
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        uncached_indices: List[int] = []
+        uncached_texts: List[str] = []
 
         # Check cache first
-        if use_cache:
-            for i, text in enumerate(texts):
-                cache_key = self._cache_key(text)
-                if cache_key in self._embedding_cache:
-                    embedding, cached_time = self._embedding_cache[cache_key]
-                    if self._is_cache_valid(cached_time):
-                        results[i] = embedding
-                        self._stats["cache_hits"] += 1
-                    else:
-                        uncached_indices.append(i)
-                        uncached_texts.append(text)
-                else:
-                    uncached_indices.append(i)
-                    uncached_texts.append(text)
-        else:
-            uncached_indices = list(range(len(texts)))
-            uncached_texts = list(texts)
-
-        # Process uncached texts in batches
-        for i in range(0, len(uncached_texts), batch_size):
-            batch_texts = uncached_texts[i:i + batch_size]
-            batch_indices = uncached_indices[i:i + batch_size]
+        for i, text in enumerate(texts):
+            if use_cache:
+                embedding = self._cache_get(self._cache_key(text))
+                if embedding is not None:
+                    results[i] = embedding
+                    self._stats["cache_hits"] += 1
+                    continue
+            uncached_indices.append(i)
+            uncached_texts.append(text)
+
+        if not uncached_texts:
+            return results
+
+        fitted = [self._fit_input(text) for text in uncached_texts]
+        pending = list(range(len(uncached_texts)))
+        identity = self._store_identity() if use_cache else None
+        if identity:
+            stored = await asyncio.to_thread(
+                self.store.get_many, *identity, [text for text, _ in fitted]
+            )
+            pending = []
+            for j, embedding in enumerate(stored):
+                if embedding is None:
+                    pending.append(j)
+                    continue
+                results[uncached_indices[j]] = embedding
+                self._cache_put(self._cache_key(uncached_texts[j]), embedding)
+            self._stats["store_hits"] += len(uncached_texts) - len(pending)
+            self._stats["store_misses"] += len(pending)
+
+        batches = plan_token_batches(
+            [fitted[j][1] for j in pending],
+            max_batch_tokens=self.max_batch_tokens,
+            max_batch_items=max(1, batch_size)
+        )
+        processed = len(uncached_texts) - len(pending)
 
-            # Generate embeddings
-            batch_embeddings = self.provider.generate_embeddings_batch(batch_texts)
+        async def run(batch: List[int]) -> None:
+            nonlocal processed
+            batch = [pending[b] for b in batch]
+            batch_embeddings = await self._embed_batch([fitted[j][0] for j in batch])
 
             # Store results and update cache
-            for idx, text, embedding in zip(batch_indices, batch_texts, batch_embeddings):
-                results[idx] = embedding
+            for j, embedding in zip(batch, batch_embeddings):
+                results[uncached_indices[j]] = embedding
                 if embedding and use_cache:
-                    cache_key = self._cache_key(text)
-                    self._embedding_cache[cache_key] = (embedding, datetime.utcnow())
+                    self._cache_put(self._cache_key(uncached_texts[j]), embedding)
                     self._stats["embeddings_generated"] += 1
+            if identity:
+                await asyncio.to_thread(
+                    self.store.put_many, *identity,
+                    [(fitted[j][0], e) for j, e in zip(batch, batch_embeddings) if e]
+                )
 
-            # Progress callback
+            processed += len(batch)
             if progress_callback:
+                progress = {
+                    "processed": processed,
+                    "total": len(uncached_texts),
+                    "cached": len(texts) - len(uncached_texts)
+                }
                 if asyncio.iscoroutinefunction(progress_callback):
-                    await progress_callback({
-                        "processed": min(i + batch_size, len(uncached_texts)),
-                        "total": len(uncached_texts),
-                        "cached": len(texts) - len(uncached_texts)
-                    })
+                    await progress_callback(progress)
                 else:
-                    progress_callback({
-                        "processed": min(i + batch_size, len(uncached_texts)),
-                        "total": len(uncached_texts),
-                        "cached": len(texts) - len(uncached_texts)
-                    })
+                    progress_callback(progress)
 
+        await asyncio.gather(*(run(batch) for batch in batches))
         return results
 
     async def enrich_documents_with_embeddings(
@@ -178,26 +400,28 @@ class EmbeddingAutomation:
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Enrich documents with embeddings.
 
+        Context-augmented inputs go through the same batched path as plain
+        text, so context_fields no longer forces one request per document.
+
         Args:
             documents: Documents to enrich
             text_field: Field containing text to embed
             embedding_field: Field to store embedding
             context_fields: Optional fields for context
-            batch_size: Batch size for embedding generation
+            batch_size: Maximum inputs per embedding request
 
         Returns:
             Tuple of (enriched documents, statistics)
         """
         start_time = datetime.utcnow()
 
-        # Extract texts and contexts
+        # Extract embedding inputs
         texts = []
-        contexts = []
         valid_indices = []
 
         for i, doc in enumerate(documents):
             if text_field in doc and doc[text_field]:
-                texts.append(doc[text_field])
+                context = None
 
                 # Build context from specified fields
                 if context_fields:
@@ -205,25 +429,14 @@ class EmbeddingAutomation:
                     for field in context_fields:
                         if field in doc and doc[field]:
                             context_parts.append(f"{field}: {doc[field]}")
-                    contexts.append("\n".join(context_parts) if context_parts else None)
-                else:
-                    contexts.append(None)
+                    context = "\n".join(context_parts) if context_parts else None
 
+                # Documents without context are embedded as plain text, as before
+                texts.append(format_code_input(doc[text_field], context) if context else doc[text_field])
                 valid_indices.append(i)
 
         # Generate embeddings
-        if contexts and any(contexts):
-            # Generate with context
-            embeddings = []
-            for text, context in zip(texts, contexts):
-                if context:
-                    embedding = await self.generate_embedding(text, context=context)
-                else:
-                    embedding = await self.generate_embedding(text)
-                embeddings.append(embedding)
-        else:
-            # Batch generate without context
-            embeddings = await self.generate_embeddings_batch(texts, batch_size=batch_size)
+        embeddings = await self.generate_embeddings_batch(texts, batch_size=batch_size)
 
         # Enrich documents
         enriched_count = 0
@@ -249,6 +462,51 @@ class EmbeddingAutomation:
 
         return documents, stats
 
+    async def enrich_document_stream(
+        self,
+        documents: AsyncIterator[Dict[str, Any]],
+        text_field: str = "content",
+        embedding_field: str = "content_vector",
+        context_fields: Optional[List[str]] = None,
+        batch_size: int = 100,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Enrich a document stream batch by batch, yielding as each batch completes.
+
+        Args:
+            documents: Async iterator of documents
+            text_field: Field containing text to embed
+            embedding_field: Field to store embedding
+            context_fields: Optional fields for context
+            batch_size: Documents enriched per batch
+            stats: Optional dict accumulating processed/enriched/failed counts
+        """
+        batch: List[Dict[str, Any]] = []
+
+        async def flush() -> List[Dict[str, Any]]:
+            enriched, batch_stats = await self.enrich_documents_with_embeddings(
+                batch,
+                text_field=text_field,
+                embedding_field=embedding_field,
+                context_fields=context_fields,
+                batch_size=batch_size
+            )
+            if stats is not None:
+                for key in ("processed", "enriched", "failed"):
+                    stats[key] = stats.get(key, 0) + batch_stats.get(key, 0)
+            return enriched
+
+        async for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                for enriched_doc in await flush():
+                    yield enriched_doc
+                batch = []
+
+        if batch:
+            for enriched_doc in await flush():
+                yield enriched_doc
+
     async def validate_embeddings(
         self,
         index_name: str,
@@ -345,11 +603,16 @@ class EmbeddingAutomation:
             if self._is_cache_valid(cached_time)
         )
 
+        limiter = self._limiter
         return {
             "provider_type": type(self.provider).__name__,
             "cache_size": cache_size,
+            "max_cache_entries": self.max_cache_entries,
             "valid_cache_entries": valid_entries,
             "cache_ttl_seconds": self.cache_ttl,
+            "concurrency_limit": limiter.limit if limiter else self.max_concurrency,
+            "peak_in_flight": limiter.peak_in_flight if limiter else 0,
             "stats": dict(self._stats),
+            "store": self.store.get_stats() if self.store is not None else None,
             "timestamp": datetime.utcnow().isoformat()
         }
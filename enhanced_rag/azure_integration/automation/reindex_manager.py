@@ -5,9 +5,11 @@ only. It replaces legacy SDK-based flows and removes the dependency on
 ReindexOperations.
 """
 
+import asyncio
 import logging
+import re
 import warnings
-from typing import Dict, Any, Optional, List, AsyncIterator, Iterable
+from typing import Dict, Any, Optional, List, AsyncIterator, Iterable, Tuple
 from datetime import datetime
 from pathlib import Path
 import json
@@ -18,10 +20,15 @@ from .data_manager import DataAutomation
 from .index_manager import IndexAutomation
 from .indexer_manager import IndexerAutomation
 from ..embedding_provider import IEmbeddingProvider
+from ..index_pointer import IndexPointer, get_index_pointer
 from ..lib import validate_index_schema as lib_validate_schema
 
 logger = logging.getLogger(__name__)
 
+SWITCH_MODES = ("auto", "alias", "pointer")
+DEFAULT_SAMPLE_QUERIES = ("*", "function", "class", "import")
+_SCHEMA_METADATA_KEYS = ("@odata.context", "@odata.etag", "etag", "e_tag")
+
 
 class ReindexAutomation:
     """Automate reindexing tasks for Azure AI Search."""
@@ -98,17 +105,19 @@ class ReindexAutomation:
         repo_name: Optional[str] = None,
         schema_path: Optional[str] = None,
         clear_filter: Optional[str] = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        **blue_green_options
     ) -> Dict[str, Any]:
         """Perform reindexing with specified method.
         
         Args:
-            method: Reindexing method (drop-rebuild, incremental, clear, repository)
-            repo_path: Repository path for repository method
-            repo_name: Repository name for repository method
-            schema_path: Schema file path for drop-rebuild
+            method: Reindexing method (drop-rebuild, blue-green, incremental, clear, repository)
+            repo_path: Repository path for repository and blue-green methods
+            repo_name: Repository name for repository and blue-green methods
+            schema_path: Schema file path for drop-rebuild and blue-green
             clear_filter: OData filter for clear method
             dry_run: If True, validate but don't execute
+            **blue_green_options: switch, sample_queries, keep_versions for blue-green
             
         Returns:
             Dict with reindexing results
@@ -131,6 +140,16 @@ class ReindexAutomation:
                     result["index_name"] = index
                     if schema_path:
                         result["schema_file"] = schema_path
+                elif method == "blue-green":
+                    if schema_path and not Path(schema_path).exists():
+                        raise ValueError(f"Schema file not found: {schema_path}")
+                    active, via = await self._resolve_active_index(index)
+                    shadow = self._version_name(index, await self._next_version(index))
+                    result["action"] = f"Would build {shadow} and switch {index} from {active or 'nothing'}"
+                    result["index_name"] = index
+                    result["active_index"] = active
+                    result["active_via"] = via
+                    result["shadow_index"] = shadow
                 elif method == "clear":
                     stats = await self.ops.get_index_stats(index)
                     result["action"] = f"Would clear {stats.get('documentCount', 0)} documents"
@@ -162,6 +181,13 @@ class ReindexAutomation:
                     await self.ops.create_index(schema)
                     result["status"] = "success"
                     result["rebuild_complete"] = True
+                elif method == "blue-green":
+                    result.update(await self.blue_green_rebuild(
+                        repo_path=repo_path,
+                        repo_name=repo_name,
+                        schema_path=schema_path,
+                        **blue_green_options
+                    ))
                 elif method == "clear":
                     count = await self._clear_documents(index, clear_filter)
                     result["status"] = "success"
@@ -271,6 +297,131 @@ class ReindexAutomation:
         else:
             raise ValueError(f"Invalid action: {action}")
     
+    async def blue_green_rebuild(
+        self,
+        repo_path: Optional[str] = None,
+        repo_name: Optional[str] = None,
+        schema_path: Optional[str] = None,
+        switch: str = "auto",
+        sample_queries: Optional[Iterable[str]] = None,
+        keep_versions: int = 1,
+        index_name: Optional[str] = None,
+        pointer: Optional[IndexPointer] = None,
+        count_timeout: float = 60.0
+    ) -> Dict[str, Any]:
+        """Rebuild into a versioned shadow index, then switch traffic to it.
+        
+        The live index keeps serving while ``{name}-v{n}`` is created and
+        populated - from the repository when one is given, otherwise by
+        copying the live index. The shadow must reach the expected document
+        count, hold at least as many documents as the live index for every
+        repository it did not rebuild, carry vectors if the live index does,
+        and return results for every sample query the live index answers
+        before the switch; otherwise it is deleted and the live index is
+        left untouched.
+        
+        Switching repoints the index alias named after the logical index,
+        or records the new index in the index pointer file that retrieval
+        code resolves per request. "auto" uses the alias when the service
+        supports aliases and the logical name is not yet held by a concrete
+        index or the pointer (an alias can't replace a concrete index without
+        a brief outage; pass switch="alias" to accept that once), and the
+        pointer otherwise.
+        
+        Args:
+            repo_path: Repository to index into the shadow
+            repo_name: Repository name for repo_path
+            schema_path: Schema file; defaults to the live index definition
+            switch: "auto", "alias", or "pointer"
+            sample_queries: Queries compared between live and shadow
+            keep_versions: Previous versions kept for rollback
+            index_name: Logical index name (defaults to the configured index)
+            pointer: Index pointer to update (defaults to the shared one)
+            count_timeout: Seconds to wait for the shadow count to settle
+            
+        Returns:
+            Dict with the shadow index, verification and switch results
+        """
+        if switch not in SWITCH_MODES:
+            raise ValueError(f"Unknown switch mode: {switch}")
+        if bool(repo_path) != bool(repo_name):
+            raise ValueError("Repository path and name must be given together")
+        logical = index_name or self._index_default_name
+        pointer = pointer or get_index_pointer()
+        active, via = await self._resolve_active_index(logical, pointer)
+
+        # Schema for the shadow comes from the file or the live definition
+        if schema_path:
+            schema = json.loads(Path(schema_path).read_text())
+        elif active:
+            schema = await self.ops.get_index(active)
+        else:
+            raise ValueError(f"No schema file given and no live index for {logical}")
+        for key in _SCHEMA_METADATA_KEYS:
+            schema.pop(key, None)
+        schema.pop("_backup_metadata", None)
+
+        shadow = self._version_name(logical, await self._next_version(logical))
+        schema["name"] = shadow
+        result: Dict[str, Any] = {
+            "index_name": logical,
+            "previous_index": active,
+            "previous_via": via,
+            "shadow_index": shadow,
+        }
+        logger.info(f"Blue/green rebuild of {logical}: building {shadow} (live: {active or 'none'})")
+        await self.ops.create_index(schema)
+
+        try:
+            if repo_path:
+                uploaded = await self._reindex_repository(shadow, repo_path, repo_name)
+                expected = uploaded
+            elif active:
+                expected = await self.ops.count_documents(active)
+                uploaded = await self._copy_documents(active, shadow)
+            else:
+                raise ValueError(f"Nothing to populate {shadow} from: no repository and no live index")
+            result["documents_uploaded"] = uploaded
+
+            verification = await self._verify_shadow(
+                shadow, active, expected, list(sample_queries or DEFAULT_SAMPLE_QUERIES), count_timeout,
+                schema=schema, rebuilt_repository=repo_name if repo_path else None
+            )
+        except Exception as e:
+            verification = {"passed": False, "issues": [str(e)]}
+        result["verification"] = verification
+
+        if not verification["passed"]:
+            logger.error(f"Shadow index {shadow} failed verification: {verification['issues']}")
+            await self._delete_index_quietly(shadow)
+            result["status"] = "failed"
+            result["active_index"] = active
+            return result
+
+        result["switch"] = await self._switch_to(logical, shadow, switch, via, pointer)
+        result["active_index"] = shadow
+        result["deleted_indexes"] = await self._collect_old_versions(logical, shadow, keep_versions)
+        result["status"] = "success"
+        return result
+
+    async def rollback_blue_green(
+        self,
+        index_name: Optional[str] = None,
+        pointer: Optional[IndexPointer] = None
+    ) -> Dict[str, Any]:
+        """Switch the logical index back to the newest version before the active one."""
+        logical = index_name or self._index_default_name
+        pointer = pointer or get_index_pointer()
+        active, via = await self._resolve_active_index(logical, pointer)
+        older = [name for n, name in await self._list_versions(logical) if name != active
+                 and n < self._version_number(logical, active or "")]
+        if not older:
+            raise ValueError(f"No earlier version of {logical} to roll back to")
+        target = older[-1]
+        mode = "alias" if via == "alias" else "pointer"
+        switched = await self._switch_to(logical, target, mode, via, pointer)
+        return {"index_name": logical, "previous_index": active, "active_index": target, "switch": switched}
+
     async def analyze_reindex_need(self, threshold_days: int = 30) -> Dict[str, Any]:
         """Analyze if reindexing is needed based on various metrics.
         
@@ -360,22 +511,271 @@ class ReindexAutomation:
     async def _reindex_repository(self, index_name: str, repo_path: str, repo_name: str) -> int:
         """Process a repository and upload documents in batches."""
         processor = FileProcessor()
-        docs = processor.process_repository(repo_path, repo_name)
+        data_automation = DataAutomation(self.ops)
+
+        documents = processor.aiter_repository(repo_path, repo_name)
+        if self.embedding_provider is not None:
+            documents = self._embed_missing_vectors(documents)
+        result = await data_automation.bulk_upload(
+            index_name=index_name,
+            documents=documents,
+            batch_size=100
+        )
+        return result.get("succeeded", 0)
+
+    @staticmethod
+    def _version_name(logical: str, version: int) -> str:
+        return f"{logical}-v{version}"
+
+    @staticmethod
+    def _version_number(logical: str, name: str) -> int:
+        match = re.fullmatch(re.escape(logical) + r"-v(\d+)", name)
+        return int(match.group(1)) if match else 0
+
+    async def _list_versions(self, logical: str) -> List[Tuple[int, str]]:
+        """Versioned indexes of logical, oldest first"""
+        indexes = await self.ops.list_indexes(select=["name"])
+        versions = []
+        for index in indexes:
+            number = self._version_number(logical, index.get("name", ""))
+            if number:
+                versions.append((number, index["name"]))
+        return sorted(versions)
+
+    async def _next_version(self, logical: str) -> int:
+        versions = await self._list_versions(logical)
+        return (versions[-1][0] if versions else 0) + 1
+
+    async def _resolve_active_index(
+        self,
+        logical: str,
+        pointer: Optional[IndexPointer] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """(physical index serving logical, how it is resolved) - alias, pointer, or index"""
+        try:
+            alias = await self.ops.get_alias(logical)
+            indexes = alias.get("indexes") or []
+            if indexes:
+                return indexes[0], "alias"
+        except Exception:
+            pass
+        target = (pointer or get_index_pointer()).get(logical)
+        if target:
+            return target, "pointer"
+        try:
+            await self.ops.get_index(logical)
+            return logical, "index"
+        except Exception:
+            return None, None
+
+    async def _aliases_supported(self) -> bool:
+        try:
+            await self.ops.list_aliases()
+            return True
+        except Exception:
+            return False
+
+    async def _switch_to(
+        self,
+        logical: str,
+        target: str,
+        mode: str,
+        via: Optional[str],
+        pointer: IndexPointer
+    ) -> Dict[str, Any]:
+        """Point logical at target by alias or pointer file"""
+        if mode == "auto":
+            # Stay on the pointer once in use: a legacy index may still hold the name
+            mode = "alias" if via in (None, "alias") and await self._aliases_supported() else "pointer"
 
+        if mode == "pointer":
+            previous = pointer.set(logical, target)
+            return {"mode": "pointer", "path": str(pointer.path), "previous": previous}
+
+        if via == "index":
+            # An alias can't share its name with an index, so the legacy
+            # index goes first. This is the only window without a target.
+            logger.warning(f"Replacing concrete index {logical} with an alias; "
+                           f"queries fail until the alias is created")
+            await self.ops.delete_index(logical)
+        await self.ops.create_or_update_alias(logical, target)
+        # Stale pointer entries would shadow the alias for local readers
+        pointer.clear(logical)
+        return {"mode": "alias", "alias": logical}
+
+    async def _copy_documents(self, source: str, target: str) -> int:
+        """Stream every document of source into target, embedding where vectors are missing"""
         data_automation = DataAutomation(self.ops)
 
-        async def gen() -> AsyncIterator[Dict[str, Any]]:
-            for d in docs:
-                yield d
+        async def stripped() -> AsyncIterator[Dict[str, Any]]:
+            async for doc in data_automation.export_documents_partitioned(source):
+                yield {k: v for k, v in doc.items() if not k.startswith("@search.")}
 
-        result = await data_automation.bulk_upload(index_name=index_name, documents=gen(), batch_size=100)
+        documents = stripped()
+        if self.embedding_provider is not None:
+            documents = self._embed_missing_vectors(documents)
+        result = await data_automation.bulk_upload(index_name=target, documents=documents)
         return result.get("succeeded", 0)
 
+    async def _embed_missing_vectors(
+        self,
+        documents: AsyncIterator[Dict[str, Any]],
+        batch_size: int = 100
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Fill content_vector for documents whose vectors aren't retrievable"""
+        from .embedding_manager import EmbeddingAutomation
+        embedder = EmbeddingAutomation(self.ops, self.embedding_provider)
+        batch: List[Dict[str, Any]] = []
+
+        async def flush() -> List[Dict[str, Any]]:
+            missing = [d for d in batch if not d.get("content_vector") and d.get("content")]
+            if missing:
+                await embedder.enrich_documents_with_embeddings(missing, batch_size=batch_size)
+            return batch
+
+        async for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                for item in await flush():
+                    yield item
+                batch = []
+        for item in await flush():
+            yield item
+
+    async def _verify_shadow(
+        self,
+        shadow: str,
+        active: Optional[str],
+        expected: int,
+        sample_queries: List[str],
+        count_timeout: float,
+        schema: Optional[Dict[str, Any]] = None,
+        rebuilt_repository: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Check the shadow's document counts, vectors and sample query results"""
+        issues: List[str] = []
+
+        # Counts lag uploads by a refresh interval; poll until they settle
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + count_timeout
+        count = await self.ops.count_documents(shadow)
+        while count < expected and loop.time() < deadline:
+            await asyncio.sleep(1.0)
+            count = await self.ops.count_documents(shadow)
+        if count == 0:
+            issues.append(f"{shadow} is empty")
+        elif count < expected:
+            issues.append(f"{shadow} has {count} documents, expected {expected}")
+
+        repositories: Dict[str, Dict[str, int]] = {}
+        if active:
+            try:
+                live_counts = await self._repository_counts(active)
+                shadow_counts = await self._repository_counts(shadow)
+            except Exception as e:
+                if rebuilt_repository:
+                    issues.append(f"Could not compare repositories of {active} and {shadow}: {e}")
+                else:
+                    logger.warning(f"Repository counts unavailable for {active}: {e}")
+            else:
+                for repository, live_count in live_counts.items():
+                    if repository == rebuilt_repository:
+                        continue
+                    shadow_count = shadow_counts.get(repository, 0)
+                    repositories[repository] = {"live": live_count, "shadow": shadow_count}
+                    if shadow_count < live_count:
+                        issues.append(
+                            f"{shadow} has {shadow_count} documents of repository {repository!r}, "
+                            f"{active} has {live_count}"
+                        )
+
+        vector_field = self._vector_field(schema or {})
+        vectors = None
+        if active and vector_field:
+            try:
+                live_vectors = await self._has_vectors(active, vector_field)
+            except Exception as e:
+                logger.warning(f"Vector probe failed on {active}: {e}")
+                live_vectors = False
+            if live_vectors:
+                vectors = await self._has_vectors(shadow, vector_field)
+                if not vectors:
+                    issues.append(f"{shadow} has no vectors in {vector_field['name']} but {active} does")
+
+        queries = []
+        for query in sample_queries:
+            shadow_hits = len((await self.ops.search(shadow, query, top=5)).get("value", []))
+            live_hits = None
+            if active:
+                try:
+                    live_hits = len((await self.ops.search(active, query, top=5)).get("value", []))
+                except Exception as e:
+                    logger.warning(f"Sample query {query!r} failed on {active}: {e}")
+            if shadow_hits == 0 and (live_hits or (live_hits is None and query == "*")):
+                issues.append(f"Query {query!r} returned no results from {shadow}")
+            queries.append({"query": query, "shadow_results": shadow_hits, "live_results": live_hits})
+
+        return {
+            "passed": not issues,
+            "document_count": count,
+            "expected_documents": expected,
+            "repositories": repositories,
+            "vectors": vectors,
+            "queries": queries,
+            "issues": issues,
+        }
+
+    async def _repository_counts(self, index_name: str) -> Dict[str, int]:
+        """Document count per repository of index_name"""
+        results = await self.ops.search(
+            index_name, query="*", facets=["repository,count:10000"], top=0
+        )
+        return {
+            facet["value"]: facet.get("count", 0)
+            for facet in results.get("@search.facets", {}).get("repository", [])
+            if facet.get("value") is not None
+        }
+
+    @staticmethod
+    def _vector_field(schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The first vector field of an index definition"""
+        return next(
+            (f for f in schema.get("fields", []) if f.get("dimensions") or f.get("vectorSearchDimensions")),
+            None
+        )
+
+    async def _has_vectors(self, index_name: str, field: Dict[str, Any]) -> bool:
+        """Whether any document of index_name has a vector in field"""
+        # Documents without a vector never match a vector query, whatever it is
+        dimensions = field.get("dimensions") or field.get("vectorSearchDimensions")
+        probe = {"kind": "vector", "vector": [1.0] * int(dimensions), "k": 1, "fields": field["name"]}
+        results = await self.ops.search(index_name, query="", top=1, vectorQueries=[probe])
+        return bool(results.get("value"))
+
+    async def _collect_old_versions(self, logical: str, current: str, keep_versions: int) -> List[str]:
+        """Delete versions older than current beyond the newest keep_versions"""
+        current_number = self._version_number(logical, current)
+        older = [name for n, name in await self._list_versions(logical) if n < current_number]
+        doomed = older[:max(0, len(older) - max(0, keep_versions))]
+        deleted = []
+        for name in doomed:
+            if await self._delete_index_quietly(name):
+                deleted.append(name)
+        return deleted
+
+    async def _delete_index_quietly(self, name: str) -> bool:
+        try:
+            await self.ops.delete_index(name)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to delete index {name}: {e}")
+            return False
+
     async def _backup_index_schema(self, index_name: str, output_path: str) -> bool:
         try:
             index = await self.ops.get_index(index_name)
             # Remove known metadata keys if present
-            for key in ("@odata.context", "@odata.etag", "etag", "e_tag"):
+            for key in _SCHEMA_METADATA_KEYS:
                 index.pop(key, None)
             index["_backup_metadata"] = {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -8,6 +8,8 @@ Commands:
     changed-files       Index specific changed files
     create-enhanced-index   Create enhanced RAG index
     validate-index      Validate index vector dimensions
+    backfill-embeddings Generate content_vector for existing documents
+    export              Export index documents to NDJSON
     create-indexer      Create Azure indexer for automated ingestion
 """
 
@@ -28,12 +30,16 @@ from .automation import IndexAutomation
 from .automation import ReindexAutomation
 from .automation import DataAutomation
 from .automation import EmbeddingAutomation
+from .automation.embedding_manager import embedding_identity
+from .embedding_provider import AzureOpenAIEmbeddingProvider
 from .rest import AzureSearchClient, SearchOperations
 from enhanced_rag.core.unified_config import get_config
+from .manifest import IncrementalSync, incremental_enabled
 from .processing import (
     extract_python_chunks, 
     process_file, 
     FileProcessor, 
+    IndexingStats,
     find_repository_root,
     validate_repo_name,
     validate_repo_path
@@ -75,46 +81,81 @@ async def index_repository(
             if pattern.startswith('*.'):
                 extensions.add(pattern[1:])
     
-    # Use FileProcessor for consistent repository processing
+    # Stream documents from FileProcessor straight into the uploader so memory
+    # stays bounded by the batch size instead of the repository size
     file_processor = FileProcessor(extensions=extensions)
-    all_documents = file_processor.process_repository(repo_path, repo_name)
-
-    logger.info(f"Collected {len(all_documents)} documents from repository")
+    index_stats = IndexingStats()
+    index_name = get_config().acs_index_name
+
+    emb_automation = EmbeddingAutomation(rest_ops) if embed_vectors else None
+
+    # With the manifest, unchanged files are skipped before parsing and only
+    # new or changed chunks flow on to embedding and upload
+    sync = None
+    if incremental_enabled():
+        sync = IncrementalSync.open(
+            repo_path, index_name, repo_name,
+            embedding=embedding_identity(emb_automation.provider, context_fields) if emb_automation else None,
+        )
+        await sync.check_index(rest_ops)
+        documents = sync.diff_stream(file_processor.aiter_repository_files(
+            repo_path, repo_name, stats=index_stats, file_filter=sync.needs_processing
+        ))
+    else:
+        documents = file_processor.aiter_repository(repo_path, repo_name, stats=index_stats)
 
     # Optionally enrich with embeddings (content_vector)
-    if embed_vectors and all_documents:
+    embedding_stats: Dict[str, Any] = {}
+    if emb_automation is not None:
         try:
             from enhanced_rag.core.unified_config import get_config as _get_unified
             batch_size = max(1, int(_get_unified().embedding_batch_size))
         except Exception:
             batch_size = 16
 
-        emb_automation = EmbeddingAutomation(rest_ops)
-        all_documents, stats = await emb_automation.enrich_documents_with_embeddings(
-            all_documents,
+        documents = emb_automation.enrich_document_stream(
+            documents,
             text_field="content",
             embedding_field="content_vector",
             context_fields=context_fields,
             batch_size=batch_size,
+            stats=embedding_stats,
         )
-        logger.info(
-            "Embedding enrichment: processed=%s enriched=%s failed=%s in %ss",
-            stats.get("processed"), stats.get("enriched"), stats.get("failed"), stats.get("elapsed_seconds")
+        if sync is not None:
+            documents = sync.embedded_stream(documents)
+
+    # Upload in batches as they are produced
+    try:
+        result = await data_automation.bulk_upload(
+            index_name=index_name,
+            documents=documents,
+            batch_size=100
         )
+        if sync is not None:
+            # Chunks that vanished from changed files, and files that are gone.
+            # A truncated walk can't tell deleted files from unvisited ones.
+            await sync.apply_deletions(rest_ops, include_vanished=not index_stats.truncated)
+            sync.commit(result)
+            logger.info("Incremental index: %s", sync.summary())
+    finally:
+        if sync is not None:
+            sync.close()
 
-    # Upload documents using async generator
-    async def document_generator():
-        for doc in all_documents:
-            yield doc
-    
-    # Upload in batches
-    result = await data_automation.bulk_upload(
-        index_name=get_config().acs_index_name,
-        documents=document_generator(),
-        batch_size=100
-    )
+    logger.info("Repository processing: %s", index_stats.to_dict())
+    if embed_vectors:
+        logger.info(
+            "Embedding enrichment: processed=%s enriched=%s failed=%s",
+            embedding_stats.get("processed", 0), embedding_stats.get("enriched", 0), embedding_stats.get("failed", 0)
+        )
+        if emb_automation.store is not None:
+            logger.info("Embedding store: %s", emb_automation.store.get_stats())
     
     logger.info(f"Upload complete: {result['succeeded']} succeeded, {result['failed']} failed")
+    logger.info(
+        "Upload throughput: %s docs/s over %s requests, batch latency %s ms, throttled=%s",
+        result.get("documents_per_second"), result.get("requests"),
+        result.get("batch_latency_ms"), result.get("throttled")
+    )
     
     return result['succeeded']
 
@@ -158,8 +199,8 @@ async def cmd_local_repo(args):
     if getattr(args, "dry_run", False):
         # Build file processor with the same extension filter as actual indexing
         fp = FileProcessor(extensions=extensions)
-        # Collect documents but only keep unique relative file paths to avoid heavy output
-        documents = fp.process_repository(args.repo_path, args.repo_name)
+        # Stream documents and only keep unique relative file paths to avoid heavy output
+        documents = fp.iter_repository(args.repo_path, args.repo_name)
         unique_files: List[str] = []
         seen = set()
         for d in documents:
@@ -169,6 +210,8 @@ async def cmd_local_repo(args):
                 unique_files.append(rel)
             if len(unique_files) >= args.sample:
                 break
+        # Stop the parser pool once enough sample paths are collected
+        documents.close()
 
         out_dir = Path(".claude/state")
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -202,33 +245,58 @@ async def index_changed_files(file_paths: List[str], repo_name: str) -> int:
     rest_ops = SearchOperations(rest_client)
     data_automation = DataAutomation(rest_ops)
     
-    # Collect all documents
-    all_documents = []
-    
     # Find the repo root using shared helper
     repo_path = find_repository_root(file_paths)
+    index_name = get_config().acs_index_name
+    sync = IncrementalSync.open(repo_path, index_name, repo_name) if incremental_enabled() else None
+    if sync is not None:
+        await sync.check_index(rest_ops)
+
+    # Collect changed documents
+    all_documents = []
     
     for file_path in file_paths:
+        if sync is not None:
+            await sync.load_indexed_chunks(rest_ops, file_path)
         if os.path.exists(file_path) and os.path.isfile(file_path):
             docs = process_file(file_path, repo_path, repo_name)
+            if sync is not None:
+                docs = sync.diff_file(file_path, docs)
             all_documents.extend(docs)
             
             if docs:
                 logger.info(f"Processed {file_path} ({len(docs)} chunks)")
+        elif sync is not None:
+            # Removed from the working tree: drop its chunks from the index
+            sync.mark_deleted(file_path)
     
     # Upload documents using async generator
     async def document_generator():
         for doc in all_documents:
             yield doc
     
-    # Upload in batches
-    result = await data_automation.bulk_upload(
-        index_name=get_config().acs_index_name,
-        documents=document_generator(),
-        batch_size=100
-    )
+    try:
+        # Upload in batches
+        result = await data_automation.bulk_upload(
+            index_name=index_name,
+            documents=document_generator(),
+            batch_size=100
+        )
+        if sync is not None:
+            # Only stale chunks of the named files; the rest of the repo wasn't walked
+            await sync.apply_deletions(rest_ops, include_vanished=False)
+            sync.commit(result)
+            logger.info("Incremental index: %s", sync.summary())
+    finally:
+        if sync is not None:
+            sync.close()
     
     logger.info(f"Upload complete: {result['succeeded']} succeeded, {result['failed']} failed")
+    logger.info(
+        "Upload throughput: %s docs/s over %s requests, batch latency %s ms, throttled=%s",
+        result.get("documents_per_second"), result.get("requests"),
+        result.get("batch_latency_ms"), result.get("throttled")
+    )
     
     return result['succeeded']
 
@@ -455,7 +523,14 @@ async def cmd_reindex(args):
         api_key=get_config().acs_admin_key.get_secret_value()
     )
     rest_ops = SearchOperations(rest_client)
-    reindex = ReindexAutomation(rest_ops)
+    # Blue/green copies re-embed documents whose vectors aren't retrievable
+    embedding_provider = None
+    if get_config().embedding_provider != "none":
+        try:
+            embedding_provider = AzureOpenAIEmbeddingProvider()
+        except Exception as e:
+            logger.warning(f"Embedding provider unavailable, rebuilt indexes get no new vectors: {e}")
+    reindex = ReindexAutomation(rest_ops, embedding_provider)
 
     try:
         if args.method == 'drop-rebuild':
@@ -465,6 +540,32 @@ async def cmd_reindex(args):
                 return 1
             logger.info("Index rebuilt. Use 'local-repo' command to repopulate.")
 
+        elif args.method == 'blue-green':
+            res = await reindex.perform_reindex(
+                'blue-green',
+                repo_path=args.repo_path if args.repo_name else None,
+                repo_name=args.repo_name,
+                schema_path=args.schema,
+                switch=args.switch,
+                sample_queries=args.sample_query,
+                keep_versions=args.keep_versions
+            )
+            verification = res.get('verification', {})
+            logger.info(
+                f"Shadow {res.get('shadow_index')}: {verification.get('document_count', 0)} documents, "
+                f"{len(verification.get('queries', []))} sample queries checked"
+            )
+            if res.get('status') != 'success':
+                logger.error(f"Blue/green rebuild failed, {res.get('active_index')} still live: "
+                             f"{res.get('error') or verification.get('issues')}")
+                return 1
+            logger.info(f"{res['index_name']} now served by {res['active_index']} "
+                        f"via {res['switch']['mode']}; removed {res.get('deleted_indexes') or 'no old versions'}")
+
+        elif args.method == 'rollback':
+            res = await reindex.rollback_blue_green()
+            logger.info(f"{res['index_name']} rolled back from {res['previous_index']} to {res['active_index']}")
+
         elif args.method == 'clear':
             res = await reindex.perform_reindex('clear', clear_filter=args.filter)
             logger.info(f"Cleared {res.get('documents_cleared', 0)} documents")
@@ -557,6 +658,35 @@ async def cmd_indexer_status(args):
     return 0
 
 
+async def cmd_export(args):
+    """Export index documents to an NDJSON file."""
+    cfg = get_config()
+    index_name = args.index or cfg.acs_index_name
+
+    rest_client = AzureSearchClient(
+        endpoint=cfg.acs_endpoint,
+        api_key=cfg.acs_admin_key.get_secret_value()
+    )
+    data_automation = DataAutomation(SearchOperations(rest_client))
+    try:
+        result = await data_automation.export_to_ndjson(
+            index_name,
+            args.output,
+            partitions=None if args.partition == 'none' else args.partition,
+            filter_query=args.filter,
+            select_fields=[f.strip() for f in args.select.split(',')] if args.select else None,
+            concurrency=args.concurrency
+        )
+    finally:
+        await rest_client.close()
+
+    logger.info(
+        "Export complete: %s documents, %s bytes to %s in %ss (%s docs/s)",
+        result["documents"], result["bytes"], result["output_path"],
+        result["elapsed_seconds"], result["documents_per_second"]
+    )
+
+
 async def cmd_backfill_embeddings(args):
     """Backfill content_vector for existing documents in an index.
 
@@ -586,69 +716,64 @@ async def cmd_backfill_embeddings(args):
     processed = 0
     enriched_total = 0
     failed_total = 0
-    skip = 0
-
-    try:
-        while True:
-            if max_docs is not None and processed >= max_docs:
-                break
-
-            top = min(page_size, (max_docs - processed)) if max_docs else page_size
+    ctx_fields = ["file_path", "repository"] if getattr(args, 'include_context', False) else None
+
+    async def backfill_page(docs: List[Dict[str, Any]]) -> None:
+        nonlocal enriched_total, failed_total
+        # Filter documents missing vectors or with mismatched dimensions
+        candidates = []
+        for d in docs:
+            vec = d.get('content_vector')
+            if not isinstance(vec, list) or len(vec) != expected_dims:
+                candidates.append(d)
+
+        if not candidates or dry_run:
+            return
+
+        enriched_docs, stats = await emb_automation.enrich_documents_with_embeddings(
+            candidates,
+            text_field='content',
+            embedding_field='content_vector',
+            context_fields=ctx_fields,
+            batch_size=min(128, page_size)
+        )
 
-            # Select minimal fields; include content for embedding
-            results = await rest_ops.search(
-                index_name,
-                query='*',
-                top=top,
-                skip=skip,
-                select=['id', 'content', 'content_vector', 'file_path', 'repository']
+        # Prepare merge docs (id + content_vector only)
+        merge_docs = [
+            {"id": t["id"], "content_vector": t.get("content_vector")}
+            for t in enriched_docs if t.get("content_vector")
+        ]
+
+        if merge_docs:
+            async def _gen():
+                for d in merge_docs:
+                    yield d
+            await data_automation.bulk_upload(
+                index_name=index_name,
+                documents=_gen(),
+                batch_size=1000,
+                merge=True
             )
-            docs = results.get('value', [])
-            if not docs:
-                break
 
-            # Filter documents missing vectors or with mismatched dimensions
-            candidates = []
-            for d in docs:
-                vec = d.get('content_vector')
-                if not isinstance(vec, list) or len(vec) != expected_dims:
-                    candidates.append(d)
-
-            if candidates and not dry_run:
-                ctx_fields = ["file_path", "repository"] if getattr(args, 'include_context', False) else None
-                enriched_docs, stats = await emb_automation.enrich_documents_with_embeddings(
-                    candidates,
-                    text_field='content',
-                    embedding_field='content_vector',
-                    context_fields=ctx_fields,
-                    batch_size=min(128, page_size)
-                )
+        enriched_total += stats.get('enriched', 0)
+        failed_total += stats.get('failed', 0)
 
-                # Prepare merge docs (id + content_vector only)
-                merge_docs = [
-                    {"id": t["id"], "content_vector": t.get("content_vector")}
-                    for t in enriched_docs if t.get("content_vector")
-                ]
-
-                if merge_docs:
-                    async def _gen():
-                        for d in merge_docs:
-                            yield d
-                    await data_automation.bulk_upload(
-                        index_name=index_name,
-                        documents=_gen(),
-                        batch_size=1000,
-                        merge=True
-                    )
-
-                enriched_total += stats.get('enriched', 0)
-                failed_total += stats.get('failed', 0)
-
-            processed += len(docs)
-            skip += len(docs)
-
-            if len(docs) < top:
-                break
+    # Keyset paging is unaffected by the merges made while iterating
+    try:
+        page: List[Dict[str, Any]] = []
+        async for doc in data_automation.export_documents_iterator(
+            index_name,
+            select_fields=['id', 'content', 'content_vector', 'file_path', 'repository'],
+            batch_size=page_size,
+            max_documents=max_docs
+        ):
+            page.append(doc)
+            processed += 1
+            if len(page) >= page_size:
+                await backfill_page(page)
+                page = []
+        if page:
+            await backfill_page(page)
     finally:
         await rest_client.close()
 
@@ -656,6 +781,8 @@ async def cmd_backfill_embeddings(args):
         "Backfill complete: processed=%s enriched=%s failed=%s dry_run=%s",
         processed, enriched_total, failed_total, dry_run
     )
+    if emb_automation.store is not None:
+        logger.info("Embedding store: %s", emb_automation.store.get_stats())
     return 0
 
 
@@ -819,6 +946,44 @@ def main():
         help='Include file_path and repository as embedding context'
     )
 
+    # export command
+    export_parser = subparsers.add_parser(
+        'export',
+        help='Export index documents to an NDJSON file'
+    )
+    export_parser.add_argument(
+        '--index',
+        type=str,
+        help='Source index name (default: from config)'
+    )
+    export_parser.add_argument(
+        '--output',
+        type=str,
+        required=True,
+        help='Output NDJSON path'
+    )
+    export_parser.add_argument(
+        '--partition',
+        choices=['none', 'key_range', 'repository'],
+        default='key_range',
+        help='Split the export into partitions fetched in parallel (default: key_range)'
+    )
+    export_parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Partitions exported at once (default: MCP_EXPORT_CONCURRENCY or 4)'
+    )
+    export_parser.add_argument(
+        '--filter',
+        type=str,
+        help='OData filter applied to the export'
+    )
+    export_parser.add_argument(
+        '--select',
+        type=str,
+        help='Comma-separated fields to export (default: all retrievable fields)'
+    )
+
     # create-indexer command
     indexer_parser = subparsers.add_parser(
         'create-indexer',
@@ -875,14 +1040,14 @@ def main():
     reindex_parser.add_argument(
         '--method',
         type=str,
-        choices=['drop-rebuild', 'clear', 'repository', 'status', 'validate', 'backup'],
+        choices=['drop-rebuild', 'blue-green', 'rollback', 'clear', 'repository', 'status', 'validate', 'backup'],
         required=True,
         help='Reindexing method'
     )
     reindex_parser.add_argument(
         '--schema',
         type=str,
-        help='Path to schema JSON file (for drop-rebuild)'
+        help='Path to schema JSON file (for drop-rebuild and blue-green)'
     )
     reindex_parser.add_argument(
         '--filter',
@@ -898,7 +1063,7 @@ def main():
     reindex_parser.add_argument(
         '--repo-name',
         type=str,
-        help='Repository name (for repository method)'
+        help='Repository name (for repository method; blue-green indexes it instead of copying the live index)'
     )
     reindex_parser.add_argument(
         '--clear-first',
@@ -910,6 +1075,23 @@ def main():
         type=str,
         help='Output path for backup'
     )
+    reindex_parser.add_argument(
+        '--switch',
+        choices=['auto', 'alias', 'pointer'],
+        default='auto',
+        help='How blue-green switches to the new index (default: auto)'
+    )
+    reindex_parser.add_argument(
+        '--sample-query',
+        action='append',
+        help='Query the new index must answer before the switch (repeatable)'
+    )
+    reindex_parser.add_argument(
+        '--keep-versions',
+        type=int,
+        default=1,
+        help='Previous index versions kept for rollback (default: 1)'
+    )
 
     # indexer-status command
     status_parser = subparsers.add_parser(
@@ -938,6 +1120,7 @@ def main():
         'create-enhanced-index': cmd_create_enhanced_index,
         'validate-index': cmd_validate_index,
         'backfill-embeddings': cmd_backfill_embeddings,
+        'export': cmd_export,
         'create-indexer': cmd_create_indexer,
         'reindex': cmd_reindex,
         'indexer-status': cmd_indexer_status,
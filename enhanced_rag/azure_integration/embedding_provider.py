@@ -5,6 +5,7 @@ providers, migrating functionality from vector_embeddings.py.
 """
 
 import os
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import List, Sequence, Optional, Dict, Any
@@ -46,6 +47,12 @@ except ModuleNotFoundError:
     OpenAI = _build_openai_stub()  # type: ignore
     AzureOpenAI = _build_openai_stub()  # type: ignore
 
+try:
+    from openai import AsyncOpenAI, AsyncAzureOpenAI  # type: ignore
+except ImportError:
+    AsyncOpenAI = None  # type: ignore
+    AsyncAzureOpenAI = None  # type: ignore
+
 
 def _get_env(name: str) -> Optional[str]:
     """Helper to normalise environment variables."""
@@ -53,6 +60,49 @@ def _get_env(name: str) -> Optional[str]:
     return value.strip() if value else None
 
 
+# Guard against oversized context-augmented code inputs
+MAX_CODE_INPUT_CHARS = 6000
+
+
+class EmbeddingRateLimitError(Exception):
+    """Raised by async batch calls when the endpoint answers 429.
+
+    ``retry_after`` carries the server's Retry-After hint in seconds, if any.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def format_code_input(code: str, context: Optional[str]) -> str:
+    """Combine context and code into the text sent for code embeddings.
+
+    Matches what generate_code_embedding has always sent - the prefix is
+    added even for empty context - so new vectors stay comparable with
+    those already stored in indexes.
+    """
+    combined = f"{context or ''}\n\nCode:\n{code}"
+    if len(combined) > MAX_CODE_INPUT_CHARS:
+        combined = combined[:MAX_CODE_INPUT_CHARS] + "..."
+    return combined
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Extract a Retry-After hint (seconds) from an SDK error response."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return max(0.0, float(value) * scale)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
 class IEmbeddingProvider(ABC):
     """Interface for embedding providers."""
 
@@ -93,6 +143,23 @@ class IEmbeddingProvider(ABC):
         """
         pass
 
+    async def agenerate_embedding(self, text: str) -> Optional[List[float]]:
+        """Generate a single embedding without blocking the event loop.
+
+        Providers with a native async client should override this; the
+        default runs the synchronous call in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate_embedding, text)
+
+    async def agenerate_embeddings_batch(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Generate a batch of embeddings without blocking the event loop.
+
+        Providers with a native async client should override this and raise
+        EmbeddingRateLimitError on 429 so callers can back off; the default
+        runs the synchronous call in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate_embeddings_batch, texts)
+
 
 class AzureOpenAIEmbeddingProvider(IEmbeddingProvider):
     """Embedding provider using Azure OpenAI or OpenAI API.
@@ -158,6 +225,9 @@ class AzureOpenAIEmbeddingProvider(IEmbeddingProvider):
             # Use standard OpenAI client
             self._client = OpenAI(api_key=self.api_key)  # type: ignore[arg-type]
 
+        # Async client is created on first async use
+        self._async_client: Optional[Any] = None
+
         self.logger = logging.getLogger(__name__)
 
     def _validate_api_key(self):
@@ -191,6 +261,41 @@ class AzureOpenAIEmbeddingProvider(IEmbeddingProvider):
             self.logger.warning("Embedding API error: %s", exc)
             return None
 
+    def _get_async_client(self) -> Optional[Any]:
+        """Lazily build the async OpenAI client (None if the SDK lacks one)."""
+        if self._async_client is None:
+            if self.use_azure and AsyncAzureOpenAI is not None:
+                self._async_client = AsyncAzureOpenAI(
+                    api_key=self.api_key,
+                    azure_endpoint=self.endpoint,
+                    api_version=self.api_version,
+                )  # type: ignore[arg-type]
+            elif not self.use_azure and AsyncOpenAI is not None:
+                self._async_client = AsyncOpenAI(api_key=self.api_key)  # type: ignore[arg-type]
+        return self._async_client
+
+    async def agenerate_embedding(self, text: str) -> Optional[List[float]]:
+        """Generate a single embedding vector using the async client."""
+        if not text or not self._validate_api_key():
+            return None
+        client = self._get_async_client()
+        if client is None:
+            return await asyncio.to_thread(self.generate_embedding, text)
+        try:
+            kwargs: Dict[str, Any] = {
+                "input": text,
+                "model": self.model_name,
+            }
+            # Add dimensions parameter for text-embedding-3 models
+            if self.dimensions is not None:
+                kwargs["dimensions"] = self.dimensions
+
+            response = await client.embeddings.create(**kwargs)
+            return response.data[0].embedding  # type: ignore[attr-defined]
+        except Exception as exc:
+            self.logger.warning("Embedding API error: %s", exc)
+            return None
+
     def generate_embeddings_batch(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
         """Generate embeddings for texts in a single batch request."""
         if not texts or not self._validate_api_key():
@@ -214,16 +319,39 @@ class AzureOpenAIEmbeddingProvider(IEmbeddingProvider):
             # On batch failure, return None for all items
             return [None] * len(texts)
 
+    async def agenerate_embeddings_batch(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Generate a batch of embeddings using the async client.
+
+        SDK retries are disabled so 429s surface as EmbeddingRateLimitError
+        and the caller's concurrency limiter can react to them.
+        """
+        if not texts or not self._validate_api_key():
+            return [None] * len(texts) if texts else []
+        client = self._get_async_client()
+        if client is None:
+            return await asyncio.to_thread(self.generate_embeddings_batch, texts)
+        try:
+            kwargs: Dict[str, Any] = {
+                "input": list(texts),
+                "model": self.model_name,
+            }
+            # Add dimensions parameter for text-embedding-3 models
+            if self.dimensions is not None:
+                kwargs["dimensions"] = self.dimensions
+
+            response = await client.with_options(max_retries=0).embeddings.create(**kwargs)
+            embeddings = sorted(response.data, key=lambda e: e.index)
+            return [e.embedding for e in embeddings]
+        except Exception as exc:
+            if getattr(exc, "status_code", None) == 429:
+                raise EmbeddingRateLimitError(str(exc), _retry_after_seconds(exc)) from exc
+            self.logger.warning("Embedding batch API error: %s", exc)
+            return [None] * len(texts)
+
     def generate_code_embedding(self, code: str, context: str) -> Optional[List[float]]:
         """Generate embedding for code with additional context."""
         # Combine context and code to improve semantic signal
-        combined = f"{context}\n\nCode:\n{code}"
-
-        MAX_INPUT_CHARS = 6000  # guard against oversized requests
-        if len(combined) > MAX_INPUT_CHARS:
-            combined = combined[:MAX_INPUT_CHARS] + "..."
-
-        return self.generate_embedding(combined)
+        return self.generate_embedding(format_code_input(code, context))
 
     def is_enabled(self) -> bool:
         """Check if embeddings are enabled (lazy validation)."""
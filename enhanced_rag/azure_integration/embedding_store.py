@@ -0,0 +1,289 @@
+"""Persistent, content-addressed store of chunk embeddings.
+
+Vectors are keyed by (model, dimensions, sha256 of the embedded text), so a
+chunk whose text is unchanged is never embedded twice - not across
+index_repository runs, reindexes, backfills, or a rebuild of the index
+from scratch after a schema change.
+
+Layout under the store directory (default ``~/.mcprag/embeddings``):
+
+- ``vectors.bin``  append-only records: 32-byte key, uint32 dimension
+  count, uint8 dtype code, then the vector as float32 or float16
+- ``vectors.idx``  append-only (key, offset) pairs, 40 bytes per entry
+
+The index is loaded into memory on open. Records appended after the last
+indexed one (a crash between the two writes) are re-indexed, and a torn
+record at the end of the data file is truncated away.
+
+Several processes (CLI indexer, MCP server, webhook worker) may share one
+store. Appends and recovery hold an exclusive lock on ``vectors.lock``
+where ``fcntl`` is available, and every read checks the key in the record
+header, so a bad index entry is a cache miss rather than a wrong vector.
+
+Environment:
+    MCP_EMBEDDING_STORE        set to "false" to disable (default: true)
+    MCP_EMBEDDING_STORE_PATH   override the store directory
+    MCP_EMBEDDING_STORE_DTYPE  "float32" (default) or "float16"
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Optional dependency: fcntl (POSIX only) serializes appends across processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRNAME = "embeddings"
+DATA_FILENAME = "vectors.bin"
+INDEX_FILENAME = "vectors.idx"
+LOCK_FILENAME = "vectors.lock"
+
+_HEADER = struct.Struct("<32sIB")   # key, dimensions, dtype code
+_INDEX_ENTRY = struct.Struct("<32sQ")  # key, data offset
+_DTYPES = {"float32": (0, 4), "float16": (1, 2)}
+_DTYPE_SIZES = {code: size for code, size in _DTYPES.values()}
+
+
+def embedding_store_enabled() -> bool:
+    return os.getenv("MCP_EMBEDDING_STORE", "true").lower() != "false"
+
+
+def default_embedding_store_path() -> Path:
+    override = os.getenv("MCP_EMBEDDING_STORE_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".mcprag" / STORE_DIRNAME
+
+
+def _encode(vector: Sequence[float], code: int) -> bytes:
+    if code == 0:
+        return array("f", vector).tobytes()
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def _decode(payload: bytes, dimensions: int, code: int) -> List[float]:
+    if code == 0:
+        vec = array("f")
+        vec.frombytes(payload)
+        return vec.tolist()
+    return list(struct.unpack(f"<{dimensions}e", payload))
+
+
+class ChunkEmbeddingStore:
+    """Append-only on-disk embedding store with an in-memory key index"""
+
+    def __init__(self, path: str, dtype: str = "float32"):
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unsupported embedding store dtype: {dtype}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype
+        self._code = _DTYPES[dtype][0]
+        self._lock = threading.Lock()
+        self._offsets: Dict[bytes, int] = {}
+        # Bytes of the index file already merged into _offsets
+        self._index_end = 0
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+        self._lock_file = open(self.path / LOCK_FILENAME, "a+b")
+        self._data = open(self.path / DATA_FILENAME, "a+b")
+        self._index = open(self.path / INDEX_FILENAME, "a+b")
+        with self._file_lock():
+            self._load()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock against other processes using the store"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def make_key(model: str, dimensions: Optional[int], text: str) -> bytes:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        raw = f"{model}\x00{dimensions or ''}\x00{text_hash}"
+        return hashlib.sha256(raw.encode("utf-8")).digest()
+
+    def _record_end(self, offset: int, data_size: int) -> Optional[int]:
+        """End offset of the record at offset, or None if it is incomplete"""
+        if offset + _HEADER.size > data_size:
+            return None
+        self._data.seek(offset)
+        _, dimensions, code = _HEADER.unpack(self._data.read(_HEADER.size))
+        size = _DTYPE_SIZES.get(code)
+        if size is None:
+            return None
+        end = offset + _HEADER.size + dimensions * size
+        return end if end <= data_size else None
+
+    def _load(self) -> None:
+        data_size = self._data.seek(0, os.SEEK_END)
+        self._index.seek(0)
+        raw = self._index.read()
+        usable = len(raw) - len(raw) % _INDEX_ENTRY.size
+        indexed_end = 0
+        for key, offset in _INDEX_ENTRY.iter_unpack(raw[:usable]):
+            end = self._record_end(offset, data_size)
+            if end is None:
+                continue
+            self._offsets[key] = offset
+            indexed_end = max(indexed_end, end)
+        if usable != len(raw):
+            self._index.truncate(usable)
+        self._index_end = usable
+
+        # Index records written after the last indexed one, then drop a torn tail
+        offset = indexed_end
+        recovered = []
+        while True:
+            end = self._record_end(offset, data_size)
+            if end is None:
+                break
+            self._data.seek(offset)
+            key = _HEADER.unpack(self._data.read(_HEADER.size))[0]
+            self._offsets.setdefault(key, offset)
+            recovered.append(_INDEX_ENTRY.pack(key, offset))
+            offset = end
+        if offset < data_size:
+            logger.warning("Truncating %d bytes of incomplete embedding records in %s",
+                           data_size - offset, self.path)
+            self._data.truncate(offset)
+        if recovered:
+            self._index.write(b"".join(recovered))
+            self._index.flush()
+            self._index_end += len(recovered) * _INDEX_ENTRY.size
+
+    def _merge_new_entries(self) -> None:
+        """Pick up index entries other processes appended since the last look"""
+        self._index.seek(self._index_end)
+        raw = self._index.read()
+        usable = len(raw) - len(raw) % _INDEX_ENTRY.size
+        for key, offset in _INDEX_ENTRY.iter_unpack(raw[:usable]):
+            self._offsets.setdefault(key, offset)
+        self._index_end += usable
+
+    def _read(self, key: bytes, offset: int) -> Optional[List[float]]:
+        """Vector stored for key at offset, None if the record there is another key's"""
+        self._data.seek(offset)
+        header = self._data.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        stored_key, dimensions, code = _HEADER.unpack(header)
+        size = _DTYPE_SIZES.get(code)
+        if stored_key != key or size is None:
+            return None
+        payload = self._data.read(dimensions * size)
+        if len(payload) < dimensions * size:
+            return None
+        return _decode(payload, dimensions, code)
+
+    def get(self, model: str, dimensions: Optional[int], text: str) -> Optional[List[float]]:
+        return self.get_many(model, dimensions, [text])[0]
+
+    def get_many(self, model: str, dimensions: Optional[int], texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up embeddings for texts, None where absent"""
+        keys = [self.make_key(model, dimensions, text) for text in texts]
+        results: List[Optional[List[float]]] = []
+        with self._lock:
+            for key in keys:
+                offset = self._offsets.get(key)
+                vector = self._read(key, offset) if offset is not None else None
+                if vector is None:
+                    if offset is not None:
+                        logger.warning("Embedding store index entry at offset %d does not match its record", offset)
+                        del self._offsets[key]
+                    self._stats["misses"] += 1
+                    results.append(None)
+                    continue
+                self._stats["hits"] += 1
+                results.append(vector)
+        return results
+
+    def put(self, model: str, dimensions: Optional[int], text: str, embedding: List[float]) -> None:
+        self.put_many(model, dimensions, [(text, embedding)])
+
+    def put_many(self, model: str, dimensions: Optional[int], items: Iterable[Tuple[str, List[float]]]) -> None:
+        """Append embeddings not already stored; data is flushed before the index"""
+        keyed = [(self.make_key(model, dimensions, text), embedding) for text, embedding in items if embedding]
+        if not keyed:
+            return
+        with self._lock, self._file_lock():
+            # Offsets are only valid while no other process can append
+            self._merge_new_entries()
+            offset = self._data.seek(0, os.SEEK_END)
+            records, entries, added = [], [], {}
+            for key, embedding in keyed:
+                if key in self._offsets or key in added:
+                    continue
+                record = _HEADER.pack(key, len(embedding), self._code) + _encode(embedding, self._code)
+                added[key] = offset
+                records.append(record)
+                entries.append(_INDEX_ENTRY.pack(key, offset))
+                offset += len(record)
+            if not records:
+                return
+            self._data.write(b"".join(records))
+            self._data.flush()
+            self._index.write(b"".join(entries))
+            self._index.flush()
+            self._index_end += len(entries) * _INDEX_ENTRY.size
+            self._offsets.update(added)
+            self._stats["writes"] += len(records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._offsets)
+            stats["data_bytes"] = self._data.seek(0, os.SEEK_END)
+            stats["index_bytes"] = self._index.seek(0, os.SEEK_END)
+        stats["path"] = str(self.path)
+        stats["dtype"] = self.dtype
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] / lookups) if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._data.closed:
+                self._data.close()
+                self._index.close()
+                self._lock_file.close()
+
+
+_chunk_embedding_store: Optional[ChunkEmbeddingStore] = None
+_chunk_embedding_store_lock = threading.Lock()
+
+
+def get_chunk_embedding_store() -> Optional[ChunkEmbeddingStore]:
+    """Get the process-wide chunk embedding store, or None when disabled"""
+    global _chunk_embedding_store
+    if not embedding_store_enabled():
+        return None
+    if _chunk_embedding_store is None:
+        with _chunk_embedding_store_lock:
+            if _chunk_embedding_store is None:
+                try:
+                    _chunk_embedding_store = ChunkEmbeddingStore(
+                        str(default_embedding_store_path()),
+                        dtype=os.getenv("MCP_EMBEDDING_STORE_DTYPE", "float32").lower(),
+                    )
+                except Exception as e:
+                    logger.warning("Chunk embedding store unavailable: %s", e)
+                    return None
+    return _chunk_embedding_store
@@ -0,0 +1,130 @@
+"""Logical-to-physical index name pointer for blue/green reindexing.
+
+A blue/green rebuild populates a versioned index (``codebase-mcp-sota-v3``)
+next to the live one and then switches traffic to it. On services that
+support index aliases the switch is an alias update and nothing here is
+needed. Otherwise the switch is recorded in a small JSON file mapping the
+logical index name to the physical index currently serving it:
+
+    {"codebase-mcp-sota": {"index": "codebase-mcp-sota-v3",
+                           "previous": "codebase-mcp-sota-v2",
+                           "updated_at": "..."}}
+
+Retrieval code calls ``resolve_index_name`` on each request. The file is
+re-read only when it changes on disk, so a switch is picked up by running
+servers without a restart. Without a pointer entry the logical name is
+returned unchanged, which also covers aliases.
+
+Environment:
+    MCP_INDEX_POINTER_PATH  override the pointer file
+                            (default: ~/.mcprag/index_pointer.json)
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def default_index_pointer_path() -> Path:
+    override = os.getenv("MCP_INDEX_POINTER_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".mcprag" / "index_pointer.json"
+
+
+class IndexPointer:
+    """JSON file of logical index name -> active physical index"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_index_pointer_path()
+        self._lock = threading.Lock()
+        self._cached: Tuple[Optional[Tuple[int, int, int]], Dict[str, Any]] = (None, {})
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            self._cached = (None, {})
+            return {}
+        # Writes replace the file, so the inode changes even within one mtime tick
+        version = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._cached[0] == version:
+            return self._cached[1]
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("pointer file must hold a JSON object")
+        except (OSError, ValueError) as e:
+            # Keep serving the last good mapping rather than failing queries
+            logger.warning("Ignoring unreadable index pointer %s: %s", self.path, e)
+            return self._cached[1]
+        self._cached = (version, data)
+        return data
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._cached = (None, {})
+
+    def get(self, logical_name: str) -> Optional[str]:
+        """Physical index for logical_name, or None when no pointer is set"""
+        with self._lock:
+            entry = self._load().get(logical_name)
+        return entry.get("index") if isinstance(entry, dict) else None
+
+    def set(self, logical_name: str, index_name: str) -> Optional[str]:
+        """Point logical_name at index_name; returns the previous target.
+
+        The file is replaced atomically so readers never see a partial write.
+        """
+        with self._lock:
+            data = dict(self._load())
+            previous = (data.get(logical_name) or {}).get("index")
+            data[logical_name] = {
+                "index": index_name,
+                "previous": previous,
+                "updated_at": datetime.utcnow().isoformat(),
+            }
+            self._write(data)
+        logger.info("Index pointer %s -> %s (was %s)", logical_name, index_name, previous)
+        return previous
+
+    def clear(self, logical_name: str) -> None:
+        """Remove the pointer so logical_name resolves to itself again"""
+        with self._lock:
+            data = dict(self._load())
+            if data.pop(logical_name, None) is None:
+                return
+            self._write(data)
+
+
+_index_pointer: Optional[IndexPointer] = None
+_index_pointer_lock = threading.Lock()
+
+
+def get_index_pointer() -> IndexPointer:
+    """Get the process-wide index pointer for the configured path"""
+    global _index_pointer
+    path = default_index_pointer_path()
+    with _index_pointer_lock:
+        if _index_pointer is None or _index_pointer.path != path:
+            _index_pointer = IndexPointer(str(path))
+        return _index_pointer
+
+
+def resolve_index_name(logical_name: str) -> str:
+    """Physical index currently serving logical_name"""
+    try:
+        return get_index_pointer().get(logical_name) or logical_name
+    except Exception as e:
+        logger.debug("Index pointer lookup failed for %s: %s", logical_name, e)
+        return logical_name
@@ -0,0 +1,594 @@
+"""Incremental indexing manifest for Azure Search uploads.
+
+A small SQLite database, by default ``<repo>/.mcprag/index_manifest.sqlite``,
+records per index and repository:
+
+- each indexed file's path, size, mtime and content hash
+- the id and content hash of every chunk uploaded for that file
+
+A re-index diffs against it: files whose size and mtime (or content hash)
+are unchanged are skipped without parsing, only new or changed chunks are
+embedded and uploaded, and chunk ids that disappeared - functions removed
+or files deleted - are deleted from the index.
+
+The manifest also records which index it describes (name and definition
+etag, so a dropped and recreated index is a different index) and, for each
+chunk, the embedding setup its vector came from. After a recreate every
+file is uploaded again; a run that embeds re-uploads chunks stored without
+a vector or with one from a different model.
+
+Repositories indexed through the GitHub API have no working tree to stat;
+their manifest (by default ``~/.mcprag/remote_manifest.sqlite``) stores the
+git blob SHA of each file instead, so unchanged files are skipped before
+their content is downloaded.
+
+Environment:
+    MCP_INCREMENTAL_INDEX       set to "false" to disable (default: true)
+    MCP_INDEX_MANIFEST_PATH     override the manifest location
+    MCP_REMOTE_MANIFEST_PATH    override the remote repository manifest location
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIRNAME = ".mcprag"
+MANIFEST_FILENAME = "index_manifest.sqlite"
+
+# Azure Search accepts at most 1000 actions per indexing request
+_DELETE_BATCH = 1000
+
+# Document fields that don't describe chunk content
+_VOLATILE_FIELDS = ("id", "last_modified")
+
+# Separates a chunk's content hash from the embedding setup it was uploaded with
+_EMBEDDING_TAG = "|"
+
+
+def incremental_enabled() -> bool:
+    return os.getenv("MCP_INCREMENTAL_INDEX", "true").lower() != "false"
+
+
+def default_manifest_path(repo_root: str) -> Path:
+    override = os.getenv("MCP_INDEX_MANIFEST_PATH")
+    if override:
+        return Path(override)
+    return Path(repo_root) / MANIFEST_DIRNAME / MANIFEST_FILENAME
+
+
+def default_remote_manifest_path() -> Path:
+    override = os.getenv("MCP_REMOTE_MANIFEST_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / MANIFEST_DIRNAME / "remote_manifest.sqlite"
+
+
+def odata_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def index_identity(ops: Any, index_name: str) -> Optional[str]:
+    """Physical index name and definition etag behind index_name (None if unknown)"""
+    try:
+        definition = await ops.get_index(index_name)
+    except Exception:
+        # Writes through an alias land in the index it points at
+        try:
+            alias = await ops.get_alias(index_name)
+            index_name = (alias.get("indexes") or [None])[0]
+            if not index_name:
+                return None
+            definition = await ops.get_index(index_name)
+        except Exception as e:
+            logger.debug("Index identity lookup failed for %s: %s", index_name, e)
+            return None
+    return f"{index_name}@{definition.get('@odata.etag', '')}"
+
+
+def chunk_digest(doc: Dict[str, Any]) -> str:
+    """Content hash of a chunk document, ignoring its id and timestamp"""
+    payload = {k: v for k, v in doc.items() if k not in _VOLATILE_FIELDS}
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FileRecord:
+    """Manifest entry for one file"""
+    file_hash: str  # content hash, "|<embedding identity>" when all chunks have vectors
+    size: int
+    mtime_ns: int
+    chunks: Dict[str, str] = field(default_factory=dict)  # chunk id -> content hash, tagged likewise
+
+
+class IndexManifest:
+    """SQLite store of indexed files and chunk hashes"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                index_name TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                path TEXT NOT NULL,
+                file_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                PRIMARY KEY (index_name, repository, path)
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                index_name TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                path TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (index_name, repository, chunk_id)
+            );
+            CREATE INDEX IF NOT EXISTS chunks_by_path ON chunks (index_name, repository, path);
+            CREATE TABLE IF NOT EXISTS indexes (
+                index_name TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                identity TEXT NOT NULL,
+                PRIMARY KEY (index_name, repository)
+            );
+            """
+        )
+        self._db.commit()
+
+    def get_identity(self, index_name: str, repository: str) -> Optional[str]:
+        """Identity of the index the repository's entries were recorded against"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT identity FROM indexes WHERE index_name = ? AND repository = ?",
+                (index_name, repository),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_identity(self, index_name: str, repository: str, identity: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO indexes (index_name, repository, identity) VALUES (?, ?, ?)",
+                (index_name, repository, identity),
+            )
+
+    def forget(self, index_name: str, repository: str) -> None:
+        """Drop every file and chunk entry of one index and repository"""
+        with self._lock:
+            for table in ("files", "chunks"):
+                self._db.execute(
+                    f"DELETE FROM {table} WHERE index_name = ? AND repository = ?",
+                    (index_name, repository),
+                )
+
+    def load_files(self, index_name: str, repository: str) -> Dict[str, FileRecord]:
+        """File records (without chunks) for one index and repository"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path, file_hash, size, mtime_ns FROM files WHERE index_name = ? AND repository = ?",
+                (index_name, repository),
+            ).fetchall()
+        return {path: FileRecord(file_hash, size, mtime_ns) for path, file_hash, size, mtime_ns in rows}
+
+    def get_chunks(self, index_name: str, repository: str, path: str) -> Dict[str, str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT chunk_id, content_hash FROM chunks WHERE index_name = ? AND repository = ? AND path = ?",
+                (index_name, repository, path),
+            ).fetchall()
+        return dict(rows)
+
+    def record_file(self, index_name: str, repository: str, path: str, record: FileRecord) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (index_name, repository, path, file_hash, size, mtime_ns)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (index_name, repository, path, record.file_hash, record.size, record.mtime_ns),
+            )
+            self._db.execute(
+                "DELETE FROM chunks WHERE index_name = ? AND repository = ? AND path = ?",
+                (index_name, repository, path),
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO chunks (index_name, repository, path, chunk_id, content_hash)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(index_name, repository, path, cid, h) for cid, h in record.chunks.items()],
+            )
+
+    def touch_file(self, index_name: str, repository: str, path: str, size: int, mtime_ns: int) -> None:
+        """Refresh stat data for a file whose content is unchanged"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE index_name = ? AND repository = ? AND path = ?",
+                (size, mtime_ns, index_name, repository, path),
+            )
+
+    def remove_file(self, index_name: str, repository: str, path: str) -> None:
+        with self._lock:
+            for table in ("files", "chunks"):
+                self._db.execute(
+                    f"DELETE FROM {table} WHERE index_name = ? AND repository = ? AND path = ?",
+                    (index_name, repository, path),
+                )
+
+    def commit(self) -> None:
+        with self._lock:
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class IncrementalSync:
+    """Diff one indexing run of a repository against the manifest.
+
+    Typical flow::
+
+        sync = IncrementalSync.open(repo_path, index_name, repo_name, embedding=key)
+        await sync.check_index(ops)
+        files = processor.aiter_repository_files(
+            repo_path, repo_name, stats=stats, file_filter=sync.needs_processing)
+        documents = sync.diff_stream(files)
+        if key:
+            documents = sync.embedded_stream(embedder.enrich_document_stream(documents))
+        result = await data_automation.bulk_upload(index_name, documents)
+        await sync.apply_deletions(ops, include_vanished=not stats.truncated)
+        sync.commit(result)
+
+    ``embedding`` identifies the embedding setup of a run that adds vectors
+    (see embedding_manager.embedding_identity) and is None for runs that
+    upload chunks without them.
+    """
+
+    def __init__(
+        self,
+        manifest: IndexManifest,
+        repo_root: str,
+        index_name: str,
+        repository: str,
+        embedding: Optional[str] = None,
+    ):
+        self.manifest = manifest
+        self.repo_root = str(Path(repo_root).resolve())
+        self.index_name = index_name
+        self.repository = repository
+        self.embedding = embedding
+        self._known = manifest.load_files(index_name, repository)
+        # Set by check_index when the index is not the one the manifest describes
+        self._index_identity: Optional[str] = None
+        self._index_changed = False
+        # Uploaded chunk ids that came out of the embedder without a vector
+        self._unembedded: Set[str] = set()
+        self._seen: Set[str] = set()
+        # rel path -> (file hash, size, mtime_ns) for files hashed this run
+        self._state: Dict[str, Tuple[str, int, int]] = {}
+        self._touched: Dict[str, Tuple[int, int]] = {}
+        self._pending: Dict[str, FileRecord] = {}
+        self._uploaded: Dict[str, Set[str]] = {}
+        self._stale: Dict[str, List[str]] = {}
+        self._deleted_paths: Set[str] = set()
+        self._failed_paths: Set[str] = set()
+        # Chunk ids found in the index for files the manifest doesn't know
+        self._indexed: Dict[str, Dict[str, str]] = {}
+        self.stats: Dict[str, int] = {
+            "files_unchanged": 0,
+            "files_changed": 0,
+            "files_deleted": 0,
+            "chunks_unchanged": 0,
+            "chunks_uploaded": 0,
+            "chunks_deleted": 0,
+        }
+
+    @classmethod
+    def open(
+        cls, repo_root: str, index_name: str, repository: str, embedding: Optional[str] = None
+    ) -> "IncrementalSync":
+        manifest = IndexManifest(str(default_manifest_path(repo_root)))
+        return cls(manifest, repo_root, index_name, repository, embedding)
+
+    async def check_index(self, ops: Any) -> bool:
+        """Compare the live index with the one the manifest was recorded against.
+
+        Call before filtering files. When the index was dropped and recreated
+        (the etag also moves on schema updates) or the manifest predates
+        identity tracking, every file counts as changed; previous chunk ids are still deleted, which is harmless on a
+        fresh index. Returns True when the index changed.
+        """
+        self._index_identity = await index_identity(ops, self.index_name)
+        if self._index_identity is None:
+            return False
+        recorded = self.manifest.get_identity(self.index_name, self.repository)
+        self._index_changed = recorded != self._index_identity and (recorded is not None or bool(self._known))
+        if self._index_changed:
+            logger.info("Index %s changed since the manifest was written; re-uploading %s",
+                        self.index_name, self.repository)
+        return self._index_changed
+
+    def _rel(self, file_path: str) -> str:
+        return os.path.relpath(os.path.realpath(file_path), self.repo_root)
+
+    def _previous_chunks(self, rel: str) -> Dict[str, str]:
+        if rel in self._known:
+            return self.manifest.get_chunks(self.index_name, self.repository, rel)
+        return self._indexed.get(rel, {})
+
+    async def load_indexed_chunks(self, ops: Any, file_path: str) -> None:
+        """Look up a file's chunk ids in the index when the manifest has no entry.
+
+        Lets changed-file indexing remove orphaned chunks even for files
+        indexed before the manifest existed. Their hashes are unknown, so
+        every current chunk of the file is uploaded again.
+        """
+        rel = self._rel(file_path)
+        if rel in self._known:
+            return
+        try:
+            result = await ops.search(
+                self.index_name,
+                "*",
+                filter=f"repository eq {odata_literal(self.repository)} and file_path eq {odata_literal(rel)}",
+                select=["id"],
+                top=1000,
+            )
+        except Exception as e:
+            logger.debug("Indexed chunk lookup failed for %s: %s", rel, e)
+            return
+        self._indexed[rel] = {d["id"]: "" for d in result.get("value", []) if d.get("id")}
+
+    def needs_processing(self, file_path: str) -> bool:
+        """File filter for FileProcessor: False when the manifest shows no change"""
+        rel = self._rel(file_path)
+        self._seen.add(rel)
+        if self._index_changed:
+            return True
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return True
+        known = self._known.get(rel)
+        if known and not self._tag_current(known.file_hash):
+            # Indexed without (or with other) vectors: chunks must go through the embedder
+            known = None
+        if known and known.size == st.st_size and known.mtime_ns == st.st_mtime_ns:
+            self.stats["files_unchanged"] += 1
+            return False
+        try:
+            digest = file_digest(file_path)
+        except OSError:
+            return True
+        self._state[rel] = (digest, st.st_size, st.st_mtime_ns)
+        if known and self._unchanged(known.file_hash, digest):
+            # Touched but identical; just refresh the stat data
+            self._touched[rel] = (st.st_size, st.st_mtime_ns)
+            self.stats["files_unchanged"] += 1
+            return False
+        return True
+
+    def diff_file(self, file_path: str, docs: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return the documents of one parsed file that need uploading.
+
+        docs=None means the file failed to process; it is left untouched.
+        """
+        if docs is None:
+            return []
+        rel = self._rel(file_path)
+        self._seen.add(rel)
+        if rel not in self._state:
+            try:
+                st = os.stat(file_path)
+                self._state[rel] = (file_digest(file_path), st.st_size, st.st_mtime_ns)
+            except OSError:
+                return []
+
+        previous = self._previous_chunks(rel)
+        current: Dict[str, str] = {}
+        changed: List[Dict[str, Any]] = []
+        for doc in docs:
+            content_hash = chunk_digest(doc)
+            stored = previous.get(doc["id"])
+            if stored is not None and not self._index_changed and self._unchanged(stored, content_hash):
+                # Keep the stored tag: the indexed vector is still the one it describes
+                current[doc["id"]] = stored
+                self.stats["chunks_unchanged"] += 1
+            else:
+                current[doc["id"]] = self._tagged(content_hash)
+                changed.append(doc)
+
+        digest, size, mtime_ns = self._state[rel]
+        self._pending[rel] = FileRecord(self._tagged(digest), size, mtime_ns, current)
+        self._uploaded[rel] = {doc["id"] for doc in changed}
+        self._stale[rel] = [cid for cid in previous if cid not in current]
+        self.stats["files_changed"] += 1
+        self.stats["chunks_uploaded"] += len(changed)
+        return changed
+
+    def _tagged(self, content_hash: str) -> str:
+        return f"{content_hash}{_EMBEDDING_TAG}{self.embedding}" if self.embedding else content_hash
+
+    def _tag_current(self, stored: str) -> bool:
+        # Runs without embedding leave existing vectors alone
+        return not self.embedding or stored.partition(_EMBEDDING_TAG)[2] == self.embedding
+
+    def _unchanged(self, stored: str, digest: str) -> bool:
+        return stored.partition(_EMBEDDING_TAG)[0] == digest and self._tag_current(stored)
+
+    def note_embedding(self, doc: Dict[str, Any], embedding_field: str = "content_vector") -> None:
+        """Record an uploaded chunk whose embedding failed, so the next run retries it"""
+        if self.embedding and not doc.get(embedding_field):
+            self._unembedded.add(doc["id"])
+
+    async def embedded_stream(
+        self, documents: AsyncIterator[Dict[str, Any]], embedding_field: str = "content_vector"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Pass enriched documents through, noting those left without a vector"""
+        async for doc in documents:
+            self.note_embedding(doc, embedding_field)
+            yield doc
+
+    async def diff_stream(
+        self, file_stream: AsyncIterator[Tuple[str, Optional[List[Dict[str, Any]]]]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Turn a (file_path, documents) stream into a stream of changed documents"""
+        async for file_path, docs in file_stream:
+            for doc in self.diff_file(file_path, docs):
+                yield doc
+
+    def mark_deleted(self, file_path: str) -> None:
+        """Schedule every chunk of a file that no longer exists for deletion"""
+        rel = self._rel(file_path)
+        self._seen.add(rel)
+        self._deleted_paths.add(rel)
+
+    async def apply_deletions(self, ops: Any, include_vanished: bool = True) -> int:
+        """Delete stale chunk ids from the index.
+
+        Args:
+            ops: SearchOperations used for delete requests
+            include_vanished: Also delete files known to the manifest but not
+                seen this run; pass False when the walk was incomplete
+
+        Returns:
+            Number of chunk ids deleted
+        """
+        if include_vanished:
+            self._deleted_paths.update(p for p in self._known if p not in self._seen)
+
+        targets: List[Tuple[str, str]] = [
+            (rel, cid) for rel, ids in self._stale.items() for cid in ids
+        ]
+        for rel in self._deleted_paths:
+            targets.extend((rel, cid) for cid in self._previous_chunks(rel))
+
+        deleted = 0
+        for start in range(0, len(targets), _DELETE_BATCH):
+            batch = targets[start:start + _DELETE_BATCH]
+            try:
+                result = await ops.delete_documents(self.index_name, [cid for _, cid in batch])
+            except Exception as e:
+                logger.warning("Deleting %s stale chunks failed: %s", len(batch), e)
+                self._failed_paths.update(rel for rel, _ in batch)
+                continue
+            failed_ids = {
+                item.get("key") for item in (result or {}).get("value", []) if not item.get("status", True)
+            }
+            for rel, cid in batch:
+                if cid in failed_ids:
+                    self._failed_paths.add(rel)
+                else:
+                    deleted += 1
+
+        self.stats["chunks_deleted"] += deleted
+        self.stats["files_deleted"] += len(self._deleted_paths - self._failed_paths)
+        return deleted
+
+    def commit(self, upload_result: Optional[Dict[str, Any]] = None) -> None:
+        """Persist the run, skipping files whose uploads or deletions failed.
+
+        Skipped files keep their old manifest entry, so the next run retries them.
+        """
+        upload_result = upload_result or {}
+        failed_keys = {
+            item.get("key") for item in upload_result.get("failed_documents", []) if item.get("key")
+        }
+        # bulk_upload truncates the failure list and whole-batch errors carry no key
+        unknown_failures = upload_result.get("failed", 0) > len(failed_keys)
+
+        if self._index_changed:
+            # Entries describe the old index; files not recorded below must be re-sent
+            self.manifest.forget(self.index_name, self.repository)
+        if self._index_identity is not None:
+            self.manifest.set_identity(self.index_name, self.repository, self._index_identity)
+
+        for rel, record in self._pending.items():
+            uploaded = self._uploaded.get(rel, set())
+            if rel in self._failed_paths or uploaded & failed_keys or (unknown_failures and uploaded):
+                continue
+            unembedded = uploaded & self._unembedded
+            if unembedded:
+                record.file_hash = record.file_hash.partition(_EMBEDDING_TAG)[0]
+            for cid in unembedded:
+                record.chunks[cid] = record.chunks[cid].partition(_EMBEDDING_TAG)[0]
+            self.manifest.record_file(self.index_name, self.repository, rel, record)
+        for rel, (size, mtime_ns) in self._touched.items():
+            self.manifest.touch_file(self.index_name, self.repository, rel, size, mtime_ns)
+        for rel in self._deleted_paths - self._failed_paths:
+            self.manifest.remove_file(self.index_name, self.repository, rel)
+        self.manifest.commit()
+
+    def summary(self) -> Dict[str, Any]:
+        return dict(self.stats, manifest=self.manifest.path)
+
+    def close(self) -> None:
+        self.manifest.close()
+
+
+class RemoteIncrementalSync(IncrementalSync):
+    """IncrementalSync for a repository read through the GitHub API.
+
+    Files are identified by their repository-relative path and versioned by
+    git blob SHA, which the tree and compare APIs report without downloading
+    content. Call needs_blob for every file before diff_file::
+
+        sync = RemoteIncrementalSync.open(index_name, "owner/repo", embedding=key)
+        await sync.check_index(ops)
+        changed = [e for e in tree if sync.needs_blob(e["path"], e["sha"], e["size"])]
+        ...fetch and parse changed files, upload sync.diff_stream(files)...
+        await sync.apply_deletions(ops, include_vanished=full_tree)
+        sync.commit(result)
+    """
+
+    def __init__(
+        self, manifest: IndexManifest, index_name: str, repository: str, embedding: Optional[str] = None
+    ):
+        super().__init__(manifest, ".", index_name, repository, embedding)
+
+    @classmethod
+    def open(  # type: ignore[override]
+        cls, index_name: str, repository: str, embedding: Optional[str] = None
+    ) -> "RemoteIncrementalSync":
+        return cls(IndexManifest(str(default_remote_manifest_path())), index_name, repository, embedding)
+
+    def _rel(self, file_path: str) -> str:
+        return file_path
+
+    def needs_blob(self, path: str, blob_sha: str, size: int = 0) -> bool:
+        """False when the manifest already holds this blob for path"""
+        self._seen.add(path)
+        self._state[path] = (blob_sha, size, 0)
+        known = self._known.get(path)
+        if known and not self._index_changed and self._unchanged(known.file_hash, blob_sha):
+            self.stats["files_unchanged"] += 1
+            return False
+        return True
+
+    def needs_processing(self, file_path: str) -> bool:
+        raise TypeError("Remote files are filtered by blob SHA; use needs_blob")
+
+    def diff_file(self, file_path: str, docs: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        if docs is not None and file_path not in self._state:
+            # The base class would stat a local file of the same name
+            raise KeyError(f"No blob SHA recorded for {file_path}; call needs_blob first")
+        return super().diff_file(file_path, docs)
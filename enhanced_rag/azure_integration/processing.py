@@ -12,18 +12,37 @@ Usage:
     
     processor = FileProcessor()
     documents = processor.process_file(file_path, repo_path, repo_name)
+
+    # Whole repositories are streamed so memory stays bounded
+    async for doc in processor.aiter_repository(repo_path, repo_name):
+        ...
 """
 from __future__ import annotations
-import ast
+import asyncio
 import hashlib
 import logging
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterator, AsyncIterator, Callable
 import os
 import pathspec
 from fnmatch import fnmatch
 
+from ..code_understanding.python_chunker import analyze_python
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 # Content truncation limits aligned with Azure Search string constraints (~32KB bytes for some analyzers/fields)
@@ -36,7 +55,7 @@ _ALLOWED_REPO_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0
 DEFAULT_EXCLUDE_DIRS = {
     ".git", ".hg", ".svn", ".venv", "venv", "env", "node_modules",
     "dist", "build", "__pycache__", ".mypy_cache", ".pytest_cache",
-    ".coverage", ".vscode", ".idea"
+    ".coverage", ".vscode", ".idea", ".mcprag"
 }
 
 def validate_repo_name(name: str) -> Optional[str]:
@@ -126,6 +145,70 @@ EXT_MIME_MAP = {
 }
 
 
+@dataclass
+class IndexingStats:
+    """Counters for one repository walk, filled in as documents stream out"""
+    files_processed: int = 0
+    files_failed: int = 0
+    chunks: int = 0
+    skipped_ext: int = 0
+    skipped_ignored: int = 0
+    skipped_unchanged: int = 0
+    pruned_dirs: int = 0
+    truncated: bool = False  # walk stopped at MCP_MAX_INDEX_FILES
+    workers: int = 1
+    elapsed_seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files_processed": self.files_processed,
+            "files_failed": self.files_failed,
+            "chunks": self.chunks,
+            "skipped_ext": self.skipped_ext,
+            "skipped_ignored": self.skipped_ignored,
+            "skipped_unchanged": self.skipped_unchanged,
+            "pruned_dirs": self.pruned_dirs,
+            "truncated": self.truncated,
+            "workers": self.workers,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "files_per_second": round(self.files_per_second, 2),
+            "chunks_per_second": round(self.chunks_per_second, 2),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (0.0 if unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _process_file_group(
+    file_paths: List[str], repo_path: str, repo_name: str
+) -> List[Optional[List[Dict[str, Any]]]]:
+    """Worker entry point: process several files, None marking a failure"""
+    out: List[Optional[List[Dict[str, Any]]]] = []
+    for file_path in file_paths:
+        try:
+            out.append(process_file(file_path, repo_path, repo_name))
+        except Exception:
+            # unreadable/problematic – skip
+            out.append(None)
+    return out
+
+
 class FileProcessor:
     """Consolidated file processor for all Azure Search indexing operations."""
     
@@ -262,8 +345,6 @@ class FileProcessor:
         return False
 
     def _should_skip_file(self, rel_file: str) -> bool:
-        from fnmatch import fnmatch
-
         if self.use_default_excludes:
             for patt in self.DEFAULT_EXCLUDE_FILES:
                 if fnmatch(Path(rel_file).name, patt):
@@ -273,18 +354,40 @@ class FileProcessor:
         return False
 
     def process_repository(self, repo_path: str, repo_name: str) -> List[Dict[str, Any]]:
-        """Process entire repository into indexable documents with pruning."""
-        base = Path(repo_path).resolve()
-        if not base.exists() or not base.is_dir():
-            return []
+        """Process entire repository into indexable documents with pruning.
+
+        Collects everything in memory; prefer iter_repository/aiter_repository
+        for large repositories.
+        """
+        return list(self.iter_repository(repo_path, repo_name))
 
+    @staticmethod
+    def _resolve_workers(workers: Optional[int]) -> int:
+        """Worker processes to use: explicit value, MCP_INDEX_WORKERS, or available cores"""
+        if workers is None:
+            env = os.getenv("MCP_INDEX_WORKERS")
+            if env:
+                workers = int(env)
+            elif hasattr(os, "sched_getaffinity"):
+                workers = len(os.sched_getaffinity(0))
+            else:
+                workers = os.cpu_count() or 1
+        return max(1, workers)
+
+    def _iter_candidate_files(
+        self,
+        base: Path,
+        stats: IndexingStats,
+        file_filter: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[str]:
+        """Walk the repository, pruning ignored directories, and yield files to parse"""
         # (Re)load ignore spec for this repository
         if self.respect_gitignore:
             self._pathspec = self._load_ignore_spec(base)
 
-        documents: List[Dict[str, Any]] = []
+        # 0 or less disables the cap; streaming keeps memory bounded regardless
         max_files = int(os.getenv("MCP_MAX_INDEX_FILES", "20000"))
-        processed = skipped_ext = skipped_ignored = pruned_dirs = 0
+        emitted = 0
 
         for root, dirnames, filenames in os.walk(base):
             rel_root = os.path.relpath(root, base)
@@ -292,40 +395,209 @@ class FileProcessor:
             # Prune dirs in-place for performance
             original_len = len(dirnames)
             dirnames[:] = [d for d in dirnames if not self._should_prune_dir(os.path.join(rel_root, d))]
-            pruned_dirs += original_len - len(dirnames)
+            stats.pruned_dirs += original_len - len(dirnames)
 
             for fname in filenames:
-                if processed >= max_files:
-                    break
                 rel_path = os.path.join(rel_root, fname) if rel_root != "." else fname
 
                 if self._should_skip_file(rel_path):
-                    skipped_ignored += 1
+                    stats.skipped_ignored += 1
                     continue
 
                 full_path = base / rel_path
                 if not self.should_process_file(str(full_path)):
-                    skipped_ext += 1
+                    stats.skipped_ext += 1
                     continue
 
-                try:
-                    docs = process_file(str(full_path), str(base), repo_name)
-                    documents.extend(docs)
-                    processed += 1
-                except Exception:
-                    # unreadable/problematic – skip
+                if file_filter is not None and not file_filter(str(full_path)):
+                    stats.skipped_unchanged += 1
                     continue
-            if processed >= max_files:
-                break
-
-        logger.info(
-            "FileProcessor.process_repository summary | processed=%s skipped_ext=%s skipped_ignored=%s pruned_dirs=%s",
-            processed,
-            skipped_ext,
-            skipped_ignored,
-            pruned_dirs,
+
+                if 0 < max_files <= emitted:
+                    stats.truncated = True
+                    return
+                emitted += 1
+                yield str(full_path)
+
+    def _iter_file_documents(
+        self,
+        repo_path: str,
+        repo_name: str,
+        workers: Optional[int],
+        stats: IndexingStats,
+        file_filter: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[Tuple[str, Optional[List[Dict[str, Any]]]]]:
+        """Yield (file_path, documents) in walk order, parsing in a process pool.
+
+        documents is None when the file could not be processed.
+
+        At most workers * 2 groups of MCP_INDEX_TASK_FILES files are in
+        flight, so memory is bounded by that window rather than repo size.
+        """
+        base = Path(repo_path).resolve()
+        if not base.exists() or not base.is_dir():
+            return
+
+        started = time.perf_counter()
+        stats.workers = self._resolve_workers(workers)
+        group_size = max(1, int(os.getenv("MCP_INDEX_TASK_FILES", "16")))
+        candidates = self._iter_candidate_files(base, stats, file_filter)
+
+        def record(
+            file_path: str, file_docs: Optional[List[Dict[str, Any]]]
+        ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+            if file_docs is None:
+                stats.files_failed += 1
+            else:
+                stats.files_processed += 1
+                stats.chunks += len(file_docs)
+            return file_path, file_docs
+
+        try:
+            if stats.workers == 1:
+                for file_path in candidates:
+                    yield record(file_path, _process_file_group([file_path], str(base), repo_name)[0])
+                return
+
+            # forkserver/spawn: forking a process that runs an event loop and
+            # helper threads is not safe
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context("forkserver")
+                # Import this module once in the server rather than in every worker
+                mp_context.set_forkserver_preload([__name__])
+            else:
+                mp_context = multiprocessing.get_context("spawn")
+            pool = ProcessPoolExecutor(max_workers=stats.workers, mp_context=mp_context)
+            in_flight: "deque[Tuple[List[str], Future]]" = deque()
+            try:
+                exhausted = False
+                while True:
+                    while not exhausted and len(in_flight) < stats.workers * 2:
+                        group = [p for _, p in zip(range(group_size), candidates)]
+                        if not group:
+                            exhausted = True
+                            break
+                        in_flight.append(
+                            (group, pool.submit(_process_file_group, group, str(base), repo_name))
+                        )
+                    if not in_flight:
+                        break
+                    group, future = in_flight.popleft()
+                    for file_path, file_docs in zip(group, future.result()):
+                        yield record(file_path, file_docs)
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        finally:
+            stats.elapsed_seconds = time.perf_counter() - started
+            stats.peak_rss_mb = _peak_rss_mb()
+            logger.info(
+                "FileProcessor.process_repository summary | processed=%s failed=%s chunks=%s "
+                "skipped_ext=%s skipped_ignored=%s skipped_unchanged=%s pruned_dirs=%s workers=%s "
+                "files_per_s=%.1f chunks_per_s=%.1f peak_rss_mb=%.1f",
+                stats.files_processed,
+                stats.files_failed,
+                stats.chunks,
+                stats.skipped_ext,
+                stats.skipped_ignored,
+                stats.skipped_unchanged,
+                stats.pruned_dirs,
+                stats.workers,
+                stats.files_per_second,
+                stats.chunks_per_second,
+                stats.peak_rss_mb,
+            )
+
+    def iter_repository(
+        self,
+        repo_path: str,
+        repo_name: str,
+        workers: Optional[int] = None,
+        stats: Optional[IndexingStats] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a repository's documents without materialising them all.
+
+        Args:
+            repo_path: Repository root
+            repo_name: Repository name stored on each document
+            workers: Parser processes (default MCP_INDEX_WORKERS or available cores; 1 = in-process)
+            stats: Optional IndexingStats filled in as the walk progresses
+        """
+        stats = stats if stats is not None else IndexingStats()
+        for _, file_docs in self._iter_file_documents(repo_path, repo_name, workers, stats):
+            yield from file_docs or []
+
+    async def aiter_repository(
+        self,
+        repo_path: str,
+        repo_name: str,
+        workers: Optional[int] = None,
+        stats: Optional[IndexingStats] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async form of iter_repository, suitable for DataAutomation.bulk_upload."""
+        async for _, file_docs in self.aiter_repository_files(repo_path, repo_name, workers, stats):
+            for doc in file_docs or []:
+                yield doc
+
+    async def aiter_repository_files(
+        self,
+        repo_path: str,
+        repo_name: str,
+        workers: Optional[int] = None,
+        stats: Optional[IndexingStats] = None,
+        file_filter: Optional[Callable[[str], bool]] = None,
+    ) -> AsyncIterator[Tuple[str, Optional[List[Dict[str, Any]]]]]:
+        """Stream (file_path, documents) pairs; documents is None for failed files.
+
+        The walk and pool run on a helper thread feeding a bounded queue, so
+        the event loop keeps uploading while later files are parsed.
+        file_filter, when given, is called on that thread with each candidate
+        path and returns False to skip the file without parsing it.
+        """
+        stats = stats if stats is not None else IndexingStats()
+        handoff: "queue.Queue[Any]" = queue.Queue(
+            maxsize=max(1, int(os.getenv("MCP_INDEX_QUEUE_FILES", "256")))
         )
-        return documents
+        stop = threading.Event()
+        done = object()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    handoff.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            file_iter = self._iter_file_documents(repo_path, repo_name, workers, stats, file_filter)
+            try:
+                for item in file_iter:
+                    if not put(item):
+                        break
+            except BaseException as e:
+                put(e)
+            finally:
+                file_iter.close()
+                put(done)
+
+        producer = threading.Thread(target=produce, name="repo-indexer", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = await asyncio.to_thread(handoff.get)
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            try:
+                # Release a helper thread still blocked in handoff.get
+                handoff.put_nowait(done)
+            except queue.Full:
+                pass
 
 # (duplicate original process_repository method removed)
 
@@ -336,29 +608,28 @@ def extract_python_chunks(content: str, file_path: str) -> List[Dict[str, Any]]:
     """Extract semantic chunks from Python code using AST.
 
     Applies content length limits before parsing to reduce DoS risk from
-    pathological inputs.
+    pathological inputs. The parse is shared with other chunkers through
+    the analyze_python cache.
     """
     chunks: List[Dict[str, Any]] = []
     try:
         # Enforce a reasonable cap before AST parsing
         safe_content, _ = FileProcessor.truncate_content(content, limit=min(CONTENT_CHAR_LIMIT, 32000))
-        tree = ast.parse(safe_content)
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                start = getattr(node, "lineno", 1)
-                end = getattr(node, "end_lineno", start)
-                chunk = {
-                    "chunk_type": "function" if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else "class",
-                    "function_name": node.name if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else None,
-                    "class_name": node.name if isinstance(node, ast.ClassDef) else None,
-                    "start_line": start,
-                    "end_line": end,
-                    "docstring": ast.get_docstring(node) or "",
-                    "signature": f"def {node.name}" if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else f"class {node.name}",
-                }
-                lines = safe_content.split('\n')
-                chunk['content'] = '\n'.join(lines[start-1:end])
-                chunks.append(chunk)
+        info = analyze_python(safe_content, filename=file_path)
+        for definition in info.definitions:
+            is_function = definition.kind == "function"
+            chunks.append({
+                "chunk_type": definition.kind,
+                "function_name": definition.name if is_function else None,
+                "class_name": None if is_function else definition.name,
+                "start_line": definition.start_line,
+                "end_line": definition.end_line,
+                "docstring": definition.docstring,
+                "signature": f"def {definition.name}" if is_function else f"class {definition.name}",
+                "imports": list(info.imports),
+                "dependencies": list(definition.calls),
+                "content": info.segment(definition.start_line, definition.end_line),
+            })
     except (SyntaxError, ValueError):
         chunks.append({
             "chunk_type": "file",
@@ -403,6 +674,10 @@ def process_file(file_path: str, repo_path: str, repo_name: str) -> List[Dict[st
     file_processor = FileProcessor()
     language = file_processor.get_language_from_extension(file_path)
     relative_path = os.path.relpath(file_path, repo_path)
+    try:
+        modified_at = datetime.utcfromtimestamp(os.path.getmtime(file_path))
+    except OSError:
+        modified_at = datetime.utcnow()
 
     if language == 'python':
         chunks = extract_python_chunks(content, file_path)
@@ -425,7 +700,7 @@ def process_file(file_path: str, repo_path: str, repo_name: str) -> List[Dict[st
             "language": language,
             "chunk_type": chunk.get('chunk_type', 'file'),
             "chunk_id": f"{relative_path}:{i}",
-            "last_modified": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")[:-4] + "Z",
+            "last_modified": modified_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")[:-4] + "Z",
             "file_extension": Path(file_path).suffix
         }
         for key in ("function_name", "class_name", "docstring", "signature", "start_line", "end_line"):
@@ -1,6 +1,11 @@
 """Azure AI Search REST API client for automation."""
 
-from .client import AzureSearchClient
+from .client import AzureSearchClient, get_shared_search_client, close_shared_search_clients
 from .operations import SearchOperations
 
-__all__ = ["AzureSearchClient", "SearchOperations"]
\ No newline at end of file
+__all__ = [
+    "AzureSearchClient",
+    "SearchOperations",
+    "get_shared_search_client",
+    "close_shared_search_clients",
+]
\ No newline at end of file
@@ -5,11 +5,13 @@ cascading failures during upstream outages while keeping tenacity
 retry behavior.
 """
 
+import importlib.util
 import os
+import threading
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from enhanced_rag.utils.error_handler import _CircuitBreaker, StructuredError, ErrorCode
 
 logger = logging.getLogger(__name__)
@@ -17,6 +19,37 @@ logger = logging.getLogger(__name__)
 # Default API version - can be overridden via environment variable
 DEFAULT_API_VERSION = "2025-08-01-preview"
 
+# Connection pool defaults, overridable via ACS_MAX_CONNECTIONS,
+# ACS_MAX_KEEPALIVE_CONNECTIONS and ACS_KEEPALIVE_EXPIRY
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_RETRIABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# Throttling asks callers to back off; it doesn't trip the circuit breaker
+_THROTTLE_STATUS = {429, 503}
+
+
+def _is_retriable(exc: BaseException) -> bool:
+    """Retry throttling, server errors and transport failures only"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRIABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _default_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("ACS_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        max_keepalive_connections=int(
+            os.getenv("ACS_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+        ),
+        keepalive_expiry=float(os.getenv("ACS_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY)),
+    )
+
 
 class AzureSearchClient:
     """Simple REST client for Azure AI Search automation."""
@@ -26,7 +59,9 @@ class AzureSearchClient:
         endpoint: str, 
         api_key: str, 
         api_version: Optional[str] = None,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        http2: Optional[bool] = None,
+        limits: Optional[httpx.Limits] = None,
     ):
         """Initialize the Azure Search REST client.
         
@@ -34,14 +69,26 @@ class AzureSearchClient:
             endpoint: Azure Search service endpoint
             api_key: Admin API key for authentication
             api_version: API version to use (defaults to ACS_API_VERSION env var or DEFAULT_API_VERSION)
-            timeout: Request timeout in seconds
+            timeout: Default request timeout in seconds; callers may pass a
+                per-request ``timeout`` to ``request``
+            http2: Negotiate HTTP/2 (defaults to ACS_HTTP2, on unless set to
+                false; requires the ``h2`` package)
+            limits: Connection pool limits (defaults from ACS_* env vars)
         """
         self.endpoint = endpoint.rstrip('/')
         self.api_key = api_key
         # Use provided version, or env var, or default
         self.api_version = api_version or os.getenv("ACS_API_VERSION", DEFAULT_API_VERSION)
+        if http2 is None:
+            http2 = os.getenv("ACS_HTTP2", "true").lower() in ("1", "true", "yes")
+        if http2 and not _http2_available():
+            logger.info("h2 package not installed; Azure Search client using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
         self.client = httpx.AsyncClient(
             timeout=timeout,
+            http2=http2,
+            limits=limits or _default_limits(),
             headers={
                 "api-key": api_key,
                 "Content-Type": "application/json",
@@ -54,6 +101,7 @@ class AzureSearchClient:
     @retry(
         stop=stop_after_attempt(3), 
         wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception(_is_retriable),
         reraise=True
     )
     async def request(
@@ -67,7 +115,7 @@ class AzureSearchClient:
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             path: API path (e.g., /indexes/my-index)
-            **kwargs: Additional arguments passed to httpx
+            **kwargs: Additional arguments passed to httpx (e.g. ``timeout``)
             
         Returns:
             JSON response as dictionary
@@ -75,6 +123,22 @@ class AzureSearchClient:
         Raises:
             httpx.HTTPStatusError: If request fails after retries
         """
+        return await self.request_once(method, path, **kwargs)
+
+    async def request_once(
+        self,
+        method: str,
+        path: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Make a single REST API request without retry.
+
+        For callers that run their own retry and back-off policy, such as
+        the pipelined bulk uploader.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails
+        """
         # Short‑circuit if the circuit is open
         if not self._circuit.allow():
             raise StructuredError(
@@ -108,7 +172,8 @@ class AzureSearchClient:
         except httpx.HTTPStatusError as e:
             status = getattr(e.response, "status_code", "unknown")
             logger.error(f"HTTP error {status} during Azure Search request")
-            self._circuit.failure()
+            if status not in _THROTTLE_STATUS:
+                self._circuit.failure()
             raise
         except Exception as e:
             logger.error(f"Request failed: {e}")
@@ -116,7 +181,13 @@ class AzureSearchClient:
             raise
     
     async def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client.
+
+        Shared clients (see get_shared_search_client) outlive any single
+        owner and are only closed by close_shared_search_clients().
+        """
+        if getattr(self, "_shared", False):
+            return
         await self.client.aclose()
     
     async def __aenter__(self):
@@ -126,3 +197,40 @@ class AzureSearchClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         await self.close()
+
+
+_shared_clients: Dict[Tuple[str, str, str], AzureSearchClient] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_search_client(
+    endpoint: str,
+    api_key: str,
+    api_version: Optional[str] = None,
+) -> AzureSearchClient:
+    """Get the process-wide REST client for a service.
+
+    Every retrieval stage reuses one connection pool per
+    (endpoint, key, api version) instead of opening its own.
+    """
+    version = api_version or os.getenv("ACS_API_VERSION", DEFAULT_API_VERSION)
+    key = (endpoint.rstrip('/'), api_key, version)
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None or client.client.is_closed:
+            client = AzureSearchClient(endpoint=endpoint, api_key=api_key, api_version=version)
+            client._shared = True
+            _shared_clients[key] = client
+        return client
+
+
+async def close_shared_search_clients() -> None:
+    """Close every shared REST client (call on shutdown)"""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        try:
+            await client.client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing shared Azure Search client: {e}")
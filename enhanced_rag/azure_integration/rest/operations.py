@@ -114,7 +114,8 @@ class SearchOperations:
         self,
         index_name: str,
         documents: List[Dict[str, Any]],
-        merge: bool = False
+        merge: bool = False,
+        retry: bool = True
     ) -> Dict[str, Any]:
         """Upload documents to an index.
 
@@ -122,6 +123,7 @@ class SearchOperations:
             index_name: Target index name
             documents: List of documents to upload
             merge: If True, merge with existing documents; otherwise upload (replace)
+            retry: If False, send once and leave throttling to the caller
 
         Returns:
             Upload result with status for each document
@@ -134,7 +136,8 @@ class SearchOperations:
                 for doc in safe_docs
             ]
         }
-        return await self.client.request("POST", f"/indexes/{index_name}/docs/index", json=batch)
+        send = self.client.request if retry else self.client.request_once
+        return await send("POST", f"/indexes/{index_name}/docs/index", json=batch)
 
     async def delete_documents(self, index_name: str, keys: List[str]) -> Dict[str, Any]:
         """Delete documents by key.
@@ -154,13 +157,20 @@ class SearchOperations:
         }
         return await self.client.request("POST", f"/indexes/{index_name}/docs/index", json=batch)
 
-    async def get_document(self, index_name: str, key: str, select: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def get_document(
+        self,
+        index_name: str,
+        key: str,
+        select: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """Get a single document by key.
 
         Args:
             index_name: Index name
             key: Document key
             select: Optional list of fields to return
+            timeout: Optional per-request timeout in seconds
 
         Returns:
             Document data
@@ -169,7 +179,8 @@ class SearchOperations:
         if select:
             params["$select"] = ",".join(select)
 
-        return await self.client.request("GET", f"/indexes/{index_name}/docs/{key}", params=params)
+        extra = {"timeout": timeout} if timeout is not None else {}
+        return await self.client.request("GET", f"/indexes/{index_name}/docs/{key}", params=params, **extra)
 
     async def count_documents(self, index_name: str) -> int:
         """Get document count for an index.
@@ -190,6 +201,7 @@ class SearchOperations:
         self,
         index_name: str,
         query: str = "*",
+        timeout: Optional[float] = None,
         **options
     ) -> Dict[str, Any]:
         """Search documents.
@@ -197,6 +209,7 @@ class SearchOperations:
         Args:
             index_name: Index to search
             query: Search query (default: * for all documents)
+            timeout: Optional per-request timeout in seconds
             **options: Additional search options (filter, select, orderby, top, skip, etc.)
 
         Returns:
@@ -229,7 +242,8 @@ class SearchOperations:
         endpoint = f"/indexes/{index_name}/docs/search"
 
         try:
-            response = await self.client.request("POST", endpoint, json=body)
+            extra = {"timeout": timeout} if timeout is not None else {}
+            response = await self.client.request("POST", endpoint, json=body, **extra)
             return response
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -448,6 +462,52 @@ class SearchOperations:
 
         await self.client.request("POST", f"/skillsets/{skillset_name}/resetskills", json=body)
 
+    # ========== Alias Operations ==========
+
+    async def create_or_update_alias(self, name: str, index_name: str) -> Dict[str, Any]:
+        """Create an alias or repoint it at another index.
+
+        Args:
+            name: Alias name
+            index_name: Index the alias should resolve to
+
+        Returns:
+            Alias definition
+        """
+        logger.info(f"Pointing alias {name} at index {index_name}")
+        return await self.client.request(
+            "PUT", f"/aliases/{name}", json={"name": name, "indexes": [index_name]}
+        )
+
+    async def delete_alias(self, name: str) -> None:
+        """Delete an alias.
+
+        Args:
+            name: Alias name to delete
+        """
+        logger.info(f"Deleting alias: {name}")
+        await self.client.request("DELETE", f"/aliases/{name}")
+
+    async def get_alias(self, name: str) -> Dict[str, Any]:
+        """Get alias definition.
+
+        Args:
+            name: Alias name
+
+        Returns:
+            Alias definition including the index it resolves to
+        """
+        return await self.client.request("GET", f"/aliases/{name}")
+
+    async def list_aliases(self) -> List[Dict[str, Any]]:
+        """List all aliases.
+
+        Returns:
+            List of alias definitions
+        """
+        result = await self.client.request("GET", "/aliases")
+        return result.get("value", [])
+
     # ========== Service Operations ==========
 
     async def get_service_statistics(self) -> Dict[str, Any]:
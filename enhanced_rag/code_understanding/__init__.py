@@ -4,5 +4,6 @@ Provides code analysis and chunking utilities
 """
 
 from .chunkers import CodeChunker
+from .js_parser_pool import JSParserPool, get_js_parser_pool
 
-__all__ = ['CodeChunker']
\ No newline at end of file
+__all__ = ['CodeChunker', 'JSParserPool', 'get_js_parser_pool']
\ No newline at end of file
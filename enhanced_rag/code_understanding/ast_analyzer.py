@@ -10,6 +10,8 @@ import subprocess
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set
 
+from .python_chunker import analyze_python
+
 logger = logging.getLogger(__name__)
 
 
@@ -175,7 +177,8 @@ class ASTAnalyzer:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
-            tree = ast.parse(content, filename=str(file_path))
+            # Shared with the chunkers through the content-hash parse cache
+            tree = analyze_python(content, filename=str(file_path)).tree
 
             # Extract information
             imports = self._extract_python_imports(tree)
@@ -4,12 +4,13 @@ Shared chunking logic for both local and remote indexing
 """
 
 import ast
-import json
-import subprocess
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from .js_parser_pool import parse_js_ts
+from .python_chunker import analyze_python
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,70 +30,60 @@ class CodeChunker:
         """
         chunks: List[Dict[str, Any]] = []
         try:
-            tree = ast.parse(content)
-
-            # Build parent mapping
-            parent_map = {
-                child: parent
-                for parent in ast.walk(tree)
-                for child in ast.iter_child_nodes(parent)
-            }
-
-            for node in ast.walk(tree):
+            info = analyze_python(content, filename=file_path)
+            imports = info.imports
+            lines = info.physical_lines
+
+            for definition in info.definitions:
+                node = definition.node
+                parent = definition.parent
+                # Async functions are part of their enclosing chunk
+                if not isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                    continue
                 # Optionally include methods; previous behavior skipped methods
-                if not include_methods and isinstance(node, ast.FunctionDef) and isinstance(
-                    parent_map.get(node), ast.ClassDef
-                ):
+                if not include_methods and isinstance(node, ast.FunctionDef) and isinstance(parent, ast.ClassDef):
                     continue
 
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    # Extract function/class with context
-                    start_line = getattr(node, "lineno", 1) - 1
-                    end_line = getattr(node, "end_lineno", start_line + 10) or (start_line + 10)
-
-                    lines = content.splitlines()
-                    chunk_lines = lines[start_line:end_line]
-                    chunk_code = "\n".join(chunk_lines)
-
-                    # Extract semantic information
-                    imports = CodeChunker._extract_imports(tree)
-                    calls = CodeChunker._extract_function_calls(node)
-                    signature = CodeChunker._get_signature(node)
-
-                    # Create semantic context
-                    # Add class context if node is a method
-                    class_ctx = ""
-                    class_name = None
-                    if isinstance(node, ast.FunctionDef) and isinstance(parent_map.get(node), ast.ClassDef):
-                        parent = parent_map.get(node)
-                        if isinstance(parent, ast.ClassDef):
-                            class_name = parent.name
-                            class_sig = CodeChunker._get_signature(parent)
-                            class_ctx = f" | Class: {class_sig}"
-
-                    semantic_context = f"""
+                # Extract function/class with context
+                start_line = getattr(node, "lineno", 1) - 1
+                end_line = getattr(node, "end_lineno", start_line + 10) or (start_line + 10)
+                chunk_code = "\n".join(lines[start_line:end_line])
+
+                calls = definition.calls
+                signature = CodeChunker._get_signature(node)
+
+                # Create semantic context
+                # Add class context if node is a method
+                class_ctx = ""
+                class_name = None
+                if isinstance(node, ast.FunctionDef) and isinstance(parent, ast.ClassDef):
+                    class_name = parent.name
+                    class_sig = CodeChunker._get_signature(parent)
+                    class_ctx = f" | Class: {class_sig}"
+
+                semantic_context = f"""
 {signature} in {file_path}{class_ctx}
 Uses: {', '.join(imports[:10])}
 Calls: {', '.join(calls[:10])}
-Purpose: {CodeChunker._extract_docstring(node) or 'Implementation details in code'}
-                    """.strip()
+Purpose: {definition.docstring or 'Implementation details in code'}
+                """.strip()
 
-                    chunks.append({
-                        "content": chunk_code,
-                        "semantic_context": semantic_context,
-                        "signature": signature,
-                        "imports": imports,
-                        "dependencies": calls,
-                        "chunk_type": (
-                            "function" if isinstance(node, ast.FunctionDef) else "class"
-                        ),
-                        "start_line": start_line + 1,
-                        "end_line": end_line,
-                        "function_name": node.name if isinstance(node, ast.FunctionDef) else None,
-                        "class_name": node.name if isinstance(node, ast.ClassDef) else class_name,
-                        "docstring": CodeChunker._extract_docstring(node),
-                        "file_path": file_path
-                    })
+                chunks.append({
+                    "content": chunk_code,
+                    "semantic_context": semantic_context,
+                    "signature": signature,
+                    "imports": list(imports),
+                    "dependencies": list(calls),
+                    "chunk_type": (
+                        "function" if isinstance(node, ast.FunctionDef) else "class"
+                    ),
+                    "start_line": start_line + 1,
+                    "end_line": end_line,
+                    "function_name": node.name if isinstance(node, ast.FunctionDef) else None,
+                    "class_name": node.name if isinstance(node, ast.ClassDef) else class_name,
+                    "docstring": definition.docstring,
+                    "file_path": file_path
+                })
 
         except (SyntaxError, UnicodeDecodeError, ValueError) as e:
             # Fallback for non-parseable code
@@ -224,22 +215,12 @@ Purpose: {CodeChunker._extract_docstring(node) or 'Implementation details in cod
     _docstring_of = staticmethod(_extract_docstring)
 
     @staticmethod
-    def _parse_js_ts(path: Path) -> dict:
-        """Parse JavaScript/TypeScript files using Babel AST."""
-        try:
-            res = subprocess.run(
-                ["node", str(Path(__file__).resolve().parents[2] / "parse_js.mjs"), str(path)],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if res.returncode == 0 and res.stdout:
-                return json.loads(res.stdout)
-        except Exception as e:
-            logger.warning(f"Failed to parse {path} with Babel: {e}")
-
-        # Fallback to empty metadata
-        return {"function_signature": "", "imports_used": [], "calls_functions": []}
+    def _parse_js_ts(path: Optional[Path] = None, content: Optional[str] = None) -> Optional[dict]:
+        """Parse JavaScript/TypeScript with Babel via the persistent node workers.
+
+        Returns None when Node or Babel is unavailable.
+        """
+        return parse_js_ts(str(path) if path is not None else None, content)
 
     @staticmethod
     def chunk_js_ts_file(content: str, file_path: str) -> List[Dict[str, Any]]:
@@ -255,12 +236,10 @@ Purpose: {CodeChunker._extract_docstring(node) or 'Implementation details in cod
         chunks: List[Dict[str, Any]] = []
         path = Path(file_path)
 
-        # Try to parse with Babel if available
-        if path.exists():
-            meta = CodeChunker._parse_js_ts(path)
-        else:
-            # For remote files, we can't use Babel parser
-            # Use simple heuristics instead
+        # Babel parses the contents, so remote files work too; fall back to
+        # simple heuristics when node or Babel is unavailable
+        meta = CodeChunker._parse_js_ts(path if path.exists() else None, content)
+        if meta is None:
             meta = CodeChunker._parse_js_ts_heuristic(content)
 
         # Split content into lines
@@ -0,0 +1,344 @@
+"""
+Persistent Node.js workers for JavaScript/TypeScript parsing
+
+``parse_js.mjs --serve`` reads one JSON request per line on stdin and writes
+one JSON response per line on stdout, so Node startup and the Babel load are
+paid once per worker rather than once per file. Requests carry either a path
+or the file contents:
+
+    {"id": 1, "path": "src/a.ts"}       -> {"id": 1, "result": {...}}
+    {"id": 2, "content": "export ..."}  -> {"id": 2, "result": {...}}
+    {"id": 3, "op": "ping"}             -> {"id": 3, "ok": true}
+
+Workers are started lazily, replaced when they crash, and killed when a
+request exceeds its timeout. When Node or Babel is unavailable the pool
+disables itself and callers fall back to heuristic parsing.
+
+Environment:
+    MCP_JS_PARSER_POOL      set to "false" to spawn one node process per file
+    MCP_JS_PARSER_WORKERS   number of node workers (default: 2)
+    MCP_JS_PARSER_TIMEOUT   per-request timeout in seconds (default: 10)
+    MCP_NODE_COMMAND        node executable (default: node)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PARSE_JS_PATH = Path(__file__).resolve().parents[2] / "parse_js.mjs"
+
+# Recycle a worker after this many requests to bound Babel's heap growth
+_MAX_REQUESTS_PER_WORKER = 10000
+
+
+def _node_command() -> str:
+    return os.getenv("MCP_NODE_COMMAND", "node")
+
+
+class _WorkerCrashed(Exception):
+    pass
+
+
+class _WorkerTimeout(Exception):
+    pass
+
+
+class _NodeWorker:
+    """One ``parse_js.mjs --serve`` process"""
+
+    def __init__(self, command: List[str]):
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.requests = 0
+        self._next_id = 0
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        try:
+            for line in self.proc.stdout:
+                self._responses.put(line)
+        except (OSError, ValueError):
+            pass
+        self._responses.put(None)  # EOF: the process exited
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def call(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self._next_id += 1
+        request_id = self._next_id
+        self.requests += 1
+        try:
+            self.proc.stdin.write(json.dumps(dict(request, id=request_id)) + "\n")
+            self.proc.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise _WorkerCrashed(str(e)) from e
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise _WorkerTimeout()
+            try:
+                line = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                raise _WorkerTimeout() from None
+            if line is None:
+                raise _WorkerCrashed(f"exited with code {self.proc.poll()}")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue  # stray output, e.g. a console.log in a dependency
+            # Responses to requests that timed out earlier are skipped
+            if isinstance(response, dict) and response.get("id") == request_id:
+                return response
+
+    def close(self, kill: bool = False) -> None:
+        if kill:
+            self.proc.kill()
+        try:
+            self.proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class JSParserPool:
+    """Bounded pool of persistent Babel parser processes.
+
+    Thread-safe; each request checks out one idle worker.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        command: Optional[List[str]] = None,
+        startup_timeout: float = 15.0,
+        max_start_failures: int = 3,
+    ):
+        self.size = max(1, workers or int(os.getenv("MCP_JS_PARSER_WORKERS", "2")))
+        self.timeout = timeout or float(os.getenv("MCP_JS_PARSER_TIMEOUT", "10"))
+        self.command = command or [_node_command(), str(PARSE_JS_PATH), "--serve"]
+        self.startup_timeout = startup_timeout
+        self.max_start_failures = max_start_failures
+
+        self._cond = threading.Condition()
+        self._idle: List[_NodeWorker] = []
+        self._spawned = 0
+        self._start_failures = 0
+        self._closed = False
+        self._pid = os.getpid()
+        self._disabled = shutil.which(self.command[0]) is None
+        if command is None and not PARSE_JS_PATH.exists():
+            self._disabled = True
+        self.stats: Dict[str, int] = {
+            "parsed": 0, "errors": 0, "timeouts": 0, "restarts": 0, "started": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return not self._disabled and not self._closed
+
+    def _start_worker(self) -> _NodeWorker:
+        worker = None
+        try:
+            worker = _NodeWorker(self.command)
+            response = worker.call({"op": "ping"}, self.startup_timeout)
+            if not response.get("ok"):
+                raise _WorkerCrashed(f"unexpected handshake {response!r}")
+        except (OSError, _WorkerCrashed, _WorkerTimeout) as e:
+            if worker is not None:
+                worker.close()
+            with self._cond:
+                self._start_failures += 1
+                if self._start_failures >= self.max_start_failures:
+                    self._disabled = True
+                    logger.warning(
+                        f"JS parser workers failed to start {self._start_failures} times "
+                        f"({e or 'timeout'}); falling back to heuristic parsing"
+                    )
+            raise _WorkerCrashed("startup failed") from e
+        with self._cond:
+            self._start_failures = 0
+            self.stats["started"] += 1
+        return worker
+
+    def _checkout(self) -> _NodeWorker:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if not self.available:
+                    raise _WorkerCrashed("pool unavailable")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        return worker
+                    self._spawned -= 1
+                    self.stats["restarts"] += 1
+                    worker.close()
+                if self._spawned < self.size:
+                    self._spawned += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    raise _WorkerTimeout()
+        try:
+            return self._start_worker()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._spawned -= 1
+            self._cond.notify()
+
+    def _checkin(self, worker: _NodeWorker) -> None:
+        if self._closed or worker.requests >= _MAX_REQUESTS_PER_WORKER:
+            self._discard(worker)
+            return
+        with self._cond:
+            self._idle.append(worker)
+            self._cond.notify()
+
+    def _discard(self, worker: _NodeWorker, kill: bool = False) -> None:
+        worker.close(kill=kill)
+        self._release_slot()
+
+    def parse(
+        self,
+        path: Optional[str] = None,
+        content: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Parse a file by contents (preferred) or path.
+
+        Returns:
+            Parser metadata ({"chunks", "imports_used", "calls_functions"}),
+            or None when the pool is unavailable or the request failed
+        """
+        if not self.available:
+            return None
+        request: Dict[str, Any] = {"content": content} if content is not None else {"path": str(path)}
+
+        # A crashed worker is replaced and the request retried once
+        for _ in range(2):
+            try:
+                worker = self._checkout()
+            except (_WorkerCrashed, _WorkerTimeout):
+                return None
+            try:
+                response = worker.call(request, self.timeout)
+            except _WorkerTimeout:
+                self.stats["timeouts"] += 1
+                logger.warning(f"JS parser timed out after {self.timeout}s on {path or '<content>'}")
+                self._discard(worker, kill=True)
+                return None
+            except _WorkerCrashed as e:
+                self.stats["restarts"] += 1
+                logger.debug(f"JS parser worker crashed on {path or '<content>'}: {e}")
+                self._discard(worker)
+                continue
+            self._checkin(worker)
+            if "error" in response:
+                self.stats["errors"] += 1
+                logger.debug(f"JS parser error for {path or '<content>'}: {response['error']}")
+                return None
+            self.stats["parsed"] += 1
+            return response.get("result")
+        return None
+
+    def health_check(self) -> Dict[str, Any]:
+        """Ping idle workers, replacing any that are dead or unresponsive"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        healthy = 0
+        for worker in idle:
+            try:
+                if worker.alive() and worker.call({"op": "ping"}, min(self.timeout, 2.0)).get("ok"):
+                    healthy += 1
+                    self._checkin(worker)
+                    continue
+            except (_WorkerCrashed, _WorkerTimeout):
+                pass
+            self.stats["restarts"] += 1
+            self._discard(worker, kill=True)
+        with self._cond:
+            busy = self._spawned - len(self._idle)
+        return {
+            "available": self.available,
+            "healthy_idle": healthy,
+            "busy": busy,
+            "size": self.size,
+            **self.stats,
+        }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._spawned -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.close()
+
+
+def parse_with_subprocess(path: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Parse one file with a fresh node process (the pre-pool behavior)"""
+    try:
+        res = subprocess.run(
+            [_node_command(), str(PARSE_JS_PATH), str(path)],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=timeout or float(os.getenv("MCP_JS_PARSER_TIMEOUT", "10")),
+        )
+        if res.returncode == 0 and res.stdout:
+            return json.loads(res.stdout)
+    except Exception as e:
+        logger.warning(f"Failed to parse {path} with Babel: {e}")
+    return None
+
+
+_pool: Optional[JSParserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_js_parser_pool() -> JSParserPool:
+    """Process-wide parser pool; a forked child gets its own"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._pid != os.getpid():
+            _pool = JSParserPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def parse_js_ts(path: Optional[str] = None, content: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Babel metadata for a JS/TS file, or None when Babel can't be used"""
+    if os.getenv("MCP_JS_PARSER_POOL", "true").lower() == "false":
+        return parse_with_subprocess(path) if path else None
+    return get_js_parser_pool().parse(path=path, content=content)
@@ -0,0 +1,171 @@
+"""
+Single-pass Python source analysis shared by every chunker
+
+analyze_python() parses a module once, walks the tree once, and returns
+every definition together with its signature inputs, docstring, calls and the
+module imports. Results are cached by content hash, so the indexer, the
+ASTAnalyzer and query-time enrichment reuse one parse of the same source.
+
+Cached trees and results are shared between callers and must not be mutated.
+
+Environment:
+    MCP_PYTHON_PARSE_CACHE_SIZE   number of parsed sources kept (default: 256)
+"""
+
+import ast
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_NEWLINE = re.compile("\n")
+
+
+@dataclass
+class PythonDefinition:
+    """A function, method or class found in a module"""
+    node: ast.AST
+    parent: Optional[ast.AST]
+    kind: str  # "function" or "class"
+    name: str
+    is_async: bool
+    start_line: int
+    end_line: int
+    docstring: str
+    calls: List[str] = field(default_factory=list)  # de-duplicated, in ast.walk order
+
+
+class PythonModuleInfo:
+    """Parse results for one Python source"""
+
+    def __init__(self, content: str, tree: ast.Module):
+        self.content = content
+        self.tree = tree
+        self.definitions, self.imports = _single_pass(tree)
+        self._line_starts: Optional[List[int]] = None
+        self._physical_lines: Optional[List[str]] = None
+
+    def segment(self, start: int, end: int) -> str:
+        """Lines start..end (1-based, inclusive) as '\\n'.join(content.split('\\n')[start-1:end])"""
+        starts = self._line_starts
+        if starts is None:
+            starts = [0] + [m.end() for m in _NEWLINE.finditer(self.content)]
+            self._line_starts = starts
+        count = len(starts)
+        first = min(max(start - 1, 0), count)
+        last = min(max(end, 0), count)
+        if last <= first:
+            return ""
+        stop = starts[last] - 1 if last < count else len(self.content)
+        return self.content[starts[first]:stop]
+
+    @property
+    def physical_lines(self) -> List[str]:
+        """content.splitlines(), computed once"""
+        if self._physical_lines is None:
+            self._physical_lines = self.content.splitlines()
+        return self._physical_lines
+
+
+def _call_name(call: ast.Call) -> Optional[str]:
+    func = call.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _single_pass(tree: ast.AST) -> Tuple[List[PythonDefinition], List[str]]:
+    """Collect definitions, per-definition calls and imports in one walk.
+
+    Uses the same breadth-first order as ast.walk, so definitions come out
+    in the order the previous per-chunker walks produced them, and each
+    definition's calls match ast.walk(definition).
+    """
+    definitions: List[PythonDefinition] = []
+    imports: Dict[str, None] = {}
+    calls: Dict[int, Dict[str, None]] = {}
+    todo: deque = deque([(tree, None, ())])
+    while todo:
+        node, parent, enclosing = todo.popleft()
+        if isinstance(node, _DEFINITION_TYPES):
+            start = getattr(node, "lineno", 1)
+            definition = PythonDefinition(
+                node=node,
+                parent=parent,
+                kind="class" if isinstance(node, ast.ClassDef) else "function",
+                name=node.name,
+                is_async=isinstance(node, ast.AsyncFunctionDef),
+                start_line=start,
+                end_line=getattr(node, "end_lineno", start) or start,
+                docstring=ast.get_docstring(node) or "",
+            )
+            calls[len(definitions)] = {}
+            enclosing = enclosing + (len(definitions),)
+            definitions.append(definition)
+        elif isinstance(node, ast.Call):
+            name = _call_name(node)
+            if name is not None:
+                for index in enclosing:
+                    calls[index].setdefault(name, None)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.setdefault(alias.name, None)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                imports.setdefault(f"{node.module}.{alias.name}", None)
+        for child in ast.iter_child_nodes(node):
+            todo.append((child, node, enclosing))
+
+    for index, definition in enumerate(definitions):
+        definition.calls = list(calls[index])
+    return definitions, list(imports)
+
+
+_cache: "OrderedDict[Tuple[str, int], PythonModuleInfo]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_size = int(os.getenv("MCP_PYTHON_PARSE_CACHE_SIZE", "256"))
+_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def analyze_python(content: str, filename: str = "<unknown>") -> PythonModuleInfo:
+    """Parse and analyze Python source, reusing a cached result for identical content.
+
+    filename only names the file in SyntaxError messages; it is not part of
+    the cache key.
+
+    Raises:
+        SyntaxError, ValueError: the source can't be parsed
+    """
+    key = (hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest(), len(content))
+    with _cache_lock:
+        info = _cache.get(key)
+        if info is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return info
+        _stats["misses"] += 1
+
+    info = PythonModuleInfo(content, ast.parse(content, filename=filename))
+    if _cache_size > 0:
+        with _cache_lock:
+            _cache[key] = info
+            _cache.move_to_end(key)
+            while len(_cache) > _cache_size:
+                _cache.popitem(last=False)
+    return info
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    with _cache_lock:
+        return dict(_stats, size=len(_cache), max_size=_cache_size)
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
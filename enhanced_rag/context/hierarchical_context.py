@@ -1,25 +1,65 @@
 """
 Hierarchical Context Analyzer
 Implements multi-level context awareness for code understanding
+
+Nothing here blocks the event loop on I/O. Git runs as async subprocesses and
+file reads, parsing and project scans run in worker threads. Results are
+cached:
+- file analyses by path, until the file's mtime or size changes
+- project facts (type, dependencies, standards, test framework and layout,
+  build system) per project root, until the root directory or its manifests
+  change
+- git facts (branch, recent commits per file) per repository, until HEAD
+  moves or cache_ttl_seconds passes
 """
 
 import ast
+import asyncio
+import fnmatch
 import os
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Set
 from datetime import datetime, timedelta
-import subprocess
 import re
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 from ..core.interfaces import ContextProvider
 from ..core.models import CodeContext, EnhancedContext, ContextLevel
 from ..core.config import get_config
+from ..code_understanding.python_chunker import analyze_python
+from ..code_understanding.js_parser_pool import parse_js_ts
 
 logger = logging.getLogger(__name__)
 
+DEPENDENCY_FILES = {
+    'python': ['requirements.txt', 'Pipfile', 'pyproject.toml', 'setup.py'],
+    'javascript': ['package.json'],
+    'typescript': ['package.json'],
+    'java': ['pom.xml', 'build.gradle'],
+    'go': ['go.mod'],
+    'rust': ['Cargo.toml'],
+}
+
+# Directories never searched for test files
+_SKIP_DIRS = {'node_modules', 'venv', '.venv', 'env', '__pycache__', 'build', 'dist', 'target', 'vendor'}
+
+_GIT_LOG_FORMAT = '--pretty=format:%x1e%H%x1f%an%x1f%ae%x1f%ad%x1f%s'
+
+
+def _names(items: List[Any]) -> List[str]:
+    """Names from analyzer output; the Python analyzer returns dicts with details"""
+    return [item['name'] if isinstance(item, dict) else str(item) for item in items]
+
+
+def _stat_key(path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
 class HierarchicalContextAnalyzer(ContextProvider):
     """
@@ -32,7 +72,17 @@ class HierarchicalContextAnalyzer(ContextProvider):
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or get_config().context.model_dump()
-        self.cache: Dict[str, Tuple[EnhancedContext, datetime]] = {}
+        self.cache: Dict[str, Tuple[EnhancedContext, datetime, Optional[Tuple[int, int]]]] = {}
+        # Per-file analyses, least recently used first
+        self._file_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._file_cache_size = self.config.get('file_cache_size', 2000)
+        self._dir_cache: Dict[str, Tuple[Optional[Tuple[int, int]], str, List[str]]] = {}
+        self._project_cache: Dict[Tuple[str, str], Tuple[Tuple, Dict[str, Any]]] = {}
+        self._git_cache: Dict[str, Tuple[Tuple, datetime, Dict[str, Any]]] = {}
+        self._git_dirs: Dict[str, Optional[Tuple[str, str]]] = {}
+        self._project_roots: Dict[str, str] = {}
+        self._locks: Dict[Any, asyncio.Lock] = {}
+        self.stats = {'file_reads': 0, 'file_cache_hits': 0, 'project_scans': 0, 'git_queries': 0}
         self._initialize_analyzers()
     
     def _initialize_analyzers(self):
@@ -73,10 +123,9 @@ class HierarchicalContextAnalyzer(ContextProvider):
             
             # Extract fresh context
             language = self._detect_language(file_path)
-            file_content = self._read_file(file_path)
             
-            # Get language-specific analysis
-            analysis = await self._analyze_file(file_path, file_content, language)
+            # Language-specific analysis; unchanged files are not re-read
+            file_content, analysis = await self._get_file_analysis(file_path, language, with_content=True)
             
             # Get git information
             git_info = await self._get_git_info(file_path)
@@ -88,8 +137,8 @@ class HierarchicalContextAnalyzer(ContextProvider):
                 current_file=file_path,
                 file_content=file_content,
                 imports=analysis.get('imports', []),
-                functions=analysis.get('functions', []),
-                classes=analysis.get('classes', []),
+                functions=_names(analysis.get('functions', [])),
+                classes=_names(analysis.get('classes', [])),
                 recent_changes=git_info.get('recent_changes', []),
                 git_branch=git_info.get('branch'),
                 language=language,
@@ -169,7 +218,7 @@ class HierarchicalContextAnalyzer(ContextProvider):
             
             # Cache the result
             if self.config.get('cache_enabled', True):
-                self.cache[file_path] = (enhanced_context, datetime.utcnow())
+                self.cache[file_path] = (enhanced_context, datetime.utcnow(), _stat_key(file_path))
             
             return enhanced_context
             
@@ -183,16 +232,64 @@ class HierarchicalContextAnalyzer(ContextProvider):
         self, 
         file_path: str, 
         content: str, 
-        language: str
+        language: str,
+        shared_parse: bool = True
     ) -> Dict[str, Any]:
         """Analyze file content based on language"""
+        if language == 'python':
+            return await self._analyze_python_file(file_path, content, shared_parse)
         analyzer = self.analyzers.get(language, self._analyze_generic_file)
         return await analyzer(file_path, content)
+
+    async def _get_file_analysis(
+        self,
+        file_path: str,
+        language: str,
+        with_content: bool = False
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Content (if requested) and analysis of a file, re-read only when its mtime or size changes"""
+        key = _stat_key(file_path)
+        entry = self._file_cache.get(file_path)
+        if entry is not None and entry['key'] == key and entry['language'] == language:
+            self._file_cache.move_to_end(file_path)
+            if entry['content'] is not None or not with_content:
+                self.stats['file_cache_hits'] += 1
+                return entry['content'], entry['analysis']
+
+        content = await asyncio.to_thread(self._read_file, file_path)
+        self.stats['file_reads'] += 1
+        if entry is not None and entry['key'] == key and entry['language'] == language:
+            analysis = entry['analysis']
+        else:
+            # Sibling and dependency files skip the shared parse cache: their small
+            # analysis is cached here, and retaining hundreds of ASTs there makes
+            # every full garbage collection pause the event loop for longer
+            analysis = await self._analyze_file(file_path, content, language, shared_parse=with_content)
+
+        if key is not None:
+            self._file_cache[file_path] = {
+                'key': key,
+                'language': language,
+                'analysis': analysis,
+                # Sibling and dependency files only need their analysis
+                'content': content if with_content else None,
+            }
+            self._file_cache.move_to_end(file_path)
+            while len(self._file_cache) > self._file_cache_size:
+                self._file_cache.popitem(last=False)
+        return content, analysis
     
-    async def _analyze_python_file(self, file_path: str, content: str) -> Dict[str, Any]:
+    async def _analyze_python_file(self, file_path: str, content: str, shared_parse: bool = True) -> Dict[str, Any]:
         """Analyze Python file using AST"""
+        # Parsing large files is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._parse_python_file, file_path, content, shared_parse)
+
+    def _parse_python_file(self, file_path: str, content: str, shared_parse: bool = True) -> Dict[str, Any]:
         try:
-            tree = ast.parse(content, filename=file_path)
+            tree = (
+                analyze_python(content, filename=file_path).tree if shared_parse
+                else ast.parse(content, filename=file_path)
+            )
             
             imports = []
             functions = []
@@ -242,22 +339,18 @@ class HierarchicalContextAnalyzer(ContextProvider):
     
     async def _analyze_javascript_file(self, file_path: str, content: str) -> Dict[str, Any]:
         """Analyze JavaScript/TypeScript file"""
-        try:
-            # Use Node.js parser if available
-            result = subprocess.run(
-                ['node', 'parse_js.mjs', file_path],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            else:
-                return self._fallback_js_analysis(content)
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        # Babel runs in the shared parser pool; regex fallback without node
+        meta = await asyncio.to_thread(parse_js_ts, None, content)
+        if not meta:
             return self._fallback_js_analysis(content)
+
+        chunks = meta.get('chunks', [])
+        return {
+            'imports': list(meta.get('imports_used', [])),
+            'functions': [c.get('name') for c in chunks if c.get('type') == 'function' and c.get('name')],
+            'classes': [c.get('name') for c in chunks if c.get('type') == 'class' and c.get('name')],
+            'patterns': []
+        }
     
     def _fallback_js_analysis(self, content: str) -> Dict[str, Any]:
         """Fallback JavaScript analysis using regex"""
@@ -284,15 +377,14 @@ class HierarchicalContextAnalyzer(ContextProvider):
         shared_imports = defaultdict(int)
         shared_patterns = []
         
-        # Analyze sibling files
-        for file in module_dir.glob(f"*.{base_context.language[:2]}*"):
-            if file.is_file() and str(file) != file_path:
-                module_files.append(str(file))
+        # Analyze sibling files; only new or changed ones are read
+        for file in await self._list_module_files(module_dir, f"*.{base_context.language[:2]}*"):
+            if file != file_path:
+                module_files.append(file)
                 
                 # Quick analysis of sibling files
                 try:
-                    content = self._read_file(str(file))
-                    analysis = await self._analyze_file(str(file), content, base_context.language)
+                    _, analysis = await self._get_file_analysis(file, base_context.language)
                     
                     # Track shared imports
                     for imp in analysis.get('imports', []):
@@ -316,25 +408,65 @@ class HierarchicalContextAnalyzer(ContextProvider):
             'module_type': self._detect_module_type(module_dir.name)
         }
     
+    async def _list_module_files(self, module_dir: Path, pattern: str) -> List[str]:
+        """Files in a directory matching pattern, re-listed only when the directory changes"""
+        key = _stat_key(module_dir)
+        cached = self._dir_cache.get(str(module_dir))
+        if cached is not None and cached[0] == key and cached[1] == pattern:
+            return cached[2]
+
+        def _list() -> List[str]:
+            return sorted(str(f) for f in module_dir.glob(pattern) if f.is_file())
+
+        files = await asyncio.to_thread(_list)
+        self._dir_cache[str(module_dir)] = (key, pattern, files)
+        return files
+
     async def _analyze_project_context(
         self, 
         file_path: str, 
         base_context: CodeContext
     ) -> Dict[str, Any]:
         """Analyze project-level context"""
-        project_root = Path(base_context.project_root) if base_context.project_root else self._find_project_root(file_path)
-        
-        project_info = {
+        project_root = Path(base_context.project_root or self._find_project_root(file_path))
+        return dict(await self._get_project_facts(project_root, base_context.language))
+
+    def _key_lock(self, key: Any) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _get_project_facts(self, project_root: Path, language: str) -> Dict[str, Any]:
+        """Project facts, scanned once per root and language until the root or its manifests change"""
+        cache_key = (str(project_root), language)
+        # Adding or removing top-level files changes the root's mtime
+        token = tuple(_stat_key(project_root / name) for name in ['.', *DEPENDENCY_FILES.get(language, [])])
+        cached = self._project_cache.get(cache_key)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+
+        # Concurrent requests for the same project share one scan
+        async with self._key_lock(cache_key):
+            cached = self._project_cache.get(cache_key)
+            if cached is not None and cached[0] == token:
+                return cached[1]
+            facts = await asyncio.to_thread(self._scan_project, project_root, language)
+            self.stats['project_scans'] += 1
+            self._project_cache[cache_key] = (token, facts)
+            return facts
+
+    def _scan_project(self, project_root: Path, language: str) -> Dict[str, Any]:
+        return {
             'project_root': str(project_root),
-            'project_type': await self._detect_project_type(project_root),
-            'dependencies': await self._get_project_dependencies(project_root, base_context.language),
-            'coding_standards': await self._detect_coding_standards(project_root),
-            'test_framework': await self._detect_test_framework(project_root, base_context.language),
-            'build_system': await self._detect_build_system(project_root),
+            'project_type': self._detect_project_type(project_root),
+            'dependencies': self._get_project_dependencies(project_root, language),
+            'coding_standards': self._detect_coding_standards(project_root),
+            'test_framework': self._detect_test_framework(project_root, language),
+            'test_directories': self._detect_test_directories(project_root),
+            'build_system': self._detect_build_system(project_root),
             'common_patterns': []
         }
-        
-        return project_info
     
     async def _analyze_cross_project_patterns(
         self, 
@@ -383,8 +515,7 @@ class HierarchicalContextAnalyzer(ContextProvider):
             visited.add(path)
             
             try:
-                content = self._read_file(path)
-                analysis = await self._analyze_file(path, content, context.language)
+                _, analysis = await self._get_file_analysis(path, context.language)
                 
                 # Extract file dependencies from imports
                 for imp in analysis.get('imports', []):
@@ -463,10 +594,11 @@ class HierarchicalContextAnalyzer(ContextProvider):
         if file_path not in self.cache:
             return False
             
-        _, cached_time = self.cache[file_path]
+        _, cached_time, file_key = self.cache[file_path]
         ttl = timedelta(seconds=self.config.get('cache_ttl_seconds', 300))
         
-        return datetime.utcnow() - cached_time < ttl
+        # An edited file is re-analyzed even within the TTL
+        return datetime.utcnow() - cached_time < ttl and file_key == _stat_key(file_path)
     
     def _detect_language(self, file_path: str) -> str:
         """Detect programming language from file extension"""
@@ -513,47 +645,127 @@ class HierarchicalContextAnalyzer(ContextProvider):
     async def _get_git_info(self, file_path: str) -> Dict[str, Any]:
         """Get git information for file"""
         try:
-            # Get current branch
-            branch_result = subprocess.run(
-                ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                cwd=os.path.dirname(file_path),
-                capture_output=True,
-                text=True
-            )
-            branch = branch_result.stdout.strip() if branch_result.returncode == 0 else None
-            
-            # Get recent changes
-            recent_changes = []
-            if self.config.get('include_git_history', True):
-                days = self.config.get('git_history_days', 7)
-                log_result = subprocess.run(
-                    ['git', 'log', f'--since={days} days ago', '--pretty=format:%H|%an|%ae|%ad|%s', '--', file_path],
-                    cwd=os.path.dirname(file_path),
-                    capture_output=True,
-                    text=True
-                )
-                
-                if log_result.returncode == 0:
-                    for line in log_result.stdout.strip().split('\n'):
-                        if line:
-                            parts = line.split('|')
-                            if len(parts) >= 5:
-                                recent_changes.append({
-                                    'commit': parts[0],
-                                    'author': parts[1],
-                                    'email': parts[2],
-                                    'date': parts[3],
-                                    'message': parts[4]
-                                })
+            located = self._find_git_dir(Path(file_path).resolve().parent)
+            if located is None:
+                return {}
+            git_root, git_dir = located
+            facts = await self._get_git_facts(git_root, git_dir)
+            relative = Path(os.path.relpath(Path(file_path).resolve(), git_root)).as_posix()
             
             return {
-                'branch': branch,
-                'recent_changes': recent_changes
+                'branch': facts.get('branch'),
+                'recent_changes': list(facts.get('file_changes', {}).get(relative, []))
             }
             
         except Exception as e:
             logger.debug(f"Error getting git info for {file_path}: {e}")
             return {}
+
+    def _find_git_dir(self, directory: Path) -> Optional[Tuple[str, str]]:
+        """(work tree root, git dir) containing directory, or None outside a repository"""
+        key = str(directory)
+        if key in self._git_dirs:
+            return self._git_dirs[key]
+
+        found = None
+        for current in (directory, *directory.parents):
+            dot_git = current / '.git'
+            if dot_git.is_dir():
+                found = (str(current), str(dot_git))
+                break
+            if dot_git.is_file():
+                # Worktrees and submodules: ".git" holds "gitdir: <path>"
+                text = dot_git.read_text(encoding='utf-8', errors='ignore').strip()
+                if text.startswith('gitdir:'):
+                    found = (str(current), str((current / text[len('gitdir:'):].strip()).resolve()))
+                break
+        self._git_dirs[key] = found
+        return found
+
+    async def _get_git_facts(self, git_root: str, git_dir: str) -> Dict[str, Any]:
+        """Branch and recent commits per file, queried once per repository until HEAD moves"""
+        git_path = Path(git_dir)
+        cached = self._git_cache.get(git_root)
+        branch = cached[2].get('branch') if cached else None
+        # HEAD changes on checkout; logs/HEAD and the branch ref on every commit
+        token = (
+            _stat_key(git_path / 'HEAD'),
+            _stat_key(git_path / 'logs' / 'HEAD'),
+            _stat_key(git_path / 'refs' / 'heads' / branch) if branch else None,
+        )
+        ttl = timedelta(seconds=self.config.get('cache_ttl_seconds', 300))
+        if cached is not None and cached[0] == token and datetime.utcnow() - cached[1] < ttl:
+            return cached[2]
+
+        async with self._key_lock(git_root):
+            cached = self._git_cache.get(git_root)
+            if cached is not None and cached[0] == token and datetime.utcnow() - cached[1] < ttl:
+                return cached[2]
+
+            queries = [self._git(git_root, 'rev-parse', '--abbrev-ref', 'HEAD')]
+            if self.config.get('include_git_history', True):
+                days = self.config.get('git_history_days', 7)
+                max_commits = self.config.get('git_history_max_commits', 1000)
+                queries.append(self._git(
+                    git_root, 'log', f'--since={days} days ago', f'--max-count={max_commits}',
+                    '--name-only', _GIT_LOG_FORMAT
+                ))
+            branch_out, *log_out = await asyncio.gather(*queries)
+
+            facts = {
+                'git_root': git_root,
+                'branch': branch_out.strip() if branch_out else None,
+                'file_changes': self._parse_git_log(log_out[0]) if log_out and log_out[0] else {},
+            }
+            # Key on the token for the branch just read so the next commit is noticed
+            token = token[:2] + (
+                _stat_key(git_path / 'refs' / 'heads' / facts['branch']) if facts['branch'] else None,
+            )
+            self._git_cache[git_root] = (token, datetime.utcnow(), facts)
+            return facts
+
+    async def _git(self, cwd: str, *args: str) -> Optional[str]:
+        """Output of a git command, or None if it fails or times out"""
+        self.stats['git_queries'] += 1
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'git', *args,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError as e:
+            logger.debug(f"git unavailable: {e}")
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), self.config.get('git_timeout_seconds', 10))
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.debug(f"git {args[0]} timed out in {cwd}")
+            return None
+        return stdout.decode('utf-8', errors='replace') if proc.returncode == 0 else None
+
+    @staticmethod
+    def _parse_git_log(output: str) -> Dict[str, List[Dict[str, str]]]:
+        """Map each path to the commits that touched it, newest first"""
+        file_changes: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+        for record in output.split('\x1e'):
+            lines = record.strip('\n').split('\n')
+            parts = lines[0].split('\x1f')
+            if len(parts) < 5:
+                continue
+            change = {
+                'commit': parts[0],
+                'author': parts[1],
+                'email': parts[2],
+                'date': parts[3],
+                'message': parts[4]
+            }
+            for path in lines[1:]:
+                if path:
+                    file_changes[path].append(change)
+        return dict(file_changes)
     
     async def _detect_framework(
         self, 
@@ -605,6 +817,13 @@ class HierarchicalContextAnalyzer(ContextProvider):
     
     def _find_project_root(self, file_path: str) -> str:
         """Find project root directory"""
+        directory = str(Path(file_path).parent)
+        root = self._project_roots.get(directory)
+        if root is None:
+            root = self._project_roots[directory] = self._search_project_root(file_path)
+        return root
+
+    def _search_project_root(self, file_path: str) -> str:
         markers = [
             '.git', 'package.json', 'requirements.txt', 'setup.py',
             'pom.xml', 'build.gradle', 'go.mod', 'Cargo.toml',
@@ -702,7 +921,7 @@ class HierarchicalContextAnalyzer(ContextProvider):
         
         return None
     
-    async def _detect_project_type(self, project_root: Path) -> str:
+    def _detect_project_type(self, project_root: Path) -> str:
         """Detect project type from structure and files"""
         # Check for microservice indicators
         if (project_root / 'Dockerfile').exists() or (project_root / 'docker-compose.yml').exists():
@@ -723,20 +942,11 @@ class HierarchicalContextAnalyzer(ContextProvider):
         
         return 'application'
     
-    async def _get_project_dependencies(self, project_root: Path, language: str) -> List[str]:
+    def _get_project_dependencies(self, project_root: Path, language: str) -> List[str]:
         """Get project dependencies based on language"""
         dependencies = []
         
-        dependency_files = {
-            'python': ['requirements.txt', 'Pipfile', 'pyproject.toml', 'setup.py'],
-            'javascript': ['package.json'],
-            'typescript': ['package.json'],
-            'java': ['pom.xml', 'build.gradle'],
-            'go': ['go.mod'],
-            'rust': ['Cargo.toml'],
-        }
-        
-        for dep_file in dependency_files.get(language, []):
+        for dep_file in DEPENDENCY_FILES.get(language, []):
             dep_path = project_root / dep_file
             if dep_path.exists():
                 try:
@@ -758,7 +968,7 @@ class HierarchicalContextAnalyzer(ContextProvider):
         
         return dependencies
     
-    async def _detect_coding_standards(self, project_root: Path) -> Dict[str, Any]:
+    def _detect_coding_standards(self, project_root: Path) -> Dict[str, Any]:
         """Detect coding standards and linting configuration"""
         standards = {}
         
@@ -784,7 +994,7 @@ class HierarchicalContextAnalyzer(ContextProvider):
         
         return standards
     
-    async def _detect_test_framework(self, project_root: Path, language: str) -> Optional[str]:
+    def _detect_test_framework(self, project_root: Path, language: str) -> Optional[str]:
         """Detect testing framework in use"""
         test_indicators = {
             'python': {
@@ -809,14 +1019,34 @@ class HierarchicalContextAnalyzer(ContextProvider):
         for framework, files in indicators.items():
             for file_pattern in files:
                 if '*' in file_pattern:
-                    if list(project_root.rglob(file_pattern)):
+                    if self._find_first(project_root, file_pattern):
                         return framework
                 elif (project_root / file_pattern).exists():
                     return framework
         
         return None
+
+    def _find_first(self, project_root: Path, pattern: str, max_dirs: int = 5000) -> Optional[str]:
+        """First file matching pattern, skipping hidden, vendored and build directories"""
+        visited = 0
+        for current, dirs, files in os.walk(project_root):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in _SKIP_DIRS]
+            for name in files:
+                if fnmatch.fnmatch(name, pattern):
+                    return os.path.join(current, name)
+            visited += 1
+            if visited >= max_dirs:
+                break
+        return None
+
+    def _detect_test_directories(self, project_root: Path) -> List[str]:
+        """Top-level and src-level directories that hold tests"""
+        names = ('tests', 'test', '__tests__', 'spec', 'testing')
+        candidates = [project_root / name for name in names]
+        candidates += [project_root / 'src' / name for name in names]
+        return [str(c.relative_to(project_root)) for c in candidates if c.is_dir()]
     
-    async def _detect_build_system(self, project_root: Path) -> Optional[str]:
+    def _detect_build_system(self, project_root: Path) -> Optional[str]:
         """Detect build system in use"""
         build_files = {
             'npm': 'package.json',
@@ -0,0 +1,158 @@
+"""
+SQLite store for SessionTracker.
+
+File events are appended to an ``events`` table; each session keeps one
+small snapshot row (timestamps, counters, open files) that is upserted when
+its events are flushed. Nothing is rewritten per event, and loading the
+active sessions is one indexed query instead of reading every session file.
+``compact()`` trims each session to its newest events and drops sessions
+past the retention window.
+
+All methods are blocking; SessionTracker calls them through
+``asyncio.to_thread``.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+def _ts(value: datetime) -> float:
+    return value.timestamp()
+
+
+class SessionStore:
+    """Append-only session event log with per-session snapshots"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                last_activity REAL NOT NULL,
+                interaction_count INTEGER NOT NULL DEFAULT 0,
+                current_files TEXT NOT NULL DEFAULT '[]'
+            );
+            CREATE INDEX IF NOT EXISTS sessions_by_activity ON sessions (last_activity);
+            CREATE TABLE IF NOT EXISTS events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                change_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                metadata TEXT NOT NULL DEFAULT '{}'
+            );
+            CREATE INDEX IF NOT EXISTS events_by_session ON events (session_id, seq);
+            """
+        )
+        self._db.commit()
+
+    def write(self, events: Iterable[Dict[str, Any]], sessions: Iterable[Dict[str, Any]]) -> None:
+        """Append events and upsert session snapshots in one transaction"""
+        event_rows = [
+            (e["session_id"], e["file_path"], e["change_type"], e["timestamp"],
+             json.dumps(e.get("metadata") or {}, default=str))
+            for e in events
+        ]
+        session_rows = [
+            (s["id"], _ts(s["started_at"]), _ts(s["last_activity"]), s["interaction_count"],
+             json.dumps(sorted(s["current_files"])))
+            for s in sessions
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO events (session_id, file_path, change_type, timestamp, metadata)"
+                " VALUES (?, ?, ?, ?, ?)",
+                event_rows,
+            )
+            self._db.executemany(
+                "INSERT INTO sessions (id, started_at, last_activity, interaction_count, current_files)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(id) DO UPDATE SET last_activity = excluded.last_activity,"
+                " interaction_count = excluded.interaction_count, current_files = excluded.current_files",
+                session_rows,
+            )
+
+    def load_active(self, since: datetime, history_limit: int) -> List[Dict[str, Any]]:
+        """Sessions active since the given time, oldest activity first, with their newest events"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, started_at, last_activity, interaction_count, current_files FROM sessions"
+                " WHERE last_activity >= ? ORDER BY last_activity",
+                (_ts(since),),
+            ).fetchall()
+            sessions = []
+            for session_id, started_at, last_activity, interactions, current_files in rows:
+                history = self._db.execute(
+                    "SELECT file_path, change_type, timestamp, metadata FROM events"
+                    " WHERE session_id = ? ORDER BY seq DESC LIMIT ?",
+                    (session_id, history_limit),
+                ).fetchall()
+                sessions.append({
+                    "id": session_id,
+                    "started_at": datetime.fromtimestamp(started_at, timezone.utc),
+                    "last_activity": datetime.fromtimestamp(last_activity, timezone.utc),
+                    "interaction_count": interactions,
+                    "current_files": set(json.loads(current_files)),
+                    "file_history": [
+                        {"file_path": f, "change_type": c, "timestamp": t, "metadata": json.loads(m)}
+                        for f, c, t, m in reversed(history)
+                    ],
+                })
+        return sessions
+
+    def delete_session(self, session_id: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM events WHERE session_id = ?", (session_id,))
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def compact(self, history_limit: int, retain_since: datetime) -> Dict[str, int]:
+        """Keep the newest history_limit events per session; drop sessions idle since before retain_since"""
+        with self._lock, self._db:
+            expired = self._db.execute(
+                "DELETE FROM sessions WHERE last_activity < ?", (_ts(retain_since),)
+            ).rowcount
+            orphaned = self._db.execute(
+                "DELETE FROM events WHERE session_id NOT IN (SELECT id FROM sessions)"
+            ).rowcount
+            trimmed = self._db.execute(
+                "DELETE FROM events WHERE seq IN (SELECT seq FROM ("
+                " SELECT seq, ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY seq DESC) AS n FROM events"
+                ") WHERE n > ?)",
+                (history_limit,),
+            ).rowcount
+        return {"expired_sessions": expired, "deleted_events": orphaned + trimmed}
+
+    def import_json_sessions(self, directory: Path) -> int:
+        """Move legacy session_<id>.json files into the store"""
+        imported = 0
+        for session_file in Path(directory).glob("session_*.json"):
+            try:
+                with open(session_file, "r") as f:
+                    data = json.load(f)
+                data["started_at"] = datetime.fromisoformat(data["started_at"])
+                data["last_activity"] = datetime.fromisoformat(data["last_activity"])
+                events = [dict(entry, session_id=data["id"]) for entry in data.get("file_history", [])]
+                self.write(events, [data])
+                session_file.unlink()
+                imported += 1
+            except Exception as e:
+                logger.warning(f"Could not import session file {session_file}: {e}")
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
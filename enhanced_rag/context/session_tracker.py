@@ -1,14 +1,23 @@
 """
 Session tracking for maintaining context across interactions
+
+With ``storage_path`` configured, sessions persist to a SQLite store in that
+directory. File events are buffered and written in batches off the event
+loop (after ``flush_interval_seconds`` or ``flush_batch_size`` events), the
+store is compacted every ``compact_interval_seconds``, and only sessions that
+are still active are loaded, on first use.
 """
 
+import asyncio
 import logging
+import time
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timezone
-from collections import defaultdict
-import json
+from datetime import datetime, timedelta, timezone
+from collections import Counter, OrderedDict, defaultdict, deque
 from pathlib import Path
 
+from .session_store import SessionStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,20 +28,35 @@ class SessionTracker:
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
-        self.sessions: Dict[str, Dict[str, Any]] = {}
-        self.file_access_history: Dict[str, List[Tuple[str, datetime]]] = defaultdict(list)
+        # Ordered by last activity, least recent first
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.file_access_counts: Counter = Counter()
         self.interaction_count: Dict[str, int] = defaultdict(int)
+        # Sum of (last_activity - started_at) over self.sessions
+        self._total_duration_seconds = 0.0
 
         # Configuration
         self.max_history_size = self.config.get('max_history_size', 100)
         self.session_timeout_minutes = self.config.get('session_timeout_minutes', 30)
+        self.flush_interval_seconds = self.config.get('flush_interval_seconds', 2.0)
+        self.flush_batch_size = self.config.get('flush_batch_size', 100)
+        self.compact_interval_seconds = self.config.get('compact_interval_seconds', 300)
+        self.retention_days = self.config.get('session_retention_days', 30)
 
-        # Persistence path (optional)
+        # Persistence (optional)
+        self.store: Optional[SessionStore] = None
         self.storage_path = self.config.get('storage_path')
         if self.storage_path:
             self.storage_path = Path(self.storage_path)
-            self.storage_path.mkdir(parents=True, exist_ok=True)
-            self._load_sessions()
+            self.store = SessionStore(self.storage_path / "sessions.sqlite")
+
+        self._loaded = self.store is None
+        self._pending_events: List[Dict[str, Any]] = []
+        self._dirty_sessions: set = set()
+        self._flush_timer_armed = False
+        self._last_compaction = time.monotonic()
+        self._io_lock: Optional[asyncio.Lock] = None
+        self._tasks: set = set()
 
     async def track_file_change(
         self,
@@ -51,22 +75,25 @@ class SessionTracker:
             metadata: Additional metadata about the change
         """
         try:
+            await self._ensure_loaded()
+            now = datetime.now(timezone.utc)
+
             # Initialize session if needed
-            if session_id not in self.sessions:
-                self.sessions[session_id] = {
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = self._add_session({
                     'id': session_id,
-                    'started_at': datetime.now(timezone.utc),
-                    'last_activity': datetime.now(timezone.utc),
+                    'started_at': now,
+                    'last_activity': now,
                     'file_history': [],
                     'current_files': set(),
                     'interaction_count': 0
-                }
-
-            session = self.sessions[session_id]
-            session['last_activity'] = datetime.now(timezone.utc)
+                })
+            else:
+                self._touch(session, now)
 
             # Track file access
-            self.file_access_history[file_path].append((session_id, datetime.now(timezone.utc)))
+            self.file_access_counts[file_path] += 1
 
             # Update current files
             if change_type == 'open':
@@ -74,25 +101,24 @@ class SessionTracker:
             elif change_type == 'close':
                 session['current_files'].discard(file_path)
 
-            # Add to history
-            session['file_history'].append({
+            # Add to history; the deque drops the oldest entries beyond max_history_size
+            entry = {
                 'file_path': file_path,
                 'change_type': change_type,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'timestamp': now.isoformat(),
                 'metadata': metadata or {}
-            })
-
-            # Trim history if too large
-            if len(session['file_history']) > self.max_history_size:
-                session['file_history'] = session['file_history'][-self.max_history_size:]
+            }
+            session['file_history'].append(entry)
 
             # Increment interaction count
             session['interaction_count'] += 1
             self.interaction_count[session_id] += 1
 
-            # Persist if configured
-            if self.storage_path:
-                await self._save_session(session_id)
+            # Buffer for the next batched write
+            if self.store:
+                self._pending_events.append(dict(entry, session_id=session_id))
+                self._dirty_sessions.add(session_id)
+                self._schedule_flush()
 
         except Exception as e:
             logger.error(f"Error tracking file change: {e}")
@@ -107,6 +133,7 @@ class SessionTracker:
         Returns:
             Session context including current files and history
         """
+        await self._ensure_loaded()
         if session_id not in self.sessions:
             return {
                 'exists': False,
@@ -137,16 +164,20 @@ class SessionTracker:
         Returns:
             Statistics about all sessions
         """
+        await self._ensure_loaded()
         await self._cleanup_expired_sessions()
 
-        active_sessions = [
-            s for s in self.sessions.values()
-            if (datetime.now(timezone.utc) - s['last_activity']).total_seconds() < self.session_timeout_minutes * 60
-        ]
+        # Sessions are ordered by activity, so count back from the most recent
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=self.session_timeout_minutes)
+        active_sessions = 0
+        for session in reversed(self.sessions.values()):
+            if session['last_activity'] <= cutoff:
+                break
+            active_sessions += 1
 
         return {
             'total_sessions': len(self.sessions),
-            'active_sessions': len(active_sessions),
+            'active_sessions': active_sessions,
             'total_interactions': sum(self.interaction_count.values()),
             'most_accessed_files': self._get_most_accessed_files(),
             'average_session_duration': self._calculate_average_duration()
@@ -199,102 +230,126 @@ class SessionTracker:
 
     def _get_most_accessed_files(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get the most frequently accessed files across all sessions"""
-        file_counts = defaultdict(int)
-
-        for file_path, accesses in self.file_access_history.items():
-            file_counts[file_path] = len(accesses)
-
-        # Sort by count and return top files
-        sorted_files = sorted(file_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_files[:limit]
+        return self.file_access_counts.most_common(limit)
 
     def _calculate_average_duration(self) -> float:
         """Calculate average session duration in minutes"""
         if not self.sessions:
             return 0.0
-
-        total_duration = 0
-        for session in self.sessions.values():
-            duration = (session['last_activity'] - session['started_at']).total_seconds() / 60
-            total_duration += duration
-
-        return total_duration / len(self.sessions)
+        return self._total_duration_seconds / 60 / len(self.sessions)
+
+    def _add_session(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        session['file_history'] = deque(session['file_history'], maxlen=self.max_history_size)
+        self.sessions[session['id']] = session
+        self.interaction_count[session['id']] = session.get('interaction_count', 0)
+        self._total_duration_seconds += (session['last_activity'] - session['started_at']).total_seconds()
+        return session
+
+    def _touch(self, session: Dict[str, Any], now: datetime) -> None:
+        self._total_duration_seconds += (now - session['last_activity']).total_seconds()
+        session['last_activity'] = now
+        self.sessions.move_to_end(session['id'])
+
+    def _remove_session(self, session_id: str) -> None:
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self._total_duration_seconds -= (session['last_activity'] - session['started_at']).total_seconds()
+        self.interaction_count.pop(session_id, None)
 
     async def _cleanup_expired_sessions(self) -> None:
         """Remove sessions that have been inactive for too long"""
-        current_time = datetime.now(timezone.utc)
-        expired_sessions = []
-
-        for session_id, session in self.sessions.items():
-            inactive_minutes = (current_time - session['last_activity']).total_seconds() / 60
-            if inactive_minutes > self.session_timeout_minutes * 2:  # Double timeout for cleanup
-                expired_sessions.append(session_id)
-
-        for session_id in expired_sessions:
-            del self.sessions[session_id]
-            if session_id in self.interaction_count:
-                del self.interaction_count[session_id]
-
-    async def _save_session(self, session_id: str) -> None:
-        """Save session to disk"""
-        if not self.storage_path:
+        # Double timeout for cleanup; the oldest sessions are at the front
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=self.session_timeout_minutes * 2)
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session['last_activity'] >= cutoff:
+                break
+            self._remove_session(session_id)
+
+    def _lock(self) -> asyncio.Lock:
+        # Created on first use so the tracker can be built outside an event loop
+        if self._io_lock is None:
+            self._io_lock = asyncio.Lock()
+        return self._io_lock
+
+    async def _ensure_loaded(self) -> None:
+        """Load sessions that are still active from the store, once"""
+        if self._loaded:
             return
-
-        try:
-            session = self.sessions.get(session_id)
-            if not session:
+        async with self._lock():
+            if self._loaded:
                 return
-
-            # Convert sets to lists for JSON serialization
-            session_data = session.copy()
-            session_data['current_files'] = list(session_data['current_files'])
-
-            # Convert datetime objects to ISO format
-            session_data['started_at'] = session_data['started_at'].isoformat()
-            session_data['last_activity'] = session_data['last_activity'].isoformat()
-
-            # Save to file
-            session_file = self.storage_path / f"session_{session_id}.json"
-            with open(session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
-
-        except Exception as e:
-            logger.error(f"Error saving session {session_id}: {e}")
-
-    def _load_sessions(self) -> None:
-        """Load sessions from disk"""
-        if not self.storage_path or not self.storage_path.exists():
+            try:
+                imported = await asyncio.to_thread(self.store.import_json_sessions, self.storage_path)
+                if imported:
+                    logger.info(f"Imported {imported} legacy session files")
+                since = datetime.now(timezone.utc) - timedelta(minutes=self.session_timeout_minutes * 2)
+                for session in await asyncio.to_thread(self.store.load_active, since, self.max_history_size):
+                    self._add_session(session)
+            except Exception as e:
+                logger.error(f"Error loading sessions: {e}")
+            self._loaded = True
+
+    def _schedule_flush(self) -> None:
+        if len(self._pending_events) >= self.flush_batch_size:
+            self._spawn(self.flush())
+        elif not self._flush_timer_armed:
+            self._flush_timer_armed = True
+            self._spawn(self._flush_later())
+
+    def _spawn(self, coro) -> None:
+        # Keep a reference so pending writes are not garbage collected
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval_seconds)
+        self._flush_timer_armed = False
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered events and session snapshots; compact the store when due"""
+        if not self.store:
             return
-
-        try:
-            for session_file in self.storage_path.glob("session_*.json"):
-                with open(session_file, 'r') as f:
-                    session_data = json.load(f)
-
-                # Convert ISO format back to datetime
-                session_data['started_at'] = datetime.fromisoformat(session_data['started_at'])
-                session_data['last_activity'] = datetime.fromisoformat(session_data['last_activity'])
-
-                # Convert lists back to sets
-                session_data['current_files'] = set(session_data['current_files'])
-
-                session_id = session_data['id']
-                self.sessions[session_id] = session_data
-                self.interaction_count[session_id] = session_data.get('interaction_count', 0)
-
-        except Exception as e:
-            logger.error(f"Error loading sessions: {e}")
+        async with self._lock():
+            events, self._pending_events = self._pending_events, []
+            snapshots = [
+                {key: self.sessions[sid][key] for key in ('id', 'started_at', 'last_activity', 'interaction_count')}
+                | {'current_files': list(self.sessions[sid]['current_files'])}
+                for sid in self._dirty_sessions if sid in self.sessions
+            ]
+            self._dirty_sessions = set()
+            compact = time.monotonic() - self._last_compaction >= self.compact_interval_seconds
+            try:
+                if events or snapshots:
+                    await asyncio.to_thread(self.store.write, events, snapshots)
+                if compact:
+                    self._last_compaction = time.monotonic()
+                    retain_since = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+                    result = await asyncio.to_thread(self.store.compact, self.max_history_size, retain_since)
+                    logger.debug(f"Compacted session store: {result}")
+            except Exception as e:
+                logger.error(f"Error saving sessions: {e}")
+
+    async def close(self) -> None:
+        """Flush pending writes and close the store"""
+        if not self.store:
+            return
+        await self.flush()
+        for task in list(self._tasks):
+            task.cancel()
+        self.store.close()
+        self.store = None
 
     async def clear_session(self, session_id: str) -> None:
         """Clear a specific session"""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-
-        if session_id in self.interaction_count:
-            del self.interaction_count[session_id]
+        await self._ensure_loaded()
+        self._remove_session(session_id)
 
         # Remove from storage if exists
-        if self.storage_path:
-            session_file = self.storage_path / f"session_{session_id}.json"
-            if session_file.exists():
-                session_file.unlink()
+        if self.store:
+            async with self._lock():
+                self._pending_events = [e for e in self._pending_events if e['session_id'] != session_id]
+                self._dirty_sessions.discard(session_id)
+                await asyncio.to_thread(self.store.delete_session, session_id)
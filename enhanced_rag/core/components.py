@@ -0,0 +1,217 @@
+"""
+Process-wide registry of shared RAG components.
+
+Retrievers, rankers, context analyzers and the pipeline built from them are
+expensive: each owns HTTP pools, caches and an embedding provider. The
+registry constructs each component once, on first use, and hands the same
+instance to every consumer, so MCP tools share one pipeline and its warm
+caches instead of building their own.
+
+Factories receive the registry and resolve their dependencies through it,
+which keeps construction lazy all the way down. ``report()`` lists what was
+built and how long each piece took.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import Config, get_config
+
+logger = logging.getLogger(__name__)
+
+Factory = Callable[["ComponentRegistry"], Any]
+
+
+def _section(config: Config, name: str) -> Dict[str, Any]:
+    section = getattr(config, name, None)
+    if section is None:
+        return {}
+    return section if isinstance(section, dict) else section.model_dump()
+
+
+def _hybrid_searcher(registry: "ComponentRegistry") -> Any:
+    # The retriever already owns one; reuse it so there is one embedder and HTTP pool
+    searcher = getattr(registry.get("retriever"), "hybrid_searcher", None)
+    if searcher is not None:
+        return searcher
+    from ..retrieval.hybrid_searcher import HybridSearcher
+    return HybridSearcher(registry.config.model_dump())
+
+
+def _pipeline(registry: "ComponentRegistry") -> Any:
+    from ..pipeline import RAGPipeline
+    return RAGPipeline(registry.config, components=registry)
+
+
+def _default_factories() -> Dict[str, Factory]:
+    # Imports stay inside the factories so unused components cost nothing
+    def context_analyzer(r):
+        from ..context.hierarchical_context import HierarchicalContextAnalyzer
+        return HierarchicalContextAnalyzer(_section(r.config, "context"))
+
+    def query_enhancer(r):
+        from ..semantic.query_enhancer import ContextualQueryEnhancer
+        return ContextualQueryEnhancer(_section(r.config, "retrieval"))
+
+    def intent_classifier(r):
+        from ..semantic.intent_classifier import IntentClassifier
+        return IntentClassifier(_section(r.config, "retrieval"))
+
+    def retriever(r):
+        from ..retrieval.multi_stage_pipeline import MultiStageRetriever
+        return MultiStageRetriever(_section(r.config, "retrieval"))
+
+    def embedding_provider(r):
+        return getattr(r.get("hybrid_searcher"), "embedder", None)
+
+    def ranker(r):
+        from ..ranking.contextual_ranker_improved import ImprovedContextualRanker
+        return ImprovedContextualRanker(_section(r.config, "ranking"))
+
+    def ranking_monitor(r):
+        from ..ranking.ranking_monitor import RankingMonitor
+        return RankingMonitor()
+
+    def result_explainer(r):
+        from ..ranking.result_explainer import ResultExplainer
+        return ResultExplainer(_section(r.config, "ranking"))
+
+    def response_generator(r):
+        from ..generation.response_generator import ResponseGenerator
+        return ResponseGenerator({})
+
+    return {
+        "context_analyzer": context_analyzer,
+        "query_enhancer": query_enhancer,
+        "intent_classifier": intent_classifier,
+        "retriever": retriever,
+        "hybrid_searcher": _hybrid_searcher,
+        "embedding_provider": embedding_provider,
+        "ranker": ranker,
+        "ranking_monitor": ranking_monitor,
+        "result_explainer": result_explainer,
+        "response_generator": response_generator,
+        "pipeline": _pipeline,
+    }
+
+
+class ComponentRegistry:
+    """Lazily constructed, shared components keyed by name"""
+
+    def __init__(self, config: Optional[Config] = None, factories: Optional[Dict[str, Factory]] = None):
+        self._config = config
+        self._factories: Dict[str, Factory] = _default_factories()
+        self._factories.update(factories or {})
+        self._instances: Dict[str, Any] = {}
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Re-entrant: factories resolve their dependencies while holding the lock
+        self._lock = threading.RLock()
+        self._building: List[str] = []
+
+    @property
+    def config(self) -> Config:
+        if self._config is None:
+            self._config = get_config()
+        return self._config
+
+    def register(self, name: str, factory: Factory) -> None:
+        """Set the factory for name; an instance already built is kept"""
+        with self._lock:
+            self._factories[name] = factory
+
+    def provide(self, name: str, instance: Any) -> None:
+        """Use a pre-built instance for name"""
+        with self._lock:
+            self._instances[name] = instance
+            self._records[name] = {"type": type(instance).__name__, "seconds": 0.0,
+                                   "self_seconds": 0.0, "provided": True, "uses": 0}
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def get(self, name: str) -> Any:
+        """Shared instance for name, constructing it (and its dependencies) on first use"""
+        instance = self._instances.get(name)
+        if instance is not None or name in self._instances:
+            self._records[name]["uses"] += 1
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                self._records[name]["uses"] += 1
+                return self._instances[name]
+            factory = self._factories.get(name)
+            if factory is None:
+                raise KeyError(f"No component registered as '{name}'")
+            if name in self._building:
+                raise RuntimeError(f"Circular component dependency: {' -> '.join(self._building + [name])}")
+
+            self._building.append(name)
+            started = time.perf_counter()
+            nested_before = self._nested_seconds()
+            try:
+                instance = factory(self)
+            except Exception as e:
+                self._records[name] = {"error": str(e), "seconds": round(time.perf_counter() - started, 4)}
+                raise
+            finally:
+                self._building.pop()
+            seconds = time.perf_counter() - started
+            # Exclude time spent building dependencies for the first time
+            self_seconds = seconds - (self._nested_seconds() - nested_before)
+
+            self._instances[name] = instance
+            self._records[name] = {
+                "type": type(instance).__name__,
+                "seconds": round(seconds, 4),
+                "self_seconds": round(self_seconds, 4),
+                "uses": 1,
+            }
+            logger.debug("Built component %s in %.3fs", name, seconds)
+            return instance
+
+    def get_optional(self, name: str) -> Optional[Any]:
+        """Like get, but logs and returns None when construction fails"""
+        try:
+            return self.get(name)
+        except Exception as e:
+            logger.warning("Component %s unavailable: %s", name, e)
+            return None
+
+    def _nested_seconds(self) -> float:
+        return sum(r.get("self_seconds", 0.0) for r in self._records.values())
+
+    def report(self) -> Dict[str, Any]:
+        """What was constructed, in build order, with timings and reuse counts"""
+        with self._lock:
+            components = {name: dict(record) for name, record in self._records.items()}
+            pending = sorted(set(self._factories) - set(self._records))
+        return {
+            "components": components,
+            "built": sum(1 for r in components.values() if "error" not in r),
+            "total_seconds": round(sum(r.get("self_seconds", 0.0) for r in components.values()), 4),
+            "not_built": pending,
+        }
+
+    def clear(self) -> None:
+        """Forget built instances; factories stay registered"""
+        with self._lock:
+            self._instances.clear()
+            self._records.clear()
+
+
+_component_registry: Optional[ComponentRegistry] = None
+_component_registry_lock = threading.Lock()
+
+
+def get_component_registry() -> ComponentRegistry:
+    """Get the process-wide component registry"""
+    global _component_registry
+    if _component_registry is None:
+        with _component_registry_lock:
+            if _component_registry is None:
+                _component_registry = ComponentRegistry()
+    return _component_registry
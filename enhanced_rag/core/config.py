@@ -5,11 +5,13 @@ Centralizes all configuration with environment variable support
 
 import logging
 import os
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, Dict, Optional, List, TYPE_CHECKING
 from pydantic import BaseModel, Field
 from pathlib import Path
 import json
 
+from ..utils.deadline import DEFAULT_BUDGET_SHARES
+
 if TYPE_CHECKING:
     from typing import Self
 else:
@@ -112,6 +114,26 @@ class RetrievalConfig(BaseModel):
     include_dependencies: bool = Field(default=True)
     dependency_depth: int = Field(default=2)
 
+    # Keyword stage query variants. "fanout" sends the variants concurrently,
+    # "or" sends a single request with the variants OR'd together.
+    keyword_variant_mode: str = Field(default="fanout")
+    keyword_max_variants: int = Field(default=3)
+    # "max" keeps each id's best score across variants, "first" keeps the
+    # hit from the earliest variant that returned it
+    keyword_merge_policy: str = Field(default="max")
+    keyword_stage_timeout_ms: int = Field(default=3000)
+    # Per-intent overrides of the keyword_* settings above, keyed by intent
+    # value, e.g. {"debug": {"keyword_max_variants": 1}}
+    keyword_intent_overrides: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    # Per-request HTTP timeouts for the other retrieval stages; the keyword
+    # stage uses keyword_stage_timeout_ms
+    stage_timeouts_ms: Dict[str, int] = Field(default_factory=lambda: {
+        "semantic": 4000,
+        "vector": 4000,
+        "hydrate": 3000,
+    })
+
 
 class RankingConfig(BaseModel):
     """Result ranking configuration"""
@@ -169,6 +191,15 @@ class PerformanceConfig(BaseModel):
     log_slow_queries: bool = Field(default=True)
     slow_query_threshold_ms: int = Field(default=1000)
 
+    # Deadline-aware scheduling: how a request's deadline_ms is split across
+    # phases, and adaptive stage timeouts of p95 * multiplier within bounds
+    deadline_budget_shares: Dict[str, float] = Field(
+        default_factory=lambda: dict(DEFAULT_BUDGET_SHARES)
+    )
+    stage_timeout_p95_multiplier: float = Field(default=1.5)
+    stage_timeout_min_ms: int = Field(default=50)
+    stage_timeout_max_ms: int = Field(default=5000)
+
 
 class Config(BaseModel):
     """Main configuration container"""
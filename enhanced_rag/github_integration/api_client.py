@@ -6,14 +6,17 @@ Thin wrapper around GitHub REST API with retry logic and authentication
 import os
 import time
 import base64
+import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+import tempfile
+from typing import List, Dict, Optional, Any, AsyncIterator, IO, Mapping, Tuple
 try:
     import requests
     from requests.structures import CaseInsensitiveDict
 except ImportError:
     raise ImportError("requests package required for GitHub API access. "
                       "Install with: pip install requests")
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,15 +26,51 @@ logger = logging.getLogger(__name__)
 # Default network timeout (seconds) for outbound HTTP requests
 DEFAULT_HTTP_TIMEOUT = 10
 
+DEFAULT_API_URL = "https://api.github.com"
+
+# Archives up to this size stay in memory while they are read
+_ARCHIVE_SPOOL_BYTES = 64 * 1024 * 1024
+
+# Longest wait for a primary rate-limit reset before giving up on a request
+_MAX_RATE_LIMIT_WAIT = 60.0
+
+_RETRIABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def _is_rate_limited(status_code: int, headers: Mapping[str, str]) -> bool:
+    """403/429 responses caused by GitHub's primary or secondary rate limits"""
+    if status_code == 429:
+        return True
+    return status_code == 403 and (
+        headers.get("x-ratelimit-remaining") == "0" or "retry-after" in headers
+    )
+
+
+def _retry_delay(headers: Mapping[str, str], attempt: int, backoff: float) -> float:
+    """Seconds to wait before retrying, honouring Retry-After and rate-limit reset"""
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_RATE_LIMIT_WAIT)
+        except ValueError:
+            pass
+    if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+        try:
+            return min(max(0.0, float(headers["x-ratelimit-reset"]) - time.time()), _MAX_RATE_LIMIT_WAIT)
+        except ValueError:
+            pass
+    return backoff * (2 ** (attempt - 1))
+
 
 class GitHubClient:
     """GitHub API client with retry logic and authentication support."""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, api_url: Optional[str] = None):
         """Initialize GitHub client.
 
         Args:
             token: GitHub personal access token (optional, uses GITHUB_TOKEN env var if not provided)
+            api_url: API base URL (optional, uses GITHUB_API_URL env var or api.github.com)
         """
         # Check for network disabled environment
         if os.getenv("CODEX_SANDBOX_NETWORK_DISABLED") == "1":
@@ -42,7 +81,10 @@ class GitHubClient:
             self.network_disabled = False
 
         self.github_token = token or os.getenv("GITHUB_TOKEN")
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
         self.headers = {"Accept": "application/vnd.github.v3+json"}
+        # API requests issued, including retries
+        self.request_count = 0
 
         # Only add Authorization header if token is present
         if self.github_token:
@@ -57,17 +99,19 @@ class GitHubClient:
         *,
         max_retries: int = 3,
         backoff: float = 1.0,
+        stream: bool = False,
     ) -> requests.Response:
         """Simple exponential-backoff wrapper around requests.get.
 
         Respects GitHub's primary rate-limit headers. Retries 3× by default
-        on 429/5xx responses.
+        on 429/5xx responses and rate-limited 403s.
 
         Args:
             url: URL to fetch
             params: Query parameters
             max_retries: Maximum number of retry attempts
             backoff: Initial backoff delay in seconds
+            stream: Leave the body unread for iter_content
 
         Returns:
             Response object
@@ -87,12 +131,14 @@ class GitHubClient:
 
         last_error = None
         for attempt in range(1, max_retries + 1):
+            self.request_count += 1
             try:
                 resp = requests.get(
                     url,
                     headers=self.headers,
                     params=params,
                     timeout=DEFAULT_HTTP_TIMEOUT,
+                    stream=stream,
                 )
             except requests.exceptions.Timeout as e:
                 last_error = e
@@ -117,10 +163,12 @@ class GitHubClient:
             if resp.status_code < 400:
                 return resp
 
-            # On 429 or 5xx we back-off and retry
-            if resp.status_code in {429, 500, 502, 503, 504} and attempt < max_retries:
-                wait = backoff * (2 ** (attempt - 1))
+            # On 429, 5xx or a rate-limited 403 we back-off and retry
+            retriable = resp.status_code in _RETRIABLE_STATUS or _is_rate_limited(resp.status_code, resp.headers)
+            if retriable and attempt < max_retries:
+                wait = _retry_delay(resp.headers, attempt, backoff)
                 logger.warning(f"HTTP {resp.status_code}, retrying in {wait}s...")
+                resp.close()
                 time.sleep(wait)
                 continue
 
@@ -150,7 +198,7 @@ class GitHubClient:
         Returns:
             List of content items
         """
-        url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+        url = f"{self.api_url}/repos/{owner}/{repo}/contents/{path}"
         params = {"ref": ref}
 
         response = self._get_with_retry(url, params=params)
@@ -174,7 +222,7 @@ class GitHubClient:
         Returns:
             File metadata including base64-encoded content
         """
-        url = f"https://api.github.com/repos/{owner}/{repo}/contents/{file_path}"
+        url = f"{self.api_url}/repos/{owner}/{repo}/contents/{file_path}"
         params = {"ref": ref}
 
         response = self._get_with_retry(url, params=params)
@@ -221,18 +269,164 @@ class GitHubClient:
         Returns:
             List of changed file paths
         """
-        url = f"https://api.github.com/repos/{owner}/{repo}/compare/{before_sha}...{after_sha}"
+        return [
+            file["filename"]
+            for file in self.compare_commit_files(owner, repo, before_sha, after_sha)
+            # Only include non-removed files
+            if file["status"] != "removed"
+        ]
+
+    def compare_commit_files(
+        self,
+        owner: str,
+        repo: str,
+        before_sha: str,
+        after_sha: str
+    ) -> List[Dict[str, Any]]:
+        """Compare two commits and get the changed file entries.
+
+        Each entry carries filename, status, the new blob sha and, for
+        renames, previous_filename. GitHub lists at most 300 files.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            before_sha: Base commit SHA
+            after_sha: Head commit SHA
+
+        Returns:
+            List of changed file entries
+        """
+        url = f"{self.api_url}/repos/{owner}/{repo}/compare/{before_sha}...{after_sha}"
         response = self._get_with_retry(url)
+        return response.json().get("files", [])
 
-        compare_data = response.json()
-        changed_files = []
+    def get_tree(self, owner: str, repo: str, ref: str = "main") -> Dict[str, Any]:
+        """Get the full git tree of a ref in one request.
 
-        for file in compare_data.get("files", []):
-            # Only include non-removed files
-            if file["status"] != "removed":
-                changed_files.append(file["filename"])
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Git ref (branch, tag, or commit SHA)
 
-        return changed_files
+        Returns:
+            Tree with "tree" entries (path, type, sha, size) and a
+            "truncated" flag set when GitHub could not return every entry
+        """
+        url = f"{self.api_url}/repos/{owner}/{repo}/git/trees/{ref}"
+        response = self._get_with_retry(url, params={"recursive": "1"})
+        return response.json()
+
+    def download_archive(self, owner: str, repo: str, ref: str = "main") -> IO[bytes]:
+        """Download a ref as a gzipped tarball in one request.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Git ref (branch, tag, or commit SHA)
+
+        Returns:
+            Seekable file positioned at the start of the archive; the caller closes it
+        """
+        url = f"{self.api_url}/repos/{owner}/{repo}/tarball/{ref}"
+        archive = tempfile.SpooledTemporaryFile(max_size=_ARCHIVE_SPOOL_BYTES)
+        response = self._get_with_retry(url, stream=True)
+        try:
+            for block in response.iter_content(chunk_size=1 << 20):
+                archive.write(block)
+        except Exception:
+            archive.close()
+            raise
+        finally:
+            response.close()
+        archive.seek(0)
+        return archive
+
+    async def _aget_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        *,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+    ) -> httpx.Response:
+        """Async counterpart of _get_with_retry"""
+        for attempt in range(1, max_retries + 1):
+            self.request_count += 1
+            try:
+                resp = await client.get(url)
+            except httpx.TransportError as e:
+                if attempt < max_retries:
+                    wait = backoff * (2 ** (attempt - 1))
+                    logger.warning(f"Request error: {e}, retrying in {wait}s...")
+                    await asyncio.sleep(wait)
+                    continue
+                raise
+
+            if resp.status_code < 400:
+                return resp
+
+            retriable = resp.status_code in _RETRIABLE_STATUS or _is_rate_limited(resp.status_code, resp.headers)
+            if retriable and attempt < max_retries:
+                wait = _retry_delay(resp.headers, attempt, backoff)
+                logger.warning(f"HTTP {resp.status_code}, retrying in {wait}s...")
+                await asyncio.sleep(wait)
+                continue
+
+            resp.raise_for_status()
+        raise httpx.HTTPError(f"Failed to get {url} after {max_retries} attempts")
+
+    async def afetch_blobs(
+        self,
+        owner: str,
+        repo: str,
+        entries: List[Dict[str, Any]],
+        concurrency: int = 8
+    ) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Fetch file contents by blob SHA, several requests at a time.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            entries: Tree or compare entries with "path" and "sha"
+            concurrency: Requests in flight at once
+
+        Yields:
+            (path, content) in completion order; content is None when the fetch failed
+        """
+        if self.network_disabled or not entries:
+            return
+
+        pending = list(entries)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, concurrency) * 2)
+        done = object()
+
+        async with httpx.AsyncClient(headers=self.headers, timeout=DEFAULT_HTTP_TIMEOUT) as client:
+            async def worker() -> None:
+                while pending:
+                    entry = pending.pop()
+                    url = f"{self.api_url}/repos/{owner}/{repo}/git/blobs/{entry['sha']}"
+                    try:
+                        blob = (await self._aget_with_retry(client, url)).json()
+                        content = base64.b64decode(blob.get("content", ""))
+                    except Exception as e:
+                        logger.error(f"Failed to fetch {entry['path']}: {e}")
+                        content = None
+                    await queue.put((entry["path"], content))
+                await queue.put(done)
+
+            workers = [asyncio.create_task(worker()) for _ in range(min(max(1, concurrency), len(pending)))]
+            remaining = len(workers)
+            try:
+                while remaining:
+                    item = await queue.get()
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    yield item
+            finally:
+                for task in workers:
+                    task.cancel()
 
     def list_pull_request_files(
         self,
@@ -250,7 +444,7 @@ class GitHubClient:
         Returns:
             List of changed file paths
         """
-        url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/files"
+        url = f"{self.api_url}/repos/{owner}/{repo}/pulls/{pr_number}/files"
         response = self._get_with_retry(url)
 
         files = []
@@ -35,6 +35,8 @@ def cmd_index_repo(args):
     logger.info(f"   Repository: {result['repository']}")
     logger.info(f"   Files processed: {result['files_processed']}")
     logger.info(f"   Chunks indexed: {result['chunks_indexed']}")
+    logger.info(f"   Files unchanged: {result.get('incremental', {}).get('files_unchanged', 0)}")
+    logger.info(f"   GitHub requests: {result['github_requests']}")
     if result['errors'] > 0:
         logger.warning(f"   Errors: {result['errors']}")
     
@@ -49,7 +51,8 @@ def cmd_index_files(args):
     result = indexer.index_changed_files_remote(
         owner=args.owner,
         repo=args.repo,
-        file_paths=args.files
+        file_paths=args.files,
+        ref=args.ref
     )
     
     logger.info(f"✅ Indexing completed:")
@@ -154,6 +157,12 @@ def main():
         required=True,
         help='File paths to index (e.g., src/main.py lib/utils.js)'
     )
+    files_parser.add_argument(
+        '--ref',
+        type=str,
+        default='main',
+        help='Git ref to read the files from'
+    )
     
     # index-pr command
     pr_parser = subparsers.add_parser(
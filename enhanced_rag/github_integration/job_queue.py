@@ -0,0 +1,416 @@
+"""Durable, coalescing job queue for webhook-driven indexing.
+
+Webhook events become rows in a small SQLite database (by default
+``~/.mcprag/webhook_jobs.sqlite``) and are executed by a pool of async
+workers, so a restart loses nothing: jobs that were running are put back
+in the queue on startup.
+
+Events are coalesced while they wait. Pushes to the same repository and
+branch fold into one pending job spanning the first ``before`` to the last
+``after`` commit, with the union of the paths they touched; a full index of
+that branch absorbs pending pushes; pull request events fold per PR number.
+Jobs of one repository run one at a time, in order, while different
+repositories are indexed in parallel. Failed jobs are retried with
+exponential back-off before they are marked failed.
+
+Environment:
+    WEBHOOK_QUEUE_PATH          override the queue database location
+    WEBHOOK_JOB_MAX_ATTEMPTS    attempts before a job is marked failed (default: 5)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ZERO_SHA = "0" * 40
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Retry delay after the n-th failure: base * 2**(n-1), capped
+_RETRY_BASE_SECONDS = 5.0
+_RETRY_MAX_SECONDS = 600.0
+
+# Finished jobs kept for /status latency figures
+_KEEP_FINISHED = 1000
+
+
+def default_queue_path() -> Path:
+    override = os.getenv("WEBHOOK_QUEUE_PATH")
+    if override:
+        return Path(override)
+    return Path.home() / ".mcprag" / "webhook_jobs.sqlite"
+
+
+def retry_delay(attempts: int) -> float:
+    return min(_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)), _RETRY_MAX_SECONDS)
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+@dataclass
+class IndexJob:
+    """One queued unit of indexing work"""
+    id: int
+    repository: str
+    ref: str
+    kind: str  # "push", "full" or "pull_request"
+    before_sha: Optional[str]
+    after_sha: Optional[str]
+    pr_number: Optional[int]
+    paths: List[str] = field(default_factory=list)
+    events: int = 1
+    attempts: int = 0
+    enqueued_at: float = 0.0
+
+
+_COLUMNS = "id, repository, ref, kind, before_sha, after_sha, pr_number, paths, events, attempts, enqueued_at"
+
+
+def _job(row: Tuple[Any, ...]) -> IndexJob:
+    values = list(row)
+    values[7] = json.loads(values[7] or "[]")
+    return IndexJob(*values)
+
+
+class IndexJobQueue:
+    """SQLite-backed queue of index jobs with coalescing and per-repository ordering"""
+
+    def __init__(self, path: Optional[str] = None, max_attempts: Optional[int] = None):
+        self.path = str(path or default_queue_path())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts or int(os.getenv("WEBHOOK_JOB_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                repository TEXT NOT NULL,
+                ref TEXT NOT NULL,
+                coalesce_key TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                before_sha TEXT,
+                after_sha TEXT,
+                pr_number INTEGER,
+                paths TEXT NOT NULL DEFAULT '[]',
+                events INTEGER NOT NULL DEFAULT 1,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                result TEXT,
+                enqueued_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, next_attempt_at);
+            CREATE INDEX IF NOT EXISTS jobs_by_key ON jobs (repository, coalesce_key, status);
+            """
+        )
+        self._db.commit()
+        self._counters = {"events": 0, "coalesced": 0, "recovered": self.recover()}
+
+    # ----- enqueue -----
+
+    def enqueue_push(
+        self,
+        repository: str,
+        ref: str,
+        before_sha: str,
+        after_sha: str,
+        paths: Iterable[str] = ()
+    ) -> Tuple[int, bool]:
+        """Queue a push; a push creating the branch becomes a full index.
+
+        Returns:
+            (job id, whether the event was folded into a pending job)
+        """
+        kind = "full" if not before_sha or before_sha == ZERO_SHA else "push"
+        return self._enqueue(repository, ref, ref, kind, before_sha, after_sha, None, paths)
+
+    def enqueue_full(self, repository: str, ref: str, sha: Optional[str] = None) -> Tuple[int, bool]:
+        """Queue a full index of a branch"""
+        return self._enqueue(repository, ref, ref, "full", None, sha, None, ())
+
+    def enqueue_pull_request(
+        self,
+        repository: str,
+        pr_number: int,
+        head_sha: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """Queue indexing of a pull request's changed files at its head commit"""
+        key = f"pull/{pr_number}"
+        return self._enqueue(repository, key, key, "pull_request", None, head_sha, pr_number, ())
+
+    def _enqueue(
+        self,
+        repository: str,
+        ref: str,
+        key: str,
+        kind: str,
+        before_sha: Optional[str],
+        after_sha: Optional[str],
+        pr_number: Optional[int],
+        paths: Iterable[str]
+    ) -> Tuple[int, bool]:
+        now = time.time()
+        new_paths = set(paths)
+        with self._lock:
+            self._counters["events"] += 1
+            row = self._db.execute(
+                "SELECT id, kind, before_sha, paths FROM jobs"
+                " WHERE repository = ? AND coalesce_key = ? AND status = 'pending' ORDER BY id LIMIT 1",
+                (repository, key),
+            ).fetchone()
+            if row is None:
+                cur = self._db.execute(
+                    "INSERT INTO jobs (repository, ref, coalesce_key, kind, before_sha, after_sha, pr_number,"
+                    " paths, enqueued_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (repository, ref, key, kind, before_sha, after_sha, pr_number,
+                     json.dumps(sorted(new_paths)), now, now),
+                )
+                self._db.commit()
+                return cur.lastrowid, False
+
+            job_id, pending_kind, pending_before, pending_paths = row
+            # A full index covers any pushes folded into it
+            merged_kind = "full" if "full" in (kind, pending_kind) else pending_kind
+            merged_paths = sorted(set(json.loads(pending_paths)) | new_paths) if merged_kind != "full" else []
+            self._db.execute(
+                "UPDATE jobs SET kind = ?, before_sha = ?, after_sha = COALESCE(?, after_sha), ref = ?,"
+                " paths = ?, events = events + 1, updated_at = ? WHERE id = ?",
+                (merged_kind, pending_before if merged_kind == "push" else None, after_sha, ref,
+                 json.dumps(merged_paths), now, job_id),
+            )
+            self._db.commit()
+            self._counters["coalesced"] += 1
+            return job_id, True
+
+    # ----- worker side -----
+
+    def claim(self) -> Optional[IndexJob]:
+        """Mark the oldest runnable job running and return it.
+
+        A job is runnable when its retry time has passed and no job of the
+        same repository is running or queued ahead of it.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM jobs AS j"
+                " WHERE status = 'pending' AND next_attempt_at <= ?"
+                " AND NOT EXISTS (SELECT 1 FROM jobs AS o WHERE o.repository = j.repository"
+                "   AND (o.status = 'running' OR (o.status = 'pending' AND o.id < j.id)))"
+                " ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (now, row[0]),
+            )
+            self._db.commit()
+        job = _job(row)
+        job.attempts += 1
+        return job
+
+    def complete(self, job_id: int, result: Optional[Dict[str, Any]] = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, updated_at = ?, last_error = NULL, result = ?"
+                " WHERE id = ?",
+                (now, now, json.dumps(result or {}, default=str), job_id),
+            )
+            self._prune()
+            self._db.commit()
+
+    def fail(self, job_id: int, error: str) -> str:
+        """Record a failed attempt; returns the job's new status, "pending" or "failed" """
+        now = time.time()
+        with self._lock:
+            attempts = self._db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            if attempts < self.max_attempts:
+                status, next_attempt_at, finished_at = "pending", now + retry_delay(attempts), None
+            else:
+                status, next_attempt_at, finished_at = "failed", 0.0, now
+            self._db.execute(
+                "UPDATE jobs SET status = ?, next_attempt_at = ?, finished_at = ?, updated_at = ?, last_error = ?"
+                " WHERE id = ?",
+                (status, next_attempt_at, finished_at, now, error[:2000], job_id),
+            )
+            self._db.commit()
+        return status
+
+    def recover(self) -> int:
+        """Requeue jobs left running by a previous process"""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE jobs SET status = 'pending', next_attempt_at = 0 WHERE status = 'running'"
+            )
+            self._db.commit()
+        if cur.rowcount:
+            logger.info("Requeued %d interrupted index jobs", cur.rowcount)
+        return cur.rowcount
+
+    def next_wakeup(self) -> Optional[float]:
+        """Seconds until the earliest delayed retry becomes runnable"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE status = 'pending' AND next_attempt_at > ?",
+                (time.time(),),
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def _prune(self) -> None:
+        self._db.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND id NOT IN"
+            " (SELECT id FROM jobs WHERE status IN ('done', 'failed') ORDER BY id DESC LIMIT ?)",
+            (_KEEP_FINISHED,),
+        )
+
+    # ----- reporting -----
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth, job latency and retry state for /status"""
+        now = time.time()
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(enqueued_at) FROM jobs WHERE status = 'pending'"
+            ).fetchone()[0]
+            finished = self._db.execute(
+                "SELECT finished_at - enqueued_at, finished_at - started_at, events FROM jobs"
+                " WHERE status = 'done' ORDER BY finished_at DESC LIMIT 200"
+            ).fetchall()
+            retrying = self._db.execute(
+                "SELECT id, repository, ref, kind, attempts, next_attempt_at, last_error FROM jobs"
+                " WHERE status = 'pending' AND attempts > 0 ORDER BY next_attempt_at LIMIT 20"
+            ).fetchall()
+            failed = self._db.execute(
+                "SELECT id, repository, ref, kind, attempts, last_error FROM jobs"
+                " WHERE status = 'failed' ORDER BY finished_at DESC LIMIT 20"
+            ).fetchall()
+        latency = [r[0] for r in finished]
+        runtime = [r[1] for r in finished if r[1] is not None]
+        return {
+            "depth": counts.get("pending", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "oldest_pending_seconds": round(now - oldest, 3) if oldest else 0.0,
+            "events_received": self._counters["events"],
+            "events_coalesced": self._counters["coalesced"],
+            "jobs_recovered": self._counters["recovered"],
+            "latency_seconds": {"p50": _percentile(latency, 0.5), "p95": _percentile(latency, 0.95)},
+            "run_seconds": {"p50": _percentile(runtime, 0.5), "p95": _percentile(runtime, 0.95)},
+            "events_per_job": round(sum(r[2] for r in finished) / len(finished), 2) if finished else None,
+            "retrying": [
+                {"id": r[0], "repository": r[1], "ref": r[2], "kind": r[3], "attempts": r[4],
+                 "retry_in_seconds": round(max(0.0, r[5] - now), 1), "error": r[6]}
+                for r in retrying
+            ],
+            "failed_jobs": [
+                {"id": r[0], "repository": r[1], "ref": r[2], "kind": r[3], "attempts": r[4], "error": r[5]}
+                for r in failed
+            ],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+JobHandler = Callable[[IndexJob], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class IndexJobWorkerPool:
+    """Async workers draining an IndexJobQueue"""
+
+    def __init__(self, queue: IndexJobQueue, handler: JobHandler, workers: int = 5, poll_interval: float = 1.0):
+        self.queue = queue
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.active = 0
+        self.peak_active = 0
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    def notify(self) -> None:
+        """Wake idle workers after an enqueue"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self) -> None:
+        # Workers also check the flag, so a cancellation lost in a race can't keep one alive
+        if self._stopping is not None:
+            self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                await self._idle()
+                continue
+
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            try:
+                result = await self.handler(job)
+            except asyncio.CancelledError:
+                # Left running in the database; recover() requeues it on restart
+                raise
+            except Exception as e:
+                status = await asyncio.to_thread(self.queue.fail, job.id, str(e))
+                logger.warning("Index job %s for %s failed (attempt %d, now %s): %s",
+                               job.id, job.repository, job.attempts, status, e)
+            else:
+                await asyncio.to_thread(self.queue.complete, job.id, result)
+            finally:
+                self.active -= 1
+            # A finished job may unblock the next one of its repository
+            self.notify()
+
+    async def _idle(self) -> None:
+        timeout = self.poll_interval
+        delayed = await asyncio.to_thread(self.queue.next_wakeup)
+        if delayed is not None:
+            timeout = min(timeout, delayed)
+        self._wakeup.clear()
+        waiters = {asyncio.ensure_future(self._wakeup.wait()), asyncio.ensure_future(self._stopping.wait())}
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "active": self.active, "peak_active": self.peak_active}
@@ -1,30 +1,58 @@
 """
 Remote Repository Indexer
 Indexes GitHub repositories without local checkout using the GitHub API
+
+A run reads the repository's git tree in one request and compares each
+file's blob SHA with the remote manifest (see azure_integration.manifest),
+so unchanged files are never downloaded. Changed files come from a single
+tarball when there are many of them, or from concurrent blob requests
+otherwise. Downloads, parsing, embedding and upload are pipelined: files are
+chunked as they arrive and documents stream through the batched embedder
+into DataAutomation.bulk_upload.
+
+Environment:
+    MCP_GITHUB_FETCH_CONCURRENCY  blob requests in flight at once (default: 8)
+    MCP_GITHUB_ARCHIVE_THRESHOLD  changed files at which the tarball is
+                                  downloaded instead of blobs (default: 50)
 """
 
 import os
+import asyncio
 import hashlib
 import logging
 import json
-from typing import List, Dict, Any, Optional
+import tarfile
+from typing import List, Dict, Any, Optional, AsyncIterator, IO, Iterable, Iterator, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
-try:
-    from azure.search.documents import SearchClient
-    from azure.core.credentials import AzureKeyCredential
-except ImportError:
-    raise ImportError("azure-search-documents package required for remote indexing. "
-                      "Install with: pip install azure-search-documents")
-
 from enhanced_rag.core.config import get_config
 from enhanced_rag.azure_integration.embedding_provider import AzureOpenAIEmbeddingProvider
+from enhanced_rag.azure_integration.rest import AzureSearchClient, SearchOperations
+from enhanced_rag.azure_integration.automation.data_manager import DataAutomation
+from enhanced_rag.azure_integration.automation.embedding_manager import EmbeddingAutomation, embedding_identity
+from enhanced_rag.azure_integration.manifest import RemoteIncrementalSync, incremental_enabled
 from enhanced_rag.code_understanding import CodeChunker
 from .api_client import GitHubClient
 
 logger = logging.getLogger(__name__)
 
+CODE_EXTENSIONS = (".py", ".js", ".ts")
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_ARCHIVE_THRESHOLD = 50
+
+# The compare API lists at most this many files
+_COMPARE_FILE_LIMIT = 300
+
+
+def is_code_file(path: str) -> bool:
+    return path.endswith(CODE_EXTENSIONS)
+
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA git assigns to a blob with this content"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
 
 def get_document_byte_size(doc: Dict[str, Any]) -> int:
     """Calculate the byte size of a document when serialized to JSON.
@@ -84,17 +112,9 @@ class RemoteIndexer:
         self.admin_key = config.azure.admin_key
         self.index_name = config.azure.index_name or "codebase-mcp-sota"
 
-        # Create search client
         if self.network_disabled:
             logger.warning("Network is disabled (CODEX_SANDBOX_NETWORK_DISABLED=1). "
                           "Azure Search operations will be stubbed.")
-            self.search_client = None  # Will be checked in methods
-        else:
-            self.search_client = SearchClient(
-                endpoint=self.endpoint,
-                index_name=self.index_name,
-                credential=AzureKeyCredential(self.admin_key)
-            )
 
         # Initialize embedding provider based on config
         self.provider = None
@@ -110,18 +130,12 @@ class RemoteIndexer:
         # Initialize code chunker
         self.chunker = CodeChunker()
 
-        self.batch_size = 50
+        self.fetch_concurrency = max(1, int(os.getenv("MCP_GITHUB_FETCH_CONCURRENCY", DEFAULT_FETCH_CONCURRENCY)))
+        self.archive_threshold = max(1, int(os.getenv("MCP_GITHUB_ARCHIVE_THRESHOLD", DEFAULT_ARCHIVE_THRESHOLD)))
         self.logger = logging.getLogger(__name__)
 
-        # Determine if integrated vectorization is configured on target index
-        self._integrated_vectors = False
-        try:
-            from azure.search.documents.indexes import SearchIndexClient
-            idx_client = SearchIndexClient(endpoint=self.endpoint, credential=AzureKeyCredential(self.admin_key))
-            idx = idx_client.get_index(self.index_name)
-            self._integrated_vectors = bool(getattr(idx, "vector_search", None) and getattr(idx.vector_search, "vectorizers", None))
-        except Exception:
-            self._integrated_vectors = False
+        # Whether the index vectorizes server-side; resolved on first run
+        self._integrated_vectors: Optional[bool] = None
 
     def index_remote_repository(
         self,
@@ -139,124 +153,41 @@ class RemoteIndexer:
         Returns:
             Summary of indexing results
         """
-        self.logger.info(f"🔄 Indexing remote repository: {owner}/{repo} (ref: {ref})")
-
-        # Get all code files
-        files = self.github_client.get_repository_files(
-            owner, repo, ref=ref,
-            extensions=[".py", ".js", ".ts"]
-        )
+        return asyncio.run(self.aindex_remote_repository(owner, repo, ref))
 
-        self.logger.info(f"📁 Found {len(files)} code files to index")
-
-        documents = []
-        indexed_count = 0
-        error_count = 0
+    async def aindex_remote_repository(
+        self,
+        owner: str,
+        repo: str,
+        ref: str = "main"
+    ) -> Dict[str, Any]:
+        """Async form of index_remote_repository.
 
-        for file_info in files:
-            try:
-                # Get file content
-                content = self.github_client.get_file_content(
-                    owner, repo, file_info["path"], ref
-                )
-
-                # Determine language and chunk
-                if file_info["name"].endswith(".py"):
-                    chunks = self.chunker.chunk_python_file(content, file_info["path"])
-                    language = "python"
-                elif file_info["name"].endswith((".js", ".ts")):
-                    chunks = self.chunker.chunk_js_ts_file(content, file_info["path"])
-                    language = "javascript" if file_info["name"].endswith(".js") else "typescript"
-                else:
-                    continue
+        Files whose blob SHA matches the manifest are skipped, and chunks of
+        files that no longer exist at ref are deleted from the index.
+        """
+        self.logger.info(f"🔄 Indexing remote repository: {owner}/{repo} (ref: {ref})")
+        requests_before = self.github_client.request_count
 
-                # Create documents for each chunk
-                for i, chunk in enumerate(chunks):
-                    doc_id = self._generate_document_id(
-                        f"{owner}/{repo}", file_info["path"], chunk["chunk_type"], i
-                    )
+        tree = await asyncio.to_thread(self.github_client.get_tree, owner, repo, ref)
+        if tree.get("truncated"):
+            # Too many entries for one tree response; hash the tarball contents instead
+            self.logger.info("Git tree truncated; reading %s/%s from the tarball", owner, repo)
+            return await self._index_files(owner, repo, ref, None, full_tree=True, requests_before=requests_before)
 
-                    raw_content = chunk["content"]
-                    # Enforce 32k char limit for safety
-                    content = raw_content[:31997] + "..." if isinstance(raw_content, str) and len(raw_content) > 32000 else raw_content
-                    doc = {
-                        "id": doc_id,
-                        "repository": f"{owner}/{repo}",
-                        "file_path": file_info["path"],
-                        "file_name": Path(file_info["path"]).name,
-                        "language": language,
-                        "last_modified": datetime.utcnow().isoformat() + "+00:00",
-                        "content": content,
-                        "semantic_context": chunk["semantic_context"],
-                        "signature": chunk["signature"],
-                        "imports": chunk["imports"],
-                        "dependencies": chunk["dependencies"],
-                        "chunk_type": chunk["chunk_type"],
-                        "start_line": chunk["start_line"],
-                        "end_line": chunk["end_line"],
-                        "function_name": chunk.get("function_name"),
-                        "class_name": chunk.get("class_name"),
-                        "docstring": chunk.get("docstring", "")
-                    }
-                    if content is not raw_content:
-                        doc["truncated"] = True
-
-                    # Add vector embedding if enabled
-                    if self.provider and not self._integrated_vectors:
-                        embedding = self.provider.generate_code_embedding(
-                            chunk["content"], chunk["semantic_context"]
-                        )
-                        if embedding:
-                            doc["content_vector"] = embedding
-                        else:
-                            self.logger.warning(
-                                f"Failed to generate embedding for {file_info['path']}"
-                            )
-
-                    # Safety check: Azure Search has 16MB payload limit per batch
-                    # Keep individual documents well below this (use 1MB as safe limit)
-                    doc_size = get_document_byte_size(doc)
-                    if doc_size > 1024 * 1024:  # 1MB in bytes
-                        # Truncate content to fit within size limit
-                        content = doc.get("content", "")
-                        if content:
-                            # Estimate how much to truncate (rough approximation)
-                            truncate_ratio = (1024 * 1024 * 0.8) / doc_size  # Target 80% of 1MB
-                            truncate_chars = int(len(content) * truncate_ratio)
-                            doc["content"] = content[:truncate_chars] + "\n... (truncated for size)"
-
-                    documents.append(doc)
-
-                    # Upload in batches
-                    if len(documents) >= self.batch_size:
-                        self._upload_documents(documents)
-                        indexed_count += len(documents)
-                        documents = []
-
-            except Exception as e:
-                self.logger.error(f"Error processing {file_info['path']}: {e}")
-                error_count += 1
-
-        # Upload remaining documents
-        if documents:
-            self._upload_documents(documents)
-            indexed_count += len(documents)
-
-        self.logger.info(f"✅ Indexed {indexed_count} chunks from {owner}/{repo}")
-
-        return {
-            "repository": f"{owner}/{repo}",
-            "ref": ref,
-            "files_processed": len(files),
-            "chunks_indexed": indexed_count,
-            "errors": error_count
-        }
+        entries = [
+            entry for entry in tree.get("tree", [])
+            if entry.get("type") == "blob" and is_code_file(entry.get("path", ""))
+        ]
+        self.logger.info(f"📁 Found {len(entries)} code files in the tree")
+        return await self._index_files(owner, repo, ref, entries, full_tree=True, requests_before=requests_before)
 
     def index_changed_files_remote(
         self,
         owner: str,
         repo: str,
-        file_paths: List[str]
+        file_paths: List[str],
+        ref: str = "main"
     ) -> Dict[str, Any]:
         """Index specific changed files from a remote repository.
 
@@ -264,105 +195,337 @@ class RemoteIndexer:
             owner: Repository owner
             repo: Repository name
             file_paths: List of file paths to index
+            ref: Git ref the files are read from
 
         Returns:
             Summary of indexing results
         """
-        self.logger.info(f"🔄 Indexing {len(file_paths)} changed files from {owner}/{repo}")
+        return asyncio.run(self.aindex_changed_files_remote(owner, repo, file_paths, ref))
 
-        documents = []
-        indexed_count = 0
-        error_count = 0
+    async def aindex_changed_files_remote(
+        self,
+        owner: str,
+        repo: str,
+        file_paths: List[str],
+        ref: str = "main"
+    ) -> Dict[str, Any]:
+        """Async form of index_changed_files_remote.
+
+        Blob SHAs come from one tree request; listed files missing at ref
+        are treated as deleted.
+        """
+        wanted = {path for path in file_paths if is_code_file(path)}
+        self.logger.info(f"🔄 Indexing {len(wanted)} changed files from {owner}/{repo}")
+        if not wanted:
+            return self._summary(f"{owner}/{repo}", ref, {})
+        requests_before = self.github_client.request_count
+
+        tree = await asyncio.to_thread(self.github_client.get_tree, owner, repo, ref)
+        entries = [
+            entry for entry in tree.get("tree", [])
+            if entry.get("type") == "blob" and entry.get("path") in wanted
+        ]
+        removed = [] if tree.get("truncated") else sorted(wanted - {e["path"] for e in entries})
+        return await self._index_files(owner, repo, ref, entries, removed=removed, requests_before=requests_before)
+
+    def index_push(
+        self,
+        owner: str,
+        repo: str,
+        before_sha: str,
+        after_sha: str
+    ) -> Dict[str, Any]:
+        """Index only the blobs a push changed.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            before_sha: Commit before the push
+            after_sha: Commit after the push
+
+        Returns:
+            Summary of indexing results
+        """
+        return asyncio.run(self.aindex_push(owner, repo, before_sha, after_sha))
 
-        for file_path in file_paths:
-            # Skip non-code files
-            if not any(file_path.endswith(ext) for ext in [".py", ".js", ".ts"]):
+    async def aindex_push(
+        self,
+        owner: str,
+        repo: str,
+        before_sha: str,
+        after_sha: str
+    ) -> Dict[str, Any]:
+        """Async form of index_push.
+
+        The compare API supplies each changed file's new blob SHA, so only
+        those blobs are fetched; removed and renamed-away files are deleted.
+        Pushes beyond the compare API's file limit fall back to a tree diff.
+        """
+        requests_before = self.github_client.request_count
+        files = await asyncio.to_thread(
+            self.github_client.compare_commit_files, owner, repo, before_sha, after_sha
+        )
+        if len(files) >= _COMPARE_FILE_LIMIT:
+            self.logger.info("Push to %s/%s changed %d+ files; diffing the full tree", owner, repo, len(files))
+            return await self.aindex_remote_repository(owner, repo, after_sha)
+
+        entries: List[Dict[str, Any]] = []
+        removed: List[str] = []
+        for file in files:
+            path = file.get("filename", "")
+            previous = file.get("previous_filename")
+            if previous and is_code_file(previous):
+                removed.append(previous)
+            if not is_code_file(path):
                 continue
+            if file.get("status") == "removed":
+                removed.append(path)
+            elif file.get("sha"):
+                entries.append({"path": path, "sha": file["sha"], "size": file.get("size", 0)})
+        self.logger.info(f"🔄 Push to {owner}/{repo}: {len(entries)} changed and {len(removed)} removed code files")
+        return await self._index_files(owner, repo, after_sha, entries, removed=removed, requests_before=requests_before)
+
+    async def _index_files(
+        self,
+        owner: str,
+        repo: str,
+        ref: str,
+        entries: Optional[List[Dict[str, Any]]],
+        removed: Iterable[str] = (),
+        full_tree: bool = False,
+        requests_before: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Fetch, parse, embed and upload the given tree entries as one pipeline.
 
-            try:
-                # Get file content
-                content = self.github_client.get_file_content(owner, repo, file_path)
-
-                # Determine language and chunk
-                if file_path.endswith(".py"):
-                    chunks = self.chunker.chunk_python_file(content, file_path)
-                    language = "python"
-                elif file_path.endswith((".js", ".ts")):
-                    chunks = self.chunker.chunk_js_ts_file(content, file_path)
-                    language = "javascript" if file_path.endswith(".js") else "typescript"
+        Args:
+            entries: Tree entries (path, sha, size) to index, or None to
+                read every code file from the tarball
+            removed: Paths whose chunks should be deleted
+            full_tree: entries cover the whole repository, so manifest
+                files not among them were deleted
+            requests_before: GitHub request count when the run started
+        """
+        repository = f"{owner}/{repo}"
+        counters: Dict[str, Any] = {"files_processed": 0, "errors": 0}
+        if requests_before is None:
+            requests_before = self.github_client.request_count
+        sync = RemoteIncrementalSync.open(self.index_name, repository) if incremental_enabled() else None
+
+        try:
+            if sync is not None:
+                if not self.network_disabled:
+                    # The embedding setup and index identity decide which blobs count as unchanged
+                    async with AzureSearchClient(endpoint=self.endpoint, api_key=self.admin_key) as client:
+                        ops = SearchOperations(client)
+                        await sync.check_index(ops)
+                        if self.provider and not await self._uses_integrated_vectors(ops):
+                            sync.embedding = embedding_identity(self.provider, ["semantic_context"])
+                for path in removed:
+                    sync.mark_deleted(path)
+
+            if entries is None:
+                counters["fetch"] = "archive"
+                files = self._archive_files(owner, repo, ref, None, sync)
+            else:
+                changed = [
+                    e for e in entries
+                    if sync is None or sync.needs_blob(e["path"], e["sha"], e.get("size", 0))
+                ]
+                counters["files_changed"] = len(changed)
+                if len(changed) >= self.archive_threshold:
+                    counters["fetch"] = "archive"
+                    files = self._archive_files(owner, repo, ref, {e["path"] for e in changed}, None)
                 else:
+                    counters["fetch"] = "blobs"
+                    files = self.github_client.afetch_blobs(owner, repo, changed, self.fetch_concurrency)
+
+            if self.network_disabled:
+                self.logger.warning("Network is disabled; skipping document upload.")
+                return self._summary(repository, ref, counters)
+
+            async with AzureSearchClient(endpoint=self.endpoint, api_key=self.admin_key) as client:
+                ops = SearchOperations(client)
+                documents = self._document_stream(repository, files, sync, counters)
+
+                embedding = None
+                if self.provider and not await self._uses_integrated_vectors(ops):
+                    embedding = EmbeddingAutomation(ops, self.provider)
+                    documents = embedding.enrich_document_stream(
+                        documents,
+                        context_fields=["semantic_context"],
+                        stats=counters.setdefault("embedding", {}),
+                    )
+                    if sync is not None:
+                        documents = sync.embedded_stream(documents)
+
+                result = await DataAutomation(ops).bulk_upload(self.index_name, documents)
+                counters["chunks_indexed"] = result.get("succeeded", 0)
+                counters["upload_failures"] = result.get("failed", 0)
+
+                if sync is not None:
+                    await sync.apply_deletions(ops, include_vanished=full_tree)
+                    sync.commit(result)
+                    counters["incremental"] = sync.summary()
+                if embedding is not None:
+                    self.logger.info("Embedding stats: %s", await embedding.get_embedding_stats())
+        finally:
+            if sync is not None:
+                sync.close()
+
+        counters["github_requests"] = self.github_client.request_count - requests_before
+        summary = self._summary(repository, ref, counters)
+        self.logger.info(
+            f"✅ Indexed {summary['chunks_indexed']} chunks from {summary['files_processed']} files "
+            f"of {repository} with {summary['github_requests']} GitHub requests"
+        )
+        return summary
+
+    @staticmethod
+    def _summary(repository: str, ref: str, counters: Dict[str, Any]) -> Dict[str, Any]:
+        return dict({"repository": repository, "ref": ref, "chunks_indexed": 0,
+                     "files_processed": 0, "errors": 0, "github_requests": 0}, **counters)
+
+    async def _uses_integrated_vectors(self, ops: SearchOperations) -> bool:
+        if self._integrated_vectors is None:
+            try:
+                index = await ops.get_index(self.index_name)
+                self._integrated_vectors = bool((index.get("vectorSearch") or {}).get("vectorizers"))
+            except Exception:
+                self._integrated_vectors = False
+        return self._integrated_vectors
+
+    async def _archive_files(
+        self,
+        owner: str,
+        repo: str,
+        ref: str,
+        wanted: Optional[Set[str]],
+        sync: Optional[RemoteIncrementalSync]
+    ) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Stream code files out of the repository tarball.
+
+        Only paths in wanted are read; with wanted=None every code file is
+        hashed and checked against sync instead.
+        """
+        archive = await asyncio.to_thread(self.github_client.download_archive, owner, repo, ref)
+        try:
+            members = self._iter_archive(archive, wanted, sync)
+            while True:
+                item = await asyncio.to_thread(next, members, None)
+                if item is None:
+                    break
+                yield item
+        finally:
+            archive.close()
+
+    @staticmethod
+    def _iter_archive(
+        archive: IO[bytes],
+        wanted: Optional[Set[str]],
+        sync: Optional[RemoteIncrementalSync]
+    ) -> Iterator[Tuple[str, bytes]]:
+        with tarfile.open(fileobj=archive, mode="r|gz") as tar:
+            for member in tar:
+                if not member.isfile():
                     continue
+                # Members live under a "<owner>-<repo>-<sha>/" directory
+                path = member.name.split("/", 1)[-1]
+                if not is_code_file(path) or (wanted is not None and path not in wanted):
+                    continue
+                content = tar.extractfile(member).read()
+                if wanted is None and sync is not None and not sync.needs_blob(path, git_blob_sha(content), len(content)):
+                    continue
+                yield path, content
 
-                # Create documents for each chunk
-                for i, chunk in enumerate(chunks):
-                    doc_id = self._generate_document_id(
-                        f"{owner}/{repo}", file_path, chunk["chunk_type"], i
+    async def _document_stream(
+        self,
+        repository: str,
+        files: AsyncIterator[Tuple[str, Optional[bytes]]],
+        sync: Optional[RemoteIncrementalSync],
+        counters: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Chunk files as they arrive and yield the documents that need uploading"""
+        async for path, content in files:
+            docs: Optional[List[Dict[str, Any]]] = None
+            if content is not None:
+                try:
+                    docs = await asyncio.to_thread(
+                        self._build_documents, repository, path, content.decode("utf-8")
                     )
+                    counters["files_processed"] += 1
+                except Exception as e:
+                    self.logger.error(f"Error processing {path}: {e}")
+            if docs is None:
+                counters["errors"] += 1
+                continue
+            for doc in sync.diff_file(path, docs) if sync is not None else docs:
+                yield doc
+
+    def _build_documents(self, repository: str, file_path: str, content: str) -> List[Dict[str, Any]]:
+        """Chunk one file into index documents.
+
+        Args:
+            repository: Repository identifier (owner/repo)
+            file_path: Path of the file within the repository
+            content: Decoded file content
+
+        Returns:
+            Documents for each chunk, without vectors
+        """
+        if file_path.endswith(".py"):
+            chunks = self.chunker.chunk_python_file(content, file_path)
+            language = "python"
+        elif file_path.endswith((".js", ".ts")):
+            chunks = self.chunker.chunk_js_ts_file(content, file_path)
+            language = "javascript" if file_path.endswith(".js") else "typescript"
+        else:
+            return []
 
-                    raw_content = chunk["content"]
-                    # Enforce 32k char limit for safety
-                    content = raw_content[:31997] + "..." if isinstance(raw_content, str) and len(raw_content) > 32000 else raw_content
-                    doc = {
-                        "id": doc_id,
-                        "repository": f"{owner}/{repo}",
-                        "file_path": file_path,
-                        "file_name": Path(file_path).name,
-                        "language": language,
-                        "last_modified": datetime.utcnow().isoformat() + "+00:00",
-                        "content": content,
-                        "semantic_context": chunk["semantic_context"],
-                        "signature": chunk["signature"],
-                        "imports": chunk["imports"],
-                        "dependencies": chunk["dependencies"],
-                        "chunk_type": chunk["chunk_type"],
-                        "start_line": chunk["start_line"],
-                        "end_line": chunk["end_line"],
-                        "function_name": chunk.get("function_name"),
-                        "class_name": chunk.get("class_name"),
-                        "docstring": chunk.get("docstring", "")
-                    }
-                    if content is not raw_content:
-                        doc["truncated"] = True
-
-                    # Add vector embedding if enabled
-                    if self.provider and not self._integrated_vectors:
-                        embedding = self.provider.generate_code_embedding(
-                            chunk["content"], chunk["semantic_context"]
-                        )
-                        if embedding:
-                            doc["content_vector"] = embedding
-
-                    # Safety check: Azure Search has 16MB payload limit per batch
-                    # Keep individual documents well below this (use 1MB as safe limit)
-                    doc_size = get_document_byte_size(doc)
-                    if doc_size > 1024 * 1024:  # 1MB in bytes
-                        # Truncate content to fit within size limit
-                        content = doc.get("content", "")
-                        if content:
-                            # Estimate how much to truncate (rough approximation)
-                            truncate_ratio = (1024 * 1024 * 0.8) / doc_size  # Target 80% of 1MB
-                            truncate_chars = int(len(content) * truncate_ratio)
-                            doc["content"] = content[:truncate_chars] + "\n... (truncated for size)"
-
-                    documents.append(doc)
-
-            except Exception as e:
-                self.logger.error(f"Error processing {file_path}: {e}")
-                error_count += 1
-
-        # Upload all documents
-        if documents:
-            self._upload_documents(documents)
-            indexed_count = len(documents)
-
-        self.logger.info(f"✅ Indexed {indexed_count} chunks from changed files")
-
-        return {
-            "repository": f"{owner}/{repo}",
-            "files_processed": len(file_paths),
-            "chunks_indexed": indexed_count,
-            "errors": error_count
-        }
+        documents = []
+        for i, chunk in enumerate(chunks):
+            doc_id = self._generate_document_id(
+                repository, file_path, chunk["chunk_type"], i
+            )
+
+            raw_content = chunk["content"]
+            # Enforce 32k char limit for safety
+            text = raw_content[:31997] + "..." if isinstance(raw_content, str) and len(raw_content) > 32000 else raw_content
+            doc = {
+                "id": doc_id,
+                "repository": repository,
+                "file_path": file_path,
+                "file_name": Path(file_path).name,
+                "language": language,
+                "last_modified": datetime.utcnow().isoformat() + "+00:00",
+                "content": text,
+                "semantic_context": chunk["semantic_context"],
+                "signature": chunk["signature"],
+                "imports": chunk["imports"],
+                "dependencies": chunk["dependencies"],
+                "chunk_type": chunk["chunk_type"],
+                "start_line": chunk["start_line"],
+                "end_line": chunk["end_line"],
+                "function_name": chunk.get("function_name"),
+                "class_name": chunk.get("class_name"),
+                "docstring": chunk.get("docstring", "")
+            }
+            if text is not raw_content:
+                doc["truncated"] = True
+
+            # Safety check: Azure Search has 16MB payload limit per batch
+            # Keep individual documents well below this (use 1MB as safe limit)
+            doc_size = get_document_byte_size(doc)
+            if doc_size > 1024 * 1024:  # 1MB in bytes
+                # Truncate content to fit within size limit
+                text = doc.get("content", "")
+                if text:
+                    # Estimate how much to truncate (rough approximation)
+                    truncate_ratio = (1024 * 1024 * 0.8) / doc_size  # Target 80% of 1MB
+                    truncate_chars = int(len(text) * truncate_ratio)
+                    doc["content"] = text[:truncate_chars] + "\n... (truncated for size)"
+
+            documents.append(doc)
+        return documents
 
     def get_changed_files_from_push(
         self,
@@ -438,25 +601,3 @@ class RemoteIndexer:
         """
         raw = f"{repo}:{file_path}:{chunk_type}:{index}".encode()
         return hashlib.md5(raw).hexdigest()
-
-    def _upload_documents(self, documents: List[Dict[str, Any]]):
-        """Upload documents to Azure Search.
-
-        Args:
-            documents: List of document dictionaries
-        """
-        if self.search_client is None:
-            self.logger.warning("Search client is not initialized (network disabled); skipping document upload.")
-            return
-
-        try:
-            # Use merge_or_upload if available, otherwise upload
-            if hasattr(self.search_client, "merge_or_upload_documents"):
-                result = self.search_client.merge_or_upload_documents(documents)
-            else:
-                result = self.search_client.upload_documents(documents)
-
-            self.logger.debug(f"Uploaded {len(documents)} documents")
-        except Exception as e:
-            self.logger.error(f"Error uploading documents: {e}")
-            raise
@@ -2,6 +2,13 @@
 """
 GitHub Webhook Handler for Real-time Code Indexing
 FastAPI application to process GitHub push and pull request events
+
+Events are queued durably (see job_queue) and indexed by a worker pool.
+
+Environment:
+    WEBHOOK_MAX_WORKERS         worker pool size (default: 5)
+    WEBHOOK_QUEUE_PATH          job queue database (default: ~/.mcprag/webhook_jobs.sqlite)
+    WEBHOOK_JOB_MAX_ATTEMPTS    attempts before a job is marked failed (default: 5)
 """
 
 import os
@@ -10,11 +17,11 @@ import hashlib
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, Request, HTTPException, BackgroundTasks, Depends, Header
+from fastapi import FastAPI, Request, HTTPException, Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -23,6 +30,7 @@ from slowapi.middleware import SlowAPIMiddleware
 from starlette.requests import Request as StarletteRequest
 from dotenv import load_dotenv
 
+from .job_queue import ZERO_SHA, IndexJob, IndexJobQueue, IndexJobWorkerPool
 from .remote_indexer import RemoteIndexer
 
 load_dotenv()
@@ -97,150 +105,136 @@ def verify_webhook_signature(payload: bytes, signature: str, secret: str) -> boo
     return hmac.compare_digest(f"sha256={expected_signature}", signature)
 
 
-async def process_push_event(data: Dict):
-    """Process push event and index changed files."""
-    try:
-        repo_name = data["repository"]["full_name"]
-        owner, repo = repo_name.split("/")
-    except Exception as e:
-        logger.exception("Malformed push payload: %s", e)
-        return
+def _branch(ref: str) -> str:
+    return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
 
-    # Mark as indexing
-    indexing_status[repo_name] = {
-        "status": "indexing",
-        "started_at": datetime.now().isoformat(),
-        "event": "push",
-    }
-    logger.info("Starting push indexing for %s", repo_name)
 
+def _pushed_paths(data: Dict) -> List[str]:
+    """Paths touched by the commits listed in a push payload"""
+    paths = set()
+    for commit in data.get("commits") or []:
+        for key in ("added", "modified", "removed"):
+            paths.update(commit.get(key) or [])
+    return sorted(paths)
+
+
+def enqueue_push_event(data: Dict) -> Optional[Dict]:
+    """Queue a push event; pending pushes to the same branch are coalesced."""
     try:
-        # Get changed files
+        repo_name = data["repository"]["full_name"]
+        ref = _branch(data["ref"])
         before = data.get("before")
         after = data.get("after")
+    except Exception as e:
+        logger.exception("Malformed push payload: %s", e)
+        return None
 
-        if not before or not after:
-            raise ValueError("Missing 'before' or 'after' commit SHAs in push payload")
-
-        if before == "0000000000000000000000000000000000000000":
-            # Initial commit - index entire repository
-            result = await asyncio.get_event_loop().run_in_executor(
-                executor, indexer.index_remote_repository, owner, repo
-            )
-            files_indexed = result.get("chunks_indexed", 0)
-        else:
-            # Get changed files
-            changed_files = await asyncio.get_event_loop().run_in_executor(
-                executor,
-                indexer.get_changed_files_from_push,
-                owner,
-                repo,
-                before,
-                after,
-            )
-
-            if changed_files:
-                logger.info("Indexing %d changed files for %s", len(changed_files), repo_name)
-                # Index changed files
-                result = await asyncio.get_event_loop().run_in_executor(
-                    executor,
-                    indexer.index_changed_files_remote,
-                    owner,
-                    repo,
-                    changed_files,
-                )
-                files_indexed = result.get("chunks_indexed", 0)
-            else:
-                # No-op for non-code changes
-                logger.info("No indexable file changes detected for %s", repo_name)
-                files_indexed = 0
-
-        # Update status
-        indexing_status[repo_name] = {
-            "status": "completed",
-            "completed_at": datetime.now().isoformat(),
-            "event": "push",
-            "files_indexed": files_indexed,
-        }
-        logger.info("Completed push indexing for %s (%d chunks)", repo_name, files_indexed)
+    if not after:
+        logger.error("Missing 'after' commit SHA in push payload for %s", repo_name)
+        return None
+    if data.get("deleted") or after == ZERO_SHA:
+        logger.info("Ignoring deletion of %s in %s", ref, repo_name)
+        return None
 
-    except Exception as e:
-        logger.exception("Push indexing failed for %s: %s", repo_name, e)
-        indexing_status[repo_name] = {
-            "status": "failed",
-            "error": str(e),
-            "failed_at": datetime.now().isoformat(),
-            "event": "push",
-        }
+    job_id, coalesced = job_queue.enqueue_push(repo_name, ref, before, after, _pushed_paths(data))
+    worker_pool.notify()
+    logger.info("Queued push for %s@%s as job %s%s", repo_name, ref, job_id, " (coalesced)" if coalesced else "")
+    return {"job_id": job_id, "coalesced": coalesced}
 
 
-async def process_pull_request_event(data: Dict):
-    """Process pull request event and index changed files."""
+def enqueue_pull_request_event(data: Dict) -> Optional[Dict]:
+    """Queue a pull request event; pending events for the same PR are coalesced."""
     try:
         repo_name = data["repository"]["full_name"]
-        owner, repo = repo_name.split("/")
         pr_number = data["pull_request"]["number"]
+        head_sha = data["pull_request"].get("head", {}).get("sha", "main")
         action = data["action"]
     except Exception as e:
         logger.exception("Malformed pull_request payload: %s", e)
-        return
+        return None
 
     # Only process opened, synchronize, and reopened events
     if action not in ["opened", "synchronize", "reopened"]:
         logger.debug("Ignoring PR action '%s' for %s", action, repo_name)
-        return
+        return None
 
-    # Mark as indexing
-    indexing_status[repo_name] = {
-        "status": "indexing",
-        "started_at": datetime.now().isoformat(),
-        "event": f"pull_request_{action}",
-        "pr_number": pr_number,
-    }
-    logger.info("Starting PR indexing for %s PR #%s (action=%s)", repo_name, pr_number, action)
+    job_id, coalesced = job_queue.enqueue_pull_request(repo_name, pr_number, head_sha)
+    worker_pool.notify()
+    logger.info("Queued %s PR #%s (action=%s) as job %s%s", repo_name, pr_number, action, job_id,
+                " (coalesced)" if coalesced else "")
+    return {"job_id": job_id, "coalesced": coalesced}
 
-    try:
-        # Get PR files
-        pr_files = await asyncio.get_event_loop().run_in_executor(
-            executor, indexer.get_pull_request_files, owner, repo, pr_number
-        )
 
-        if pr_files:
-            logger.info("Indexing %d PR files for %s PR #%s", len(pr_files), repo_name, pr_number)
-            # Index PR files
-            result = await asyncio.get_event_loop().run_in_executor(
-                executor, indexer.index_changed_files_remote, owner, repo, pr_files
+async def run_index_job(job: IndexJob) -> Dict:
+    """Run one queued job; raising lets the queue schedule a retry."""
+    owner, repo = job.repository.split("/", 1)
+    loop = asyncio.get_running_loop()
+    event = job.kind
+    details = {"event": event, "ref": job.ref, "job_id": job.id, "events": job.events}
+    if job.pr_number is not None:
+        details["pr_number"] = job.pr_number
+
+    indexing_status[job.repository] = dict(
+        details, status="indexing", started_at=datetime.now().isoformat(), attempt=job.attempts
+    )
+    logger.info("Starting %s indexing for %s (job %s, %d events)", event, job.repository, job.id, job.events)
+
+    try:
+        if job.kind == "push":
+            # One compare across the coalesced range covers every folded push
+            result = await loop.run_in_executor(
+                executor, indexer.index_push, owner, repo, job.before_sha, job.after_sha
+            )
+        elif job.kind == "full":
+            result = await loop.run_in_executor(
+                executor, indexer.index_remote_repository, owner, repo, job.after_sha or job.ref
             )
-            files_indexed = result.get("chunks_indexed", 0)
         else:
-            # No-op for non-code diffs
-            logger.info("No indexable PR file changes for %s PR #%s", repo_name, pr_number)
-            files_indexed = 0
-
-        # Update status
-        indexing_status[repo_name] = {
-            "status": "completed",
-            "completed_at": datetime.now().isoformat(),
-            "event": f"pull_request_{action}",
-            "pr_number": pr_number,
-            "files_indexed": files_indexed,
-        }
-        logger.info("Completed PR indexing for %s PR #%s (%d chunks)", repo_name, pr_number, files_indexed)
-
+            pr_files = await loop.run_in_executor(
+                executor, indexer.get_pull_request_files, owner, repo, job.pr_number
+            )
+            if pr_files:
+                logger.info("Indexing %d PR files for %s PR #%s", len(pr_files), job.repository, job.pr_number)
+                result = await loop.run_in_executor(
+                    executor, indexer.index_changed_files_remote, owner, repo, pr_files, job.after_sha or "main"
+                )
+            else:
+                # No-op for non-code diffs
+                logger.info("No indexable PR file changes for %s PR #%s", job.repository, job.pr_number)
+                result = {"chunks_indexed": 0, "files_processed": 0}
     except Exception as e:
-        logger.exception("PR indexing failed for %s PR #%s: %s", repo_name, pr_number, e)
-        indexing_status[repo_name] = {
-            "status": "failed",
-            "error": str(e),
-            "failed_at": datetime.now().isoformat(),
-            "event": f"pull_request_{action}",
-            "pr_number": pr_number,
-        }
+        logger.exception("Indexing job %s failed for %s: %s", job.id, job.repository, e)
+        indexing_status[job.repository] = dict(
+            details, status="failed", error=str(e), failed_at=datetime.now().isoformat(), attempt=job.attempts
+        )
+        raise
+
+    files_indexed = result.get("chunks_indexed", 0)
+    indexing_status[job.repository] = dict(
+        details, status="completed", completed_at=datetime.now().isoformat(), files_indexed=files_indexed
+    )
+    logger.info("Completed %s indexing for %s (%d chunks)", event, job.repository, files_indexed)
+    return {"chunks_indexed": files_indexed, "files_processed": result.get("files_processed", 0)}
+
+
+# Durable queue drained by MAX_WORKERS workers; one job per repository at a time
+job_queue = IndexJobQueue()
+worker_pool = IndexJobWorkerPool(job_queue, run_index_job, workers=MAX_WORKERS)
+
+
+@app.on_event("startup")
+async def start_workers():
+    worker_pool.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    await worker_pool.stop()
 
 
 @app.post("/webhook")
 @limiter.limit("10/minute")
-async def github_webhook(request: Request, background_tasks: BackgroundTasks):
+async def github_webhook(request: Request):
     """Handle GitHub webhook events."""
     # Get webhook signature
     signature = request.headers.get("X-Hub-Signature-256")
@@ -274,11 +268,11 @@ async def github_webhook(request: Request, background_tasks: BackgroundTasks):
 
     # Process event based on type
     if event_type == "push":
-        background_tasks.add_task(process_push_event, data)
-        return {"status": "accepted", "event": "push"}
+        queued = enqueue_push_event(data)
+        return {"status": "accepted" if queued else "ignored", "event": "push", **(queued or {})}
     elif event_type == "pull_request":
-        background_tasks.add_task(process_pull_request_event, data)
-        return {"status": "accepted", "event": "pull_request"}
+        queued = enqueue_pull_request_event(data)
+        return {"status": "accepted" if queued else "ignored", "event": "pull_request", **(queued or {})}
     else:
         logger.info("Ignoring event type: %s", event_type)
         return {"status": "ignored", "event": event_type}
@@ -292,8 +286,9 @@ async def health_check():
 
 @app.get("/status")
 async def get_status():
-    """Get indexing status for all repositories."""
+    """Get indexing status for all repositories and the job queue."""
     return {
+        "queue": dict(job_queue.get_status(), workers=worker_pool.get_status()),
         "repositories": indexing_status,
         "total": len(indexing_status),
         "in_progress": sum(1 for s in indexing_status.values() if s["status"] == "indexing"),
@@ -305,7 +300,7 @@ async def get_status():
 @app.post("/manual/index-repo")
 @limiter.limit("5/minute")
 async def manual_index_repository(
-    background_tasks: BackgroundTasks,
+    request: Request,
     owner: str,
     repo: str,
     ref: str = "main",
@@ -313,56 +308,23 @@ async def manual_index_repository(
 ):
     """Manually trigger repository indexing."""
     repo_name = f"{owner}/{repo}"
-    
-    # Check if already indexing
-    if repo_name in indexing_status and indexing_status[repo_name]["status"] == "indexing":
-        raise HTTPException(status_code=409, detail="Repository is already being indexed")
-    
-    # Mark as indexing
-    indexing_status[repo_name] = {
-        "status": "indexing",
-        "started_at": datetime.now().isoformat(),
-        "event": "manual",
-        "ref": ref,
-    }
-    
-    # Add indexing task
-    async def index_task():
-        try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                executor, indexer.index_remote_repository, owner, repo, ref
-            )
-            indexing_status[repo_name] = {
-                "status": "completed",
-                "completed_at": datetime.now().isoformat(),
-                "event": "manual",
-                "ref": ref,
-                "files_indexed": result.get("chunks_indexed", 0),
-            }
-        except Exception as e:
-            logger.exception("Manual indexing failed for %s: %s", repo_name, e)
-            indexing_status[repo_name] = {
-                "status": "failed",
-                "error": str(e),
-                "failed_at": datetime.now().isoformat(),
-                "event": "manual",
-                "ref": ref,
-            }
-    
-    background_tasks.add_task(index_task)
-    
+    job_id, coalesced = job_queue.enqueue_full(repo_name, _branch(ref))
+    worker_pool.notify()
+
     return {
         "status": "accepted",
         "repository": repo_name,
         "ref": ref,
-        "message": "Indexing started"
+        "job_id": job_id,
+        "coalesced": coalesced,
+        "message": "Indexing queued"
     }
 
 
 @app.post("/manual/index-pr")
 @limiter.limit("5/minute")
 async def manual_index_pull_request(
-    background_tasks: BackgroundTasks,
+    request: Request,
     owner: str,
     repo: str,
     pr_number: int,
@@ -370,58 +332,16 @@ async def manual_index_pull_request(
 ):
     """Manually trigger PR indexing."""
     repo_name = f"{owner}/{repo}"
-    
-    # Check if already indexing
-    if repo_name in indexing_status and indexing_status[repo_name]["status"] == "indexing":
-        raise HTTPException(status_code=409, detail="Repository is already being indexed")
-    
-    # Mark as indexing
-    indexing_status[repo_name] = {
-        "status": "indexing",
-        "started_at": datetime.now().isoformat(),
-        "event": "manual_pr",
-        "pr_number": pr_number,
-    }
-    
-    # Add indexing task
-    async def index_pr_task():
-        try:
-            pr_files = await asyncio.get_event_loop().run_in_executor(
-                executor, indexer.get_pull_request_files, owner, repo, pr_number
-            )
-            
-            if pr_files:
-                result = await asyncio.get_event_loop().run_in_executor(
-                    executor, indexer.index_changed_files_remote, owner, repo, pr_files
-                )
-                files_indexed = result.get("chunks_indexed", 0)
-            else:
-                files_indexed = 0
-            
-            indexing_status[repo_name] = {
-                "status": "completed",
-                "completed_at": datetime.now().isoformat(),
-                "event": "manual_pr",
-                "pr_number": pr_number,
-                "files_indexed": files_indexed,
-            }
-        except Exception as e:
-            logger.exception("Manual PR indexing failed for %s PR #%s: %s", repo_name, pr_number, e)
-            indexing_status[repo_name] = {
-                "status": "failed",
-                "error": str(e),
-                "failed_at": datetime.now().isoformat(),
-                "event": "manual_pr",
-                "pr_number": pr_number,
-            }
-    
-    background_tasks.add_task(index_pr_task)
-    
+    job_id, coalesced = job_queue.enqueue_pull_request(repo_name, pr_number)
+    worker_pool.notify()
+
     return {
         "status": "accepted",
         "repository": repo_name,
         "pr_number": pr_number,
-        "message": "PR indexing started"
+        "job_id": job_id,
+        "coalesced": coalesced,
+        "message": "PR indexing queued"
     }
 
 
@@ -10,6 +10,7 @@ import re
 from typing import Any, Dict, List, Optional
 
 from ..pipeline import RAGPipeline
+from ..core.components import ComponentRegistry
 from ..core.models import QueryContext, SearchIntent
 from ..generation.code_generator import CodeGenerator, GenerationContext
 from ..generation.style_matcher import StyleMatcher
@@ -26,9 +27,10 @@ class CodeGenerationTool:
     # ---------------------------------------------------------------------#
     # Constructor
     # ---------------------------------------------------------------------#
-    def __init__(self, config: Dict[str, Any]) -> None:
+    def __init__(self, config: Dict[str, Any], components: Optional[ComponentRegistry] = None) -> None:
         self.config = config
-        self.pipeline = RAGPipeline(config)
+        # Use the shared pipeline when a registry is supplied
+        self.pipeline = components.get("pipeline") if components else RAGPipeline(config)
         
         # Initialize generation modules
         generation_config = config.get('generation', {})
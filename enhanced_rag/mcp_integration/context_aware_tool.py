@@ -12,6 +12,7 @@ from ..context.hierarchical_context import HierarchicalContextAnalyzer
 from ..context.session_tracker import SessionTracker
 from ..code_understanding.ast_analyzer import ASTAnalyzer
 from ..code_understanding.dependency_graph import DependencyGraphBuilder
+from ..core.components import ComponentRegistry
 from ..core.models import FileContext, ModuleContext, ProjectContext
 
 logger = logging.getLogger(__name__)
@@ -22,9 +23,12 @@ class ContextAwareTool:
     MCP tool providing context-aware operations
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], components: Optional[ComponentRegistry] = None):
         self.config = config
-        self.context_analyzer = HierarchicalContextAnalyzer(config)
+        # Sharing the pipeline's analyzer lets both warm the same context cache
+        self.context_analyzer = (
+            components.get("context_analyzer") if components else HierarchicalContextAnalyzer(config)
+        )
         self.session_tracker = SessionTracker(config)
         self.ast_analyzer = ASTAnalyzer(config)
         self.dep_builder = DependencyGraphBuilder(config)
@@ -305,9 +309,10 @@ class ContextAwareTool:
         try:
             # Track the change
             await self.session_tracker.track_file_change(
+                session_id=self.config.get('session_id', 'default'),
                 file_path=file_path,
-                event_type=event_type,
-                content=content
+                change_type=event_type,
+                metadata={'content_length': len(content)} if content is not None else None
             )
             
             # Analyze impact
@@ -7,6 +7,7 @@ import uuid
 from typing import Dict, Any, List, Optional
 
 from ..pipeline import RAGPipeline
+from ..core.components import ComponentRegistry
 from ..core.models import QueryContext
 
 logger = logging.getLogger(__name__)
@@ -17,8 +18,9 @@ class EnhancedSearchTool:
     MCP tool wrapper for enhanced RAG search
     """
 
-    def __init__(self, config: Dict[str, Any]):
-        self.pipeline = RAGPipeline(config)
+    def __init__(self, config: Dict[str, Any], components: Optional[ComponentRegistry] = None):
+        # Use the shared pipeline when a registry is supplied
+        self.pipeline = components.get("pipeline") if components else RAGPipeline(config)
         self.feedback_collector = getattr(self.pipeline, 'feedback_collector', None)
 
     async def search(
@@ -59,7 +61,8 @@ class EnhancedSearchTool:
             query=query,
             context=context,
             generate_response=kwargs.get('generate_response', True),
-            max_results=kwargs.get('max_results', 10)
+            max_results=kwargs.get('max_results', 10),
+            deadline_ms=kwargs.get('deadline_ms'),
         )
 
         # Track query if feedback collector is available
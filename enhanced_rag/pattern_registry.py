@@ -3,12 +3,15 @@ Unified pattern registry for code analysis
 Consolidates pattern recognition functionality across the system
 """
 
+import hashlib
 import logging
+import os
 import re
-from typing import Dict, List, Optional, Any, Set, Union
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
-from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,84 @@ class PatternMatch:
     file_id: Optional[str] = None
 
 
+@dataclass
+class _CompiledPatternDef:
+    """Precompiled form of one pattern definition"""
+    pattern_type: PatternType
+    pattern_name: str
+    keywords: List[str]
+    keywords_lower: List[str]
+    # (source, compiled, lowercase literal every match must contain)
+    regexes: List[Tuple[str, re.Pattern, str]]
+
+
+_QUANTIFIERS = set('*?{')
+_BREAKERS = set('.^$+')
+
+
+def _required_literal(pattern_str: str) -> str:
+    """Longest literal run that any match of pattern_str must contain.
+
+    Conservative: groups, classes and escapes like \\s end a run, a char
+    followed by an optional quantifier is dropped, and top-level alternation
+    yields '' (no prefilter).
+    """
+    runs: List[str] = []
+    current = ''
+    i = 0
+    n = len(pattern_str)
+    while i < n:
+        ch = pattern_str[i]
+        if ch == '\\' and i + 1 < n:
+            nxt = pattern_str[i + 1]
+            if nxt.isalnum():
+                runs.append(current)
+                current = ''
+            else:
+                current += nxt
+            i += 2
+            continue
+        if ch in '([':
+            # Skip the whole group or class, honouring nesting and escapes
+            runs.append(current)
+            current = ''
+            close = ')' if ch == '(' else ']'
+            depth = 0
+            while i < n:
+                c = pattern_str[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                if c == ch:
+                    depth += 1
+                elif c == close:
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            i += 1
+            if i < n and pattern_str[i] in _QUANTIFIERS:
+                i += 1
+            continue
+        if ch == '|':
+            return ''
+        if ch in _QUANTIFIERS:
+            # The preceding char may be optional; drop it from the run
+            runs.append(current[:-1])
+            current = ''
+            if ch == '{':
+                close = pattern_str.find('}', i)
+                i = n if close < 0 else close
+        elif ch in _BREAKERS or ch in ')]}':
+            runs.append(current)
+            current = ''
+        else:
+            current += ch
+        i += 1
+    runs.append(current)
+    return max(runs, key=len).lower()
+
+
 class PatternRegistry:
     """
     Unified pattern registry that consolidates all pattern matching functionality
@@ -52,7 +133,14 @@ class PatternRegistry:
     def __init__(self):
         if not hasattr(self, '_initialized'):
             self._initialize_patterns()
-            self._compiled_patterns = {}
+            self._compiled_patterns: Dict[str, re.Pattern] = {}
+            self._compile_patterns()
+            # Memoized recognition results keyed by content hash
+            self._recognition_cache: "OrderedDict[Tuple, List[Tuple]]" = OrderedDict()
+            self._recognition_cache_size = int(os.getenv("ENHANCED_RAG_PATTERN_CACHE_SIZE", "2048"))
+            self._recognition_lock = threading.Lock()
+            self._cache_hits = 0
+            self._cache_misses = 0
             self._initialized = True
     
     def _initialize_patterns(self):
@@ -261,11 +349,51 @@ class PatternRegistry:
             }
         }
     
-    @lru_cache(maxsize=1000)
+    def _compile_patterns(self) -> None:
+        """Precompile every regex and build the combined keyword matcher"""
+        self._compiled_defs: Dict[PatternType, List[_CompiledPatternDef]] = {}
+        all_keywords: Set[str] = set()
+
+        for pattern_type, definitions in self.patterns.items():
+            compiled_defs = []
+            for pattern_name, pattern_def in definitions.items():
+                keywords = list(pattern_def.get('keywords', []))
+                keywords_lower = [kw.lower() for kw in keywords]
+                all_keywords.update(keywords_lower)
+                compiled_defs.append(_CompiledPatternDef(
+                    pattern_type=pattern_type,
+                    pattern_name=pattern_name,
+                    keywords=keywords,
+                    keywords_lower=keywords_lower,
+                    regexes=[
+                        (
+                            pattern_str,
+                            self._get_compiled_pattern(pattern_str),
+                            _required_literal(pattern_str)
+                        )
+                        for pattern_str in pattern_def.get('patterns', [])
+                    ]
+                ))
+            self._compiled_defs[pattern_type] = compiled_defs
+
+        # Keywords shared by several definitions are tested once per snippet.
+        # Plain substring tests run in C and measured faster here than a
+        # combined alternation regex, which must try every keyword at every
+        # position (see scripts/bench_pattern_registry.py).
+        self._all_keywords = tuple(sorted(all_keywords))
+
     def _get_compiled_pattern(self, pattern_str: str) -> re.Pattern:
         """Get compiled regex pattern with caching"""
-        return re.compile(pattern_str, re.IGNORECASE | re.DOTALL)
-    
+        compiled = self._compiled_patterns.get(pattern_str)
+        if compiled is None:
+            compiled = re.compile(pattern_str, re.IGNORECASE | re.DOTALL)
+            self._compiled_patterns[pattern_str] = compiled
+        return compiled
+
+    def _find_keywords(self, code_lower: str) -> Set[str]:
+        """All registry keywords occurring in code_lower"""
+        return {kw for kw in self._all_keywords if kw in code_lower}
+
     def recognize_patterns(
         self,
         code: str,
@@ -285,72 +413,121 @@ class PatternRegistry:
         """
         if pattern_types is None:
             pattern_types = list(PatternType)
-        
+
+        context_lower = str(context).lower() if context else None
+        cache_key = (
+            hashlib.sha1(code.encode('utf-8', 'surrogatepass')).hexdigest(),
+            context_lower,
+            tuple(pattern_types),
+        )
+
+        with self._recognition_lock:
+            cached = self._recognition_cache.get(cache_key)
+            if cached is not None:
+                self._recognition_cache.move_to_end(cache_key)
+                self._cache_hits += 1
+        if cached is None:
+            cached = self._recognize(code, context_lower, pattern_types)
+            with self._recognition_lock:
+                self._cache_misses += 1
+                self._recognition_cache[cache_key] = cached
+                while len(self._recognition_cache) > self._recognition_cache_size:
+                    self._recognition_cache.popitem(last=False)
+
+        # Fresh objects per call so callers can't mutate the memoized entry
+        return [
+            PatternMatch(
+                pattern_type=pattern_type,
+                pattern_name=pattern_name,
+                confidence=confidence,
+                matched_keywords=list(matched_kw),
+                matched_patterns=list(matched_patterns),
+                context=context or {}
+            )
+            for pattern_type, pattern_name, confidence, matched_kw, matched_patterns in cached
+        ]
+
+    def _recognize(
+        self,
+        code: str,
+        context_lower: Optional[str],
+        pattern_types: List[PatternType]
+    ) -> List[Tuple]:
+        """Uncached recognition; returns match tuples sorted by confidence"""
         matches = []
         code_lower = code.lower()
-        
+        found_keywords = self._find_keywords(code_lower)
+        # Unicode case folding can match non-ASCII text against an ASCII
+        # literal, so only prefilter when the snippet is plain ASCII
+        literal_text = code_lower if code.isascii() else None
+
         for pattern_type in pattern_types:
-            if pattern_type not in self.patterns:
-                continue
-                
-            for pattern_name, pattern_def in self.patterns[pattern_type].items():
-                confidence, matched_kw, matched_patterns = self._calculate_confidence(
-                    code, code_lower, pattern_def, context
+            for compiled_def in self._compiled_defs.get(pattern_type, ()):
+                confidence, matched_kw, matched_patterns = self._score_definition(
+                    code, literal_text, found_keywords, compiled_def, context_lower
                 )
                 
                 if confidence > 0.1:  # Low threshold to catch weak matches
-                    match = PatternMatch(
-                        pattern_type=pattern_type,
-                        pattern_name=pattern_name,
-                        confidence=confidence,
-                        matched_keywords=matched_kw,
-                        matched_patterns=matched_patterns,
-                        context=context or {}
-                    )
-                    matches.append(match)
+                    matches.append((
+                        pattern_type,
+                        compiled_def.pattern_name,
+                        confidence,
+                        matched_kw,
+                        matched_patterns
+                    ))
         
         # Sort by confidence descending
-        matches.sort(key=lambda x: x.confidence, reverse=True)
+        matches.sort(key=lambda x: x[2], reverse=True)
         return matches
-    
-    def _calculate_confidence(
+
+    def _score_definition(
         self,
         code: str,
-        code_lower: str,
-        pattern_def: Dict[str, Any],
-        context: Optional[Dict[str, Any]]
-    ) -> tuple[float, List[str], List[str]]:
+        literal_text: Optional[str],
+        found_keywords: Set[str],
+        compiled_def: _CompiledPatternDef,
+        context_lower: Optional[str]
+    ) -> Tuple[float, List[str], List[str]]:
         """Calculate confidence score for pattern match"""
         confidence = 0.0
         matched_keywords = []
         matched_patterns = []
+        keywords = compiled_def.keywords
         
         # Check keyword matches (40% weight)
-        keywords = pattern_def.get('keywords', [])
         if keywords:
-            keyword_matches = [kw for kw in keywords if kw.lower() in code_lower]
-            matched_keywords = keyword_matches
-            confidence += (len(keyword_matches) / len(keywords)) * 0.4
+            matched_keywords = [
+                kw for kw, kw_lower in zip(keywords, compiled_def.keywords_lower)
+                if kw_lower in found_keywords
+            ]
+            confidence += (len(matched_keywords) / len(keywords)) * 0.4
         
         # Check regex pattern matches (50% weight)
-        patterns = pattern_def.get('patterns', [])
-        if patterns:
-            pattern_matches = []
-            for pattern_str in patterns:
-                compiled_pattern = self._get_compiled_pattern(pattern_str)
-                if compiled_pattern.search(code):
-                    pattern_matches.append(pattern_str)
-            
-            matched_patterns = pattern_matches
-            confidence += (len(pattern_matches) / len(patterns)) * 0.5
+        if compiled_def.regexes:
+            matched_patterns = [
+                pattern_str for pattern_str, compiled, literal in compiled_def.regexes
+                if (literal_text is None or literal in literal_text) and compiled.search(code)
+            ]
+            confidence += (len(matched_patterns) / len(compiled_def.regexes)) * 0.5
         
         # Context boost (10% weight)
-        if context and keywords:
-            context_str = str(context).lower()
-            context_matches = [kw for kw in keywords if kw.lower() in context_str]
+        if context_lower and keywords:
+            context_matches = [kw for kw in compiled_def.keywords_lower if kw in context_lower]
             confidence += (len(context_matches) / len(keywords)) * 0.1
         
         return min(confidence, 1.0), matched_keywords, matched_patterns
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Recognition memo statistics"""
+        with self._recognition_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                'entries': len(self._recognition_cache),
+                'max_entries': self._recognition_cache_size,
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'hit_ratio': (self._cache_hits / lookups) if lookups else 0.0,
+            }
     
     def get_dominant_pattern(
         self,
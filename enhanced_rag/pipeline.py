@@ -3,8 +3,9 @@ Main RAG Pipeline Orchestrator
 Coordinates all enhanced RAG components for optimal code search
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Union, TYPE_CHECKING
+from typing import Dict, List, Any, Optional, Union, Protocol, runtime_checkable, Iterable, TypeVar
 from collections import OrderedDict
 
 from datetime import datetime, timezone
@@ -13,16 +14,9 @@ from .core.models import (
     SearchQuery, SearchResult, CodeContext, EnhancedContext, QueryContext
 )
 from .core.config import get_config, Config
-from .context.hierarchical_context import HierarchicalContextAnalyzer
-from .semantic.query_enhancer import ContextualQueryEnhancer
-from .semantic.intent_classifier import IntentClassifier
-from .retrieval.multi_stage_pipeline import MultiStageRetriever
-# Import improved ranker without aliasing loops; use a Protocol type for attribute typing
-from .ranking.contextual_ranker_improved import ImprovedContextualRanker
-from typing import Protocol, runtime_checkable, Iterable, TypeVar, List, Any
-R = TypeVar("R")
-from .ranking.result_explainer import ResultExplainer
-from .generation.response_generator import ResponseGenerator
+from .core.components import ComponentRegistry
+from .retrieval.multi_stage_pipeline import RetrievalContext
+from .utils.deadline import Deadline
 from .utils.performance_monitor import PerformanceMonitor
 from .utils.error_handler import ErrorHandler
 
@@ -35,6 +29,9 @@ from .azure_integration import FileProcessor, UnifiedAutomation, SearchOperation
 
 logger = logging.getLogger(__name__)
 
+# Rankers are typed by Protocol to avoid importing the concrete classes
+R = TypeVar("R")
+
 
 class RAGPipelineResult:
     """Result from RAG pipeline processing"""
@@ -78,7 +75,11 @@ class RAGPipeline:
     6. Learning and feedback collection
     """
 
-    def __init__(self, config: Optional[Union[Config, Dict[str, Any]]] = None):
+    def __init__(
+        self,
+        config: Optional[Union[Config, Dict[str, Any]]] = None,
+        components: Optional[ComponentRegistry] = None
+    ):
         # Handle both Config object and dict
         if config is None:
             self.config = get_config()
@@ -101,6 +102,10 @@ class RAGPipeline:
         self.performance_monitor = PerformanceMonitor()
         self.error_handler = ErrorHandler()
 
+        # Retrievers, rankers and analyzers come from a registry so they can be
+        # shared with other consumers; without one the pipeline gets its own
+        self.components = components or ComponentRegistry(self.config)
+
         # Initialize components
         self._initialize_components()
 
@@ -140,14 +145,8 @@ class RAGPipeline:
         enable_vector = retrieval_cfg.get('enable_vector_search', False) if isinstance(retrieval_cfg, dict) else retrieval_cfg.enable_vector_search
         if enable_vector:
             try:
-                from .retrieval.hybrid_searcher import HybridSearcher
-                if hasattr(self.config, "model_dump"):
-                    hybrid_config = self.config.model_dump()
-                elif isinstance(self.config, dict):
-                    hybrid_config = self.config
-                else:
-                    hybrid_config = {}
-                self.hybrid_searcher = HybridSearcher(hybrid_config)
+                # Shared with the retriever: one embedder, one query-embedding cache
+                self.hybrid_searcher = self.components.get("hybrid_searcher")
                 logger.info("✅ Vector search enabled in pipeline")
             except Exception as e:
                 logger.warning(f"Vector search initialization failed: {e}")
@@ -167,18 +166,14 @@ class RAGPipeline:
         try:
             # Core components
             if isinstance(self.config, dict):
-                context_config = self.config.get("context", {})
-                retrieval_config = self.config.get("retrieval", {})
                 ranking_config = self.config.get("ranking", {})
             else:
-                context_config = self.config.context if isinstance(self.config.context, dict) else self.config.context.model_dump()
-                retrieval_config = self.config.retrieval if isinstance(self.config.retrieval, dict) else self.config.retrieval.model_dump()
                 ranking_config = self.config.ranking if isinstance(self.config.ranking, dict) else self.config.ranking.model_dump()
 
-            self.context_analyzer = HierarchicalContextAnalyzer(context_config)
-            self.query_enhancer = ContextualQueryEnhancer(retrieval_config)
-            self.intent_classifier = IntentClassifier(retrieval_config)
-            self.retriever = MultiStageRetriever(retrieval_config)
+            self.context_analyzer = self.components.get("context_analyzer")
+            self.query_enhancer = self.components.get("query_enhancer")
+            self.intent_classifier = self.components.get("intent_classifier")
+            self.retriever = self.components.get("retriever")
 
             # Initialize ranking with optional adaptive ranker and monitoring
             # Check if monitoring is enabled in config
@@ -186,14 +181,13 @@ class RAGPipeline:
 
             # Initialize improved ranker with monitoring support
             if enable_monitoring:
-                from .ranking.ranking_monitor import RankingMonitor
-                self.ranking_monitor = RankingMonitor()
+                self.ranking_monitor = self.components.get("ranking_monitor")
                 logger.info("✅ Ranking monitoring enabled")
             else:
                 self.ranking_monitor = None
 
             # Create improved ranker at runtime
-            base_ranker = ImprovedContextualRanker(ranking_config)
+            base_ranker = self.components.get("ranker")
             learning_config = self.config.learning
 
             # Default ranker is the improved base (fits PipelineRanker protocol)
@@ -233,8 +227,8 @@ class RAGPipeline:
                 except Exception as e:
                     logger.warning(f"Adaptive ranking initialization skipped: {e}")
 
-            self.result_explainer = ResultExplainer(ranking_config)
-            self.response_generator = ResponseGenerator({})
+            self.result_explainer = self.components.get("result_explainer")
+            self.response_generator = self.components.get("response_generator")
 
             logger.info("✅ RAG Pipeline components initialized successfully")
 
@@ -301,7 +295,8 @@ class RAGPipeline:
         query: str,
         context: QueryContext,
         generate_response: bool = True,
-        max_results: int = 10
+        max_results: int = 10,
+        deadline_ms: Optional[int] = None,
     ) -> RAGPipelineResult:
         """
         Process a search query through the complete RAG pipeline
@@ -311,24 +306,48 @@ class RAGPipeline:
             context: Query context information
             generate_response: Whether to generate a natural language response
             max_results: Maximum number of results to return
+            deadline_ms: Optional end-to-end latency budget. It is split across
+                context extraction, enhancement, retrieval stages, reranking,
+                hydration and ranking; phases
+                that overrun are cut and metadata['degraded'] is set.
 
         Returns:
             RAGPipelineResult with search results and optional response
         """
         start_time = datetime.now(timezone.utc)
+        # Request-scoped so concurrent queries don't share warnings/metadata
+        retrieval_ctx = RetrievalContext(
+            deadline=Deadline(
+                deadline_ms,
+                getattr(getattr(self.config, "performance", None), "deadline_budget_shares", None),
+            )
+        )
+        deadline = retrieval_ctx.deadline
 
         try:
             # 1. Extract and analyze context
-            code_context = await self._extract_context(context)
+            try:
+                code_context = await asyncio.wait_for(
+                    self._extract_context(context), timeout=deadline.phase_s("context")
+                )
+            except asyncio.TimeoutError:
+                retrieval_ctx.mark_degraded("context_deadline")
+                code_context = None
 
             # 2. Classify intent and enhance query
             intent = await self.intent_classifier.classify_intent(query)
 
             # Handle case where context is None
+            enhancement_result = None
             if code_context:
-                enhancement_result = await self.query_enhancer.enhance_query(
-                    query, code_context, intent.value
-                )
+                try:
+                    enhancement_result = await asyncio.wait_for(
+                        self.query_enhancer.enhance_query(query, code_context, intent.value),
+                        timeout=deadline.phase_s("enhance"),
+                    )
+                except asyncio.TimeoutError:
+                    retrieval_ctx.mark_degraded("enhancement_deadline")
+            if enhancement_result:
                 enhanced_queries = enhancement_result['queries']
                 exclude_terms = enhancement_result['exclude_terms']
             else:
@@ -366,7 +385,7 @@ class RAGPipeline:
 
             # 4. Execute multi-stage retrieval
             try:
-                raw_results = await self.retriever.retrieve(search_query)
+                raw_results = await self.retriever.retrieve(search_query, ctx=retrieval_ctx)
                 logger.debug(f"Retrieved {len(raw_results)} results from multi-stage retrieval")
 
                 # Wire-in: if results are dict-like without enriched code understanding,
@@ -542,12 +561,18 @@ class RAGPipeline:
                     # Call appropriate ranking method based on available method
                     # Try AdaptiveRanker's rank method first
                     if hasattr(self.ranker, 'rank'):
-                        ranked_results = await self.ranker.rank(  # type: ignore[call-arg]
-                            raw_results, query, enhanced_context, intent
+                        ranked_results = await asyncio.wait_for(
+                            self.ranker.rank(  # type: ignore[call-arg]
+                                raw_results, query, enhanced_context, intent
+                            ),
+                            timeout=deadline.phase_s("rank"),
                         )
                     elif hasattr(self.ranker, 'rank_results'):
-                        ranked_results = await self.ranker.rank_results(  # type: ignore[call-arg]
-                            raw_results, enhanced_context, intent
+                        ranked_results = await asyncio.wait_for(
+                            self.ranker.rank_results(  # type: ignore[call-arg]
+                                raw_results, enhanced_context, intent
+                            ),
+                            timeout=deadline.phase_s("rank"),
                         )
                     else:
                         raise AttributeError(f"Ranker {type(self.ranker).__name__} has no rank or rank_results method")
@@ -579,6 +604,10 @@ class RAGPipeline:
                         )
 
                     logger.debug(f"Ranked {len(ranked_results)} results in {ranking_time_ms:.1f}ms")
+                except asyncio.TimeoutError:
+                    # Out of budget: keep fused retrieval order
+                    retrieval_ctx.mark_degraded("ranking_deadline")
+                    ranked_results = raw_results
                 except Exception as e:
                     logger.error(f"Ranking failed: {e}")
                     # Fallback to original results
@@ -590,6 +619,9 @@ class RAGPipeline:
             # 6. Limit results and add explanations
             final_results = ranked_results[:max_results]
             for result in final_results:
+                if deadline.expired():
+                    retrieval_ctx.mark_degraded("explanation_deadline")
+                    break
                 explanation = await self.result_explainer.explain_ranking(
                     result, search_query, code_context
                 )
@@ -607,12 +639,7 @@ class RAGPipeline:
 
             # 9. Build metadata
             # Collect retrieval warnings (e.g., semantic-config fallback)
-            retrieval_warnings = []
-            try:
-                if hasattr(self.retriever, '_warnings') and isinstance(getattr(self.retriever, '_warnings'), list):
-                    retrieval_warnings = list(getattr(self.retriever, '_warnings'))
-            except Exception:
-                retrieval_warnings = []
+            retrieval_warnings = list(retrieval_ctx.warnings)
 
             # Surface auto-routing decision if applied
             try:
@@ -629,7 +656,10 @@ class RAGPipeline:
                 'context_used': bool(code_context),
                 'session_id': context.session_id,
                 'retrieval_warnings': retrieval_warnings,
+                'degraded': retrieval_ctx.degraded,
             }
+            if deadline.bounded:
+                metadata['deadline_ms'] = deadline.budget_ms
 
             return RAGPipelineResult(
                 success=True,
@@ -806,18 +836,20 @@ class RAGPipeline:
             # Use consolidated FileProcessor for repository processing
             # FileProcessor may not expose a single-shot repository API in this runtime.
             # Use a safe fallback that returns an empty document list to avoid attribute errors.
+            documents_processed = 0
             try:
-                documents = self._file_processor.process_repository(repo_path, repo_name)  # type: ignore[attr-defined]
+                # Stream rather than materialise; only the count is reported here
+                async for _ in self._file_processor.aiter_repository(repo_path, repo_name):  # type: ignore[attr-defined]
+                    documents_processed += 1
             except AttributeError:
-                logger.warning("FileProcessor.process_repository not available; skipping document extraction")
-                documents = []
+                logger.warning("FileProcessor.aiter_repository not available; skipping document extraction")
 
             # Use the configured index name or provided one
             target_index = index_name or getattr(self.config.azure, 'index_name', 'codebase-mcp-sota')
 
             # Upload documents using Azure operations
-            result = {'documents_processed': len(documents)}
-            logger.info(f"Processed {len(documents)} documents from {repo_name}")
+            result = {'documents_processed': documents_processed}
+            logger.info(f"Processed {documents_processed} documents from {repo_name}")
 
             return result
 
@@ -9,6 +9,13 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore
+    NUMPY_AVAILABLE = False
+
 from ..core.interfaces import Ranker
 from ..core.models import (
     SearchResult, EnhancedContext, SearchIntent, CodeContext,
@@ -17,6 +24,18 @@ from ..core.models import (
 
 logger = logging.getLogger(__name__)
 
+# Column order of the result x factor matrix used by batch scoring
+FACTOR_NAMES = (
+    'text_relevance',
+    'semantic_similarity',
+    'context_overlap',
+    'import_similarity',
+    'proximity_score',
+    'recency_score',
+    'quality_score',
+    'pattern_match',
+)
+
 
 @dataclass
 class ValidatedFactor:
@@ -44,6 +63,14 @@ class RankingFactors:
     pattern_match: ValidatedFactor = field(default_factory=lambda: ValidatedFactor(0.0))
 
 
+@dataclass
+class QueryFeatures:
+    """Query-side inputs computed once per ranking call instead of per result"""
+    query: str = ""
+    keywords: Optional[set] = None  # None when the context carries no query
+    patterns: Optional[set] = None  # None when extraction failed
+
+
 class ImprovedContextualRanker(Ranker):
     """
     Improved multi-factor ranking system with normalization, validation, and tie-breaking
@@ -145,7 +172,11 @@ class ImprovedContextualRanker(Ranker):
 
         # Calculate normalization bounds from all results
         normalization_bounds = self._calculate_normalization_bounds(results)
-        
+        weights = self.weights.get(intent, self.weights[SearchIntent.IMPLEMENT])
+
+        if NUMPY_AVAILABLE and self.config.get('batch_scoring', True):
+            return await self._rank_batch(results, context, weights, normalization_bounds)
+
         ranked_results = []
 
         for result in results:
@@ -153,18 +184,11 @@ class ImprovedContextualRanker(Ranker):
             factors = await self._calculate_factors(result, context, normalization_bounds)
 
             # Apply intent-specific weights
-            weights = self.weights.get(intent, self.weights[SearchIntent.IMPLEMENT])
             final_score = self._calculate_weighted_score(factors, weights)
 
             # Update result with new score and explanation
             result.score = final_score
-            result.ranking_explanation = self._generate_explanation(factors, weights)
-            
-            # Populate ranking factor fields in SearchResult
-            result.context_similarity = factors.semantic_similarity.value
-            result.import_overlap = factors.import_similarity.value
-            result.pattern_match = factors.pattern_match.value
-            
+            self._apply_factors(result, factors, weights)
             ranked_results.append(result)
 
         # Sort with tie-breaking rules
@@ -172,6 +196,91 @@ class ImprovedContextualRanker(Ranker):
 
         return ranked_results
 
+    async def _rank_batch(
+        self,
+        results: List[SearchResult],
+        context: EnhancedContext,
+        weights: Dict[str, float],
+        normalization_bounds: Dict[str, Tuple[float, float]]
+    ) -> List[SearchResult]:
+        """Score all results as one result x factor matrix.
+
+        Produces the same scores and order as the per-result loop.
+        """
+        query_features = await self._prepare_query_features(context)
+
+        n = len(results)
+        values = np.empty((n, len(FACTOR_NAMES)))
+        confidences = np.empty((n, len(FACTOR_NAMES)))
+        all_factors = []
+        for i, result in enumerate(results):
+            factors = await self._calculate_factors(
+                result, context, normalization_bounds, query_features
+            )
+            all_factors.append(factors)
+            for j, name in enumerate(FACTOR_NAMES):
+                factor = getattr(factors, name)
+                values[i, j] = factor.value
+                confidences[i, j] = factor.confidence
+
+        weight_vector = np.array([weights.get(name, 0.0) for name in FACTOR_NAMES])
+        scores = self._weighted_scores(values, confidences, weight_vector)
+
+        for result, factors, score in zip(results, all_factors, scores.tolist()):
+            result.score = score
+            self._apply_factors(result, factors, weights)
+
+        return [results[i] for i in self._tie_broken_order(results, scores)]
+
+    @staticmethod
+    def _weighted_scores(values, confidences, weight_vector):
+        """Confidence-adjusted weighted average for every row of the factor matrix.
+
+        Accumulates one factor column at a time, in FACTOR_NAMES order, so each
+        row gets exactly the floating-point result of _calculate_weighted_score.
+        """
+        score = np.zeros(values.shape[0])
+        total_weight = np.zeros(values.shape[0])
+        for j in np.flatnonzero(weight_vector > 0):
+            weighted_confidence = weight_vector[j] * confidences[:, j]
+            score += values[:, j] * weight_vector[j] * confidences[:, j]
+            total_weight += weighted_confidence
+        return np.divide(score, total_weight, out=np.zeros_like(score), where=total_weight > 0)
+
+    @staticmethod
+    def _tie_broken_order(results: List[SearchResult], scores) -> List[int]:
+        """Stable descending order matching _sort_key with reverse=True"""
+        original = np.array([getattr(r, '_original_score', 0.0) for r in results], dtype=float)
+        snippet_len = np.array([len(r.code_snippet) for r in results])
+        _, path_rank = np.unique(np.array([r.file_path for r in results]), return_inverse=True)
+        # np.lexsort is stable and treats its last key as the primary one
+        return np.lexsort((-path_rank, snippet_len, -original, -scores)).tolist()
+
+    async def _prepare_query_features(self, context: EnhancedContext) -> QueryFeatures:
+        """Compute the query keywords and expected patterns once per ranking call"""
+        query = getattr(context, 'query', '')
+        features = QueryFeatures(query=query)
+        if isinstance(query, str):
+            features.keywords = self._extract_keywords(query)
+        try:
+            features.patterns = await self._get_pattern_scorer().extract_query_patterns(query, context)
+        except Exception:
+            # Leave unset so the scorer reports the failure per result as before
+            features.patterns = None
+        return features
+
+    def _apply_factors(
+        self,
+        result: SearchResult,
+        factors: RankingFactors,
+        weights: Dict[str, float]
+    ) -> None:
+        """Populate explanation and ranking factor fields in SearchResult"""
+        result.ranking_explanation = self._generate_explanation(factors, weights)
+        result.context_similarity = factors.semantic_similarity.value
+        result.import_overlap = factors.import_similarity.value
+        result.pattern_match = factors.pattern_match.value
+
     def _calculate_normalization_bounds(self, results: List[SearchResult]) -> Dict[str, Tuple[float, float]]:
         """Calculate min/max bounds for normalization"""
         bounds = {
@@ -237,7 +346,8 @@ class ImprovedContextualRanker(Ranker):
         self,
         result: SearchResult,
         context: EnhancedContext,
-        normalization_bounds: Dict[str, Tuple[float, float]]
+        normalization_bounds: Dict[str, Tuple[float, float]],
+        query_features: Optional[QueryFeatures] = None
     ) -> RankingFactors:
         """Calculate all ranking factors with validation and normalization"""
         factors = RankingFactors()
@@ -262,7 +372,7 @@ class ImprovedContextualRanker(Ranker):
 
         # Semantic similarity with fallback
         factors.semantic_similarity = await self._calculate_semantic_similarity_with_fallback(
-            result, context
+            result, context, query_features.keywords if query_features else None
         )
 
         # Context overlap
@@ -288,22 +398,26 @@ class ImprovedContextualRanker(Ranker):
         factors.quality_score = quality_score
 
         # Pattern matching score
-        if not hasattr(self, 'pattern_scorer'):
-            from .pattern_matcher_integration import PatternMatchScorer
-            self.pattern_scorer = PatternMatchScorer(self.config)
-
         query = getattr(context, 'query', '')
-        pattern_score = await self.pattern_scorer.calculate_pattern_score(
-            result, query, context
+        pattern_score = await self._get_pattern_scorer().calculate_pattern_score(
+            result, query, context,
+            query_patterns=query_features.patterns if query_features else None
         )
         factors.pattern_match = ValidatedFactor(pattern_score, 0.7, "pattern_matcher")
 
         return factors
 
+    def _get_pattern_scorer(self):
+        if not hasattr(self, 'pattern_scorer'):
+            from .pattern_matcher_integration import PatternMatchScorer
+            self.pattern_scorer = PatternMatchScorer(self.config)
+        return self.pattern_scorer
+
     async def _calculate_semantic_similarity_with_fallback(
         self,
         result: SearchResult,
-        context: EnhancedContext
+        context: EnhancedContext,
+        query_keywords: Optional[set] = None
     ) -> ValidatedFactor:
         """Calculate semantic similarity with fallback strategies"""
         # 1) Cross-encoder reranker score (if available)
@@ -345,7 +459,8 @@ class ImprovedContextualRanker(Ranker):
         # 4) Fallback: Keyword overlap
         if hasattr(context, 'query'):
             keywords = self._extract_keywords(result.code_snippet)
-            query_keywords = self._extract_keywords(context.query)
+            if query_keywords is None:
+                query_keywords = self._extract_keywords(context.query)
 
             if keywords and query_keywords:
                 overlap = len(keywords & query_keywords) / len(keywords | query_keywords)
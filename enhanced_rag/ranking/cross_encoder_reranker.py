@@ -8,8 +8,15 @@ from __future__ import annotations
 
 import logging
 import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional, Any
 
+from ..utils.performance_monitor import PerformanceMonitor
+
 # Optional deps
 try:
     from sentence_transformers import CrossEncoder as STCrossEncoder  # type: ignore
@@ -121,70 +128,260 @@ class CrossEncoderReranker:
         rng = hi - lo
         return [(s - lo) / rng for s in clean]
 
-    def _score_with_st(self, query: str, texts: List[str]) -> List[float]:
+    def _predict_with_st(self, pairs: List[Tuple[str, str]]) -> List[float]:
         assert self._st_model is not None
-        pairs = [(query, t if t is not None else "") for t in texts]
-        try:
-            scores = self._st_model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
-            return self._normalize([float(s) for s in scores])
-        except Exception as e:
-            logger.warning("CrossEncoderReranker: ST predict failed: %s", e)
-            return self._score_lexical(query, texts)
+        scores = self._st_model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        return [float(s) for s in scores]
 
-    def _score_with_hf(self, query: str, texts: List[str]) -> List[float]:
+    def _predict_with_hf(self, pairs: List[Tuple[str, str]]) -> List[float]:
         assert self._hf_model is not None and self._hf_tokenizer is not None
+        if torch is None:
+            raise RuntimeError("torch not available")
+        model = self._hf_model
+        tok = self._hf_tokenizer
+        dev = next(model.parameters()).device  # type: ignore
         all_scores: List[float] = []
-        try:
-            model = self._hf_model
-            tok = self._hf_tokenizer
-            if torch is None:
-                return self._score_lexical(query, texts)
-            dev = next(model.parameters()).device  # type: ignore
-            for i in range(0, len(texts), self.batch_size):
-                batch = texts[i:i+self.batch_size]
-                inputs = tok([query]*len(batch), batch, padding=True, truncation=True, return_tensors="pt", max_length=512)
-                inputs = {k: v.to(dev) for k, v in inputs.items()}
-                with torch.no_grad():  # type: ignore
-                    out = model(**inputs)
-                logits = out.logits
-                if logits.shape[-1] == 1:
-                    # sigmoid for binary relevance
-                    probs = torch.sigmoid(logits).squeeze(-1)  # type: ignore
-                else:
-                    probs = torch.softmax(logits, dim=-1)[..., -1]  # type: ignore
-                all_scores.extend([float(x) for x in probs.detach().cpu().tolist()])  # type: ignore
-            return self._normalize(all_scores)
-        except Exception as e:
-            logger.warning("CrossEncoderReranker: HF predict failed: %s", e)
-            return self._score_lexical(query, texts)
+        for i in range(0, len(pairs), self.batch_size):
+            batch = pairs[i:i+self.batch_size]
+            inputs = tok([q for q, _ in batch], [t for _, t in batch], padding=True, truncation=True, return_tensors="pt", max_length=512)
+            inputs = {k: v.to(dev) for k, v in inputs.items()}
+            with torch.no_grad():  # type: ignore
+                out = model(**inputs)
+            logits = out.logits
+            if logits.shape[-1] == 1:
+                # sigmoid for binary relevance
+                probs = torch.sigmoid(logits).squeeze(-1)  # type: ignore
+            else:
+                probs = torch.softmax(logits, dim=-1)[..., -1]  # type: ignore
+            all_scores.extend([float(x) for x in probs.detach().cpu().tolist()])  # type: ignore
+        return all_scores
 
-    def score(self, query: str, candidates: List[Tuple[str, str]]) -> Dict[str, float]:
+    def _predict_pairs(self, pairs: List[Tuple[str, str]]) -> Tuple[List[float], bool]:
         """
-        Synchronous scoring API (used under the hood by async_score).
-        Returns dict {doc_id: normalized_score}
+        Score (query, text) pairs in one forward pass.
+        Returns (scores, model_scored); model scores still need per-query normalization.
         """
         self._ensure_loaded()
-        ids = [cid for cid, _ in candidates]
-        texts = [txt for _, txt in candidates]
-
+        pairs = [(q, t if t is not None else "") for q, t in pairs]
         if self._st_model is not None:
-            scores = self._score_with_st(query, texts)
+            try:
+                return self._predict_with_st(pairs), True
+            except Exception as e:
+                logger.warning("CrossEncoderReranker: ST predict failed: %s", e)
         elif self._hf_model is not None:
-            scores = self._score_with_hf(query, texts)
-        else:
-            scores = self._score_lexical(query, texts)
+            try:
+                return self._predict_with_hf(pairs), True
+            except Exception as e:
+                logger.warning("CrossEncoderReranker: HF predict failed: %s", e)
+        return [self._score_lexical(q, [t])[0] for q, t in pairs], False
 
-        # Align lengths safely
-        if len(scores) != len(ids):
-            logger.debug("CrossEncoderReranker: score length mismatch (%d != %d)", len(scores), len(ids))
-            m = min(len(scores), len(ids))
-            ids = ids[:m]
-            scores = scores[:m]
-        return {i: s for i, s in zip(ids, scores)}
+    def score_many(self, requests: List[Tuple[str, List[Tuple[str, str]]]]) -> List[Dict[str, float]]:
+        """
+        Score several (query, candidates) requests with a single forward pass.
+        Scores are normalized per request, so each result matches score().
+        """
+        pairs = [(query, txt) for query, candidates in requests for _, txt in candidates]
+        if not pairs:
+            return [{} for _ in requests]
+        flat, model_scored = self._predict_pairs(pairs)
+
+        results: List[Dict[str, float]] = []
+        offset = 0
+        for _, candidates in requests:
+            ids = [cid for cid, _ in candidates]
+            scores = flat[offset:offset + len(candidates)]
+            offset += len(candidates)
+            if model_scored:
+                scores = self._normalize(scores)
+            # Align lengths safely
+            if len(scores) != len(ids):
+                logger.debug("CrossEncoderReranker: score length mismatch (%d != %d)", len(scores), len(ids))
+                m = min(len(scores), len(ids))
+                ids = ids[:m]
+                scores = scores[:m]
+            results.append({i: s for i, s in zip(ids, scores)})
+        return results
+
+    def score(self, query: str, candidates: List[Tuple[str, str]]) -> Dict[str, float]:
+        """
+        Synchronous scoring API (used under the hood by async_score).
+        Returns dict {doc_id: normalized_score}
+        """
+        return self.score_many([(query, candidates)])[0]
 
     async def async_score(self, query: str, candidates: List[Tuple[str, str]]) -> Dict[str, float]:
         """
         Async scoring that offloads heavy CPU work to a thread executor when needed.
         """
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.score, query, candidates)
\ No newline at end of file
+        return await loop.run_in_executor(None, self.score, query, candidates)
+
+
+@dataclass
+class _ScoreRequest:
+    query: str
+    candidates: List[Tuple[str, str]]
+    future: "asyncio.Future[Dict[str, float]]"
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class RerankerService:
+    """
+    Process-wide cross-encoder service.
+
+    Keeps one warm CrossEncoderReranker and coalesces concurrent async_score
+    calls from in-flight queries into a single batched forward pass. A batch
+    is flushed once it holds ``max_batch_size`` pairs or ``max_wait_ms`` has
+    elapsed since its first request. Inference runs on a dedicated
+    single-thread executor so it never competes for the default executor.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 32,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 5.0,
+        device: Optional[str] = None,
+        performance_monitor: Optional[PerformanceMonitor] = None,
+    ):
+        self.reranker = CrossEncoderReranker(model_name=model_name, batch_size=batch_size, device=device)
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.performance_monitor = performance_monitor or PerformanceMonitor()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cross-encoder")
+        self._load_lock = threading.Lock()
+        # Queue and worker are bound to the event loop that first uses them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[_ScoreRequest]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    def _load(self) -> None:
+        with self._load_lock:
+            self.reranker._ensure_loaded()
+
+    async def warmup(self) -> None:
+        """Load the model ahead of the first query."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        await loop.run_in_executor(self._executor, self._load)
+        self.performance_monitor.record_metric("reranker_load_ms", (time.perf_counter() - start) * 1000)
+
+    def _ensure_worker(self) -> "asyncio.Queue[_ScoreRequest]":
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def async_score(self, query: str, candidates: List[Tuple[str, str]]) -> Dict[str, float]:
+        """Same contract as CrossEncoderReranker.async_score, but micro-batched."""
+        if not candidates:
+            return {}
+        queue = self._ensure_worker()
+        future: "asyncio.Future[Dict[str, float]]" = asyncio.get_running_loop().create_future()
+        queue.put_nowait(_ScoreRequest(query=query, candidates=list(candidates), future=future))
+        self.performance_monitor.increment_counter("reranker_requests")
+        return await future
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await queue.get()
+            batch = [first]
+            pairs = len(first.candidates)
+            flush_at = loop.time() + self.max_wait_ms / 1000.0
+            while pairs < self.max_batch_size:
+                if queue.empty():
+                    remaining = flush_at - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        req = await asyncio.wait_for(queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    req = queue.get_nowait()
+                batch.append(req)
+                pairs += len(req.candidates)
+            await self._score_batch(batch, queue.qsize())
+
+    async def _score_batch(self, batch: List[_ScoreRequest], queue_depth: int) -> None:
+        # Drop requests whose callers already gave up (e.g. stage timeout)
+        live = [req for req in batch if not req.future.done()]
+        if not live:
+            return
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(
+                self._executor,
+                self.reranker.score_many,
+                [(req.query, req.candidates) for req in live],
+            )
+        except Exception as e:
+            logger.warning("RerankerService: batch scoring failed: %s", e)
+            for req in live:
+                if not req.future.done():
+                    req.future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        monitor = self.performance_monitor
+        monitor.increment_counter("reranker_batches")
+        monitor.record_metric("reranker_batch_requests", len(live))
+        monitor.record_metric("reranker_batch_pairs", sum(len(req.candidates) for req in live))
+        monitor.record_metric("reranker_batch_latency_ms", (finished - started) * 1000)
+        monitor.record_metric("reranker_queue_depth", queue_depth)
+        for req in live:
+            monitor.record_metric("reranker_queue_wait_ms", (started - req.enqueued_at) * 1000)
+
+        for req, result in zip(live, results):
+            if not req.future.done():
+                req.future.set_result(result)
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting for the next batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, batch size and per-batch latency metrics."""
+        reranker = self.reranker
+        if reranker._st_model is not None:
+            backend = "sentence-transformers"
+        elif reranker._hf_model is not None:
+            backend = "transformers"
+        else:
+            backend = "lexical" if reranker._loaded else None
+        return {
+            "model_name": reranker.model_name,
+            "backend": backend,
+            "loaded": reranker._loaded,
+            "queue_depth": self.queue_depth(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            **self.performance_monitor.get_metrics(),
+        }
+
+
+_reranker_service: Optional[RerankerService] = None
+_reranker_service_lock = threading.Lock()
+
+
+def get_reranker_service() -> RerankerService:
+    """Get the process-wide reranker service, creating it from the environment on first use"""
+    global _reranker_service
+    if _reranker_service is None:
+        with _reranker_service_lock:
+            if _reranker_service is None:
+                _reranker_service = RerankerService(
+                    model_name=os.getenv("ENHANCED_RAG_RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+                    batch_size=int(os.getenv("ENHANCED_RAG_RERANKER_BATCH", "32")),
+                    max_batch_size=int(os.getenv("ENHANCED_RAG_RERANKER_MAX_BATCH_PAIRS", "256")),
+                    max_wait_ms=float(os.getenv("ENHANCED_RAG_RERANKER_MAX_WAIT_MS", "5")),
+                )
+    return _reranker_service
+
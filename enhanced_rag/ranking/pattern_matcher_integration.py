@@ -44,24 +44,29 @@ class PatternMatchScorer:
         self,
         result: SearchResult,
         query: str,
-        context: Optional[EnhancedContext] = None
+        context: Optional[EnhancedContext] = None,
+        query_patterns: Optional[set] = None
     ) -> float:
         """
         Calculate pattern match score between query and result
 
+        Pass query_patterns (from extract_query_patterns) when scoring many
+        results for the same query to skip re-deriving them per result.
+
         Returns score between 0 and 1
         """
         try:
-            # Extract patterns from result
-            result_patterns = await self._extract_result_patterns(result)
-
             # Extract expected patterns from query
-            query_patterns = await self._extract_query_patterns(query, context)
+            if query_patterns is None:
+                query_patterns = await self._extract_query_patterns(query, context)
 
             if not query_patterns:
                 # No patterns expected, return neutral score
                 return 0.5
 
+            # Extract patterns from result
+            result_patterns = await self._extract_result_patterns(result)
+
             # Calculate similarity score
             score = self._calculate_pattern_similarity(result_patterns, query_patterns)
 
@@ -75,6 +80,14 @@ class PatternMatchScorer:
             logger.error(f"Error calculating pattern score: {e}")
             return 0.0
 
+    async def extract_query_patterns(
+        self,
+        query: str,
+        context: Optional[EnhancedContext] = None
+    ) -> set:
+        """Patterns a query is looking for; reusable across results"""
+        return await self._extract_query_patterns(query, context)
+
     async def _extract_result_patterns(self, result: SearchResult) -> Dict[str, float]:
         """Extract patterns from search result with confidence scores"""
         patterns = {}
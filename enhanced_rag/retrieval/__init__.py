@@ -8,7 +8,7 @@ Multi-stage retrieval pipeline for code search with:
 - Result fusion
 """
 
-from .multi_stage_pipeline import MultiStageRetriever, SearchStage
+from .multi_stage_pipeline import MultiStageRetriever, RetrievalContext, SearchStage
 from .hybrid_searcher import HybridSearcher, HybridSearchResult
 from .dependency_resolver import DependencyResolver, Dependency
 # DEPRECATED: Use pattern_registry instead
@@ -17,6 +17,7 @@ from ..pattern_registry import get_pattern_registry, PatternType, PatternMatch
 
 __all__ = [
     'MultiStageRetriever',
+    'RetrievalContext',
     'SearchStage',
     'HybridSearcher',
     'HybridSearchResult',
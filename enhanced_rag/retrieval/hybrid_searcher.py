@@ -10,11 +10,14 @@ from dataclasses import dataclass
 from ..ranking.filter_manager import FilterManager
 
 from enhanced_rag.azure_integration.rest.operations import SearchOperations
-from enhanced_rag.azure_integration.rest.client import AzureSearchClient
+from enhanced_rag.azure_integration.rest.client import get_shared_search_client
+from enhanced_rag.azure_integration.index_pointer import resolve_index_name
 # Note: Azure SDK SearchClient and AzureKeyCredential removed - using REST API only
 
 from ..core.config import get_config, Config
 from enhanced_rag.utils.performance_monitor import PerformanceMonitor
+from enhanced_rag.utils.deadline import Deadline
+from enhanced_rag.utils.embedding_cache import QueryEmbeddingCache, get_query_embedding_cache
 
 # Add missing imports for type safety
 try:
@@ -42,6 +45,15 @@ class HybridSearcher:
     Implements hybrid search combining vector similarity and keyword matching
     """
 
+    @property
+    def _index_name(self) -> str:
+        # Resolved per request so a blue/green switch applies without a restart
+        return resolve_index_name(self._logical_index_name)
+
+    @_index_name.setter
+    def _index_name(self, name: str) -> None:
+        self._logical_index_name = name
+
     def _sanitize_search_kwargs(self, params: dict) -> dict:
         """
         Compatibility shim:
@@ -83,7 +95,8 @@ class HybridSearcher:
         self,
         config: Optional[Config | Dict[str, Any]] = None,
         performance_monitor: Optional[PerformanceMonitor] = None,
-        rest_ops: Optional[SearchOperations] = None
+        rest_ops: Optional[SearchOperations] = None,
+        embedding_cache: Optional[QueryEmbeddingCache] = None
     ):
         self.performance_monitor = performance_monitor or PerformanceMonitor()
         self.config = config or get_config()
@@ -91,6 +104,8 @@ class HybridSearcher:
         self._initialize_client()
         self.embedder = None
         self._setup_embedder()
+        # Shared across searchers so identical queries are embedded once per process
+        self.embedding_cache = embedding_cache or get_query_embedding_cache()
 
     def _initialize_client(self):
         """Initialize Azure Search client"""
@@ -164,7 +179,7 @@ class HybridSearcher:
             self._index_name = index_name
             self.search_client = None
             if self.rest_ops is None:
-                self._rest_client = AzureSearchClient(endpoint=endpoint, api_key=admin_key)
+                self._rest_client = get_shared_search_client(endpoint, admin_key)
                 self.rest_ops = SearchOperations(self._rest_client)
 
             # Log successful initialization with connection details for debugging
@@ -210,6 +225,25 @@ class HybridSearcher:
             logger.error(f"Failed to initialize embedder: {e}")
             self.embedder = None
 
+    async def _embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed a query through the cache, without blocking the event loop"""
+        if not self.embedder:
+            return None
+        model = getattr(self.embedder, "model_name", "") or ""
+        dimensions = getattr(self.embedder, "dimensions", None)
+
+        cached = await self.embedding_cache.aget(model, dimensions, query)
+        if cached is not None:
+            self.performance_monitor.increment_counter("query_embedding_cache_hits")
+            return cached
+        self.performance_monitor.increment_counter("query_embedding_cache_misses")
+
+        with self.performance_monitor.span("query_embedding"):
+            embedding = await self.embedder.agenerate_embedding(query)
+        if embedding:
+            await self.embedding_cache.aput(model, dimensions, query, embedding)
+        return embedding
+
 
     # ------------------------------------------------------------------ #
     #  NEW  – unified hybrid entry-point with semantic + vector + keyword
@@ -233,7 +267,12 @@ class HybridSearcher:
         deterministic pagination and weighted score fusion.
 
         Adds exact-term fallback boosting for numeric tokens and quoted phrases.
+
+        ``deadline_ms`` is one budget for the whole call: the concurrent
+        sub-paths share whatever remains of it rather than each getting
+        the full amount.
         """
+        deadline = Deadline(deadline_ms)
         if not self.rest_ops:
             logger.error(
                 "REST SearchOperations not initialized; hybrid search unavailable",
@@ -347,7 +386,7 @@ class HybridSearcher:
                 emb = None
                 if self.embedder:
                     try:
-                        emb = self.embedder.generate_embedding(query)
+                        emb = await self._embed_query(query)
                     except Exception as e:
                         logger.warning(f"Embedding generation failed: {e}")
                         emb = None
@@ -372,12 +411,13 @@ class HybridSearcher:
                 logger.warning("Vector search failed – %s", e)
                 return []
 
-        # Run all paths concurrently with optional per-path timeout
-        tasks = []
+        # Run all paths concurrently within what remains of the deadline
+        path_timeout = deadline.remaining_s()
+
         async def _with_timeout(coro):
-            if deadline_ms:
+            if path_timeout is not None:
                 try:
-                    return await asyncio.wait_for(coro, timeout=max(0.05, deadline_ms / 1000))
+                    return await asyncio.wait_for(coro, timeout=max(0.05, path_timeout))
                 except Exception as e:
                     logger.debug(f"Subsearch timed out or failed: {e}")
                     return []
@@ -466,7 +506,8 @@ class HybridSearcher:
         query: str,
         vector_queries: Optional[List[Any]] = None,
         filter_expr: Optional[str] = None,
-        top_k: int = 50
+        top_k: int = 50,
+        timeout: Optional[float] = None,
     ) -> List[HybridSearchResult]:
         """Execute vector similarity search (wrapper keeps old API)"""
         if not self.rest_ops:
@@ -475,19 +516,17 @@ class HybridSearcher:
             )
             return []
 
-        vector_query = self._build_vector_query(query, top_k)
+        vector_query = await self._build_vector_query(query, top_k)
         if not vector_query:
             logger.warning("Could not build vector query for: %s", query)
             return []
 
         try:
             # Execute vector search using REST API
-            options: Dict[str, Any] = {"top": top_k}
-            if VectorizedQuery is not None and getattr(vector_query, "vector", None):
-                options["vectorQueries"] = [{"vector": getattr(vector_query, "vector"), "k": top_k, "fields": "content_vector"}]
+            options: Dict[str, Any] = {"top": top_k, "vectorQueries": [vector_query]}
             if filter_expr:
                 options["filter"] = filter_expr
-            resp = await self.rest_ops.search(self._index_name, query="", **options)
+            resp = await self.rest_ops.search(self._index_name, query="", timeout=timeout, **options)
             return self._process_results(resp.get("value", []))
         except Exception as e:
             logger.error(f"Vector search failed: {e}")
@@ -627,26 +666,17 @@ class HybridSearcher:
 
         return processed
 
-    def _build_vector_query(self, query: str, k: int) -> Optional[Any]:
-        """Build vector query, preferring server-side vectorization."""
-        try:
-            # Prefer server-side vectorization with VectorizableTextQuery
-            if VectorizableTextQuery is not None:
-                return VectorizableTextQuery(
-                    text=query, k_nearest_neighbors=k, fields="content_vector"
-                )
-        except Exception:
-            pass
-        
-        # Fallback to client-side vectorization if the above is not supported
-        # or if an embedder is explicitly available.
+    async def _build_vector_query(self, query: str, k: int) -> Optional[Dict[str, Any]]:
+        """Build a REST vector query, preferring a cached client-side embedding."""
         if self.embedder:
             try:
-                embedding = self.embedder.generate_embedding(query)
-                if embedding and VectorizedQuery is not None:
-                    return VectorizedQuery(
-                        vector=embedding, k_nearest_neighbors=k, fields="content_vector"
-                    )
+                embedding = await self._embed_query(query)
+                if embedding:
+                    return {"kind": "vector", "vector": embedding, "k": k, "fields": "content_vector"}
             except Exception as e:
                 logger.error(f"Client-side embedding failed: {e}")
+
+        # Fall back to server-side vectorization (requires an index vectorizer)
+        if query:
+            return {"kind": "text", "text": query, "k": k, "fields": "content_vector"}
         return None
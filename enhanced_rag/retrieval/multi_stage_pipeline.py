@@ -5,20 +5,15 @@ Multi-stage retrieval pipeline orchestrating different search strategies
 import asyncio
 import logging
 import os
+import time
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
-# from ..utils.performance_monitor import PerformanceMonitor  # currently unused
-
-try:
-    from azure.search.documents import SearchClient
-    from azure.search.documents.models import QueryType
-    from azure.core.credentials import AzureKeyCredential
-except Exception:  # pragma: no cover
-    SearchClient = None  # type: ignore
-    QueryType = None  # type: ignore
-    AzureKeyCredential = None  # type: ignore
-from enhanced_rag.utils.error_handler import with_retry
+from ..utils.performance_monitor import PerformanceMonitor
+from ..utils.deadline import Deadline
 
+from ..azure_integration.rest import SearchOperations, get_shared_search_client
+from ..azure_integration.index_pointer import resolve_index_name
 from ..core.interfaces import Retriever
 from ..core.models import SearchQuery, SearchResult, SearchIntent, CodeContext
 from ..core.config import get_config, Config
@@ -29,6 +24,54 @@ from ..ranking.filter_manager import FilterManager
 
 logger = logging.getLogger(__name__)
 
+# Fields a stage hit must carry in candidate metadata to skip document hydration
+_HYDRATION_REQUIRED_FIELDS = ('content', 'file_path', 'repository', 'language')
+# Upper bound on ids per search.in() hydration query
+_HYDRATION_BATCH_SIZE = 50
+# Fields searched by the keyword and semantic stages
+_SEARCH_FIELDS = "content,function_name,class_name,docstring"
+
+
+# Operators of the simple query syntax, escaped when variants are OR'd together
+_SIMPLE_QUERY_SPECIAL = set('+-&|!(){}[]^~*?:\\/')
+
+
+def _escape_simple_query(text: str) -> str:
+    """Escape a free-text variant so it can be embedded in a combined query"""
+    escaped = "".join(f"\\{c}" if c in _SIMPLE_QUERY_SPECIAL else c for c in text)
+    # Keep balanced phrase quotes; drop them when unbalanced
+    if escaped.count('"') % 2:
+        escaped = escaped.replace('"', '')
+    return escaped
+
+
+@dataclass
+class RetrievalContext:
+    """State for a single retrieve() call.
+
+    Threaded through the stage executors, fusion and context assembly so
+    one MultiStageRetriever can serve concurrent queries without them
+    overwriting each other's metadata.
+    """
+    # Stage-captured metadata per doc id (highlights, original scores, content)
+    candidate_metadata: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Config mismatches or fallbacks to surface to clients
+    warnings: List[str] = field(default_factory=list)
+    # Assembled, token-bounded context for a downstream generation stage
+    context_text: str = ""
+    citations: List[Dict[str, Any]] = field(default_factory=list)
+    # End-to-end latency budget; unbounded unless the caller sets deadline_ms
+    deadline: Deadline = field(default_factory=Deadline)
+    # Set when a stage or phase was cut short and results are partial
+    degraded: bool = False
+
+    def meta(self, doc_id: str) -> Dict[str, Any]:
+        return self.candidate_metadata.setdefault(doc_id, {})
+
+    def mark_degraded(self, reason: str) -> None:
+        self.degraded = True
+        self.warnings.append(reason)
+
 
 class SearchStage(Enum):
     VECTOR = "vector"
@@ -62,68 +105,64 @@ class MultiStageRetriever(Retriever):
 
         self.config: Config = cfg
 
-        self.search_clients = self._initialize_clients()
-        self.hybrid_searcher = HybridSearcher(self.config.model_dump())
+        # One shared async REST client serves every stage (see rest.client)
+        self.index_names: Dict[str, str] = {
+            "main": self.config.azure.index_name or "codebase-mcp-sota",
+            "patterns": "codebase-patterns",
+            "dependencies": "codebase-dependencies",
+        }
+        self.rest_ops: Optional[SearchOperations] = self._initialize_clients()
+        self.hybrid_searcher = HybridSearcher(self.config.model_dump(), rest_ops=self.rest_ops)
         self.dependency_resolver = DependencyResolver(self.config.model_dump())
         self.pattern_registry = get_pattern_registry()
-        self._cache = {}
+        self._cache: Dict[str, SearchResult] = {}
+        # Physical index the caches were filled from
+        self._cache_index: Optional[str] = None
+        # Observed per-stage latencies; drive adaptive stage timeouts
+        self.stage_latency = PerformanceMonitor(max_history=200)
         # Cache for semantic fallback SIMPLE path keyed by (query, filter)
         self._semantic_fallback_cache: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
-        # Stage-level metadata captured during retrieval to preserve highlights and original scores
-        self._candidate_metadata: Dict[str, Dict[str, Any]] = {}
-        # Per-call warnings to surface config mismatches or fallbacks to clients
-        self._warnings: List[str] = []
-
-    def _initialize_clients(self) -> Dict[str, SearchClient]:
-        """Initialize search clients for different indexes"""
-        # Short-circuit if Azure Search SDK is not available at runtime
-        if SearchClient is None or AzureKeyCredential is None:
-            logger.warning("Azure Search SDK not available; skipping client initialization")
-            return {}
-        clients: Dict[str, SearchClient] = {}
 
+    @property
+    def main_index_name(self) -> str:
+        """Physical main index, following blue/green switches without a restart"""
+        return resolve_index_name(self.index_names["main"])
+
+    def _document_cache(self) -> Dict[str, SearchResult]:
+        """Document cache of the current main index, emptied when a switch repoints it"""
+        index = self.main_index_name
+        if index != self._cache_index:
+            self._cache = {}
+            self._semantic_fallback_cache = {}
+            self._cache_index = index
+        return self._cache
+
+    def _initialize_clients(self) -> Optional[SearchOperations]:
+        """Get REST operations on the process-wide Azure Search client"""
         try:
             endpoint = self.config.azure.endpoint
             admin_key = self.config.azure.admin_key
 
             if not endpoint or not admin_key:
                 logger.warning("Azure Search credentials not configured")
-                return clients
+                return None
 
-            credential = AzureKeyCredential(admin_key)
+            return SearchOperations(get_shared_search_client(endpoint, admin_key))
         except Exception as e:
-            logger.warning("Failed to get Azure Search configuration: %s", e)
-            return clients
-
-        main_index_name: str = self.config.azure.index_name or "codebase-mcp-sota"
-
-        index_names = {
-            "main": main_index_name,
-            "patterns": "codebase-patterns",
-            "dependencies": "codebase-dependencies",
-        }
-
-        for key, index_name in index_names.items():
-            try:
-                clients[key] = SearchClient(
-                    endpoint=endpoint,
-                    index_name=index_name,
-                    credential=credential,
-                    api_version="2024-07-01",
-                )
-            except Exception as e:
-                logger.warning(
-                    "Failed to initialize client for %s: %s",
-                    index_name,
-                    e,
-                    extra={
-                        "endpoint_host": (endpoint or "").split("://")[-1],
-                        "index_name": index_name,
-                        "component": "enhanced_rag.retrieval.multi_stage_pipeline",
-                    },
-                )
+            logger.warning(
+                "Failed to initialize Azure Search client: %s",
+                e,
+                extra={
+                    "endpoint_host": (getattr(self.config.azure, "endpoint", "") or "").split("://")[-1],
+                    "component": "enhanced_rag.retrieval.multi_stage_pipeline",
+                },
+            )
+            return None
 
-        return clients
+    def _stage_timeout(self, stage: str) -> Optional[float]:
+        """Per-request HTTP timeout in seconds for a stage, if configured"""
+        timeout_ms = self.config.retrieval.stage_timeouts_ms.get(stage)
+        return timeout_ms / 1000.0 if timeout_ms else None
 
     async def retrieve(
         self,
@@ -132,22 +171,36 @@ class MultiStageRetriever(Retriever):
         *,
         token_budget_ctx: int = 3500,
         deadline_ms: Optional[int] = None,
+        ctx: Optional[RetrievalContext] = None,
     ) -> List[SearchResult]:
         """
         Execute multi-stage retrieval pipeline
+
+        Pass ``ctx`` to read per-call warnings and the assembled context
+        afterwards; a fresh one is used otherwise. ``deadline_ms`` bounds the
+        whole call: stages that would overrun it are cancelled and partial
+        results are returned with ``ctx.degraded`` set.
         """
-        # Reset per-call candidate metadata store and warnings
-        self._candidate_metadata = {}
-        self._warnings = []
+        if ctx is None:
+            ctx = RetrievalContext()
+        if deadline_ms and not ctx.deadline.bounded:
+            ctx.deadline = Deadline(deadline_ms, self.config.performance.deadline_budget_shares)
+        stage_budget = ctx.deadline.phase_s("stages")
+
         # Fast path: BM25-only (keyword) – preserve BM25 scores from Azure
         if getattr(query, "bm25_only", False):
             try:
                 logger.info("Using BM25-only retrieval path")
-                pairs = await self._execute_keyword_search(query)  # List[Tuple[id, score]]
+                try:
+                    pairs = await self._run_stage_timed(SearchStage.KEYWORD, query, ctx, stage_budget)
+                except asyncio.TimeoutError:
+                    ctx.mark_degraded("stage_timeout:keyword")
+                    return []
                 max_k = getattr(query, "top_k", 20)
+                hydrated = await self._hydrate_documents([doc_id for doc_id, _ in pairs[:max_k]], ctx)
                 final_results: List[SearchResult] = []
                 for doc_id, score in pairs[:max_k]:
-                    result = await self._fetch_document(doc_id)
+                    result = hydrated.get(doc_id)
                     if result:
                         result.score = score  # Keep original BM25 score
                         final_results.append(result)
@@ -161,22 +214,11 @@ class MultiStageRetriever(Retriever):
                 query.intent or SearchIntent.IMPLEMENT
             )
 
-        # Execute stages in parallel with timeouts
-        stage_tasks = []
-        stage_timeout = 5.0  # 5 seconds per stage
-
-        for stage in stages:
-            # Wrap each stage execution with a timeout
-            stage_task = asyncio.create_task(
-                asyncio.wait_for(
-                    self._execute_stage(stage, query),
-                    timeout=stage_timeout
-                )
-            )
-            stage_tasks.append(stage_task)
-
-        # Gather with return_exceptions to handle failures gracefully
-        stage_results_raw = await asyncio.gather(*stage_tasks, return_exceptions=True)
+        # Execute stages in parallel, each under its adaptive timeout
+        stage_results_raw = await asyncio.gather(
+            *(self._run_stage_timed(stage, query, ctx, stage_budget) for stage in stages),
+            return_exceptions=True,
+        )
 
         # Filter out failed stages and log warnings
         stage_results = []
@@ -184,7 +226,8 @@ class MultiStageRetriever(Retriever):
             if isinstance(result, Exception):
                 stage_name = stages[idx] if idx < len(stages) else f"stage_{idx}"
                 if isinstance(result, asyncio.TimeoutError):
-                    logger.warning(f"Stage {stage_name} timed out after {stage_timeout}s")
+                    logger.warning(f"Stage {stage_name} cancelled at its deadline; using partial results")
+                    ctx.mark_degraded(f"stage_timeout:{getattr(stage_name, 'value', stage_name)}")
                 else:
                     logger.warning(f"Stage {stage_name} failed: {result}")
                 # Add empty result for failed stage
@@ -216,7 +259,7 @@ class MultiStageRetriever(Retriever):
 
             stage_results = trimmed_stage_results
 
-        fused_results = await self._fuse_results(stage_results, query)
+        fused_results = await self._fuse_results(stage_results, query, ctx)
 
         return fused_results
 
@@ -232,19 +275,55 @@ class MultiStageRetriever(Retriever):
         }
         return intent_stages.get(intent, [SearchStage.VECTOR, SearchStage.KEYWORD])
 
+    def _adaptive_stage_timeout(self, stage: SearchStage, budget_s: Optional[float]) -> float:
+        """Timeout for a stage: p95 of its recent latency times a multiplier,
+        clamped to configured bounds and to the remaining stage budget."""
+        perf = self.config.performance
+        metric = f"stage_{stage.value}_ms"
+        samples = len(self.stage_latency.metrics.get(metric, ()))
+        p95 = self.stage_latency.percentile(metric, 95) if samples >= 5 else None
+        timeout_ms = perf.stage_timeout_max_ms if p95 is None else p95 * perf.stage_timeout_p95_multiplier
+        timeout_ms = min(max(timeout_ms, perf.stage_timeout_min_ms), perf.stage_timeout_max_ms)
+        timeout = timeout_ms / 1000.0
+        return min(timeout, budget_s) if budget_s is not None else timeout
+
+    async def _run_stage_timed(
+        self,
+        stage: SearchStage,
+        query: SearchQuery,
+        ctx: RetrievalContext,
+        budget_s: Optional[float],
+    ) -> List[Tuple[str, float]]:
+        """Run a stage under its adaptive timeout and record its latency.
+
+        Cancelled runs are recorded at the time they were cut, so a stage
+        that keeps hitting its timeout pushes its own p95 (and timeout) up.
+        """
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                self._execute_stage(stage, query, ctx),
+                timeout=self._adaptive_stage_timeout(stage, budget_s),
+            )
+        finally:
+            self.stage_latency.record_metric(
+                f"stage_{stage.value}_ms", (time.perf_counter() - started) * 1000
+            )
+
     async def _execute_stage(
         self,
         stage: SearchStage,
-        query: SearchQuery
+        query: SearchQuery,
+        ctx: RetrievalContext,
     ) -> List[Tuple[str, float]]:
         """Execute a single search stage"""
         try:
             if stage == SearchStage.VECTOR:
-                return await self._execute_vector_search(query)
+                return await self._execute_vector_search(query, ctx)
             elif stage == SearchStage.KEYWORD:
-                return await self._execute_keyword_search(query)
+                return await self._execute_keyword_search(query, ctx)
             elif stage == SearchStage.SEMANTIC:
-                return await self._execute_semantic_search(query)
+                return await self._execute_semantic_search(query, ctx)
             elif stage == SearchStage.PATTERN:
                 return await self._execute_pattern_search(query)
             elif stage == SearchStage.DEPENDENCY:
@@ -256,16 +335,17 @@ class MultiStageRetriever(Retriever):
             logger.error(f"Error executing {stage} stage: {e}")
             return []
 
-    async def _execute_vector_search(self, query: SearchQuery) -> List[Tuple[str, float]]:
+    async def _execute_vector_search(self, query: SearchQuery, ctx: RetrievalContext) -> List[Tuple[str, float]]:
         """Execute vector similarity search"""
         results = await self.hybrid_searcher.vector_search(
             query.query,
             filter_expr=self._build_filter(query),
-            top_k=50
+            top_k=50,
+            timeout=self._stage_timeout("vector"),
         )
         # Preserve vector scores and any metadata provided by HybridSearcher
         for r in results or []:
-            meta = self._candidate_metadata.setdefault(r.id, {})
+            meta = ctx.meta(r.id)
             meta['vector_score'] = r.score
             # Fill in content and basic metadata if not already captured
             if 'content' not in meta and getattr(r, 'content', None):
@@ -276,45 +356,36 @@ class MultiStageRetriever(Retriever):
                     meta[key] = md[key]
         return [(r.id, r.score) for r in results]
 
-    async def _execute_keyword_search(self, query: SearchQuery) -> List[Tuple[str, float]]:
+    async def _execute_keyword_search(self, query: SearchQuery, ctx: RetrievalContext) -> List[Tuple[str, float]]:
         """Execute keyword-based search"""
-        if 'main' not in self.search_clients:
+        if self.rest_ops is None:
             return []
 
         # Use enhanced queries if available, otherwise fall back to original
         queries_to_search = query.queries if query.queries else [query.query]
-
-        def _do_keyword(search_text):
-            return with_retry(op_name="acs.keyword")(self.search_clients["main"].search)(
-                search_text=search_text,
-                query_type=QueryType.SIMPLE,
-                filter=self._build_filter(query),
-                include_total_count=True,
+        policy = self._keyword_variant_policy(query.intent)
+        variants = [q for q in dict.fromkeys(queries_to_search) if q][:policy['max_variants']]
+        if not variants:
+            return []
+        search_filter = self._build_filter(query)
+
+        async def _do_keyword(search_text):
+            resp = await self.rest_ops.search(
+                self.main_index_name,
+                query=search_text,
+                timeout=policy['timeout'] or None,
+                queryType="simple",
+                filter=search_filter,
+                count=True,
                 top=50,
-                search_fields=["content", "function_name", "class_name", "docstring"],
+                searchFields=_SEARCH_FIELDS,
             )
+            return resp.get("value", [])
 
-        # Execute searches for all query variants and merge results
-        all_docs = []
-        seen_ids = set()
-
-        for search_text in queries_to_search[:3]:  # Limit to first 3 variants for performance
-            try:
-                # Run blocking SDK call in a thread to avoid blocking the event loop
-                results = await asyncio.to_thread(_do_keyword, search_text)
-                # Materialize results to allow multiple passes and capture metadata
-                docs = list(results)
-
-                # Merge unique results
-                for doc in docs:
-                    doc_id = doc.get('id')
-                    if doc_id and doc_id not in seen_ids:
-                        all_docs.append(doc)
-                        seen_ids.add(doc_id)
-            except Exception as e:
-                logger.warning(f"Failed to search with query variant '{search_text}': {e}")
-
-        docs = all_docs
+        if policy['mode'] == 'or' and len(variants) > 1:
+            docs = await self._keyword_or_search(variants, _do_keyword, policy['timeout'], ctx)
+        else:
+            docs = await self._keyword_fanout(variants, _do_keyword, policy, ctx)
 
         # Capture original BM25 score and any snippet/highlights for later enrichment
         for r in docs:
@@ -323,7 +394,7 @@ class MultiStageRetriever(Retriever):
             except Exception:
                 # Skip entries without an id
                 continue
-            meta = self._candidate_metadata.setdefault(doc_id, {})
+            meta = ctx.meta(doc_id)
             # Preserve original keyword/BM25 score
             try:
                 meta['bm25_score'] = r.get('@search.score')  # type: ignore[attr-defined]
@@ -335,7 +406,8 @@ class MultiStageRetriever(Retriever):
                     pass
             # Preserve content and metadata if present
             for key in ('content', 'file_path', 'repository', 'language',
-                        'function_name', 'class_name', 'start_line', 'end_line'):
+                        'function_name', 'class_name', 'start_line', 'end_line',
+                        'imports', 'tags'):
                 try:
                     val = r.get(key)
                 except Exception:
@@ -370,63 +442,162 @@ class MultiStageRetriever(Retriever):
 
         return [(r['id'], r['@search.score']) for r in docs]
 
-    async def _execute_semantic_search(self, query: SearchQuery) -> List[Tuple[str, float]]:
+    def _keyword_variant_policy(self, intent: Optional[SearchIntent]) -> Dict[str, Any]:
+        """Resolve keyword variant settings, applying any per-intent override"""
+        rc = self.config.retrieval
+        settings = {
+            'keyword_variant_mode': rc.keyword_variant_mode,
+            'keyword_max_variants': rc.keyword_max_variants,
+            'keyword_merge_policy': rc.keyword_merge_policy,
+            'keyword_stage_timeout_ms': rc.keyword_stage_timeout_ms,
+        }
+        if intent is not None:
+            intent_key = intent.value if isinstance(intent, SearchIntent) else str(intent)
+            settings.update(rc.keyword_intent_overrides.get(intent_key, {}))
+        return {
+            'mode': str(settings['keyword_variant_mode']).lower(),
+            'max_variants': max(1, int(settings['keyword_max_variants'])),
+            'merge': str(settings['keyword_merge_policy']).lower(),
+            'timeout': max(0.0, float(settings['keyword_stage_timeout_ms']) / 1000.0),
+            # Enough unique ids to stop waiting on slower variants
+            'cutoff': max(1, int(rc.max_results_per_stage)),
+        }
+
+    async def _keyword_fanout(
+        self,
+        variants: List[str],
+        do_keyword,
+        policy: Dict[str, Any],
+        ctx: RetrievalContext,
+    ) -> List[Dict[str, Any]]:
+        """Run keyword variants concurrently under one stage deadline.
+
+        Results are merged as each variant completes. Collection stops early
+        once the cut-off number of unique ids is reached or the deadline
+        passes; variants still in flight are abandoned.
+        """
+        async def _run(idx: int, text: str):
+            return idx, await do_keyword(text)
+
+        tasks = [asyncio.create_task(_run(i, text)) for i, text in enumerate(variants)]
+        # id -> (variant index, position, doc)
+        merged: Dict[str, Tuple[int, int, Any]] = {}
+        keep_max = policy['merge'] != 'first'
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=policy['timeout'] or None):
+                try:
+                    idx, docs = await next_done
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Failed to search with query variant: {e}")
+                    continue
+                for pos, doc in enumerate(docs):
+                    doc_id = doc.get('id')
+                    if not doc_id:
+                        continue
+                    current = merged.get(doc_id)
+                    if current is None:
+                        merged[doc_id] = (idx, pos, doc)
+                    elif keep_max:
+                        if (doc.get('@search.score') or 0) > (current[2].get('@search.score') or 0):
+                            merged[doc_id] = (idx, pos, doc)
+                    elif (idx, pos) < current[:2]:
+                        merged[doc_id] = (idx, pos, doc)
+                if len(merged) >= policy['cutoff']:
+                    break
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Keyword stage deadline of %.0fms reached with %d/%d variants complete",
+                policy['timeout'] * 1000, sum(1 for t in tasks if t.done()), len(tasks),
+            )
+            ctx.warnings.append("keyword_stage_deadline")
+        finally:
+            for t in tasks:
+                if not t.done():
+                    t.cancel()
+
+        if keep_max:
+            ordered = sorted(merged.values(), key=lambda m: -(m[2].get('@search.score') or 0))
+        else:
+            ordered = sorted(merged.values(), key=lambda m: (m[0], m[1]))
+        return [m[2] for m in ordered]
+
+    async def _keyword_or_search(
+        self,
+        variants: List[str],
+        do_keyword,
+        timeout: float,
+        ctx: RetrievalContext,
+    ) -> List[Dict[str, Any]]:
+        """Send all variants as a single simple-syntax OR query"""
+        search_text = " | ".join(f"({_escape_simple_query(v)})" for v in variants)
+        try:
+            return await asyncio.wait_for(do_keyword(search_text), timeout or None)
+        except asyncio.TimeoutError:
+            logger.warning("Keyword OR query exceeded stage deadline of %.0fms", timeout * 1000)
+            ctx.warnings.append("keyword_stage_deadline")
+        except Exception as e:
+            logger.warning(f"Failed to search with combined query variants: {e}")
+        return []
+
+    async def _execute_semantic_search(self, query: SearchQuery, ctx: RetrievalContext) -> List[Tuple[str, float]]:
         """Execute semantic search with query understanding"""
-        if 'main' not in self.search_clients:
+        if self.rest_ops is None:
             return []
 
         # Enrich semantic search with facets, captions/answers, highlights, total count, search_fields and retries
         filter_expr = self._build_filter(query)
-        def _do_semantic():
-            # Get semantic config from config (prefer azure.semantic_config_name)
-            sem_cfg = (
-                getattr(getattr(self.config, "azure", object()), "semantic_config_name", None)
-                or getattr(self.config, "semantic_config_name", None)
-                or "semantic-config"
-            )
+        timeout = self._stage_timeout("semantic")
+        # Get semantic config from config (prefer azure.semantic_config_name)
+        sem_cfg = (
+            getattr(getattr(self.config, "azure", object()), "semantic_config_name", None)
+            or getattr(self.config, "semantic_config_name", None)
+            or "semantic-config"
+        )
 
-            return with_retry(op_name="acs.semantic")(self.search_clients["main"].search)(
-                search_text=query.query,
-                query_type=QueryType.SEMANTIC,
-                semantic_configuration_name=sem_cfg,  # Use config value
-                # scoring_profile="code_quality_boost",  # Commented out - profile doesn't exist
+        try:
+            resp = await self.rest_ops.search(
+                self.main_index_name,
+                query=query.query,
+                timeout=timeout,
+                queryType="semantic",
+                semanticConfiguration=sem_cfg,  # Use config value
+                # scoringProfile="code_quality_boost",  # Commented out - profile doesn't exist
                 filter=filter_expr,
                 facets=["language,count:20", "repository,count:20", "tags,count:20"],
-                query_caption="extractive",
-                query_answer="extractive",
-                highlight_fields="content,docstring",
-                include_total_count=True,
+                captions="extractive",
+                answers="extractive",
+                highlight="content,docstring",
+                count=True,
                 top=50,
-                search_fields=["content", "function_name", "class_name", "docstring"],
+                searchFields=_SEARCH_FIELDS,
             )
-
-        try:
-            results = await asyncio.to_thread(_do_semantic)
-            docs = list(results)
+            docs = resp.get("value", [])
         except Exception as e:
             # Fallback: semantic configuration missing or disabled – degrade to SIMPLE query
-            self._warnings.append("semantic_search_fallback_simple")
+            ctx.warnings.append("semantic_search_fallback_simple")
             logger.warning(f"Semantic search unavailable, falling back to keyword SIMPLE: {e}")
 
             # Try cached SIMPLE results first to avoid duplicate retries
             cache_key = (query.query, filter_expr)
+            self._document_cache()
             cached = self._semantic_fallback_cache.get(cache_key) if hasattr(self, "_semantic_fallback_cache") else None
             if cached is not None:
                 docs = list(cached)
             else:
-                def _do_simple():
-                    return with_retry(op_name="acs.semantic.fallback")(self.search_clients["main"].search)(
-                        search_text=query.query,
-                        query_type=QueryType.SIMPLE,
-                        filter=filter_expr,
-                        include_total_count=True,
-                        top=50,
-                        search_fields=["content", "function_name", "class_name", "docstring"],
-                        highlight_fields="content,docstring",
-                    )
-
-                results = await asyncio.to_thread(_do_simple)
-                docs = list(results)
+                resp = await self.rest_ops.search(
+                    self.main_index_name,
+                    query=query.query,
+                    timeout=timeout,
+                    queryType="simple",
+                    filter=filter_expr,
+                    count=True,
+                    top=50,
+                    searchFields=_SEARCH_FIELDS,
+                    highlight="content,docstring",
+                )
+                docs = resp.get("value", [])
                 # Cache bounded to 128 entries
                 try:
                     self._semantic_fallback_cache[cache_key] = docs
@@ -442,7 +613,7 @@ class MultiStageRetriever(Retriever):
                 doc_id = r['id']
             except Exception:
                 continue
-            meta = self._candidate_metadata.setdefault(doc_id, {})
+            meta = ctx.meta(doc_id)
 
             # Prefer reranker score; fall back to @search.score
             sem_score = None
@@ -464,7 +635,8 @@ class MultiStageRetriever(Retriever):
 
             # Preserve content and core metadata
             for key in ('content', 'file_path', 'repository', 'language',
-                        'function_name', 'class_name', 'start_line', 'end_line'):
+                        'function_name', 'class_name', 'start_line', 'end_line',
+                        'imports', 'tags'):
                 try:
                     val = r.get(key)  # type: ignore[attr-defined]
                 except Exception:
@@ -554,7 +726,8 @@ class MultiStageRetriever(Retriever):
     async def _fuse_results(
         self,
         stage_results: List[List[Tuple[str, float]]],
-        query: SearchQuery
+        query: SearchQuery,
+        ctx: RetrievalContext,
     ) -> List[SearchResult]:
         """Fuse results from multiple stages using stage-aware RRF with weighted scoring"""
         # RRF implementation with stage weights
@@ -608,7 +781,7 @@ class MultiStageRetriever(Retriever):
                 top_n = min(len(sorted_docs), int(getattr(query, "rerank_top_n", 100)))
                 candidates = []
                 for doc_id, _ in sorted_docs[:top_n]:
-                    meta = self._candidate_metadata.get(doc_id, {}) if hasattr(self, "_candidate_metadata") else {}
+                    meta = ctx.candidate_metadata.get(doc_id, {})
                     text = None
                     try:
                         hl = meta.get("highlights")
@@ -622,14 +795,16 @@ class MultiStageRetriever(Retriever):
                         text = str(meta.get("content") or "")
                     candidates.append((doc_id, text))
 
-                # Lazy import and score
+                # Lazy import; the shared warm service micro-batches concurrent queries
                 try:
-                    from enhanced_rag.ranking.cross_encoder_reranker import CrossEncoderReranker  # type: ignore
-                    model_name = os.getenv("ENHANCED_RAG_RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
-                    batch_size = int(os.getenv("ENHANCED_RAG_RERANKER_BATCH", "32"))
-                    reranker = CrossEncoderReranker(model_name=model_name, batch_size=batch_size)
-                    # async scoring to avoid blocking the loop
-                    ce_scores = await reranker.async_score(query.query, candidates)
+                    from enhanced_rag.ranking.cross_encoder_reranker import get_reranker_service  # type: ignore
+                    ce_scores = await asyncio.wait_for(
+                        get_reranker_service().async_score(query.query, candidates),
+                        timeout=ctx.deadline.phase_s("rerank"),
+                    )
+                except asyncio.TimeoutError:
+                    ctx.mark_degraded("rerank_deadline")
+                    ce_scores = {}
                 except Exception as ce_err:
                     logger.warning(f"Cross-encoder reranker unavailable or failed: {ce_err}")
                     ce_scores = {}
@@ -639,7 +814,7 @@ class MultiStageRetriever(Retriever):
                     # write into candidate metadata for later attachment
                     for doc_id, s in ce_scores.items():
                         try:
-                            meta = self._candidate_metadata.setdefault(doc_id, {})
+                            meta = ctx.meta(doc_id)
                             meta["cross_encoder_score"] = float(s)
                         except Exception:
                             pass
@@ -660,15 +835,17 @@ class MultiStageRetriever(Retriever):
         final_results = []
         top_k = getattr(query, 'top_k', 20)
 
+        # Hydrate all fused ids in one pass instead of one get_document per hit
+        hydrated = await self._hydrate_documents([doc_id for doc_id, _ in sorted_docs[:top_k]], ctx)
+
         for doc_id, fused_score in sorted_docs[:top_k]:
-            # Fetch full document details
-            result = await self._fetch_document(doc_id)
+            result = hydrated.get(doc_id)
             if result:
                 # Attach fused score
                 result.score = fused_score
 
                 # Enrich with stage-captured metadata (content, highlights, original scores)
-                meta = self._candidate_metadata.get(doc_id, {})
+                meta = ctx.candidate_metadata.get(doc_id, {})
 
                 # Preserve original BM25 / semantic / vector / cross-encoder scores for downstream use and display
                 if 'bm25_score' in meta:
@@ -734,9 +911,9 @@ class MultiStageRetriever(Retriever):
             for r in final_results:
                 if not hasattr(r, "citations"):
                     setattr(r, "citations", [])
-            # Store on retriever for downstream generation stage if needed
-            self._last_context_text = context_text
-            self._last_citations = citations
+            # Keep on the request context for a downstream generation stage
+            ctx.context_text = context_text
+            ctx.citations = citations
         except Exception as assemble_err:
             logger.warning(f"Context assembly failed: {assemble_err}")
 
@@ -850,10 +1027,10 @@ class MultiStageRetriever(Retriever):
             )
 
             # Convert dependencies to SearchResult objects
+            hydrated = await self._hydrate_documents([dep.file_id for dep in deps])
             results = []
             for dep in deps:
-                # Fetch full document details for each dependency
-                result = await self._fetch_document(dep.file_id)
+                result = hydrated.get(dep.file_id)
                 if result:
                     result.score = dep.relevance_score
                     results.append(result)
@@ -864,46 +1041,156 @@ class MultiStageRetriever(Retriever):
             logger.error(f"Error resolving dependencies: {e}")
             return []
 
+    async def _hydrate_documents(
+        self,
+        doc_ids: List[str],
+        ctx: Optional[RetrievalContext] = None,
+    ) -> Dict[str, SearchResult]:
+        """
+        Resolve many document ids to SearchResult objects in bulk.
+
+        Resolution order per id:
+        1. Retriever-level document cache
+        2. Stage-captured candidate metadata, when it already carries
+           the fields needed to render a result (no network call)
+        3. A single ``search.in(id, ...)`` filter query per batch of ids,
+           falling back to bounded concurrent ``get_document`` calls
+        """
+        hydrated: Dict[str, SearchResult] = {}
+        pending: List[str] = []
+
+        candidate_metadata = ctx.candidate_metadata if ctx is not None else {}
+        cache = self._document_cache()
+
+        for doc_id in dict.fromkeys(doc_ids):  # de-duplicate, keep order
+            if not doc_id:
+                continue
+            cached = cache.get(doc_id)
+            if cached is not None:
+                hydrated[doc_id] = cached.model_copy()
+                continue
+            meta = candidate_metadata.get(doc_id, {})
+            if all(meta.get(key) for key in _HYDRATION_REQUIRED_FIELDS):
+                hydrated[doc_id] = self._document_to_result(doc_id, meta)
+                continue
+            pending.append(doc_id)
+
+        if not pending or self.rest_ops is None:
+            return hydrated
+
+        budget = ctx.deadline.phase_s("hydrate") if ctx is not None else None
+        try:
+            await asyncio.wait_for(self._hydrate_pending(pending, hydrated, cache), timeout=budget)
+        except asyncio.TimeoutError:
+            # Keep what arrived; fall back to stage-captured content for the rest
+            ctx.mark_degraded("hydration_deadline")
+            for doc_id in pending:
+                meta = candidate_metadata.get(doc_id, {})
+                if doc_id not in hydrated and meta.get('content'):
+                    hydrated[doc_id] = self._document_to_result(doc_id, meta)
+
+        return hydrated
+
+    async def _hydrate_pending(
+        self,
+        pending: List[str],
+        hydrated: Dict[str, SearchResult],
+        cache: Dict[str, SearchResult]
+    ) -> None:
+        """Fetch pending ids into ``hydrated`` as they arrive"""
+        batches = [
+            pending[i:i + _HYDRATION_BATCH_SIZE]
+            for i in range(0, len(pending), _HYDRATION_BATCH_SIZE)
+        ]
+        batch_results = await asyncio.gather(
+            *(self._fetch_documents_batch(batch) for batch in batches),
+            return_exceptions=True,
+        )
+
+        missing: List[str] = []
+        for batch, docs in zip(batches, batch_results):
+            if isinstance(docs, Exception):
+                logger.warning(f"Bulk hydration failed for {len(batch)} ids, falling back to get_document: {docs}")
+                missing.extend(batch)
+                continue
+            for doc_id in batch:
+                doc = docs.get(doc_id)
+                if doc is None:
+                    missing.append(doc_id)
+                    continue
+                result = self._document_to_result(doc_id, doc)
+                cache[doc_id] = result
+                hydrated[doc_id] = result.model_copy()
+
+        if missing:
+            concurrency = max(1, int(os.getenv("ENHANCED_RAG_HYDRATION_CONCURRENCY", "8")))
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def _bounded_fetch(doc_id: str) -> None:
+                async with semaphore:
+                    result = await self._fetch_document(doc_id)
+                if result:
+                    hydrated[doc_id] = result
+
+            await asyncio.gather(*(_bounded_fetch(doc_id) for doc_id in missing))
+
+    async def _fetch_documents_batch(self, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch a batch of documents with one ``search.in`` filter query"""
+        id_list = ",".join(FilterManager.escape(doc_id) for doc_id in doc_ids)
+
+        resp = await self.rest_ops.search(
+            self.main_index_name,
+            query="*",
+            timeout=self._stage_timeout("hydrate"),
+            filter=f"search.in(id, '{id_list}', ',')",
+            top=len(doc_ids),
+        )
+        return {doc['id']: doc for doc in resp.get("value", []) if doc.get('id')}
+
+    @staticmethod
+    def _document_to_result(doc_id: str, doc: Dict[str, Any]) -> SearchResult:
+        """Convert an index document (or captured metadata) to a SearchResult"""
+        return SearchResult(
+            id=doc_id,
+            score=0.0,  # Will be updated by caller
+            file_path=doc.get('file_path') or '',
+            repository=doc.get('repository') or '',
+            function_name=doc.get('function_name'),
+            class_name=doc.get('class_name'),
+            code_snippet=doc.get('content') or '',
+            language=doc.get('language') or '',
+            start_line=doc.get('start_line'),
+            end_line=doc.get('end_line'),
+            dependencies=doc.get('imports') or [],
+            tags=doc.get('tags') or [],
+            complexity_score=doc.get('complexity_score'),
+            test_coverage=doc.get('test_coverage'),
+            last_modified=doc.get('last_modified')
+        )
+
     async def _fetch_document(self, doc_id: str) -> Optional[SearchResult]:
         """Fetch full document details from Azure Search"""
         try:
-            if 'main' not in self.search_clients:
+            if self.rest_ops is None:
                 return None
 
             # Try to get from cache first
-            if doc_id in self._cache:
-                return self._cache[doc_id]
+            cache = self._document_cache()
+            if doc_id in cache:
+                return cache[doc_id].model_copy()
 
             # Fetch from Azure Search
-            def _do_get():
-                return with_retry(op_name="acs.get_document")(self.search_clients['main'].get_document)(key=doc_id)
-
-            # Offload blocking get_document to thread pool
-            doc = await asyncio.to_thread(_do_get)
+            doc = await self.rest_ops.get_document(
+                self.main_index_name, doc_id, timeout=self._stage_timeout("hydrate")
+            )
 
             # Convert to SearchResult
-            result = SearchResult(
-                id=doc_id,
-                score=0.0,  # Will be updated by caller
-                file_path=doc.get('file_path', ''),
-                repository=doc.get('repository', ''),
-                function_name=doc.get('function_name'),
-                class_name=doc.get('class_name'),
-                code_snippet=doc.get('content', ''),
-                language=doc.get('language', ''),
-                start_line=doc.get('start_line'),
-                end_line=doc.get('end_line'),
-                dependencies=doc.get('imports', []),
-                tags=doc.get('tags', []),
-                complexity_score=doc.get('complexity_score'),
-                test_coverage=doc.get('test_coverage'),
-                last_modified=doc.get('last_modified')
-            )
+            result = self._document_to_result(doc_id, doc)
 
             # Cache the result
-            self._cache[doc_id] = result
+            cache[doc_id] = result
 
-            return result
+            return result.model_copy()
 
         except Exception as e:
             logger.error(f"Error fetching document {doc_id}: {e}")
@@ -0,0 +1,68 @@
+"""
+Adaptive concurrency limiting for Enhanced RAG
+
+Shared by the embedding and upload pipelines: concurrency grows while
+requests succeed and is cut, with a pause, when the service throttles.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limiter for concurrent requests to a throttling service.
+
+    The limit grows by one after every ``increase_after`` consecutive
+    successes and halves on a rate-limit response, which also pauses all
+    new requests until the Retry-After hint has elapsed.
+    """
+
+    def __init__(self, max_concurrency: int, initial: Optional[int] = None, increase_after: int = 4):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limit = max(1, min(self.max_concurrency, initial or self.max_concurrency))
+        self.increase_after = max(1, increase_after)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rate_limited = 0
+        self._successes = 0
+        self._paused_until = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while True:
+                delay = self._paused_until - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < self.limit:
+                    break
+                await self._cond.wait()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self, rate_limited: bool = False, retry_after: Optional[float] = None) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self.rate_limited += 1
+                self._successes = 0
+                self.limit = max(1, self.limit // 2)
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            else:
+                self._successes += 1
+                if self._successes >= self.increase_after and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    async def abandon(self) -> None:
+        """Free a slot whose request never finished (e.g. it was cancelled), without changing the limit"""
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
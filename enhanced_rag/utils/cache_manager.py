@@ -3,7 +3,7 @@ Simple cache manager for enhanced RAG pipeline
 """
 
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
 from collections import OrderedDict
 import asyncio
 import fnmatch
@@ -17,6 +17,11 @@ class CacheManager:
         self.max_size = max_size
         self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
         self._lock = asyncio.Lock()
+        # In-flight computations for single-flight de-duplication
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
         
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache if not expired"""
@@ -26,11 +31,62 @@ class CacheManager:
                 if time.time() - entry['timestamp'] < self.ttl:
                     # Move to end (LRU)
                     self._cache.move_to_end(key)
+                    self._hits += 1
                     return entry['value']
                 else:
                     # Expired
                     del self._cache[key]
+            self._misses += 1
             return None
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, str]:
+        """Return the cached value for key, computing it at most once.
+
+        Concurrent callers asking for the same missing key wait on the
+        first caller's computation instead of starting their own.
+
+        Returns:
+            (value, source) where source is "hit", "coalesced" or "miss".
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value, "hit"
+
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(fut), "coalesced"
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise
+                # The leading caller was cancelled; compute on our own
+                return await compute(), "miss"
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't log a warning
+            fut.exception()
+            raise
+        else:
+            fut.set_result(value)
+            if value is not None and (cacheable is None or cacheable(value)):
+                await self.set(key, value)
+            return value, "miss"
+        finally:
+            self._inflight.pop(key, None)
             
     async def set(self, key: str, value: Any) -> None:
         """Set value in cache"""
@@ -90,10 +146,16 @@ class CacheManager:
                 if current_time - entry['timestamp'] >= self.ttl:
                     expired += 1
                     
+            lookups = self._hits + self._misses
             return {
                 'total_entries': total_entries,
                 'active_entries': total_entries - expired,
                 'expired_entries': expired,
                 'max_size': self.max_size,
-                'ttl_seconds': self.ttl
+                'ttl_seconds': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'coalesced': self._coalesced,
+                'hit_ratio': (self._hits / lookups) if lookups else 0.0,
+                'inflight': len(self._inflight)
             }
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+End-to-end latency budgets for the search path
+"""
+
+import time
+from typing import Dict, Optional
+
+# Pipeline phases in execution order
+PHASES = ("context", "enhance", "stages", "rerank", "hydrate", "rank")
+
+# Default split of a request budget across phases. A phase gets its share
+# of whatever remains relative to the phases still to run, so time left
+# over by a fast (or skipped) phase carries forward.
+DEFAULT_BUDGET_SHARES: Dict[str, float] = {
+    "context": 0.05,   # code context extraction
+    "enhance": 0.05,   # intent + query enhancement
+    "stages": 0.50,    # parallel retrieval stages
+    "rerank": 0.10,    # optional cross-encoder reranking of fused results
+    "hydrate": 0.10,   # document hydration
+    "rank": 0.20,      # contextual ranking and explanations
+}
+
+
+class Deadline:
+    """Monotonic deadline for one request; unbounded when budget_ms is None"""
+
+    def __init__(self, budget_ms: Optional[float] = None, shares: Optional[Dict[str, float]] = None):
+        self.budget_ms = float(budget_ms) if budget_ms and budget_ms > 0 else None
+        # Phases missing from a configured split keep their default share
+        self.shares = {**DEFAULT_BUDGET_SHARES, **(shares or {})}
+        self._start = time.monotonic()
+
+    @property
+    def bounded(self) -> bool:
+        return self.budget_ms is not None
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self._start) * 1000
+
+    def remaining_ms(self) -> Optional[float]:
+        if self.budget_ms is None:
+            return None
+        return max(0.0, self.budget_ms - self.elapsed_ms())
+
+    def expired(self) -> bool:
+        remaining = self.remaining_ms()
+        return remaining is not None and remaining <= 0
+
+    def remaining_s(self) -> Optional[float]:
+        remaining = self.remaining_ms()
+        return None if remaining is None else remaining / 1000.0
+
+    def phase_s(self, phase: str, floor_ms: float = 10.0) -> Optional[float]:
+        """Seconds allotted to a phase out of the time that remains"""
+        if self.budget_ms is None:
+            return None
+        upcoming = PHASES[PHASES.index(phase):] if phase in PHASES else (phase,)
+        total_share = sum(self.shares.get(p, 0.0) for p in upcoming)
+        fraction = self.shares.get(phase, 0.0) / total_share if total_share else 1.0
+        return max(floor_ms, (self.remaining_ms() or 0.0) * fraction) / 1000.0
@@ -0,0 +1,156 @@
+"""
+Query embedding cache for Enhanced RAG
+
+Two tiers keyed by (model, dimensions, normalized text):
+- in-memory LRU of float32 arrays
+- optional SQLite file that survives restarts
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """LRU + optional on-disk cache for query embeddings"""
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.path = path
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                    " key TEXT PRIMARY KEY, model TEXT, dimensions INTEGER,"
+                    " vector BLOB NOT NULL, created_at REAL)"
+                )
+                self._db.commit()
+            except Exception as e:
+                logger.warning("Query embedding disk cache unavailable at %s: %s", path, e)
+                self._db = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so trivially different queries share an entry"""
+        return " ".join((text or "").split())
+
+    @classmethod
+    def make_key(cls, model: str, dimensions: Optional[int], text: str) -> str:
+        raw = f"{model}\x00{dimensions or ''}\x00{cls.normalize(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, dimensions: Optional[int], text: str) -> Optional[List[float]]:
+        """Look up an embedding, promoting disk hits into memory"""
+        key = self.make_key(model, dimensions, text)
+        with self._lock:
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return vec.tolist()
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT vector FROM query_embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                except Exception as e:
+                    logger.debug("Query embedding disk lookup failed: %s", e)
+                    row = None
+                if row is not None:
+                    vec = array("f")
+                    vec.frombytes(row[0])
+                    self._remember(key, vec)
+                    self._stats["disk_hits"] += 1
+                    return vec.tolist()
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, model: str, dimensions: Optional[int], text: str, embedding: List[float]) -> None:
+        """Store an embedding in memory and, when configured, on disk"""
+        if not embedding:
+            return
+        key = self.make_key(model, dimensions, text)
+        vec = array("f", embedding)
+        with self._lock:
+            self._remember(key, vec)
+            self._stats["writes"] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO query_embeddings (key, model, dimensions, vector, created_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (key, model, dimensions, vec.tobytes(), time.time()),
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    logger.debug("Query embedding disk write failed: %s", e)
+
+    def _remember(self, key: str, vec: array) -> None:
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def aget(self, model: str, dimensions: Optional[int], text: str) -> Optional[List[float]]:
+        """Async lookup; only the disk tier is moved off the event loop"""
+        if self._db is None:
+            return self.get(model, dimensions, text)
+        return await asyncio.to_thread(self.get, model, dimensions, text)
+
+    async def aput(self, model: str, dimensions: Optional[int], text: str, embedding: List[float]) -> None:
+        if self._db is None:
+            self.put(model, dimensions, text, embedding)
+            return
+        await asyncio.to_thread(self.put, model, dimensions, text, embedding)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["max_entries"] = self.max_entries
+            stats["disk_path"] = self.path
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = ((stats["memory_hits"] + stats["disk_hits"]) / lookups) if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_query_embedding_cache: Optional[QueryEmbeddingCache] = None
+_query_embedding_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache, configured from the environment"""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        with _query_embedding_cache_lock:
+            if _query_embedding_cache is None:
+                _query_embedding_cache = QueryEmbeddingCache(
+                    max_entries=int(os.getenv("ENHANCED_RAG_QUERY_EMBEDDING_CACHE_SIZE", "1024")),
+                    path=os.getenv("ENHANCED_RAG_QUERY_EMBEDDING_CACHE_PATH") or None,
+                )
+    return _query_embedding_cache
@@ -49,6 +49,15 @@ class PerformanceMonitor:
         """Increment a counter"""
         self.counters[counter_name] += amount
 
+    def percentile(self, metric_name: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of a metric's recorded values, or None if empty"""
+        values = self.metrics.get(metric_name)
+        if not values:
+            return None
+        ordered = sorted(v['value'] for v in values)
+        rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[rank]
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get current performance metrics"""
         current_metrics = {}
@@ -61,6 +70,7 @@ class PerformanceMonitor:
                     'avg': sum(recent_values) / len(recent_values),
                     'min': min(recent_values),
                     'max': max(recent_values),
+                    'p95': self.percentile(metric_name, 95),
                     'latest': recent_values[-1]
                 }
 
@@ -14,6 +14,7 @@ from .search_impl import (
     search_code_impl,
     search_microsoft_docs_impl,
     explain_ranking_impl,
+    invalidate_search_cache,
 )
 
 __all__ = [
@@ -30,4 +31,5 @@ __all__ = [
     "search_code_impl",
     "search_microsoft_docs_impl",
     "explain_ranking_impl",
+    "invalidate_search_cache",
 ]
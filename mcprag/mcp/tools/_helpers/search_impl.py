@@ -1,7 +1,10 @@
 """Search implementation helpers for MCP tools."""
 
+import copy
+import json
 import time
 import asyncio
+import hashlib
 import logging
 import difflib
 from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
@@ -39,6 +42,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Cache scope for search_code results; keys are "search:<repository>:<digest>"
+SEARCH_CACHE_SCOPE = "search"
+# Segment for searches without a repository filter; '~' never survives
+# repository sanitizing, so no repository name can collide with it
+ALL_REPOSITORIES_SEGMENT = "~all"
+
 
 async def search_code_impl(
     server: "MCPServer",
@@ -59,6 +68,7 @@ async def search_code_impl(
     detail_level: str,
     snippet_lines: int,
     simulate_failure: Optional[str] = None,   # <-- NUOVO
+    deadline_ms: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Implementation of search_code functionality."""
     from ....utils.response_helpers import ok, err
@@ -73,7 +83,6 @@ async def search_code_impl(
             "invalid_auth":       "Authentication failed – invalid credentials",
             "timeout":            "Search operation timed-out",
         }.get(simulate_failure, "Simulated failure")
-        from ....utils.response_helpers import ok
         return ok({
             "items": [],
             "count": 0,
@@ -125,6 +134,188 @@ async def search_code_impl(
     if exact_terms is None and query:
         exact_terms = extract_exact_terms(query)
 
+    if deadline_ms is not None and deadline_ms <= 0:
+        deadline_ms = None
+
+    async def _compute() -> Dict[str, Any]:
+        return await _run_search(
+            server,
+            query=query,
+            intent=intent,
+            language=language,
+            repository=repository,
+            max_results=max_results,
+            include_dependencies=include_dependencies,
+            skip=skip,
+            orderby=orderby,
+            highlight_code=highlight_code,
+            bm25_only=bm25_only,
+            exact_terms=exact_terms,
+            dependency_mode=dependency_mode,
+            detail_level=detail_level,
+            snippet_lines=snippet_lines,
+            start_time=start_time,
+            deadline_ms=deadline_ms,
+        )
+
+    cache = None if disable_cache else server.cache_manager
+    source = None
+    if cache is None:
+        response = await _compute()
+    else:
+        key = _search_cache_key(
+            query=query,
+            intent=intent,
+            language=language,
+            repository=repository,
+            max_results=max_results,
+            include_dependencies=include_dependencies,
+            skip=skip,
+            orderby=orderby,
+            highlight_code=highlight_code,
+            bm25_only=bm25_only,
+            exact_terms=exact_terms,
+            dependency_mode=dependency_mode,
+            detail_level=detail_level,
+            snippet_lines=snippet_lines,
+        )
+        try:
+            # Partial (degraded) results are served but never cached
+            response, source = await cache.get_or_compute(
+                key,
+                _compute,
+                cacheable=lambda r: bool(r.get("ok")) and not r.get("data", {}).get("degraded"),
+            )
+        except Exception as e:
+            return err(str(e))
+        # Cached envelopes are shared; never hand out or mutate the stored copy
+        response = copy.deepcopy(response)
+
+    # Per-request fields are applied after the cache so hits report their own timing
+    if response.get("ok") and isinstance(response.get("data"), dict):
+        data = response["data"]
+        took_ms = (time.time() - start_time) * 1000
+        data["took_ms"] = took_ms
+        data["query"] = query
+        if source in ("hit", "coalesced"):
+            data["cache_hit"] = True
+        if disable_cache:
+            data["cache_disabled"] = True
+        if include_timings:
+            data["timings_ms"] = {"total": took_ms}
+
+    return response
+
+
+def _search_cache_key(
+    query: str,
+    intent: Optional[str],
+    language: Optional[str],
+    repository: Optional[str],
+    max_results: int,
+    include_dependencies: bool,
+    skip: int,
+    orderby: Optional[str],
+    highlight_code: bool,
+    bm25_only: bool,
+    exact_terms: Optional[List[str]],
+    dependency_mode: str,
+    detail_level: str,
+    snippet_lines: int,
+) -> str:
+    """Build the search cache key.
+
+    The repository is kept readable in the key so writes to one repository
+    can invalidate only its entries (see invalidate_search_cache).
+    """
+    normalized = " ".join((query or "").split()).lower()
+    payload = json.dumps(
+        {
+            "q": normalized,
+            "intent": intent,
+            "language": (language or "").lower() or None,
+            "repository": (repository or "").lower() or None,
+            "max_results": max_results,
+            "include_dependencies": include_dependencies,
+            "skip": skip,
+            "orderby": orderby,
+            "highlight_code": highlight_code,
+            "bm25_only": bm25_only,
+            "exact_terms": sorted(exact_terms) if exact_terms else None,
+            "dependency_mode": dependency_mode,
+            "detail_level": detail_level,
+            "snippet_lines": snippet_lines,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{SEARCH_CACHE_SCOPE}:{_repo_cache_segment(repository)}:{digest}"
+
+
+def _repo_cache_segment(repository: Optional[str]) -> str:
+    # ':' and glob metacharacters would break the scope/pattern matching
+    repo = (repository or "").strip().lower()
+    return "".join(c if c.isalnum() or c in "-_./" else "_" for c in repo) or ALL_REPOSITORIES_SEGMENT
+
+
+async def invalidate_search_cache(
+    server: "MCPServer", repositories: Optional[List[str]] = None
+) -> int:
+    """Drop cached search results affected by a write.
+
+    Entries for each named repository are removed along with unscoped
+    searches, which may contain hits from any repository. Without
+    repository names the whole search scope is cleared.
+
+    Returns:
+        Number of entries removed.
+    """
+    cache = getattr(server, "cache_manager", None)
+    if cache is None:
+        return 0
+    try:
+        repos = [r for r in (repositories or []) if r]
+        if not repos:
+            return await cache.clear_scope(SEARCH_CACHE_SCOPE)
+        removed = await cache.clear_pattern(f"{SEARCH_CACHE_SCOPE}:{ALL_REPOSITORIES_SEGMENT}:*")
+        for segment in {_repo_cache_segment(r) for r in repos}:
+            removed += await cache.clear_scope(f"{SEARCH_CACHE_SCOPE}:{segment}")
+        return removed
+    except Exception as e:
+        logger.warning(f"Search cache invalidation failed: {e}")
+        return 0
+
+
+async def _run_search(
+    server: "MCPServer",
+    query: str,
+    intent: Optional[str],
+    language: Optional[str],
+    repository: Optional[str],
+    max_results: int,
+    include_dependencies: bool,
+    skip: int,
+    orderby: Optional[str],
+    highlight_code: bool,
+    bm25_only: bool,
+    exact_terms: Optional[List[str]],
+    dependency_mode: str,
+    detail_level: str,
+    snippet_lines: int,
+    start_time: float,
+    deadline_ms: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run the search backend and build the response envelope."""
+    from ....utils.response_helpers import ok, err
+
+    def _remaining_ms() -> Optional[int]:
+        if deadline_ms is None:
+            return None
+        return max(1, int(deadline_ms - (time.time() - start_time) * 1000))
+
+    degraded = False
+
     try:
 
         # Use enhanced search if available
@@ -145,11 +336,13 @@ async def search_code_impl(
                 highlight_code=highlight_code,
                 exact_terms=exact_terms,
                 dependency_mode=dependency_mode,
+                deadline_ms=_remaining_ms(),
             )
 
             # Check if enhanced search returned an error
             if "error" in result:
                 return err(result["error"])
+            degraded = bool((result.get("metadata") or {}).get("degraded"))
 
             # Pick correct list of items based on requested detail level
             items = _get_items_by_detail_level(result, detail_level)
@@ -163,9 +356,16 @@ async def search_code_impl(
             # Add null check for type checker
             if server.search_client is None:
                 return err("Search client is not initialized")
-            items, total = await _basic_search(
-                server.search_client, query, language, repository, max_results, skip, orderby
-            )
+            try:
+                remaining = _remaining_ms()
+                items, total = await asyncio.wait_for(
+                    _basic_search(
+                        server.search_client, query, language, repository, max_results, skip, orderby
+                    ),
+                    timeout=remaining / 1000 if remaining is not None else None,
+                )
+            except asyncio.TimeoutError:
+                items, total, degraded = [], 0, True
         else:
             return err("No search backend available")
 
@@ -194,11 +394,8 @@ async def search_code_impl(
                 "query": query,
                 "applied_exact_terms": bool(exact_terms),
                 "backend": backend,
+                "degraded": degraded,
             }
-            if disable_cache:
-                response["cache_disabled"] = True
-            if include_timings:
-                response["timings_ms"] = {"total": took_ms}
             return ok(response)
 
         # Normalize to a stable schema for presentation
@@ -235,12 +432,8 @@ async def search_code_impl(
             "backend": backend,
             "has_more": has_more,
             "next_skip": next_skip_value,
+            "degraded": degraded,
         }
-        if include_timings:
-            response["timings_ms"] = {
-                "total": took_ms
-            }
-        
         # Ensure overall response consistency
         response = ensure_consistent_response(response)
         
@@ -289,7 +482,6 @@ def _build_compact(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     out = []
     for i, e in enumerate(entries, start=1):
         # Ensure fields are consistent first
-        from .data_consistency import ensure_consistent_fields
         e = ensure_consistent_fields(e)
         
         line_ref = f":{e['start_line']}" if e.get('start_line') else ""
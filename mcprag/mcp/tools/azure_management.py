@@ -7,6 +7,7 @@ from typing import Optional, List, Dict, Any, TYPE_CHECKING, Tuple
 from enhanced_rag.core.unified_config import get_config
 from ...utils.response_helpers import ok, err
 from .base import check_component
+from ._helpers import invalidate_search_cache
 
 if TYPE_CHECKING:
     from ...server import MCPServer
@@ -159,6 +160,7 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
                 result = await server.index_automation.recreate_index(
                     index_definition, backup_documents
                 )
+                await invalidate_search_cache(server)
                 return ok(result)
 
             elif action == "delete":
@@ -167,6 +169,7 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
                 # Component already checked above
                 assert server.rest_ops is not None  # for type checker
                 await server.rest_ops.delete_index(index_name)
+                await invalidate_search_cache(server)
                 return ok({"deleted": True, "index": index_name})
 
             elif action == "optimize":
@@ -259,6 +262,11 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
                 result = await server.data_automation.bulk_upload(
                     index_name, doc_generator(), batch_size, merge
                 )
+                repos = [d.get("repository") for d in documents if isinstance(d, dict)]
+                # Documents without a repository could surface in any search
+                await invalidate_search_cache(
+                    server, repos if all(repos) else None
+                )
                 return ok(result)
 
             elif action == "delete":
@@ -268,6 +276,8 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
                 if server.rest_ops is None:
                     return err("REST operations component is not initialized")
                 result = await server.rest_ops.delete_documents(index_name, document_keys)
+                # Keys don't tell us the repository, so drop every cached search
+                await invalidate_search_cache(server)
                 return ok({"deleted": len(document_keys), "index": index_name})
 
             elif action == "cleanup":
@@ -279,6 +289,8 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
                 result = await server.data_automation.cleanup_old_documents(
                     index_name, date_field, days_old, batch_size, dry_run
                 )
+                if not dry_run:
+                    await invalidate_search_cache(server)
                 return ok(result)
 
             elif action == "count":
@@ -442,7 +454,12 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
             "indexer_automation": server.indexer_automation is not None,
         }
         overall = all(components.values())
-        return ok({"healthy": overall, "components": components})
+        result: Dict[str, Any] = {"healthy": overall, "components": components}
+        registry = getattr(server, "components", None)
+        if registry is not None:
+            # What the shared registry built and how long each piece took
+            result["construction"] = registry.report()
+        return ok(result)
 
     @mcp.tool()
     async def create_datasource(
@@ -747,6 +764,8 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
             if returncode != 0:
                 return err(f"Failed to index repository: {stderr}")
 
+            await invalidate_search_cache(server, [repo_name])
+
             return ok({
                 "indexed": True,
                 "repo_path": repo_path,
@@ -784,6 +803,8 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
             if returncode != 0:
                 return err(f"Failed to index changed files: {stderr}")
 
+            await invalidate_search_cache(server, [repo_name])
+
             return ok({
                 "indexed": True,
                 "files": files,
@@ -932,12 +953,19 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
 
     @mcp.tool()
     async def rebuild_index(
-        confirm: bool = False
+        confirm: bool = False,
+        method: str = "blue-green"
     ) -> Dict[str, Any]:
-        """Drop and rebuild the entire index. ⚠️ CAUTION: This deletes all data!
+        """Rebuild the entire index.
+
+        "blue-green" (default) builds a new index version next to the live
+        one, verifies it and switches to it; the live index keeps serving
+        throughout. "drop-rebuild" deletes the index first. ⚠️ CAUTION: that
+        deletes all data!
 
         Args:
-            confirm: Must be set to True to confirm this destructive operation
+            confirm: Must be set to True to confirm the rebuild
+            method: "blue-green" or "drop-rebuild"
         """
         try:
             from enhanced_rag.core.unified_config import UnifiedConfig as Config
@@ -945,10 +973,13 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
                 return err("Admin mode required for index rebuild")
 
             if not confirm:
-                return err("Must set confirm=True to rebuild index. This operation deletes all data!")
+                return err("Must set confirm=True to rebuild index. drop-rebuild deletes all data!")
+
+            if method not in ("blue-green", "drop-rebuild"):
+                return err(f"Unknown rebuild method: {method}")
 
             # Build CLI arguments
-            argv = ["reindex", "--method", "drop-rebuild"]
+            argv = ["reindex", "--method", method]
             
             # Run CLI command
             returncode, stdout, stderr = _run_enhanced_cli(argv)
@@ -956,8 +987,19 @@ def register_azure_tools(mcp, server: "MCPServer") -> None:
             if returncode != 0:
                 return err(f"Failed to rebuild index: {stderr}")
 
+            # Every document may have changed, so drop every cached search
+            await invalidate_search_cache(server)
+
+            if method == "blue-green":
+                return ok({
+                    "rebuilt": True,
+                    "method": method,
+                    "note": "Previous index version kept for rollback",
+                    "output": stdout
+                })
             return ok({
                 "rebuilt": True,
+                "method": method,
                 "warning": "All previous data has been deleted",
                 "output": stdout
             })
@@ -28,6 +28,7 @@ def register_search_tools(mcp, server: "MCPServer") -> None:
         dependency_mode: str = "auto",
         detail_level: str = "full",  # full | compact | ultra
         snippet_lines: int = 0,  # 0 = no truncation, >0 = max lines in snippet
+        deadline_ms: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Search for code using enhanced RAG pipeline.
 
@@ -45,6 +46,10 @@ def register_search_tools(mcp, server: "MCPServer") -> None:
             The selected headline is trimmed to 120 chars. When
             `snippet_lines` > 1, additional raw lines from the snippet are
             appended up to the requested count.
+
+        deadline_ms: Optional end-to-end latency budget. Stages that would
+            overrun it are cancelled and partial results are returned with
+            "degraded": true.
         """
         return await search_code_impl(
             server=server,
@@ -64,6 +69,7 @@ def register_search_tools(mcp, server: "MCPServer") -> None:
             dependency_mode=dependency_mode,
             detail_level=detail_level,
             snippet_lines=snippet_lines,
+            deadline_ms=deadline_ms,
         )
 
     @mcp.tool()
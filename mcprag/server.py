@@ -2,140 +2,127 @@
 MCP Server orchestration.
 
 Initializes and coordinates enhanced_rag modules for MCP access.
+
+The enhanced_rag subsystems (retrieval, ranking, generation, learning,
+GitHub and Azure automation) are imported and constructed on first use, so
+the server answers initialize/tools/list before any of them load. Set
+MCP_PREWARM=true to load them in a background thread right after startup.
+
+Environment:
+    MCP_PREWARM     load all components in the background at startup (default: false)
 """
 
+import importlib
 import logging
 import os
-from typing import Dict, Any, Literal, cast
+import sys
+import threading
+import time
+from typing import Dict, Any, Iterable, Literal, Optional, Tuple, cast
 
 from enhanced_rag.core.unified_config import get_config
+from enhanced_rag.core.components import get_component_registry
 from .compatibility.socketpair_patch import apply_patches
 
-# Import what we need from enhanced_rag - separate try/except for each component
-EnhancedSearchTool = None
-try:
-    from enhanced_rag.mcp_integration.enhanced_search_tool import EnhancedSearchTool
-    ENHANCED_SEARCH_AVAILABLE = True
-except ImportError:
-    ENHANCED_SEARCH_AVAILABLE = False
-
-CodeGenerationTool = None
-try:
-    from enhanced_rag.mcp_integration.code_gen_tool import CodeGenerationTool
-    CODE_GEN_AVAILABLE = True
-except ImportError:
-    CODE_GEN_AVAILABLE = False
-
-ContextAwareTool = None
-try:
-    from enhanced_rag.mcp_integration.context_aware_tool import ContextAwareTool
-    CONTEXT_AWARE_AVAILABLE = True
-except ImportError:
-    CONTEXT_AWARE_AVAILABLE = False
-
-# For backward compatibility
-ENHANCED_RAG_AVAILABLE = (
-    ENHANCED_SEARCH_AVAILABLE or CODE_GEN_AVAILABLE or CONTEXT_AWARE_AVAILABLE
-)
-
-try:
-    VECTOR_SUPPORT = True
-except ImportError:
-    VECTOR_SUPPORT = False
-
-RAGPipeline = None
-try:
-    from enhanced_rag.pipeline import RAGPipeline
-    PIPELINE_AVAILABLE = True
-except ImportError:
-    PIPELINE_AVAILABLE = False
-
-FeedbackCollector = None
-UsageAnalyzer = None
-ModelUpdater = None
-try:
-    from enhanced_rag.learning.feedback_collector import FeedbackCollector
-    from enhanced_rag.learning.usage_analyzer import UsageAnalyzer
-    from enhanced_rag.learning.model_updater import ModelUpdater
-    LEARNING_SUPPORT = True
-except ImportError:
-    LEARNING_SUPPORT = False
+# Optional enhanced_rag subsystems, imported on first use: feature -> (module, symbol) pairs.
+# A feature is available when all of its symbols import.
+_OPTIONAL_FEATURES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "enhanced_search": (("enhanced_rag.mcp_integration.enhanced_search_tool", "EnhancedSearchTool"),),
+    "code_gen": (("enhanced_rag.mcp_integration.code_gen_tool", "CodeGenerationTool"),),
+    "context_aware": (("enhanced_rag.mcp_integration.context_aware_tool", "ContextAwareTool"),),
+    "pipeline": (("enhanced_rag.pipeline", "RAGPipeline"),),
+    "learning": (
+        ("enhanced_rag.learning.feedback_collector", "FeedbackCollector"),
+        ("enhanced_rag.learning.usage_analyzer", "UsageAnalyzer"),
+        ("enhanced_rag.learning.model_updater", "ModelUpdater"),
+    ),
+    # GitHub integration pulls in FastAPI app with slowapi limiter that can fail outside web context
+    "github": (
+        ("enhanced_rag.github_integration.api_client", "GitHubClient"),
+        ("enhanced_rag.github_integration.remote_indexer", "RemoteIndexer"),
+    ),
+    "semantic": (
+        ("enhanced_rag.semantic.intent_classifier", "IntentClassifier"),
+        ("enhanced_rag.semantic.query_enhancer", "ContextualQueryEnhancer"),
+        ("enhanced_rag.semantic.query_rewriter", "MultiVariantQueryRewriter"),
+    ),
+    "ranking": (("enhanced_rag.ranking.result_explainer", "ResultExplainer"),),
+    "cache": (("enhanced_rag.utils.cache_manager", "CacheManager"),),
+    # Direct Azure Search for fallback
+    "azure_sdk": (
+        ("azure.search.documents", "SearchClient"),
+        ("azure.core.credentials", "AzureKeyCredential"),
+    ),
+    # REST API automation support
+    "rest_api": (
+        ("enhanced_rag.azure_integration.rest", "AzureSearchClient"),
+        ("enhanced_rag.azure_integration.rest", "SearchOperations"),
+        ("enhanced_rag.azure_integration.automation", "IndexAutomation"),
+        ("enhanced_rag.azure_integration.automation", "DataAutomation"),
+        ("enhanced_rag.azure_integration.automation", "IndexerAutomation"),
+        ("enhanced_rag.azure_integration.automation", "HealthMonitor"),
+    ),
+}
+
+# Module-level availability flags kept for existing callers; resolved lazily in __getattr__
+_FEATURE_FLAGS = {
+    "ENHANCED_SEARCH_AVAILABLE": "enhanced_search",
+    "CODE_GEN_AVAILABLE": "code_gen",
+    "CONTEXT_AWARE_AVAILABLE": "context_aware",
+    "PIPELINE_AVAILABLE": "pipeline",
+    "LEARNING_SUPPORT": "learning",
+    "GITHUB_SUPPORT": "github",
+    "SEMANTIC_SUPPORT": "semantic",
+    "RANKING_SUPPORT": "ranking",
+    "CACHE_SUPPORT": "cache",
+    "AZURE_SDK_AVAILABLE": "azure_sdk",
+    "REST_API_SUPPORT": "rest_api",
+}
+
+VECTOR_SUPPORT = True
 
 # NOTE: The legacy Azure SDK based admin helpers (IndexOperations, IndexerIntegration,
 # DocumentOperations) have been fully replaced by their REST-API counterparts as part
 # of the Azure integration migration (see docs/azure_integration_migration_plan.md).
-# We purposely avoid importing the deprecated modules here to prevent an unnecessary
-# runtime dependency on the Azure SDK.  Instead, REST_API_SUPPORT (defined below)
-# determines whether admin-level functionality is available.
-
-# Kept for backward-compatibility checks further down in the module.  Code that still
-# guards on `AZURE_ADMIN_SUPPORT` should now reference the REST implementation.
+# REST_API_SUPPORT determines whether admin-level functionality is available.
 AZURE_ADMIN_SUPPORT = False
 
-# GitHub integration pulls in FastAPI app with slowapi limiter that can fail outside web context.
-# To avoid import-time side effects for MCP server, guard these imports strictly.
-GitHubClient = None
-RemoteIndexer = None
-try:
-    from enhanced_rag.github_integration.api_client import GitHubClient  # type: ignore
-    from enhanced_rag.github_integration.remote_indexer import RemoteIndexer  # type: ignore
-    GITHUB_SUPPORT = True
-except Exception:
-    GITHUB_SUPPORT = False
-
-IntentClassifier = None
-ContextualQueryEnhancer = None
-MultiVariantQueryRewriter = None
-try:
-    from enhanced_rag.semantic.intent_classifier import IntentClassifier
-    from enhanced_rag.semantic.query_enhancer import ContextualQueryEnhancer
-    from enhanced_rag.semantic.query_rewriter import MultiVariantQueryRewriter
-    SEMANTIC_SUPPORT = True
-except ImportError:
-    SEMANTIC_SUPPORT = False
+_loaded_features: Dict[str, Optional[Dict[str, Any]]] = {}
+_feature_lock = threading.RLock()
 
-ResultExplainer = None
-try:
-    from enhanced_rag.ranking.result_explainer import ResultExplainer
-    RANKING_SUPPORT = True
-except ImportError:
-    RANKING_SUPPORT = False
 
-CacheManager = None
-try:
-    from enhanced_rag.utils.cache_manager import CacheManager
-    CACHE_SUPPORT = True
-except ImportError:
-    CACHE_SUPPORT = False
+def load_feature(feature: str) -> Optional[Dict[str, Any]]:
+    """Import an optional feature's symbols once; None when unavailable"""
+    if feature in _loaded_features:
+        return _loaded_features[feature]
+    with _feature_lock:
+        if feature not in _loaded_features:
+            symbols: Optional[Dict[str, Any]] = {}
+            try:
+                for module_name, symbol in _OPTIONAL_FEATURES[feature]:
+                    symbols[symbol] = getattr(importlib.import_module(module_name), symbol)
+            except Exception as e:
+                logger.info("Optional feature %s unavailable: %s", feature, e)
+                symbols = None
+            _loaded_features[feature] = symbols
+    return _loaded_features[feature]
+
+
+def feature_available(feature: str) -> bool:
+    return load_feature(feature) is not None
+
+
+def __getattr__(name: str) -> Any:
+    # Backward-compatible module attributes (flags and classes) without eager imports
+    if name in _FEATURE_FLAGS:
+        return feature_available(_FEATURE_FLAGS[name])
+    if name == "ENHANCED_RAG_AVAILABLE":
+        return any(feature_available(f) for f in ("enhanced_search", "code_gen", "context_aware"))
+    for feature, imports in _OPTIONAL_FEATURES.items():
+        if any(symbol == name for _, symbol in imports):
+            return (load_feature(feature) or {}).get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Direct Azure Search for fallback
-SearchClient = None
-AzureKeyCredential = None
-try:
-    from azure.search.documents import SearchClient
-    from azure.core.credentials import AzureKeyCredential
-    AZURE_SDK_AVAILABLE = True
-except ImportError:
-    AZURE_SDK_AVAILABLE = False
-
-# New REST API automation support
-AzureSearchClient = None
-SearchOperations = None
-IndexAutomation = None
-DataAutomation = None
-IndexerAutomation = None
-HealthMonitor = None
-try:
-    from enhanced_rag.azure_integration.rest import AzureSearchClient, SearchOperations
-    from enhanced_rag.azure_integration.automation import (
-        IndexAutomation,
-        DataAutomation,
-        IndexerAutomation,
-        HealthMonitor
-    )
-    REST_API_SUPPORT = True
-except ImportError:
-    REST_API_SUPPORT = False
 
 # MCP SDK
 try:
@@ -181,9 +168,56 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class _LazyComponent:
+    """Server attribute built by a group builder on first access.
+
+    The builder ``MCPServer._build_<group>`` returns every attribute of its
+    group; all are stored on the instance, which then shadows this descriptor.
+    Assigning the attribute directly also bypasses the builder.
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        with obj._component_lock:
+            if self.name not in obj.__dict__:
+                for attr, value in getattr(obj, f"_build_{self.group}")().items():
+                    obj.__dict__.setdefault(attr, value)
+        return obj.__dict__[self.name]
+
+
 class MCPServer:
     """MCP Server orchestrating enhanced_rag modules."""
 
+    # Components load on first use so tool registration stays cheap
+    pipeline = _LazyComponent("pipeline")
+    enhanced_search = _LazyComponent("enhanced_search")
+    code_gen = _LazyComponent("code_gen")
+    context_aware = _LazyComponent("context_aware")
+    search_client = _LazyComponent("search_client")
+    intent_classifier = _LazyComponent("semantic")
+    query_enhancer = _LazyComponent("semantic")
+    query_rewriter = _LazyComponent("semantic")
+    result_explainer = _LazyComponent("result_explainer")
+    cache_manager = _LazyComponent("cache_manager")
+    feedback_collector = _LazyComponent("learning")
+    usage_analyzer = _LazyComponent("learning")
+    model_updater = _LazyComponent("learning")
+    github_client = _LazyComponent("github")
+    remote_indexer = _LazyComponent("github")
+    rest_client = _LazyComponent("rest")
+    rest_ops = _LazyComponent("rest")
+    index_automation = _LazyComponent("rest")
+    data_automation = _LazyComponent("rest")
+    indexer_automation = _LazyComponent("rest")
+    health_monitor = _LazyComponent("rest")
+
     def __init__(self):
         """Initialize MCP server."""
         self.name = "azure-code-search-enhanced"
@@ -262,6 +296,7 @@ class MCPServer:
 
         # Track if async components have been started
         self._async_components_started = False
+        self._async_start_lock: Optional[Any] = None
 
         # Initialize transport wrapper for unified auth
         from .mcp.transport_wrapper import TransportWrapper
@@ -275,204 +310,221 @@ class MCPServer:
         register_resources(self.mcp, self)
         register_prompts(self.mcp)
 
-        logger.info(
-            f"MCP Server initialized - Features: "
-            f"RAG={ENHANCED_RAG_AVAILABLE}, "
-            f"Vector={VECTOR_SUPPORT}, "
-            f"Pipeline={PIPELINE_AVAILABLE}, "
-            f"REST_API={REST_API_SUPPORT}"
-        )
+        logger.info("MCP Server initialized - components load on first use")
 
     def _init_components(self):
-        """Initialize enhanced_rag components."""
-        # Initialize search tools if available - each component independently
-        self.enhanced_search = None
-        if ENHANCED_SEARCH_AVAILABLE:
-            try:
-                self.enhanced_search = EnhancedSearchTool(self.rag_config)  # type: ignore[call-arg]
-            except Exception as e:
-                logger.warning("EnhancedSearchTool unavailable; continuing without enhanced search: %s", e)
-
-        self.code_gen = None
-        if CODE_GEN_AVAILABLE:
-            try:
-                self.code_gen = CodeGenerationTool(self.rag_config)  # type: ignore[call-arg]
-            except Exception as e:
-                logger.warning("CodeGenerationTool unavailable; generation tools disabled: %s", e)
-
-        self.context_aware = None
-        if CONTEXT_AWARE_AVAILABLE:
-            try:
-                self.context_aware = ContextAwareTool(self.rag_config)  # type: ignore[call-arg]
-            except Exception as e:
-                logger.warning("ContextAwareTool unavailable; context-aware features disabled: %s", e)
-
-        # Initialize basic Azure Search as fallback
-        # Guard against partially available Azure SDK imports where AzureKeyCredential could be None
-        if (
-            AZURE_SDK_AVAILABLE
-            and AzureKeyCredential is not None
-            and SearchClient is not None
-            and bool(self.rag_config.acs_endpoint and self.rag_config.acs_endpoint.strip())
-        ):
-            # Choose key: admin if available
-            api_key = self.rag_config.acs_admin_key.get_secret_value() if self.rag_config.acs_admin_key else ""
-            if api_key:
-                try:
-                    # Construct credential only after verifying the symbol is available
-                    azure_key_credential = AzureKeyCredential(api_key)  # type: ignore[call-arg]
-                    self.search_client = SearchClient(
-                        endpoint=str(self.rag_config.acs_endpoint),
-                        index_name=str(self.rag_config.acs_index_name),
-                        credential=azure_key_credential,
-                    )  # type: ignore[call-arg]
-                except TypeError as e:
-                    # Common in type-checkers when symbol resolution fails; hard-disable SDK path
-                    logger.warning(f"Azure SDK credential construction failed (TypeError). Disabling SDK fallback. Error: {e}")
-                    self.search_client = None
-                except Exception as e:
-                    logger.warning(f"Azure SearchClient initialization failed, disabling SDK fallback: {e}")
-                    self.search_client = None
-            else:
-                self.search_client = None
-        else:
-            self.search_client = None
-
-        # Initialize pipeline if available
+        """Prepare lazy enhanced_rag components; nothing heavy is imported here."""
+        # Guards the group builders; re-entrant because builders use each other
+        self._component_lock = threading.RLock()
+        # One registry builds each retriever, ranker and analyzer once; the
+        # pipeline and every tool share those instances
+        self.components = get_component_registry()
+
+    def load_components(self, names: Optional[Iterable[str]] = None) -> None:
+        """Build the named components now (all of them by default)"""
+        for name in names or [n for n, v in vars(MCPServer).items() if isinstance(v, _LazyComponent)]:
+            getattr(self, name)
+
+    def _built(self, name: str) -> Any:
+        """Component if it has been built, without triggering construction"""
+        return self.__dict__.get(name)
+
+    def _build_pipeline(self) -> Dict[str, Any]:
         # RAGPipeline expects a dict-like config; pass server.rag_config with model_updater
-        self.pipeline = None
-        if PIPELINE_AVAILABLE:
-            try:
-                # Convert config to dict for pipeline
-                pipeline_config = self.rag_config.model_dump()  # Use Pydantic v2 method
-                # Wire up adaptive ranking and ModelUpdater if learning support is available
-                if LEARNING_SUPPORT:
-                    # Initialize model_updater first since pipeline needs it
-                    self.model_updater = ModelUpdater()  # type: ignore[call-arg]
-                    pipeline_config["model_updater"] = self.model_updater
-                    pipeline_config["adaptive_ranking"] = True
-
-                # Enable ranking monitoring for the improved ranker
-                if "ranking" not in pipeline_config:
-                    pipeline_config["ranking"] = {}
-                pipeline_config["ranking"]["enable_monitoring"] = True
-
-                self.pipeline = RAGPipeline(pipeline_config)  # type: ignore[call-arg]
-            except Exception as e:
-                logger.warning("RAGPipeline initialization failed; continuing without pipeline: %s", e)
-
-        # Initialize semantic tools
-        if SEMANTIC_SUPPORT:
-            self.intent_classifier = IntentClassifier()  # type: ignore[call-arg]
-            self.query_enhancer = ContextualQueryEnhancer()  # type: ignore[call-arg]
-            self.query_rewriter = MultiVariantQueryRewriter()  # type: ignore[call-arg]
-        else:
-            self.intent_classifier = None
-            self.query_enhancer = None
-            self.query_rewriter = None
-
-        # Initialize ranking tools
-        if RANKING_SUPPORT:
-            self.result_explainer = cast(Any, ResultExplainer)()
-        else:
-            self.result_explainer = None
+        symbols = load_feature("pipeline")
+        if symbols is None:
+            return {"pipeline": None}
+        RAGPipeline = symbols["RAGPipeline"]
+        try:
+            # Convert config to dict for pipeline
+            pipeline_config = self.rag_config.model_dump()  # Use Pydantic v2 method
+            # Wire up adaptive ranking and ModelUpdater if learning support is available
+            if self.model_updater is not None:
+                pipeline_config["model_updater"] = self.model_updater
+                pipeline_config["adaptive_ranking"] = True
+
+            # Enable ranking monitoring for the improved ranker
+            if "ranking" not in pipeline_config:
+                pipeline_config["ranking"] = {}
+            pipeline_config["ranking"]["enable_monitoring"] = True
+
+            self.components.register(
+                "pipeline", lambda registry: RAGPipeline(pipeline_config, components=registry)  # type: ignore[call-arg]
+            )
+            return {"pipeline": self.components.get("pipeline")}
+        except Exception as e:
+            logger.warning("RAGPipeline initialization failed; continuing without pipeline: %s", e)
+            return {"pipeline": None}
+
+    def _build_enhanced_search(self) -> Dict[str, Any]:
+        symbols = load_feature("enhanced_search")
+        if symbols is None:
+            return {"enhanced_search": None}
+        self.pipeline  # registers the server's pipeline factory before the tool asks for it
+        try:
+            tool = symbols["EnhancedSearchTool"](self.rag_config, components=self.components)
+        except Exception as e:
+            logger.warning("EnhancedSearchTool unavailable; continuing without enhanced search: %s", e)
+            tool = None
+        return {"enhanced_search": tool}
+
+    def _build_code_gen(self) -> Dict[str, Any]:
+        symbols = load_feature("code_gen")
+        if symbols is None:
+            return {"code_gen": None}
+        self.pipeline  # as in _build_enhanced_search
+        try:
+            tool = symbols["CodeGenerationTool"](self.rag_config, components=self.components)
+        except Exception as e:
+            logger.warning("CodeGenerationTool unavailable; generation tools disabled: %s", e)
+            tool = None
+        return {"code_gen": tool}
+
+    def _build_context_aware(self) -> Dict[str, Any]:
+        symbols = load_feature("context_aware")
+        if symbols is None:
+            return {"context_aware": None}
+        try:
+            tool = symbols["ContextAwareTool"](self.rag_config, components=self.components)
+        except Exception as e:
+            logger.warning("ContextAwareTool unavailable; context-aware features disabled: %s", e)
+            tool = None
+        return {"context_aware": tool}
 
-        # Initialize cache manager
-        if CACHE_SUPPORT:
-            self.cache_manager = CacheManager(
+    def _build_search_client(self) -> Dict[str, Any]:
+        # Initialize basic Azure Search as fallback
+        symbols = load_feature("azure_sdk")
+        if symbols is None or not (self.rag_config.acs_endpoint and self.rag_config.acs_endpoint.strip()):
+            return {"search_client": None}
+        # Choose key: admin if available
+        api_key = self.rag_config.acs_admin_key.get_secret_value() if self.rag_config.acs_admin_key else ""
+        if not api_key:
+            return {"search_client": None}
+        try:
+            search_client = symbols["SearchClient"](
+                endpoint=str(self.rag_config.acs_endpoint),
+                index_name=str(self.rag_config.acs_index_name),
+                credential=symbols["AzureKeyCredential"](api_key),
+            )
+        except Exception as e:
+            logger.warning(f"Azure SearchClient initialization failed, disabling SDK fallback: {e}")
+            search_client = None
+        return {"search_client": search_client}
+
+    def _build_semantic(self) -> Dict[str, Any]:
+        symbols = load_feature("semantic")
+        if symbols is None:
+            return {"intent_classifier": None, "query_enhancer": None, "query_rewriter": None}
+        return {
+            "intent_classifier": self.components.get("intent_classifier"),
+            "query_enhancer": self.components.get("query_enhancer"),
+            "query_rewriter": symbols["MultiVariantQueryRewriter"](),
+        }
+
+    def _build_result_explainer(self) -> Dict[str, Any]:
+        if not feature_available("ranking"):
+            return {"result_explainer": None}
+        return {"result_explainer": self.components.get("result_explainer")}
+
+    def _build_cache_manager(self) -> Dict[str, Any]:
+        symbols = load_feature("cache")
+        if symbols is None:
+            return {"cache_manager": None}
+        return {
+            "cache_manager": symbols["CacheManager"](
                 ttl=self.rag_config.cache_ttl_seconds, max_size=self.rag_config.cache_max_entries
-            )  # type: ignore[call-arg]
-        else:
-            self.cache_manager = None
-
-        # Initialize learning components
-        if LEARNING_SUPPORT:
-            self.feedback_collector = FeedbackCollector(
-                storage_path=str(self.rag_config.feedback_dir)
-            )  # type: ignore[call-arg]
-            self.usage_analyzer = UsageAnalyzer(
-                feedback_collector=self.feedback_collector
-            )  # type: ignore[call-arg]
-            # model_updater initialized above for pipeline
-        else:
-            self.feedback_collector = None
-            self.usage_analyzer = None
-            self.model_updater = None
+            )
+        }
+
+    def _build_learning(self) -> Dict[str, Any]:
+        symbols = load_feature("learning")
+        if symbols is None:
+            return {"feedback_collector": None, "usage_analyzer": None, "model_updater": None}
+        feedback_collector = symbols["FeedbackCollector"](storage_path=str(self.rag_config.feedback_dir))
+        return {
+            "feedback_collector": feedback_collector,
+            "usage_analyzer": symbols["UsageAnalyzer"](feedback_collector=feedback_collector),
+            "model_updater": symbols["ModelUpdater"](),
+        }
+
+    def _build_github(self) -> Dict[str, Any]:
+        symbols = load_feature("github")
+        try:
+            if symbols is not None:
+                return {"github_client": symbols["GitHubClient"](), "remote_indexer": symbols["RemoteIndexer"]()}
+        except Exception:
+            # Disable GitHub integration if setup fails in this environment
+            pass
+        return {"github_client": None, "remote_indexer": None}
 
-        # ------------------------------------------------------------------
-        # ADMIN COMPONENTS (REST-BASED)
-        # ------------------------------------------------------------------
+    def _build_rest(self) -> Dict[str, Any]:
         # The original SDK based admin helpers have been superseded by the REST
         # automation layer.  We now rely on those helpers when available.
-
-        # Initialize GitHub integration
-        if GITHUB_SUPPORT:
-            try:
-                self.github_client = GitHubClient()  # type: ignore[call-arg]
-                self.remote_indexer = RemoteIndexer()  # type: ignore[call-arg]
-            except Exception:
-                # Disable GitHub integration if imports or setup fail in this environment
-                self.github_client = None
-                self.remote_indexer = None
-        else:
-            self.github_client = None
-            self.remote_indexer = None
-
-        # Initialize REST API automation components
-        if REST_API_SUPPORT:
-            try:
-                # Create REST client and operations
-                self.rest_client = AzureSearchClient(
-                    endpoint=self.rag_config.acs_endpoint,
-                    api_key=self.rag_config.acs_admin_key.get_secret_value() if self.rag_config.acs_admin_key else ""
-                )  # type: ignore[call-arg]
-                self.rest_ops = SearchOperations(self.rest_client)  # type: ignore[call-arg]
-
+        unavailable = dict.fromkeys(
+            ("rest_client", "rest_ops", "index_automation", "data_automation", "indexer_automation", "health_monitor")
+        )
+        symbols = load_feature("rest_api")
+        if symbols is None:
+            return unavailable
+        try:
+            api_key = self.rag_config.acs_admin_key.get_secret_value() if self.rag_config.acs_admin_key else ""
+            # Create REST client and operations
+            rest_client = symbols["AzureSearchClient"](endpoint=self.rag_config.acs_endpoint, api_key=api_key)
+            rest_ops = symbols["SearchOperations"](rest_client)
+            components = {
+                "rest_client": rest_client,
+                "rest_ops": rest_ops,
                 # Initialize automation managers
-                self.index_automation = IndexAutomation(
-                    endpoint=self.rag_config.acs_endpoint,
-                    api_key=self.rag_config.acs_admin_key.get_secret_value() if self.rag_config.acs_admin_key else ""
-                )  # type: ignore[call-arg]
-                self.data_automation = DataAutomation(self.rest_ops)  # type: ignore[call-arg]
-                self.indexer_automation = IndexerAutomation(self.rest_ops)  # type: ignore[call-arg]
-                self.health_monitor = HealthMonitor(self.rest_ops)  # type: ignore[call-arg]
-
-                logger.info("REST API automation components initialized")
-            except Exception as e:
-                logger.warning(f"REST API components unavailable: {e}")
-                self.rest_client = None
-                self.rest_ops = None
-                self.index_automation = None
-                self.data_automation = None
-                self.indexer_automation = None
-                self.health_monitor = None
-        else:
-            self.rest_client = None
-            self.rest_ops = None
-            self.index_automation = None
-            self.data_automation = None
-            self.indexer_automation = None
-            self.health_monitor = None
+                "index_automation": symbols["IndexAutomation"](endpoint=self.rag_config.acs_endpoint, api_key=api_key),
+                "data_automation": symbols["DataAutomation"](rest_ops),
+                "indexer_automation": symbols["IndexerAutomation"](rest_ops),
+                "health_monitor": symbols["HealthMonitor"](rest_ops),
+            }
+            logger.info("REST API automation components initialized")
+            return components
+        except Exception as e:
+            logger.warning(f"REST API components unavailable: {e}")
+            return unavailable
 
     async def ensure_async_components_started(self):
         """
         Ensure async components are started. This is called lazily when needed.
         """
-        if not self._async_components_started:
-            await self.start_async_components()
-            self._async_components_started = True
+        if self._async_components_started:
+            return
+        if self._async_start_lock is None:
+            import asyncio
+            self._async_start_lock = asyncio.Lock()
+        async with self._async_start_lock:
+            if not self._async_components_started:
+                await self.start_async_components()
+                self._async_components_started = True
 
     async def start_async_components(self):
         """
         Start async components that require an event loop.
         This should be called when an event loop is available.
         """
+        import asyncio
+
         try:
+            # Build the pipeline off the event loop so other requests keep being served
+            await asyncio.to_thread(self.load_components, ("pipeline", "feedback_collector"))
+
             # Start RAGPipeline async components
             if self.pipeline is not None:
                 await self.pipeline.start()
                 logger.info("✅ RAGPipeline async components started")
 
+            # Load the shared cross-encoder once, before the first query needs it
+            if str(os.getenv("ENHANCED_RAG_ENABLE_CROSS_ENCODER_RERANKER", "")).lower() in ("1", "true", "yes"):
+                try:
+                    from enhanced_rag.ranking.cross_encoder_reranker import get_reranker_service
+                    await get_reranker_service().warmup()
+                    logger.info("✅ Cross-encoder reranker warmed up")
+                except Exception as e:
+                    logger.warning(f"Cross-encoder reranker warmup failed: {e}")
+
             # Start feedback collector if it exists and wasn't started by pipeline
             if (
                 self.feedback_collector is not None
@@ -493,23 +545,37 @@ class MCPServer:
         Clean up async components.
         """
         try:
+            # Only components that were built need cleanup
+            pipeline = self._built("pipeline")
+            feedback_collector = self._built("feedback_collector")
+            rest_client = self._built("rest_client")
+            index_automation = self._built("index_automation")
+            context_aware = self._built("context_aware")
+
             # Cleanup RAGPipeline
-            if self.pipeline is not None and hasattr(self.pipeline, "cleanup"):
-                await self.pipeline.cleanup()
+            if pipeline is not None and hasattr(pipeline, "cleanup"):
+                await pipeline.cleanup()
 
             # Cleanup feedback collector if it exists separately
-            if self.feedback_collector is not None and hasattr(
-                self.feedback_collector, "cleanup"
-            ):
-                await self.feedback_collector.cleanup()
+            if feedback_collector is not None and hasattr(feedback_collector, "cleanup"):
+                await feedback_collector.cleanup()
+
+            # Flush buffered session events
+            if context_aware is not None:
+                await context_aware.session_tracker.close()
 
             # Cleanup REST API client
-            if self.rest_client is not None:
-                await self.rest_client.close()
+            if rest_client is not None:
+                await rest_client.close()
 
             # Cleanup index automation client
-            if self.index_automation is not None and hasattr(self.index_automation, "client"):
-                await self.index_automation.client.close()
+            if index_automation is not None and hasattr(index_automation, "client"):
+                await index_automation.client.close()
+
+            # Close the shared retrieval transport (owned by no single component)
+            if "enhanced_rag.azure_integration.rest" in sys.modules:
+                from enhanced_rag.azure_integration.rest import close_shared_search_clients
+                await close_shared_search_clients()
 
             logger.info("✅ MCP Server async components cleanup completed")
 
@@ -523,50 +589,47 @@ class MCPServer:
 
         logger.info(f"Starting MCP server in {transport} mode")
 
-        # For stdio mode, start async components synchronously to ensure they're ready
         import asyncio
 
-        if transport == "stdio":
-            # In stdio mode, ensure components are started before handling requests
-            try:
-                asyncio.run(self.start_async_components())
-                logger.info("Async components started successfully in stdio mode")
-            except Exception as e:
-                logger.error(f"Failed to start async components: {e}")
-                # Continue anyway as some functionality may still work
-        else:
+        # Components load on first use; optionally warm them up in the background
+        # so the first search does not pay for imports and client construction
+        if str(os.getenv("MCP_PREWARM", "")).lower() in ("1", "true", "yes"):
+            threading.Thread(target=self._prewarm, name="mcprag-prewarm", daemon=True).start()
+
+        if transport != "stdio":
             # For other transports, schedule async startup
             async def _startup_task():
                 """Start async components after event loop is running"""
                 try:
-                    await self.start_async_components()
+                    await self.ensure_async_components_started()
                 except Exception as e:
                     logger.error(f"Failed to start async components: {e}")
 
             # Schedule the startup task to run after the event loop starts
-            def schedule_startup():
-                try:
-                    loop = asyncio.get_running_loop()
-                    loop.create_task(_startup_task())
-                except RuntimeError:
-                    # No event loop running yet, try to schedule for later
-                    logger.warning(
-                        "No event loop available yet for async component startup"
-                    )
-
-            # Try to schedule startup immediately, or wait for event loop
             try:
-                schedule_startup()
-            except Exception:
-                # If we can't schedule immediately, we'll try during the first tool call
+                asyncio.get_running_loop().create_task(_startup_task())
+            except RuntimeError:
+                # No event loop running yet; components start on first tool usage
                 logger.debug("Will start async components on first tool usage")
 
         self.mcp.run(transport=transport)
 
+    def _prewarm(self) -> None:
+        started = time.perf_counter()
+        try:
+            self.load_components()
+            logger.info("Prewarmed MCP components in %.2fs", time.perf_counter() - started)
+        except Exception as e:
+            logger.warning(f"Component prewarm failed: {e}")
+
     async def get_ranking_metrics(self, time_window_hours: int = 24) -> Dict[str, Any]:
         """Get ranking performance metrics from the pipeline."""
         if self.pipeline and hasattr(self.pipeline, 'get_ranking_performance_report'):
-            return await self.pipeline.get_ranking_performance_report(time_window_hours)
+            report = await self.pipeline.get_ranking_performance_report(time_window_hours)
+            if str(os.getenv("ENHANCED_RAG_ENABLE_CROSS_ENCODER_RERANKER", "")).lower() in ("1", "true", "yes"):
+                from enhanced_rag.ranking.cross_encoder_reranker import get_reranker_service
+                report["cross_encoder_reranker"] = get_reranker_service().get_stats()
+            return report
         else:
             return {"error": "Ranking metrics not available"}
 
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MCP tool construction with and without the shared component registry.
+
+"separate" builds the server pipeline plus EnhancedSearchTool, CodeGenerationTool
+and ContextAwareTool the old way, each with its own RAGPipeline / analyzer.
+"shared" builds the same objects from one ComponentRegistry. Each mode runs in a
+fresh interpreter; imports are done before timing so only construction is measured.
+Placeholder credentials are set when none are configured so that search clients
+and embedders are actually constructed; nothing is sent over the network.
+
+Usage:
+  python scripts/bench_component_startup.py [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = ("separate", "shared")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_mode(mode: str) -> dict:
+    from enhanced_rag.core.components import ComponentRegistry
+    from enhanced_rag.mcp_integration import CodeGenerationTool, ContextAwareTool, EnhancedSearchTool
+    from enhanced_rag.pipeline import RAGPipeline
+
+    config: dict = {}
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    report = None
+    if mode == "separate":
+        pipelines = [RAGPipeline(config)]
+        tools = [EnhancedSearchTool(config), CodeGenerationTool(config), ContextAwareTool(config)]
+        pipelines += [t.pipeline for t in tools if hasattr(t, "pipeline")]
+    else:
+        registry = ComponentRegistry()
+        pipelines = [registry.get("pipeline")]
+        tools = [
+            EnhancedSearchTool(config, components=registry),
+            CodeGenerationTool(config, components=registry),
+            ContextAwareTool(config, components=registry),
+        ]
+        pipelines += [t.pipeline for t in tools if hasattr(t, "pipeline")]
+        report = registry.report()
+    seconds = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "seconds": round(seconds, 4),
+        "rss_delta_mb": round(_rss_mb() - rss_before, 1),
+        "distinct_pipelines": len({id(p) for p in pipelines}),
+        "distinct_retrievers": len({id(p.retriever) for p in pipelines}),
+        "registry": report,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode)))
+        return
+
+    env = dict(os.environ)
+    env.setdefault("ACS_ENDPOINT", "https://bench.search.windows.net")
+    env.setdefault("ACS_ADMIN_KEY", "bench")
+    env.setdefault("AZURE_OPENAI_ENDPOINT", "https://bench.openai.azure.com")
+    env.setdefault("AZURE_OPENAI_KEY", "bench")
+
+    for mode in MODES:
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run(
+                [sys.executable, __file__, "--mode", mode], capture_output=True, text=True, check=True, env=env
+            ).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+        best = min(runs, key=lambda r: r["seconds"])
+        print(
+            f"{mode:>9}: {best['seconds'] * 1000:8.1f} ms  rss +{best['rss_delta_mb']:6.1f} MB  "
+            f"pipelines={best['distinct_pipelines']} retrievers={best['distinct_retrievers']}"
+        )
+        if best["registry"]:
+            for name, record in best["registry"]["components"].items():
+                print(f"           {name:<20} {record.get('self_seconds', 0.0) * 1000:8.1f} ms  uses={record.get('uses')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HierarchicalContextAnalyzer on a synthetic repository.
+
+Builds a git repository with one package of --siblings modules and a tests/
+tree of --test-dirs directories, then asks for the hierarchical context of
+--files different modules in that package. A heartbeat task measures how long
+the event loop is blocked. Reports the first request (cold caches), the
+following requests, and the same requests again after one file is edited.
+
+Usage:
+  python scripts/bench_context_analyzer.py [--siblings 200] [--test-dirs 2000] [--files 20]
+"""
+
+import argparse
+import asyncio
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from enhanced_rag.context.hierarchical_context import HierarchicalContextAnalyzer
+
+MODULE = '''"""Module {i}"""
+import os
+import json
+from typing import Any, Dict
+
+from .module_{prev} import helper_{prev}
+
+
+class Service{i}:
+    def run(self, payload: Dict[str, Any]) -> str:
+        return json.dumps(payload)
+
+''' + "\n".join(f"def helper_{{i}}_{n}(x):\n    return os.path.join(str(x), '{n}')\n" for n in range(40)) + '''
+
+def helper_{i}(x):
+    return x
+'''
+
+
+def build_repo(root: Path, siblings: int, test_dirs: int) -> None:
+    package = root / "app" / "services"
+    package.mkdir(parents=True)
+    (root / "requirements.txt").write_text("requests\npydantic\n")
+    (package / "__init__.py").write_text("")
+    for i in range(siblings):
+        (package / f"module_{i}.py").write_text(MODULE.format(i=i, prev=max(i - 1, 0)))
+    for d in range(test_dirs):
+        target = root / "tests" / f"group_{d % 50}" / f"case_{d}"
+        target.mkdir(parents=True)
+        (target / "helpers.txt").write_text("")
+    (root / "tests" / "group_0" / "test_last.py").write_text("def test_ok():\n    pass\n")
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "add", ".")
+    git("-c", "user.name=bench", "-c", "user.email=bench@example.com", "commit", "-qm", "initial")
+
+
+async def _heartbeat(lags: list, stop: asyncio.Event) -> None:
+    interval = 0.001
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def timed(analyzer: HierarchicalContextAnalyzer, paths) -> tuple:
+    lags: list = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(_heartbeat(lags, stop))
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    for path in paths:
+        await analyzer.get_hierarchical_context(str(path))
+        # Requests arrive independently; let the heartbeat run between them
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    return elapsed, max(lags, default=0.0)
+
+
+async def run(root: Path, files: int) -> None:
+    package = root / "app" / "services"
+    paths = [package / f"module_{i}.py" for i in range(files)]
+    analyzer = HierarchicalContextAnalyzer({"cache_enabled": False})
+
+    rows = [("first request", *await timed(analyzer, paths[:1]))]
+    rows.append((f"next {files - 1} files", *await timed(analyzer, paths[1:])))
+    rows.append((f"all {files} again", *await timed(analyzer, paths)))
+    paths[0].write_text(paths[0].read_text() + "\n# edited\n")
+    rows.append(("after one edit", *await timed(analyzer, paths)))
+
+    for label, elapsed, lag in rows:
+        print(f"  {label:<16} {elapsed * 1000:9.1f} ms   max loop block {lag * 1000:8.1f} ms")
+    print(f"  {analyzer.stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--siblings", type=int, default=200)
+    parser.add_argument("--test-dirs", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=20)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="ctx-bench-"))
+    try:
+        build_repo(root, args.siblings, args.test_dirs)
+        print(f"{args.siblings} modules, {args.test_dirs} test directories, {args.files} requests")
+        asyncio.run(run(root, args.files))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-result vs batch scoring in ImprovedContextualRanker.
+
+Ranks synthetic candidate sets of 50, 200 and 1000 results with both modes,
+checks that they produce the same order and scores, and prints timings.
+
+Usage:
+  python scripts/bench_contextual_ranker.py [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from enhanced_rag.core.models import EnhancedContext, SearchIntent, SearchResult
+from enhanced_rag.ranking.contextual_ranker_improved import ImprovedContextualRanker
+
+SIZES = (50, 200, 1000)
+
+SNIPPETS = [
+    "class CacheFactory:\n    _instance = None\n    def create_cache(self) -> Cache:\n        return Cache()\n",
+    "async def fetch(url):\n    await session.get(url)\n    return retry(fetch, url)\n",
+    "def subscribe(self, observer):\n    self.observers.append(observer)\n\ndef notify(self):\n    pass\n",
+    "@lru_cache\ndef parse_config(path):\n    with open(path) as f:\n        return json.load(f)\n",
+    "function loadUser(id) {\n  return db.users.find(id).then(u => u.profile);\n}\n",
+]
+
+
+class _QueryContext(EnhancedContext):
+    """EnhancedContext carrying the query text, as the ranker's query paths expect"""
+    query: str = ""
+
+
+def _make_results(n: int, seed: int = 7) -> List[SearchResult]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    results = []
+    for i in range(n):
+        language = rng.choice(["python", "python", "javascript"])
+        result = SearchResult(
+            id=f"doc-{i}",
+            score=round(rng.uniform(0.0, 30.0), 1),
+            file_path=f"src/pkg_{rng.randint(0, 9)}/mod_{i % 37}.py",
+            repository="bench",
+            code_snippet=rng.choice(SNIPPETS) * rng.randint(1, 4),
+            language=language,
+            imports=rng.sample(["os", "json", "asyncio", "typing", "re", "httpx"], k=rng.randint(0, 4)),
+            last_modified=now - timedelta(days=rng.randint(0, 400)),
+            complexity_score=rng.choice([None, rng.uniform(1, 40)]),
+            tags=rng.choice([[], ["test"], ["util"]]),
+        )
+        if rng.random() < 0.3:
+            result.vector_score = rng.random()
+        results.append(result)
+    return results
+
+
+def _context() -> _QueryContext:
+    return _QueryContext(
+        query="implement cache factory with retry",
+        current_file="src/pkg_1/mod_3.py",
+        language="python",
+        imports=["os", "json", "asyncio"],
+        functions=["load", "save"],
+        project_root="/work/bench",
+    )
+
+
+async def _time_mode(ranker, size: int, repeat: int):
+    best = float("inf")
+    ranked = []
+    for _ in range(repeat):
+        results = _make_results(size)
+        started = time.perf_counter()
+        ranked = await ranker.rank_results(results, _context(), SearchIntent.IMPLEMENT)
+        best = min(best, time.perf_counter() - started)
+    return best, [(r.id, r.score) for r in ranked]
+
+
+async def main(repeat: int) -> None:
+    loop_ranker = ImprovedContextualRanker({"batch_scoring": False})
+    batch_ranker = ImprovedContextualRanker({"batch_scoring": True})
+
+    print(f"{'candidates':>10} {'per-result ms':>14} {'batch ms':>10} {'speedup':>8} {'identical':>10}")
+    for size in SIZES:
+        loop_s, loop_out = await _time_mode(loop_ranker, size, repeat)
+        batch_s, batch_out = await _time_mode(batch_ranker, size, repeat)
+        print(
+            f"{size:>10} {loop_s * 1000:>14.2f} {batch_s * 1000:>10.2f} "
+            f"{loop_s / batch_s:>7.1f}x {str(loop_out == batch_out):>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per size; best time is reported")
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
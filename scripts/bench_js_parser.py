@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JavaScript/TypeScript parsing throughput, spawn-per-file vs. pool.
+
+Generates a corpus of small TypeScript modules and parses each one twice:
+
+  spawn   one `node parse_js.mjs <file>` process per file, as before
+  pool    JSParserPool, persistent `parse_js.mjs --serve` workers fed the
+          file contents over stdin (worker startup is included)
+
+Requires node and the @babel packages from package.json (`npm install`).
+
+Usage:
+  python scripts/bench_js_parser.py [--files 200] [--workers 2]
+"""
+
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+from enhanced_rag.code_understanding.js_parser_pool import PARSE_JS_PATH, JSParserPool
+
+MODULE_TEMPLATE = """import {{ Injectable }} from "@angular/core";
+import axios from "axios";
+
+export interface Item{i} {{
+  id: number;
+  name: string;
+}}
+
+export class Service{i} {{
+  private cache = new Map<number, Item{i}>();
+
+  async load(id: number): Promise<Item{i}> {{
+    if (this.cache.has(id)) {{
+      return this.cache.get(id)!;
+    }}
+    const res = await axios.get(`/api/items/${{id}}`);
+    this.cache.set(id, res.data);
+    return res.data;
+  }}
+}}
+
+export function helper{i}(items: Item{i}[]): string[] {{
+  return items.filter(x => x.id > {i}).map(x => x.name.trim());
+}}
+
+export const format{i} = (item: Item{i}) => `${{item.id}}: ${{item.name}}`;
+"""
+
+
+def make_corpus(root: Path, count: int) -> List[Path]:
+    paths = []
+    for i in range(count):
+        path = root / f"module_{i}.ts"
+        path.write_text(MODULE_TEMPLATE.format(i=i), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def spawn_parse(node: str, script: str, path: Path) -> dict:
+    res = subprocess.run([node, script, str(path)], capture_output=True, text=True, check=False)
+    return json.loads(res.stdout) if res.returncode == 0 and res.stdout else {}
+
+
+def main(files: int, workers: int, node: str, script: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = make_corpus(Path(tmp), files)
+        contents = [p.read_text(encoding="utf-8") for p in corpus]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            spawned = list(executor.map(lambda p: spawn_parse(node, script, p), corpus))
+        spawn_s = time.perf_counter() - started
+
+        pool = JSParserPool(workers=workers, command=[node, script, "--serve"])
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pooled = list(executor.map(lambda c: pool.parse(content=c), contents))
+        pool_s = time.perf_counter() - started
+        health = pool.health_check()
+        pool.close()
+
+    if pooled != spawned:
+        print("WARNING: pool results differ from spawn-per-file results")
+    chunks = sum(len(r.get("chunks", [])) for r in spawned)
+    print(f"{files} files, {chunks} chunks, {workers} concurrent parsers")
+    print(f"  spawn   {spawn_s:7.2f}s  {files / spawn_s:8.1f} files/s")
+    print(f"  pool    {pool_s:7.2f}s  {files / pool_s:8.1f} files/s  ({spawn_s / pool_s:.1f}x)")
+    print(f"  pool stats: {health}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--node", default="node")
+    parser.add_argument("--script", default=str(PARSE_JS_PATH), help="parser script (default: parse_js.mjs)")
+    args = parser.parse_args()
+    main(args.files, args.workers, args.node, args.script)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PatternRegistry.recognize_patterns over a realistic snippet corpus.
+
+The corpus is this repository's own Python sources cut into 40-line chunks,
+roughly the size of indexed code chunks. Three passes are timed:
+
+  legacy     per-keyword substring tests and per-lookup regex access, as before
+  compiled   precompiled regexes with literal prefilters, memo disabled
+  memoized   repeated pass over the same corpus with the content-hash memo warm
+
+Usage:
+  python scripts/bench_pattern_registry.py [--root enhanced_rag] [--limit 2000]
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import List
+
+from enhanced_rag.pattern_registry import PatternRegistry, PatternType, get_pattern_registry
+
+CHUNK_LINES = 40
+
+
+def load_corpus(root: Path, limit: int) -> List[str]:
+    chunks: List[str] = []
+    for path in sorted(root.rglob("*.py")):
+        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        for start in range(0, len(lines), CHUNK_LINES):
+            chunk = "\n".join(lines[start:start + CHUNK_LINES]).strip()
+            if chunk:
+                chunks.append(chunk)
+            if len(chunks) >= limit:
+                return chunks
+    return chunks
+
+
+def legacy_recognize(registry: PatternRegistry, code: str, context=None):
+    """The pre-compilation algorithm, kept here as the comparison baseline"""
+    matches = []
+    code_lower = code.lower()
+    for pattern_type in PatternType:
+        for pattern_name, pattern_def in registry.patterns.get(pattern_type, {}).items():
+            confidence = 0.0
+            keywords = pattern_def.get("keywords", [])
+            if keywords:
+                hits = [kw for kw in keywords if kw.lower() in code_lower]
+                confidence += (len(hits) / len(keywords)) * 0.4
+            patterns = pattern_def.get("patterns", [])
+            if patterns:
+                hits = [p for p in patterns if re.compile(p, re.IGNORECASE | re.DOTALL).search(code)]
+                confidence += (len(hits) / len(patterns)) * 0.5
+            if context and keywords:
+                context_str = str(context).lower()
+                hits = [kw for kw in keywords if kw.lower() in context_str]
+                confidence += (len(hits) / len(keywords)) * 0.1
+            confidence = min(confidence, 1.0)
+            if confidence > 0.1:
+                matches.append((pattern_name, confidence))
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return matches
+
+
+def _timed(fn, corpus):
+    started = time.perf_counter()
+    out = [fn(code) for code in corpus]
+    return time.perf_counter() - started, out
+
+
+def main(root: str, limit: int) -> None:
+    corpus = load_corpus(Path(root), limit)
+    registry = get_pattern_registry()
+    context = {"file_type": "python"}
+
+    legacy_s, legacy_out = _timed(lambda c: legacy_recognize(registry, c, context), corpus)
+
+    registry._recognition_cache.clear()
+    size = registry._recognition_cache_size
+    registry._recognition_cache_size = 0
+    compiled_s, compiled_out = _timed(lambda c: registry.recognize_patterns(c, context), corpus)
+    registry._recognition_cache_size = size
+
+    _timed(lambda c: registry.recognize_patterns(c, context), corpus)  # warm the memo
+    memo_s, _ = _timed(lambda c: registry.recognize_patterns(c, context), corpus)
+
+    identical = legacy_out == [[(m.pattern_name, m.confidence) for m in ms] for ms in compiled_out]
+    n = len(corpus)
+    print(f"corpus: {n} chunks of up to {CHUNK_LINES} lines from {root}")
+    for label, seconds in (("legacy", legacy_s), ("compiled", compiled_s), ("memoized", memo_s)):
+        print(f"{label:>9}: {seconds * 1000:9.1f} ms total  {seconds / n * 1e6:8.1f} us/snippet  "
+              f"{legacy_s / seconds:6.1f}x")
+    print(f"identical results: {identical}")
+    print(f"memo: {registry.get_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default="enhanced_rag", help="directory of Python sources to chunk")
+    parser.add_argument("--limit", type=int, default=2000, help="maximum number of chunks")
+    args = parser.parse_args()
+    main(args.root, args.limit)
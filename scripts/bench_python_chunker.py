@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Python chunking on a large module, per-node walks vs. single pass.
+
+Generates one module with --classes classes of --methods methods each and
+times, for both the indexer extractor and CodeChunker:
+
+  legacy   ast.walk per chunk for calls, re-split source per chunk, imports
+           re-collected per chunk (CodeChunker), as before
+  single   analyze_python: one parse, one walk, line-offset slicing
+           (parse cache cleared before each run)
+
+Outputs are checked for equality.
+
+Usage:
+  python scripts/bench_python_chunker.py [--classes 100] [--methods 8]
+"""
+
+import argparse
+import ast
+import time
+
+from enhanced_rag.azure_integration.processing import extract_python_chunks
+from enhanced_rag.code_understanding import python_chunker
+from enhanced_rag.code_understanding.chunkers import CodeChunker
+
+
+def make_module(classes: int, methods: int) -> str:
+    parts = ["import os", "import json", "from typing import Any, Dict, List", ""]
+    for c in range(classes):
+        parts.append(f"class Service{c}:")
+        parts.append(f'    """Service number {c}"""')
+        for m in range(methods):
+            parts.append(f"    def method_{m}(self, items: List[Any]) -> Dict[str, Any]:")
+            parts.append(f'        """Process items for step {m}"""')
+            parts.append("        result = {}")
+            parts.append("        for item in items:")
+            parts.append(f"            result[str(item)] = json.dumps(os.path.basename(str(item)) + '{m}')")
+            parts.append("        return result")
+            parts.append("")
+    return "\n".join(parts) + "\n"
+
+
+def legacy_extract(content: str):
+    """The previous extract_python_chunks loop"""
+    chunks = []
+    tree = ast.parse(content)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            start, end = node.lineno, node.end_lineno
+            lines = content.split("\n")
+            chunks.append((node.name, start, end, "\n".join(lines[start - 1:end]), ast.get_docstring(node) or ""))
+    return chunks
+
+
+def legacy_code_chunker(content: str):
+    """The previous CodeChunker.chunk_python_file inner loop"""
+    chunks = []
+    tree = ast.parse(content)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            lines = content.splitlines()
+            code = "\n".join(lines[node.lineno - 1:node.end_lineno])
+            imports = CodeChunker._extract_imports(tree)
+            calls = CodeChunker._extract_function_calls(node)
+            chunks.append((code, imports, calls))
+    return chunks
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main(classes: int, methods: int) -> None:
+    content = make_module(classes, methods)
+    lines = content.count("\n")
+    print(f"module: {lines} lines, {len(content) / 1024:.0f} KiB, {classes * (methods + 1)} definitions")
+
+    # The indexer truncates to 32k characters before parsing; bypass that here
+    legacy_s, legacy = _timed(legacy_extract, content)
+    python_chunker.clear_cache()
+    single_s, info = _timed(python_chunker.analyze_python, content)
+    started = time.perf_counter()
+    single = [(d.name, d.start_line, d.end_line, info.segment(d.start_line, d.end_line), d.docstring)
+              for d in info.definitions]
+    single_s += time.perf_counter() - started
+    assert single == legacy
+    print(f"  indexer extractor  legacy {legacy_s * 1000:8.1f} ms   single {single_s * 1000:8.1f} ms"
+          f"   ({legacy_s / single_s:.1f}x)")
+
+    legacy_s, legacy = _timed(legacy_code_chunker, content)
+    python_chunker.clear_cache()
+    single_s, chunks = _timed(CodeChunker.chunk_python_file, content, "bench.py")
+    assert [(c["content"], c["imports"], c["dependencies"]) for c in chunks] == legacy
+    print(f"  CodeChunker        legacy {legacy_s * 1000:8.1f} ms   single {single_s * 1000:8.1f} ms"
+          f"   ({legacy_s / single_s:.1f}x)")
+
+    small = make_module(8, 6)
+    cached_s, _ = _timed(lambda: [extract_python_chunks(small, "a.py") for _ in range(200)])
+    print(f"  extract_python_chunks x200 on a {len(small) // 1024} KiB module (cache warm): {cached_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=100)
+    parser.add_argument("--methods", type=int, default=8)
+    args = parser.parse_args()
+    main(args.classes, args.methods)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stdio MCP server cold start.
+
+Spawns ``python -m mcprag`` the way editors do and speaks JSON-RPC over its
+stdin/stdout. Each run records:
+  - time to the first tools/list response (measured from process spawn)
+  - time to the first search_code response after that (components load here
+    unless MCP_PREWARM=true already loaded them)
+
+Without search credentials search_code returns an error, but the time still
+covers importing and constructing the search stack.
+
+Usage:
+  python scripts/bench_server_startup.py [--runs 5] [--query "parse config"] [--prewarm] [--idle 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict
+
+PROTOCOL_VERSION = "2025-06-18"
+
+
+class StdioSession:
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self._next_id = 0
+
+    async def send(self, method: str, params: Dict[str, Any], notify: bool = False) -> None:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method, "params": params}
+        if not notify:
+            self._next_id += 1
+            message["id"] = self._next_id
+        self.proc.stdin.write((json.dumps(message) + "\n").encode())
+        await self.proc.stdin.drain()
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        await self.send(method, params)
+        while True:
+            line = await asyncio.wait_for(self.proc.stdout.readline(), timeout)
+            if not line:
+                raise RuntimeError(f"server exited before answering {method}")
+            message = json.loads(line)
+            # Skip notifications and log messages
+            if message.get("id") == self._next_id:
+                if "error" in message:
+                    raise RuntimeError(f"{method} failed: {message['error']}")
+                return message["result"]
+
+
+async def _run_once(query: str, prewarm: bool, idle: float, timeout: float) -> Dict[str, float]:
+    env = dict(os.environ, MCP_PREWARM="true" if prewarm else "false")
+    started = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "mcprag",
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        env=env,
+    )
+    session = StdioSession(proc)
+    try:
+        await session.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "bench", "version": "0"},
+        }, timeout)
+        initialized = time.perf_counter() - started
+        await session.send("notifications/initialized", {}, notify=True)
+
+        tools = await session.request("tools/list", {}, timeout)
+        tools_list = time.perf_counter() - started
+
+        # Editors usually sit idle for a moment before the first search
+        await asyncio.sleep(idle)
+        search_started = time.perf_counter()
+        await session.request("tools/call", {"name": "search_code", "arguments": {"query": query}}, timeout)
+        first_search = time.perf_counter() - search_started
+    finally:
+        proc.kill()
+        await proc.wait()
+
+    return {
+        "initialize": initialized,
+        "tools_list": tools_list,
+        "first_search": first_search,
+        "tools": len(tools.get("tools", [])),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--query", default="parse config")
+    parser.add_argument("--prewarm", action="store_true", help="start the server with MCP_PREWARM=true")
+    parser.add_argument("--idle", type=float, default=0.0, help="seconds between tools/list and the search")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    runs = [asyncio.run(_run_once(args.query, args.prewarm, args.idle, args.timeout)) for _ in range(args.runs)]
+    print(f"{runs[0]['tools']} tools, {args.runs} runs, prewarm={args.prewarm}, idle={args.idle}s")
+    for key in ("initialize", "tools_list", "first_search"):
+        values = [r[key] * 1000 for r in runs]
+        print(f"  {key:<13} median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
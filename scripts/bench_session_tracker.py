@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SessionTracker persistence.
+
+Replays IDE-style file events into a tracker with ``storage_path`` set and
+reports:
+  - mean / max time one track_file_change call holds the event loop
+  - wall time for the whole replay, including the final flush
+  - time for a fresh tracker to load its sessions (first get_session_stats)
+    when the store also holds many inactive sessions
+
+Usage:
+  python scripts/bench_session_tracker.py [--events 5000] [--sessions 20] [--stale 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from enhanced_rag.context.session_store import SessionStore
+from enhanced_rag.context.session_tracker import SessionTracker
+
+
+async def _replay(storage: Path, events: int, sessions: int) -> None:
+    tracker = SessionTracker({"storage_path": str(storage)})
+    changes = ("open", "edit", "edit", "edit", "save", "close")
+    latencies = []
+    started = time.perf_counter()
+    for i in range(events):
+        t0 = time.perf_counter()
+        await tracker.track_file_change(f"s{i % sessions}", f"src/module_{i % 97}.py", changes[i % len(changes)],
+                                        {"line": i})
+        latencies.append(time.perf_counter() - t0)
+    await tracker.close()
+    total = time.perf_counter() - started
+
+    print(f"replay: {events} events, {sessions} sessions")
+    print(f"  per event  mean {statistics.mean(latencies) * 1e6:8.1f} us   max {max(latencies) * 1e3:8.2f} ms")
+    print(f"  total      {total * 1e3:8.1f} ms (includes final flush)")
+
+
+async def _startup(storage: Path, stale: int) -> None:
+    store = SessionStore(storage / "sessions.sqlite")
+    old = datetime.now(timezone.utc) - timedelta(days=3)
+    store.write(
+        [{"session_id": f"old{i}", "file_path": "x.py", "change_type": "edit", "timestamp": old.isoformat()}
+         for i in range(stale)],
+        [{"id": f"old{i}", "started_at": old, "last_activity": old, "interaction_count": 1, "current_files": []}
+         for i in range(stale)],
+    )
+    store.close()
+
+    started = time.perf_counter()
+    tracker = SessionTracker({"storage_path": str(storage)})
+    stats = await tracker.get_session_stats()
+    loaded = time.perf_counter() - started
+    await tracker.close()
+    print(f"startup: {stats['total_sessions']} active sessions loaded, {stale} inactive skipped, "
+          f"{loaded * 1e3:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--stale", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(_replay(Path(tmp), args.events, args.sessions))
+        asyncio.run(_startup(Path(tmp), args.stale))
+
+
+if __name__ == "__main__":
+    main()
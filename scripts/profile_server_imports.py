@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the MCP server.
+
+Runs ``python -X importtime`` in a fresh interpreter that imports
+``mcprag.server`` and constructs ``MCPServer`` (what the stdio transport does
+before it can answer ``initialize``), then lists the slowest modules. Use it
+to catch a heavy dependency creeping back into the startup path.
+
+Usage:
+  python scripts/profile_server_imports.py [--top 25] [--load-components] [--filter enhanced_rag]
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import List, Tuple
+
+
+def _profile(load_components: bool) -> List[Tuple[str, int, int]]:
+    code = "import mcprag.server as s; server = s.MCPServer()"
+    if load_components:
+        code += "; server.load_components()"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-2000:])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--load-components", action="store_true", help="also build every lazy component")
+    parser.add_argument("--filter", default="", help="only show modules whose name contains this")
+    args = parser.parse_args()
+
+    rows = [r for r in _profile(args.load_components) if args.filter in r[0]]
+    total_ms = sum(r[1] for r in rows) / 1000
+    print(f"{len(rows)} modules, {total_ms:.1f} ms self time")
+
+    print("\nBy cumulative time:")
+    for name, _, cumulative in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+    print("\nBy self time:")
+    for name, self_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import re
+
+import pytest
+
+from enhanced_rag.core.config import Config
+from enhanced_rag.core.models import SearchQuery
+from enhanced_rag.retrieval.multi_stage_pipeline import MultiStageRetriever, RetrievalContext
+from enhanced_rag.utils.performance_monitor import PerformanceMonitor
+
+_SEARCH_IN = re.compile(r"search\.in\(id, '([^']*)', ','\)")
+
+
+def _index_doc(doc_id):
+    return {
+        "id": doc_id,
+        "content": f"def {doc_id.replace('-', '_')}(): pass",
+        "file_path": f"src/{doc_id}.py",
+        "repository": "repo",
+        "language": "python",
+        "function_name": doc_id,
+        "start_line": 1,
+    }
+
+
+class _RecordingOps:
+    """Index of d-0..d-119; search.in() never returns the ids in `unlisted`"""
+
+    def __init__(self, unlisted=(), missing=()):
+        self.docs = {f"d-{n}": _index_doc(f"d-{n}") for n in range(120)}
+        self.unlisted = set(unlisted)
+        self.missing = set(missing)
+        self.batches = []
+        self.single_lookups = []
+        self.keyword_hits = []
+
+    async def search(self, index_name, query="*", timeout=None, **options):
+        match = _SEARCH_IN.fullmatch(options.get("filter") or "")
+        if match is None:
+            # Keyword stage: hits carry content only, so they need hydrating
+            return {"value": [
+                {"id": doc_id, "@search.score": score, "content": self.docs[doc_id]["content"]}
+                for doc_id, score in self.keyword_hits
+            ]}
+        ids = match.group(1).split(",")
+        self.batches.append(ids)
+        assert options["top"] == len(ids)
+        return {"value": [self.docs[i] for i in ids if i in self.docs and i not in self.unlisted]}
+
+    async def get_document(self, index_name, doc_id, timeout=None):
+        self.single_lookups.append(doc_id)
+        if doc_id in self.missing or doc_id not in self.docs:
+            raise LookupError(doc_id)
+        return self.docs[doc_id]
+
+
+def _retriever(ops):
+    r = MultiStageRetriever.__new__(MultiStageRetriever)
+    r.config = Config()
+    r.rest_ops = ops
+    r.index_names = {"main": "codebase"}
+    r._cache = {}
+    r._cache_index = None
+    r._semantic_fallback_cache = {}
+    r.stage_latency = PerformanceMonitor(max_history=200)
+    return r
+
+
+@pytest.mark.asyncio
+async def test_hydration_batches_ids_and_falls_back_for_misses():
+    ops = _RecordingOps(unlisted={"d-14", "d-77"}, missing={"d-77"})
+    retriever = _retriever(ops)
+    ctx = RetrievalContext()
+    # Complete stage metadata needs no lookup; content alone does
+    for n in range(10):
+        ctx.meta(f"d-{n}").update(_index_doc(f"d-{n}"), file_path=f"captured/d-{n}.py")
+    for n in range(10, 120):
+        ctx.meta(f"d-{n}")["content"] = "captured"
+
+    ids = [f"d-{n}" for n in range(120)] + ["d-3"]
+    hydrated = await retriever._hydrate_documents(ids, ctx)
+
+    assert [len(batch) for batch in ops.batches] == [50, 50, 10]
+    assert sorted(i for batch in ops.batches for i in batch) == sorted(f"d-{n}" for n in range(10, 120))
+    # Only ids the batch queries didn't return are fetched one by one
+    assert sorted(ops.single_lookups) == ["d-14", "d-77"]
+    assert "d-77" not in hydrated and len(hydrated) == 119
+    assert hydrated["d-3"].file_path == "captured/d-3.py"
+    assert hydrated["d-14"].file_path == "src/d-14.py"
+    assert hydrated["d-60"].code_snippet == "def d_60(): pass" and hydrated["d-60"].language == "python"
+
+    # Batch-hydrated documents are cached for the next request
+    ops.batches.clear()
+    await retriever._hydrate_documents(["d-60", "d-61"], RetrievalContext())
+    assert ops.batches == []
+
+
+@pytest.mark.asyncio
+async def test_hydrated_fields_merge_onto_ranked_results():
+    ops = _RecordingOps(unlisted={"d-2"})
+    ops.keyword_hits = [("d-5", 9.0), ("d-2", 7.5), ("d-9", 3.0)]
+    retriever = _retriever(ops)
+
+    results = await retriever.retrieve(SearchQuery(query="handler", bm25_only=True, top_k=3))
+
+    # Ranking and BM25 scores come from the stage, fields from the index
+    assert [(r.id, r.score) for r in results] == [("d-5", 9.0), ("d-2", 7.5), ("d-9", 3.0)]
+    assert [r.file_path for r in results] == ["src/d-5.py", "src/d-2.py", "src/d-9.py"]
+    assert all(r.function_name == r.id for r in results)
+    assert ops.batches == [["d-5", "d-2", "d-9"]]
+    assert ops.single_lookups == ["d-2"]
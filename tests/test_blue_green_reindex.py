@@ -0,0 +1,281 @@
+import re
+
+import pytest
+
+from enhanced_rag.azure_integration.automation.reindex_manager import ReindexAutomation
+from enhanced_rag.azure_integration.embedding_provider import IEmbeddingProvider
+from enhanced_rag.azure_integration.index_pointer import IndexPointer, resolve_index_name
+from enhanced_rag.core.config import Config
+from enhanced_rag.retrieval.multi_stage_pipeline import MultiStageRetriever
+
+_CLAUSE = re.compile(r"(\w+) (eq|gt|ge|lt) ('(?:[^']|'')*'|null)")
+LOGICAL = "codebase-mcp-sota"
+
+
+class FakeSearchService:
+    """In-memory stand-in for the index, alias and document endpoints"""
+
+    def __init__(self, aliases_supported=True):
+        self.indexes = {}
+        self.aliases = {} if aliases_supported else None
+        self.lossy = set()
+        self.deleted = []
+
+    def add_index(self, name, docs, fields=()):
+        self.indexes[name] = {"definition": {"name": name, "fields": [{"name": "id", "key": True}, *fields]},
+                              "docs": {d["id"]: dict(d) for d in docs}}
+
+    def _target(self, name):
+        if self.aliases and name in self.aliases:
+            name = self.aliases[name]
+        if name not in self.indexes:
+            raise LookupError(f"index {name} not found")
+        return self.indexes[name]
+
+    async def list_aliases(self):
+        if self.aliases is None:
+            raise RuntimeError("aliases not supported by this api-version")
+        return [{"name": n, "indexes": [i]} for n, i in self.aliases.items()]
+
+    async def get_alias(self, name):
+        if self.aliases is None or name not in self.aliases:
+            raise LookupError(f"alias {name} not found")
+        return {"name": name, "indexes": [self.aliases[name]]}
+
+    async def create_or_update_alias(self, name, index_name):
+        await self.list_aliases()
+        assert name not in self.indexes, "alias name collides with an index"
+        self.aliases[name] = index_name
+        return {"name": name, "indexes": [index_name]}
+
+    async def get_index(self, name):
+        if name not in self.indexes:
+            raise LookupError(f"index {name} not found")
+        return dict(self.indexes[name]["definition"], **{"@odata.etag": "x"})
+
+    async def list_indexes(self, select=None):
+        return [{"name": n} for n in self.indexes]
+
+    async def create_index(self, definition):
+        assert "@odata.etag" not in definition
+        self.indexes[definition["name"]] = {"definition": definition, "docs": {}}
+        return definition
+
+    async def delete_index(self, name):
+        assert name not in (self.aliases or {}).values(), "index is referenced by an alias"
+        del self.indexes[name]
+        self.deleted.append(name)
+
+    async def count_documents(self, name):
+        return len(self._target(name)["docs"])
+
+    async def upload_documents(self, index_name, documents, merge=False, retry=True):
+        if index_name not in self.lossy:
+            self.indexes[index_name]["docs"].update({d["id"]: dict(d) for d in documents})
+        return {"value": [{"key": d["id"], "status": True, "statusCode": 201} for d in documents]}
+
+    async def search(self, index_name, query="*", **options):
+        docs = sorted(self._target(index_name)["docs"].values(), key=lambda d: d["id"])
+        for field, op, raw in _CLAUSE.findall(options.get("filter") or ""):
+            value = None if raw == "null" else raw[1:-1]
+            docs = [d for d in docs if {
+                "eq": lambda a: a == value,
+                "gt": lambda a: a is not None and a > value,
+                "ge": lambda a: a is not None and a >= value,
+                "lt": lambda a: a is not None and a < value,
+            }[op](d.get(field))]
+        if query not in ("*", ""):
+            docs = [d for d in docs if query in d.get("content", "")]
+        for vector_query in options.get("vectorQueries", []):
+            docs = [d for d in docs if d.get(vector_query["fields"])]
+        if options.get("facets"):
+            counts = {}
+            for d in docs:
+                counts[d.get("repository")] = counts.get(d.get("repository"), 0) + 1
+            return {"value": [], "@search.facets": {"repository": [
+                {"value": v, "count": c} for v, c in counts.items() if v is not None
+            ]}}
+        hidden = {f["name"] for f in self._target(index_name)["definition"]["fields"] if f.get("retrievable") is False}
+        return {"value": [
+            dict({k: v for k, v in d.items() if k not in hidden}, **{"@search.score": 1.0})
+            for d in docs[:options.get("top", 50)]
+        ]}
+
+
+class FakeEmbeddingProvider(IEmbeddingProvider):
+    model_name = "fake-embedding"
+    dimensions = 3
+
+    def generate_embedding(self, text):
+        return self.generate_embeddings_batch([text])[0]
+
+    def generate_embeddings_batch(self, texts):
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+    def generate_code_embedding(self, code, context):
+        return self.generate_embedding(f"{context}\n\nCode:\n{code}")
+
+
+def _docs(n):
+    return [{"id": f"{i * 7919 % 65536:04x}", "content": f"def function_{i}(): pass"} for i in range(n)]
+
+
+@pytest.fixture
+def pointer(tmp_path, monkeypatch):
+    path = tmp_path / "index_pointer.json"
+    monkeypatch.setenv("MCP_INDEX_POINTER_PATH", str(path))
+    return IndexPointer(str(path))
+
+
+@pytest.mark.asyncio
+async def test_blue_green_switches_alias_and_collects_old_versions(pointer):
+    service = FakeSearchService()
+    service.add_index(f"{LOGICAL}-v1", _docs(120))
+    service.aliases[LOGICAL] = f"{LOGICAL}-v1"
+    reindex = ReindexAutomation(service)
+
+    first = await reindex.blue_green_rebuild(index_name=LOGICAL, pointer=pointer, count_timeout=0)
+
+    assert first["status"] == "success", first
+    assert first["previous_index"] == f"{LOGICAL}-v1"
+    assert first["switch"]["mode"] == "alias"
+    assert service.aliases[LOGICAL] == f"{LOGICAL}-v2"
+    assert len(service.indexes[f"{LOGICAL}-v2"]["docs"]) == 120
+    assert not any(k.startswith("@search.") for d in service.indexes[f"{LOGICAL}-v2"]["docs"].values() for k in d)
+    assert first["deleted_indexes"] == []
+    # Readers keep using the logical name; the alias does the routing
+    assert resolve_index_name(LOGICAL) == LOGICAL
+
+    second = await reindex.blue_green_rebuild(index_name=LOGICAL, pointer=pointer, count_timeout=0)
+
+    assert second["active_index"] == f"{LOGICAL}-v3"
+    assert second["deleted_indexes"] == [f"{LOGICAL}-v1"]
+    assert sorted(service.indexes) == [f"{LOGICAL}-v2", f"{LOGICAL}-v3"]
+
+    rolled_back = await reindex.rollback_blue_green(index_name=LOGICAL, pointer=pointer)
+    assert rolled_back["active_index"] == f"{LOGICAL}-v2"
+    assert service.aliases[LOGICAL] == f"{LOGICAL}-v2"
+
+
+@pytest.mark.asyncio
+async def test_blue_green_uses_pointer_beside_a_legacy_index(pointer):
+    service = FakeSearchService(aliases_supported=False)
+    service.add_index(LOGICAL, _docs(40))
+    reindex = ReindexAutomation(service)
+
+    result = await reindex.blue_green_rebuild(index_name=LOGICAL, pointer=pointer, count_timeout=0)
+
+    assert result["status"] == "success", result
+    assert result["previous_via"] == "index"
+    assert result["switch"]["mode"] == "pointer"
+    # The legacy index keeps serving until readers pick up the pointer
+    assert LOGICAL in service.indexes
+    assert resolve_index_name(LOGICAL) == f"{LOGICAL}-v1"
+
+    await reindex.blue_green_rebuild(index_name=LOGICAL, pointer=pointer, count_timeout=0)
+    assert resolve_index_name(LOGICAL) == f"{LOGICAL}-v2"
+
+
+@pytest.mark.asyncio
+async def test_failed_verification_keeps_the_live_index(pointer):
+    service = FakeSearchService()
+    service.add_index(f"{LOGICAL}-v1", _docs(30))
+    service.aliases[LOGICAL] = f"{LOGICAL}-v1"
+    service.lossy.add(f"{LOGICAL}-v2")
+    reindex = ReindexAutomation(service)
+
+    result = await reindex.perform_reindex("blue-green", count_timeout=0, index_name=LOGICAL, pointer=pointer)
+
+    assert result["status"] == "failed"
+    assert result["verification"]["issues"]
+    assert service.aliases[LOGICAL] == f"{LOGICAL}-v1"
+    assert service.deleted == [f"{LOGICAL}-v2"]
+
+
+def test_index_pointer_changes_are_seen_by_other_readers(tmp_path):
+    path = str(tmp_path / "pointer.json")
+    reader, writer = IndexPointer(path), IndexPointer(path)
+
+    assert reader.get(LOGICAL) is None
+    assert writer.set(LOGICAL, f"{LOGICAL}-v1") is None
+    assert reader.get(LOGICAL) == f"{LOGICAL}-v1"
+    assert writer.set(LOGICAL, f"{LOGICAL}-v2") == f"{LOGICAL}-v1"
+    assert reader.get(LOGICAL) == f"{LOGICAL}-v2"
+    writer.clear(LOGICAL)
+    assert reader.get(LOGICAL) is None
+
+
+@pytest.mark.asyncio
+async def test_repository_rebuild_refuses_to_drop_other_repositories(pointer, monkeypatch):
+    service = FakeSearchService()
+    docs = [dict(d, repository="a" if i % 2 else "b") for i, d in enumerate(_docs(40))]
+    service.add_index(f"{LOGICAL}-v1", docs)
+    service.aliases[LOGICAL] = f"{LOGICAL}-v1"
+    reindex = ReindexAutomation(service)
+
+    async def reindex_repository(index_name, repo_path, repo_name):
+        rebuilt = [dict(d, content=d["content"] + " # edited") for d in docs if d["repository"] == repo_name]
+        await service.upload_documents(index_name, rebuilt)
+        return len(rebuilt)
+
+    monkeypatch.setattr(reindex, "_reindex_repository", reindex_repository)
+
+    result = await reindex.blue_green_rebuild(
+        repo_path="/src/a", repo_name="a", index_name=LOGICAL, pointer=pointer, count_timeout=0
+    )
+
+    # The shadow matched its own upload count but holds none of repository b
+    assert result["status"] == "failed"
+    assert result["verification"]["repositories"] == {"b": {"live": 20, "shadow": 0}}
+    assert any("'b'" in issue for issue in result["verification"]["issues"])
+    assert service.aliases[LOGICAL] == f"{LOGICAL}-v1"
+
+
+@pytest.mark.asyncio
+async def test_blue_green_copy_needs_vectors_when_the_live_index_has_them(pointer, monkeypatch):
+    monkeypatch.setenv("MCP_EMBEDDING_STORE", "false")
+    service = FakeSearchService()
+    vector_field = {"name": "content_vector", "dimensions": 3, "retrievable": False}
+    docs = [dict(d, content_vector=[0.1, 0.2, 0.3]) for d in _docs(30)]
+    service.add_index(f"{LOGICAL}-v1", docs, fields=[vector_field])
+    service.aliases[LOGICAL] = f"{LOGICAL}-v1"
+
+    # Exports can't read the vectors back, so a copy without a provider has none
+    failed = await ReindexAutomation(service).blue_green_rebuild(index_name=LOGICAL, pointer=pointer, count_timeout=0)
+    assert failed["status"] == "failed"
+    assert failed["verification"]["vectors"] is False
+    assert service.aliases[LOGICAL] == f"{LOGICAL}-v1"
+
+    reindex = ReindexAutomation(service, FakeEmbeddingProvider())
+    result = await reindex.blue_green_rebuild(index_name=LOGICAL, pointer=pointer, count_timeout=0)
+    assert result["status"] == "success", result
+    assert result["verification"]["vectors"] is True
+    assert all(d.get("content_vector") for d in service.indexes[result["active_index"]]["docs"].values())
+
+
+class _IndexDocumentOps:
+    def __init__(self, service):
+        self.service = service
+
+    async def get_document(self, index_name, doc_id, timeout=None):
+        return self.service.indexes[index_name]["docs"][doc_id]
+
+
+@pytest.mark.asyncio
+async def test_hydration_cache_follows_a_pointer_switch(pointer):
+    service = FakeSearchService(aliases_supported=False)
+    service.add_index(f"{LOGICAL}-v1", [{"id": "d1", "content": "old body"}])
+    service.add_index(f"{LOGICAL}-v2", [{"id": "d1", "content": "new body"}])
+    pointer.set(LOGICAL, f"{LOGICAL}-v1")
+
+    retriever = MultiStageRetriever.__new__(MultiStageRetriever)
+    retriever.config = Config()
+    retriever.rest_ops = _IndexDocumentOps(service)
+    retriever.index_names = {"main": LOGICAL}
+    retriever._cache = {}
+    retriever._cache_index = None
+    retriever._semantic_fallback_cache = {}
+
+    assert (await retriever._fetch_document("d1")).code_snippet == "old body"
+    pointer.set(LOGICAL, f"{LOGICAL}-v2")
+    assert (await retriever._fetch_document("d1")).code_snippet == "new body"
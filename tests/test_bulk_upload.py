@@ -0,0 +1,155 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+from enhanced_rag.azure_integration.automation import data_manager
+from enhanced_rag.azure_integration.automation.data_manager import DataAutomation
+from enhanced_rag.azure_integration.rest import AzureSearchClient, SearchOperations
+from enhanced_rag.utils.error_handler import _CircuitBreaker
+
+
+class FakeSearchIndex:
+    """Local docs/index endpoint with a request size cap, throttling and per-item failures"""
+
+    def __init__(self, max_body_bytes, throttle_requests=(2,), flaky_suffix="7", bad_keys=("doc-13",)):
+        self.max_body_bytes = max_body_bytes
+        self.throttle_requests = set(throttle_requests)
+        self.flaky_suffix = flaky_suffix
+        self.bad_keys = set(bad_keys)
+        self.requests = 0
+        self.body_sizes = []
+        self.batch_keys = []
+        self.stored = {}
+        self.seen_flaky = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handle(self, request):
+        raw = await request.read()
+        self.requests += 1
+        if len(raw) > self.max_body_bytes:
+            return web.json_response({"error": {"message": "Request too large"}}, status=413)
+        if self.requests in self.throttle_requests:
+            return web.json_response({"error": {"message": "Throttled"}}, status=503, headers={"Retry-After": "0"})
+
+        self.body_sizes.append(len(raw))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.in_flight -= 1
+
+        actions = json.loads(raw)["value"]
+        self.batch_keys.append([a["id"] for a in actions])
+        results = []
+        for action in actions:
+            key = action["id"]
+            if key in self.bad_keys:
+                results.append({"key": key, "status": False, "statusCode": 400, "errorMessage": "Invalid document"})
+            elif key.endswith(self.flaky_suffix) and key not in self.seen_flaky:
+                self.seen_flaky.add(key)
+                results.append({"key": key, "status": False, "statusCode": 503, "errorMessage": "Throttled"})
+            else:
+                self.stored[key] = action
+                results.append({"key": key, "status": True, "statusCode": 201})
+        failed = any(not r["status"] for r in results)
+        return web.json_response({"value": results}, status=207 if failed else 200)
+
+
+@asynccontextmanager
+async def serve_fake_index(index):
+    app = web.Application()
+    app.router.add_post("/indexes/{name}/docs/index", index.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    client = AzureSearchClient(endpoint=f"http://127.0.0.1:{port}", api_key="test", http2=False)
+    try:
+        yield SearchOperations(client)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+async def _documents(n):
+    for i in range(n):
+        yield {"id": f"doc-{i}", "content": "x" * 900, "content_vector": [0.125] * 16}
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_sizes_batches_and_retries_only_failed_keys(monkeypatch):
+    monkeypatch.setattr(data_manager, "_backoff", lambda attempt: 0.01)
+    index = FakeSearchIndex(max_body_bytes=16 * 1024)
+    async with serve_fake_index(index) as ops:
+        result = await DataAutomation(ops).bulk_upload(
+            "idx", _documents(200), batch_size=1000, max_batch_bytes=12 * 1024, max_concurrency=4
+        )
+
+    # Byte budget, not the document count, closes every batch
+    assert max(index.body_sizes) <= 12 * 1024
+    assert all(len(keys) < 1000 for keys in index.batch_keys)
+
+    # Flaky keys were resent on their own; the bad key is reported, not retried
+    flaky = {f"doc-{i}" for i in range(200) if str(i).endswith("7")}
+    resent = [keys for keys in index.batch_keys if set(keys) <= flaky]
+    assert resent and sum(len(keys) for keys in resent) == len(flaky)
+    assert sum(keys.count("doc-13") for keys in index.batch_keys) == 1
+    assert result["succeeded"] == 199 and result["failed"] == 1
+    assert result["failed_documents"] == [{"key": "doc-13", "error": "Invalid document"}]
+    assert len(index.stored) == 199
+
+    # Throttled request backed off and was retried; batches overlapped
+    assert result["throttled"] == 1
+    assert result["retried_documents"] == len(flaky)
+    assert index.peak_in_flight > 1
+    assert result["batch_latency_ms"]["p50"] > 0
+    assert result["documents_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_splits_batches_rejected_as_too_large():
+    index = FakeSearchIndex(max_body_bytes=4 * 1024, throttle_requests=(), bad_keys=())
+    async with serve_fake_index(index) as ops:
+        result = await DataAutomation(ops).bulk_upload(
+            "idx", _documents(20), max_batch_bytes=12 * 1024, max_concurrency=2
+        )
+
+    assert result["succeeded"] == 20 and result["failed"] == 0
+    assert result["split_batches"] > 0
+    assert max(index.body_sizes) <= 4 * 1024
+
+
+@pytest.mark.asyncio
+async def test_sustained_throttling_backs_off_without_opening_the_circuit(monkeypatch):
+    monkeypatch.setattr(data_manager, "_backoff", lambda attempt: 0.01)
+    monkeypatch.setenv("MCP_UPLOAD_MAX_RETRIES", "8")
+    # More consecutive throttles than the circuit breaker's failure threshold
+    index = FakeSearchIndex(max_body_bytes=64 * 1024, throttle_requests=range(1, 7), bad_keys=(), flaky_suffix="x")
+    async with serve_fake_index(index) as ops:
+        result = await DataAutomation(ops).bulk_upload(
+            "idx", _documents(40), batch_size=10, max_concurrency=1
+        )
+        assert ops.client._circuit.allow()
+
+    assert result["succeeded"] == 40 and result["failed"] == 0
+    assert result["throttled"] == 6
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_retried_once_it_resets(monkeypatch):
+    monkeypatch.setattr(data_manager, "_backoff", lambda attempt: 0.05)
+    index = FakeSearchIndex(max_body_bytes=64 * 1024, throttle_requests=(), bad_keys=(), flaky_suffix="x")
+    async with serve_fake_index(index) as ops:
+        ops.client._circuit = _CircuitBreaker(failure_threshold=1, reset_sec=0.05)
+        ops.client._circuit.failure()
+        result = await DataAutomation(ops).bulk_upload("idx", _documents(20), batch_size=10, max_concurrency=1)
+
+    assert result["succeeded"] == 20 and result["failed"] == 0
+    assert len(index.stored) == 20
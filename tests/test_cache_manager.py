@@ -40,4 +40,55 @@ async def test_cache_manager_clear_scope_and_pattern():
     # Stats return shape (not asserting exact counts due to TTL clock)
     stats = await cm.get_stats()
     assert "total_entries" in stats
-    assert "ttl_seconds" in stats
\ No newline at end of file
+    assert "ttl_seconds" in stats
+
+@pytest.mark.asyncio
+async def test_cache_manager_get_or_compute_single_flight():
+    cm = CacheManager(ttl=60, max_size=100)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"ok": True, "n": calls}
+
+    results = await asyncio.gather(*(cm.get_or_compute("search:_all:q", compute) for _ in range(5)))
+    assert calls == 1
+    assert sorted(src for _, src in results) == ["coalesced"] * 4 + ["miss"]
+    assert all(value == {"ok": True, "n": 1} for value, _ in results)
+
+    value, source = await cm.get_or_compute("search:_all:q", compute)
+    assert source == "hit" and calls == 1
+
+    # Values rejected by cacheable are returned but not stored
+    value, _ = await cm.get_or_compute("search:_all:bad", lambda: _err(), cacheable=lambda r: r["ok"])
+    assert value == {"ok": False}
+    assert await cm.get("search:_all:bad") is None
+
+    stats = await cm.get_stats()
+    assert stats["coalesced"] == 4
+    assert stats["hits"] >= 1
+    assert 0.0 < stats["hit_ratio"] < 1.0
+
+
+async def _err():
+    return {"ok": False}
+
+
+@pytest.mark.asyncio
+async def test_unscoped_search_entries_do_not_collide_with_a_repository_named_all():
+    from types import SimpleNamespace
+    from mcprag.mcp.tools._helpers.search_impl import SEARCH_CACHE_SCOPE, _repo_cache_segment, invalidate_search_cache
+
+    cm = CacheManager(ttl=60, max_size=100)
+    unscoped = f"{SEARCH_CACHE_SCOPE}:{_repo_cache_segment(None)}:q"
+    repo_all = f"{SEARCH_CACHE_SCOPE}:{_repo_cache_segment('_all')}:q"
+    assert unscoped != repo_all
+    await cm.set(unscoped, {"v": 1})
+    await cm.set(repo_all, {"v": 2})
+
+    # A write to another repository drops unscoped results only
+    assert await invalidate_search_cache(SimpleNamespace(cache_manager=cm), ["other"]) == 1
+    assert await cm.get(unscoped) is None
+    assert await cm.get(repo_all) == {"v": 2}
@@ -0,0 +1,130 @@
+import multiprocessing
+
+import pytest
+
+from enhanced_rag.azure_integration.embedding_store import ChunkEmbeddingStore, DATA_FILENAME, INDEX_FILENAME
+from enhanced_rag.azure_integration.embedding_provider import IEmbeddingProvider
+
+
+class CountingProvider(IEmbeddingProvider):
+    model_name = "fake-embedding"
+    dimensions = 3
+
+    def __init__(self):
+        self.embedded = []
+
+    def generate_embedding(self, text):
+        return self.generate_embeddings_batch([text])[0]
+
+    def generate_embeddings_batch(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+    def generate_code_embedding(self, code, context):
+        return self.generate_embedding(f"{context}\n\nCode:\n{code}")
+
+
+def test_store_roundtrip_keys_on_model_and_dimensions(tmp_path):
+    store = ChunkEmbeddingStore(str(tmp_path))
+    store.put_many("m", 3, [("a", [0.25, -0.5, 1.0]), ("b", [1.0, 2.0, 3.0])])
+    store.put("m", 3, "a", [9.0, 9.0, 9.0])  # already stored, not appended again
+    store.close()
+
+    reopened = ChunkEmbeddingStore(str(tmp_path))
+    assert reopened.get_many("m", 3, ["a", "b", "c"]) == [[0.25, -0.5, 1.0], [1.0, 2.0, 3.0], None]
+    assert reopened.get("m", 8, "a") is None
+    assert reopened.get("other", 3, "a") is None
+    stats = reopened.get_stats()
+    assert stats["entries"] == 2
+    assert stats["hits"] == 2 and stats["misses"] == 3
+    assert stats["data_bytes"] == 2 * (37 + 3 * 4)
+    reopened.close()
+
+
+def test_store_float16_and_torn_tail_recovery(tmp_path):
+    store = ChunkEmbeddingStore(str(tmp_path), dtype="float16")
+    store.put("m", 2, "a", [0.5, -2.0])
+    store.put("m", 2, "b", [1.5, 4.0])
+    store.close()
+
+    # Lose the index entirely and leave half a record at the end of the data file
+    (tmp_path / "vectors.idx").write_bytes(b"")
+    with open(tmp_path / DATA_FILENAME, "ab") as f:
+        f.write(b"\x01" * 20)
+
+    reopened = ChunkEmbeddingStore(str(tmp_path))
+    assert reopened.get("m", 2, "a") == [0.5, -2.0]
+    assert reopened.get("m", 2, "b") == [1.5, 4.0]
+    assert reopened.get_stats()["data_bytes"] == 2 * (37 + 2 * 2)
+    reopened.close()
+
+
+def _append_worker(path, worker, barrier):
+    store = ChunkEmbeddingStore(path)
+    barrier.wait()
+    for batch in range(100):
+        store.put_many("m", 64, [
+            (f"w{worker}-{batch}-{i}", [float(worker * 1000 + batch * 10 + i)] * 64) for i in range(5)
+        ])
+    store.close()
+
+
+def test_concurrent_processes_append_without_mixing_up_offsets(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(2)
+    workers = [context.Process(target=_append_worker, args=(str(tmp_path), w, barrier)) for w in (1, 2)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    store = ChunkEmbeddingStore(str(tmp_path))
+    texts = [f"w{w}-{b}-{i}" for w in (1, 2) for b in range(100) for i in range(5)]
+    vectors = store.get_many("m", 64, texts)
+    assert [v[0] for v in vectors] == [float(w * 1000 + b * 10 + i) for w in (1, 2) for b in range(100) for i in range(5)]
+    assert store.get_stats()["entries"] == 1000
+    store.close()
+
+
+def test_index_entry_pointing_at_another_record_is_a_miss(tmp_path):
+    store = ChunkEmbeddingStore(str(tmp_path))
+    store.put_many("m", 3, [("a", [1.0, 1.0, 1.0]), ("b", [2.0, 2.0, 2.0])])
+    store.close()
+
+    # Swap the two offsets in the index
+    raw = (tmp_path / INDEX_FILENAME).read_bytes()
+    (tmp_path / INDEX_FILENAME).write_bytes(raw[:32] + raw[72:] + raw[40:72] + raw[32:40])
+
+    reopened = ChunkEmbeddingStore(str(tmp_path))
+    assert reopened.get_many("m", 3, ["a", "b"]) == [None, None]
+    assert reopened.get_stats()["misses"] == 2
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_scratch_makes_no_embedding_calls(tmp_path):
+    from enhanced_rag.azure_integration.automation.embedding_manager import EmbeddingAutomation
+
+    def documents():
+        return [
+            {"id": str(i), "content": f"def f{i}():\n    return {i}\n", "file_path": f"m{i}.py"}
+            for i in range(25)
+        ]
+
+    provider = CountingProvider()
+    first = EmbeddingAutomation(None, provider, embedding_store=ChunkEmbeddingStore(str(tmp_path)))
+    _, stats = await first.enrich_documents_with_embeddings(documents(), context_fields=["file_path"])
+    assert stats["enriched"] == 25 and len(provider.embedded) == 25
+    first.store.close()
+
+    # A new process with a cold in-memory cache rebuilding the whole index
+    provider = CountingProvider()
+    second = EmbeddingAutomation(None, provider, embedding_store=ChunkEmbeddingStore(str(tmp_path)))
+    enriched, stats = await second.enrich_documents_with_embeddings(documents(), context_fields=["file_path"])
+    assert stats["enriched"] == 25
+    assert provider.embedded == []
+    assert enriched[3]["content_vector"][0] == float(len("file_path: m3.py\n\nCode:\ndef f3():\n    return 3\n"))
+    store_stats = (await second.get_embedding_stats())["store"]
+    assert store_stats["hits"] == 25 and store_stats["hit_ratio"] == 1.0
+    second.store.close()
@@ -0,0 +1,80 @@
+import pytest
+
+from enhanced_rag.core.components import ComponentRegistry
+
+
+def test_components_are_built_once_lazily_with_timings():
+    built = []
+
+    def make(name, *deps):
+        def factory(registry):
+            for dep in deps:
+                registry.get(dep)
+            built.append(name)
+            return object()
+        return factory
+
+    registry = ComponentRegistry(factories={
+        "client": make("client"),
+        "retriever": make("retriever", "client"),
+        "ranker": make("ranker"),
+        "pipeline": make("pipeline", "retriever", "ranker", "client"),
+    })
+    assert built == []
+
+    first = registry.get("pipeline")
+    assert registry.get("pipeline") is first
+    assert built == ["client", "retriever", "ranker", "pipeline"]
+
+    report = registry.report()
+    assert list(report["components"]) == ["client", "retriever", "ranker", "pipeline"]
+    assert report["components"]["client"]["uses"] == 2
+    assert report["components"]["pipeline"]["uses"] == 2
+    pipeline = report["components"]["pipeline"]
+    assert pipeline["seconds"] >= pipeline["self_seconds"] >= 0
+    assert "context_analyzer" in report["not_built"]
+
+
+def test_failed_and_circular_components_are_not_cached():
+    attempts = []
+
+    def flaky(registry):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("endpoint unreachable")
+        return "client"
+
+    registry = ComponentRegistry(factories={
+        "client": flaky,
+        "a": lambda r: r.get("b"),
+        "b": lambda r: r.get("a"),
+    })
+
+    assert registry.get_optional("client") is None
+    assert registry.report()["components"]["client"]["error"] == "endpoint unreachable"
+    assert registry.get("client") == "client"
+
+    with pytest.raises(RuntimeError, match="a -> b -> a"):
+        registry.get("a")
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_mcp_tools_share_one_pipeline():
+    pytest.importorskip("networkx")
+    from enhanced_rag.mcp_integration import CodeGenerationTool, ContextAwareTool, EnhancedSearchTool
+
+    registry = ComponentRegistry()
+    search = EnhancedSearchTool({}, components=registry)
+    codegen = CodeGenerationTool({}, components=registry)
+    context = ContextAwareTool({}, components=registry)
+
+    pipeline = registry.get("pipeline")
+    assert search.pipeline is pipeline and codegen.pipeline is pipeline
+    assert context.context_analyzer is pipeline.context_analyzer
+    assert pipeline.retriever is registry.get("retriever")
+    assert pipeline.ranker is registry.get("ranker")
+
+    components = registry.report()["components"]
+    assert components["pipeline"]["uses"] == 3
+    assert components["retriever"]["uses"] == 3
@@ -0,0 +1,64 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from enhanced_rag.core.models import EnhancedContext, SearchIntent, SearchResult
+from enhanced_rag.ranking.contextual_ranker_improved import ImprovedContextualRanker
+
+
+class _QueryContext(EnhancedContext):
+    query: str = ""
+
+
+SNIPPETS = [
+    "class UserFactory:\n    def create_user(self) -> User:\n        return User()\n",
+    "async def load(path):\n    await asyncio.sleep(0)\n",
+    "def subscribe(self, cb):\n    pass\ndef notify(self):\n    pass\n",
+    "x = 1\n",
+]
+
+
+def _results(n, seed):
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    out = []
+    for i in range(n):
+        r = SearchResult(
+            id=f"r{i}",
+            # Coarse scores and shared paths force tie-breaking to matter
+            score=float(rng.randint(0, 3)),
+            file_path=f"src/m{rng.randint(0, 4)}.py",
+            code_snippet=rng.choice(SNIPPETS),
+            language=rng.choice(["python", "javascript"]),
+            imports=rng.sample(["os", "re", "json"], k=rng.randint(0, 2)),
+            last_modified=rng.choice([None, now - timedelta(days=rng.randint(0, 9))]),
+            tags=rng.choice([[], ["test"]]),
+        )
+        if rng.random() < 0.3:
+            r.vector_score = rng.choice([0.25, 0.5])
+        out.append(r)
+    return out
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", ["", "create factory with observer"])
+@pytest.mark.parametrize("intent", [SearchIntent.IMPLEMENT, SearchIntent.DEBUG, SearchIntent.TEST])
+async def test_batch_ranking_matches_per_result_ranking(query, intent):
+    context = _QueryContext(
+        query=query,
+        current_file="src/m1.py",
+        language="python",
+        imports=["os", "json"],
+    )
+
+    per_result = await ImprovedContextualRanker({"batch_scoring": False}).rank_results(
+        _results(120, seed=3), context, intent
+    )
+    batch = await ImprovedContextualRanker({"batch_scoring": True}).rank_results(
+        _results(120, seed=3), context, intent
+    )
+
+    assert [(r.id, r.score, r.ranking_explanation, r.pattern_match) for r in batch] == [
+        (r.id, r.score, r.ranking_explanation, r.pattern_match) for r in per_result
+    ]
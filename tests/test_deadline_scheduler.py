@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from enhanced_rag.core.config import Config
+from enhanced_rag.core.models import SearchQuery
+from enhanced_rag.retrieval.multi_stage_pipeline import (
+    MultiStageRetriever,
+    RetrievalContext,
+    SearchStage,
+)
+from enhanced_rag.utils.deadline import Deadline
+from enhanced_rag.utils.performance_monitor import PerformanceMonitor
+
+
+def _doc(n):
+    return {
+        "id": f"k-{n}",
+        "@search.score": float(10 - n),
+        "content": f"def keyword_hit_{n}(): pass",
+        "file_path": f"src/mod_{n}.py",
+        "repository": "repo",
+        "language": "python",
+    }
+
+
+class _FastKeywordOps:
+    async def search(self, index_name, query="*", timeout=None, **options):
+        await asyncio.sleep(0.01)
+        return {"value": [_doc(n) for n in range(3)]}
+
+
+class _SlowVectorSearcher:
+    async def vector_search(self, query, filter_expr=None, top_k=50, timeout=None):
+        await asyncio.sleep(2)
+        return []
+
+
+def _retriever():
+    r = MultiStageRetriever.__new__(MultiStageRetriever)
+    r.config = Config()
+    r.rest_ops = _FastKeywordOps()
+    r.index_names = {"main": "codebase"}
+    r.hybrid_searcher = _SlowVectorSearcher()
+    r._cache = {}
+    r._cache_index = None
+    r._semantic_fallback_cache = {}
+    r.stage_latency = PerformanceMonitor(max_history=200)
+    return r
+
+
+@pytest.mark.asyncio
+async def test_slow_stage_is_cancelled_and_partial_results_are_degraded():
+    retriever = _retriever()
+    ctx = RetrievalContext()
+
+    started = time.perf_counter()
+    results = await retriever.retrieve(
+        SearchQuery(query="keyword hit"),
+        stages=[SearchStage.VECTOR, SearchStage.KEYWORD],
+        deadline_ms=300,
+        ctx=ctx,
+    )
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5
+    assert [r.id for r in results] == ["k-0", "k-1", "k-2"]
+    assert ctx.degraded
+    assert "stage_timeout:vector" in ctx.warnings
+
+
+def test_adaptive_stage_timeout_tracks_p95():
+    retriever = _retriever()
+    perf = retriever.config.performance
+
+    # Cold start: no history, use the configured ceiling
+    assert retriever._adaptive_stage_timeout(SearchStage.KEYWORD, None) == perf.stage_timeout_max_ms / 1000
+
+    for ms in [100] * 19 + [200]:
+        retriever.stage_latency.record_metric("stage_keyword_ms", ms)
+    expected = 100 * perf.stage_timeout_p95_multiplier / 1000
+    assert retriever._adaptive_stage_timeout(SearchStage.KEYWORD, None) == pytest.approx(expected)
+    # Never more than the remaining stage budget
+    assert retriever._adaptive_stage_timeout(SearchStage.KEYWORD, 0.02) == pytest.approx(0.02)
+
+
+def test_deadline_phase_budget_carries_forward():
+    deadline = Deadline(1000)
+    assert deadline.phase_s("context") == pytest.approx(0.05, rel=0.05)
+    assert deadline.phase_s("enhance") == pytest.approx(0.05 / 0.95, rel=0.05)
+    assert deadline.phase_s("rerank") == pytest.approx(0.25, rel=0.05)
+    assert deadline.phase_s("rank") == pytest.approx(1.0, rel=0.05)
+    # A partial configured split keeps the defaults for the other phases
+    assert Deadline(1000, {"stages": 0.7}).phase_s("rerank") > 0.1
+    assert Deadline(None).phase_s("stages") is None
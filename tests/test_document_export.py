@@ -0,0 +1,134 @@
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+
+from enhanced_rag.azure_integration.automation.data_manager import DataAutomation, key_range_partitions
+
+_CLAUSE = re.compile(r"(\w+) (eq|gt|ge|lt) ('(?:[^']|'')*'|null)")
+
+
+class FakeSearchOps:
+    """In-memory docs/search supporting the filters and ordering export relies on"""
+
+    def __init__(self, documents, sortable_key=True):
+        self.documents = sorted(documents, key=lambda d: d["id"])
+        self.sortable_key = sortable_key
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @staticmethod
+    def _matches(doc, filter_query):
+        for field, op, raw in _CLAUSE.findall(filter_query or ""):
+            value = None if raw == "null" else raw[1:-1].replace("''", "'")
+            actual = doc.get(field)
+            if op == "eq" and actual != value:
+                return False
+            if op != "eq" and (actual is None or not {
+                "gt": actual > value, "ge": actual >= value, "lt": actual < value
+            }[op]):
+                return False
+        return True
+
+    async def search(self, index_name, query="*", **options):
+        self.requests.append(options)
+        assert options.get("skip", 0) <= 100000
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            self.in_flight -= 1
+        matched = [d for d in self.documents if self._matches(d, options.get("filter"))]
+        if options.get("facets"):
+            counts = {}
+            for d in matched:
+                counts[d.get("repository")] = counts.get(d.get("repository"), 0) + 1
+            return {"value": [], "@search.facets": {"repository": [
+                {"value": v, "count": c} for v, c in counts.items() if v is not None
+            ]}}
+        if options.get("orderby"):
+            if not self.sortable_key:
+                request = httpx.Request("POST", "https://search/indexes/idx/docs/search")
+                raise httpx.HTTPStatusError(
+                    "Field 'id' is not sortable", request=request, response=httpx.Response(400, request=request)
+                )
+            assert options["orderby"] == "id asc"
+        skip = options.get("skip", 0)
+        page = matched[skip:skip + options["top"]]
+        select = options.get("select")
+        if select:
+            page = [{k: d.get(k) for k in select} for d in page]
+        return {"value": [dict(d, **{"@search.score": 1.0}) for d in page]}
+
+
+def _docs(n):
+    return [
+        {"id": f"{i * 7919 % 65536:04x}{i:04d}", "repository": None if i % 10 == 0 else f"repo{i % 3}", "content": f"c{i}"}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keyset_export_pages_past_the_skip_limit_without_skip():
+    ops = FakeSearchOps(_docs(2500))
+    exported = [d async for d in DataAutomation(ops).export_documents_iterator("idx", select_fields=["content"])]
+
+    assert [d["id"] for d in exported] == [d["id"] for d in ops.documents]
+    assert len(ops.requests) == 3
+    assert all("skip" not in r for r in ops.requests)
+    assert ops.requests[1]["filter"] == f"(id gt '{ops.documents[999]['id']}')"
+
+    limited = [d async for d in DataAutomation(ops).export_documents_iterator("idx", max_documents=5)]
+    assert len(limited) == 5
+
+
+def test_key_range_partitions_cover_the_key_space():
+    assert key_range_partitions("8") == ["(id lt '8')", "id ge '8'"]
+    assert len(key_range_partitions()) == 16
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("partitions", ["key_range", "repository"])
+async def test_partitioned_export_streams_every_document_once(partitions, tmp_path):
+    ops = FakeSearchOps(_docs(1200))
+    output = tmp_path / "export.ndjson"
+
+    result = await DataAutomation(ops).export_to_ndjson(
+        "idx", str(output), partitions=partitions, batch_size=100, concurrency=4
+    )
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    ids = [json.loads(line)["id"] for line in lines]
+    assert result["documents"] == len(ids) == 1200
+    assert sorted(ids) == [d["id"] for d in ops.documents]
+    assert "@search.score" not in lines[0]
+    assert ops.peak_in_flight > 1
+
+
+class LegacyIndexOps(FakeSearchOps):
+    """An index whose definition marks the key as not sortable"""
+
+    async def get_index(self, name):
+        return {"name": name, "fields": [{"name": "id", "type": "Edm.String", "key": True, "sortable": False}]}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ops_class", [LegacyIndexOps, FakeSearchOps])
+async def test_export_falls_back_to_skip_paging_when_key_is_not_sortable(ops_class):
+    # LegacyIndexOps says so in its definition; FakeSearchOps only rejects the orderby
+    ops = ops_class(_docs(2500), sortable_key=False)
+    automation = DataAutomation(ops)
+
+    exported = [d async for d in automation.export_documents_iterator("idx")]
+    assert sorted(d["id"] for d in exported) == [d["id"] for d in ops.documents]
+    assert [r.get("skip") for r in ops.requests if "orderby" not in r] == [0, 1000, 2000]
+
+    # The partitioned export used by blue/green copies works the same way
+    ops.requests.clear()
+    copied = [d async for d in automation.export_documents_partitioned("idx", batch_size=500)]
+    assert len(copied) == 2500
+    assert not any("orderby" in r for r in ops.requests)
@@ -0,0 +1,155 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("openai")
+web = pytest.importorskip("aiohttp.web")
+
+from enhanced_rag.azure_integration.automation.embedding_manager import (
+    EmbeddingAutomation,
+    plan_token_batches,
+)
+from enhanced_rag.azure_integration.embedding_provider import AzureOpenAIEmbeddingProvider, format_code_input
+
+
+class FakeEmbeddingEndpoint:
+    """OpenAI-compatible /embeddings endpoint that rate limits every third request"""
+
+    def __init__(self, reject_every: int = 3):
+        self.reject_every = reject_every
+        self.requests = 0
+        self.rejected = 0
+        self.batch_sizes = []
+        self.inputs = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handle(self, request):
+        body = await request.json()
+        self.requests += 1
+        if self.requests % self.reject_every == 0:
+            self.rejected += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}},
+                status=429,
+                headers={"retry-after-ms": "50"},
+            )
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.in_flight -= 1
+        inputs = body["input"]
+        self.batch_sizes.append(len(inputs))
+        self.inputs.extend(inputs)
+        return web.json_response({
+            "object": "list",
+            "model": body["model"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": [float(len(text)), 1.0]}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        })
+
+
+@asynccontextmanager
+async def serve_fake_endpoint(monkeypatch):
+    endpoint = FakeEmbeddingEndpoint()
+    app = web.Application()
+    app.router.add_post("/v1/embeddings", endpoint.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    for name in ("AZURE_OPENAI_ENDPOINT", "AZURE_OPENAI_API_KEY", "AZURE_OPENAI_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{port}/v1")
+    monkeypatch.setenv("EMBEDDING_MODEL", "fake-embedding")
+    monkeypatch.setenv("MCP_EMBEDDING_STORE", "false")
+    try:
+        yield endpoint
+    finally:
+        await runner.cleanup()
+
+
+def test_plan_token_batches_respects_token_and_item_limits():
+    assert plan_token_batches([40, 40, 40, 90, 10], max_batch_tokens=100, max_batch_items=10) == [
+        [0, 1], [2], [3, 4]
+    ]
+    assert plan_token_batches([1] * 5, max_batch_tokens=100, max_batch_items=2) == [[0, 1], [2, 3], [4]]
+    # An oversized input still gets its own request
+    assert plan_token_batches([500, 1], max_batch_tokens=100, max_batch_items=10) == [[0], [1]]
+
+
+def test_code_input_format_matches_stored_vectors():
+    # Same text generate_code_embedding has always sent, including for empty context
+    assert format_code_input("x = 1", "name: x") == "name: x\n\nCode:\nx = 1"
+    assert format_code_input("x = 1", "") == "\n\nCode:\nx = 1"
+    assert format_code_input("y" * 7000, "c").endswith("y...") and len(format_code_input("y" * 7000, "c")) == 6003
+
+
+@pytest.mark.asyncio
+async def test_context_enrichment_is_batched_and_survives_rate_limits(monkeypatch):
+    async with serve_fake_endpoint(monkeypatch) as fake_endpoint:
+        await _check_batched_enrichment(fake_endpoint)
+
+
+async def _check_batched_enrichment(fake_endpoint):
+    automation = EmbeddingAutomation(
+        operations=None,
+        embedding_provider=AzureOpenAIEmbeddingProvider(),
+        max_cache_entries=50,
+        max_concurrency=4,
+        max_batch_tokens=400,
+    )
+    documents = [
+        {"id": str(i), "content": f"def f{i}():\n    return {i}\n" * 5, "function_name": f"f{i}"}
+        for i in range(120)
+    ]
+
+    enriched, stats = await automation.enrich_documents_with_embeddings(
+        documents, context_fields=["function_name"]
+    )
+
+    assert stats["enriched"] == 120 and stats["failed"] == 0
+    # Context-augmented inputs are sent in multi-document requests, not one per doc
+    assert fake_endpoint.rejected > 0
+    assert fake_endpoint.requests - fake_endpoint.rejected < 120
+    assert max(fake_endpoint.batch_sizes) > 1
+    assert all(text.startswith("function_name: f") for text in fake_endpoint.inputs)
+    for doc in enriched:
+        assert doc["content_vector"][1] == 1.0
+
+    # Several requests overlapped, and 429s shrank the concurrency limit
+    assert fake_endpoint.peak_in_flight > 1
+    embedding_stats = await automation.get_embedding_stats()
+    assert embedding_stats["stats"]["rate_limited"] == fake_endpoint.rejected
+    assert embedding_stats["concurrency_limit"] < 4
+    # The cache stays within its bound
+    assert embedding_stats["cache_size"] == 50
+    assert embedding_stats["stats"]["cache_evictions"] == 70
+
+
+class HangingProvider:
+    async def agenerate_embeddings_batch(self, texts):
+        await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_gives_its_limiter_slot_back(monkeypatch):
+    monkeypatch.setenv("MCP_EMBEDDING_STORE", "false")
+    automation = EmbeddingAutomation(None, HangingProvider(), max_concurrency=2)
+    limiter = automation._get_limiter()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(automation._embed_batch(["def f(): pass"]), timeout=0.05)
+
+    assert limiter.in_flight == 0
+    # A cancellation is neither a success nor a throttle
+    assert (limiter.limit, limiter.rate_limited) == (2, 0)
@@ -0,0 +1,38 @@
+import pytest
+
+from enhanced_rag.utils.embedding_cache import QueryEmbeddingCache
+
+
+def test_query_embedding_cache_lru_and_key_normalization():
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("m", 4, "parse  config\n", [1.0, 2.0, 3.0, 4.0])
+    cache.put("m", 4, "b", [0.0] * 4)
+
+    # Whitespace-normalized text shares the entry; model/dimensions do not
+    assert cache.get("m", 4, "parse config") == [1.0, 2.0, 3.0, 4.0]
+    assert cache.get("m", 8, "parse config") is None
+    assert cache.get("other", 4, "parse config") is None
+
+    cache.put("m", 4, "c", [0.5] * 4)  # evicts "b", the least recently used
+    assert cache.get("m", 4, "b") is None
+
+    stats = cache.get_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_cache_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "query_embeddings.sqlite")
+    cache = QueryEmbeddingCache(path=path)
+    await cache.aput("m", 2, "hello", [0.25, -0.5])
+    cache.close()
+
+    reopened = QueryEmbeddingCache(path=path)
+    assert await reopened.aget("m", 2, "hello") == [0.25, -0.5]
+    assert reopened.get("m", 2, "hello") == [0.25, -0.5]
+    stats = reopened.get_stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+    reopened.close()
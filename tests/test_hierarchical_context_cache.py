@@ -0,0 +1,118 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from enhanced_rag.context.hierarchical_context import HierarchicalContextAnalyzer
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+MODULE = "import os\nimport json\n\n\nclass Service{i}:\n    pass\n\n\ndef helper_{i}(x):\n    return os.path.join(x, json.dumps(x))\n"
+
+
+def _git(root, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    package = tmp_path / "app" / "services"
+    package.mkdir(parents=True)
+    (tmp_path / "requirements.txt").write_text("requests\n")
+    (tmp_path / "conftest.py").write_text("")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_services.py").write_text("")
+    for i in range(20):
+        (package / f"module_{i}.py").write_text(MODULE.format(i=i))
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "initial")
+    return tmp_path
+
+
+async def _max_loop_block(coro):
+    """Run coro while a heartbeat measures the longest stretch the loop was blocked"""
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - started - 0.001)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.005)
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await beat
+    return result, max(lags)
+
+
+def test_slow_git_and_disk_do_not_block_the_event_loop(repo, tmp_path_factory, monkeypatch):
+    # A git that takes 0.3s per call, and file reads / project scans that take 50ms / 0.3s
+    bin_dir = tmp_path_factory.mktemp("bin")
+    slow_git = bin_dir / "git"
+    slow_git.write_text(f'#!/bin/sh\nsleep 0.3\nexec "{shutil.which("git")}" "$@"\n')
+    slow_git.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    analyzer = HierarchicalContextAnalyzer({"cache_enabled": False})
+    read_file, scan_project = analyzer._read_file, analyzer._scan_project
+    monkeypatch.setattr(analyzer, "_read_file", lambda path: (time.sleep(0.05), read_file(path))[1])
+    monkeypatch.setattr(analyzer, "_scan_project", lambda *a: (time.sleep(0.3), scan_project(*a))[1])
+
+    target = str(repo / "app" / "services" / "module_0.py")
+    started = time.perf_counter()
+    context, blocked = asyncio.run(_max_loop_block(analyzer.get_hierarchical_context(target)))
+
+    assert time.perf_counter() - started >= 0.6
+    assert blocked < 0.15
+    assert context.git_branch in ("master", "main")
+    assert context.functions == ["helper_0"] and context.classes == ["Service0"]
+    assert context.recent_changes[0]["message"] == "initial"
+    assert context.project_context["test_framework"] == "pytest"
+    assert context.project_context["test_directories"] == ["tests"]
+    assert context.module_context["module_size"] == 19
+
+
+def test_project_facts_and_files_are_cached_until_they_change(repo):
+    analyzer = HierarchicalContextAnalyzer({"cache_enabled": False})
+    package = repo / "app" / "services"
+
+    async def scenario():
+        await analyzer.get_hierarchical_context(str(package / "module_0.py"))
+        first = dict(analyzer.stats)
+        assert first["project_scans"] == 1 and first["file_reads"] == 20
+
+        # Another file of the same package: only its content is read; no scans, no git
+        await analyzer.get_hierarchical_context(str(package / "module_1.py"))
+        second = dict(analyzer.stats)
+        assert second["file_reads"] == first["file_reads"] + 1
+        assert second["project_scans"] == 1
+        assert second["git_queries"] == first["git_queries"]
+
+        # Editing a sibling re-reads just that file
+        (package / "module_5.py").write_text(MODULE.format(i=5) + "\nimport yaml\n")
+        await analyzer.get_hierarchical_context(str(package / "module_1.py"))
+        assert analyzer.stats["file_reads"] == second["file_reads"] + 1
+
+        # A new commit moves HEAD, so git facts are refreshed
+        _git(repo, "commit", "-qam", "use yaml")
+        context = await analyzer.get_hierarchical_context(str(package / "module_5.py"))
+        assert analyzer.stats["git_queries"] > second["git_queries"]
+        assert [c["message"] for c in context.recent_changes] == ["use yaml", "initial"]
+
+        # A new manifest in the project root invalidates project facts
+        (repo / "pyproject.toml").write_text("[project]\nname = 'demo'\n")
+        context = await analyzer.get_hierarchical_context(str(package / "module_5.py"))
+        assert analyzer.stats["project_scans"] == 2
+        assert context.project_context["project_type"] == "library"
+
+    asyncio.run(scenario())
@@ -0,0 +1,143 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from enhanced_rag.azure_integration.manifest import IncrementalSync, IndexManifest
+from enhanced_rag.azure_integration.processing import FileProcessor, IndexingStats
+
+
+class FakeOps:
+    """Records deletions; search returns no indexed chunks"""
+
+    def __init__(self):
+        self.deleted = []
+        self.etag = '"0x1"'
+
+    async def get_index(self, name):
+        return {"name": name, "@odata.etag": self.etag}
+
+    async def delete_documents(self, index_name, keys):
+        self.deleted.extend(keys)
+        return {"value": [{"key": k, "status": True} for k in keys]}
+
+    async def search(self, index_name, query="*", **options):
+        return {"value": []}
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _make_repo(root: Path) -> None:
+    for i in range(6):
+        _write(root / "pkg" / f"mod_{i}.py", f"def f{i}():\n    return {i}\n\n\ndef g{i}():\n    return -{i}\n")
+
+
+async def _embed(documents, fail=()):
+    async for doc in documents:
+        if doc["function_name"] not in fail:
+            doc["content_vector"] = [0.1, 0.2]
+        yield doc
+
+
+async def _run(root: Path, ops: FakeOps, embedding=None, fail_embedding=()):
+    sync = IncrementalSync(
+        IndexManifest(str(root / ".mcprag" / "m.sqlite")), str(root), "idx", "repo", embedding
+    )
+    await sync.check_index(ops)
+    stats = IndexingStats()
+    files = FileProcessor().aiter_repository_files(
+        str(root), "repo", workers=1, stats=stats, file_filter=sync.needs_processing
+    )
+    documents = sync.diff_stream(files)
+    if embedding:
+        documents = sync.embedded_stream(_embed(documents, fail_embedding))
+    uploaded = [d async for d in documents]
+    await sync.apply_deletions(ops, include_vanished=not stats.truncated)
+    sync.commit({"succeeded": len(uploaded), "failed": 0, "failed_documents": []})
+    sync.close()
+    return uploaded, sync.stats
+
+
+@pytest.mark.asyncio
+async def test_incremental_runs_upload_only_changes(tmp_path):
+    _make_repo(tmp_path)
+    ops = FakeOps()
+
+    first, _ = await _run(tmp_path, ops)
+    assert len(first) == 12 and not ops.deleted
+
+    second, stats = await _run(tmp_path, ops)
+    assert second == [] and stats["files_unchanged"] == 6
+
+    # Touching a file without changing it only refreshes the manifest
+    os.utime(tmp_path / "pkg" / "mod_0.py", ns=(1, 1))
+    third, stats = await _run(tmp_path, ops)
+    assert third == [] and stats["files_unchanged"] == 6
+
+    # Editing one function re-uploads just that chunk
+    _write(tmp_path / "pkg" / "mod_1.py", "def f1():\n    return 100\n\n\ndef g1():\n    return -1\n")
+    fourth, stats = await _run(tmp_path, ops)
+    assert [d["function_name"] for d in fourth] == ["f1"]
+    assert stats["chunks_unchanged"] == 1 and not ops.deleted
+
+
+@pytest.mark.asyncio
+async def test_removed_chunks_and_files_are_deleted(tmp_path):
+    _make_repo(tmp_path)
+    ops = FakeOps()
+    first, _ = await _run(tmp_path, ops)
+    ids = {(d["file_path"], d["function_name"]): d["id"] for d in first}
+
+    # Dropping the last function leaves its positional id orphaned
+    _write(tmp_path / "pkg" / "mod_2.py", "def f2():\n    return 2\n")
+    (tmp_path / "pkg" / "mod_3.py").unlink()
+    uploaded, stats = await _run(tmp_path, ops)
+
+    assert uploaded == []
+    mod2 = next(p for p, _ in ids if p.endswith("mod_2.py"))
+    mod3 = [i for (p, _), i in ids.items() if p.endswith("mod_3.py")]
+    assert sorted(ops.deleted) == sorted([ids[(mod2, "g2")]] + mod3)
+    assert stats["files_deleted"] == 1
+
+    # Deletions are recorded, so a further run is a no-op
+    ops.deleted.clear()
+    again, _ = await _run(tmp_path, ops)
+    assert again == [] and ops.deleted == []
+
+
+@pytest.mark.asyncio
+async def test_recreated_index_is_fully_reuploaded(tmp_path):
+    _make_repo(tmp_path)
+    ops = FakeOps()
+    await _run(tmp_path, ops)
+    assert (await _run(tmp_path, ops))[0] == []
+
+    # drop + create gives the index a new etag; the manifest no longer describes it
+    ops.etag = '"0x2"'
+    uploaded, stats = await _run(tmp_path, ops)
+    assert len(uploaded) == 12 and stats["files_changed"] == 6
+
+    again, _ = await _run(tmp_path, ops)
+    assert again == []
+
+
+@pytest.mark.asyncio
+async def test_enabling_embeddings_reembeds_unchanged_chunks(tmp_path):
+    _make_repo(tmp_path)
+    ops = FakeOps()
+    await _run(tmp_path, ops)
+
+    # Same content, but now with vectors: every chunk goes through the embedder
+    uploaded, _ = await _run(tmp_path, ops, embedding="model:3072:", fail_embedding={"g4"})
+    assert len(uploaded) == 12
+
+    # Only the chunk whose embedding failed is retried
+    retried, _ = await _run(tmp_path, ops, embedding="model:3072:")
+    assert [d["function_name"] for d in retried] == ["g4"]
+
+    # A run without embeddings leaves the vectors alone; a new model re-embeds
+    assert (await _run(tmp_path, ops))[0] == []
+    assert len((await _run(tmp_path, ops, embedding="other:1536:"))[0]) == 12
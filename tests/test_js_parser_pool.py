@@ -0,0 +1,90 @@
+import sys
+import time
+
+from enhanced_rag.code_understanding import js_parser_pool
+from enhanced_rag.code_understanding.chunkers import CodeChunker
+from enhanced_rag.code_understanding.js_parser_pool import JSParserPool
+
+# Speaks the parse_js.mjs --serve protocol; "crash" and "hang" misbehave
+FAKE_WORKER = r'''
+import json, os, sys, time
+for line in sys.stdin:
+    req = json.loads(line)
+    if req.get("op") == "ping":
+        out = {"id": req["id"], "ok": True}
+    else:
+        content = req["content"] if "content" in req else open(req["path"]).read()
+        if content == "crash":
+            sys.exit(3)
+        if content == "hang":
+            time.sleep(30)
+        out = {"id": req["id"], "result": {
+            "chunks": [{"type": "function", "name": "f", "signature": "function f()",
+                        "start_line": 1, "end_line": 1}],
+            "imports_used": [], "calls_functions": [], "pid": os.getpid()}}
+    print(json.dumps(out), flush=True)
+'''
+
+
+def _pool(tmp_path, **kwargs):
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER, encoding="utf-8")
+    return JSParserPool(command=[sys.executable, str(script)], **kwargs)
+
+
+def test_workers_are_reused_and_accept_paths(tmp_path):
+    pool = _pool(tmp_path, workers=1)
+    src = tmp_path / "a.ts"
+    src.write_text("function f() {}", encoding="utf-8")
+    try:
+        results = [pool.parse(content="function f() {}") for _ in range(20)]
+        results.append(pool.parse(path=str(src)))
+        assert len({r["pid"] for r in results}) == 1
+        assert pool.stats["started"] == 1 and pool.stats["parsed"] == 21
+        assert pool.health_check()["healthy_idle"] == 1
+    finally:
+        pool.close()
+
+
+def test_crashed_worker_is_restarted(tmp_path):
+    pool = _pool(tmp_path, workers=1)
+    try:
+        first = pool.parse(content="ok")["pid"]
+        assert pool.parse(content="crash") is None
+        second = pool.parse(content="ok")["pid"]
+        assert second != first
+        assert pool.stats["restarts"] == 2  # the crash and its retry
+    finally:
+        pool.close()
+
+
+def test_hung_request_times_out_and_worker_is_replaced(tmp_path):
+    pool = _pool(tmp_path, workers=1, timeout=0.5)
+    try:
+        start = time.monotonic()
+        assert pool.parse(content="hang") is None
+        assert time.monotonic() - start < 5
+        assert pool.stats["timeouts"] == 1
+        assert pool.parse(content="ok") is not None
+    finally:
+        pool.close()
+
+
+def test_pool_disables_itself_when_workers_cannot_start(tmp_path):
+    missing = JSParserPool(command=["definitely-not-a-node-binary"])
+    assert not missing.available and missing.parse(content="x") is None
+
+    broken = JSParserPool(command=[sys.executable, "-c", "import sys; sys.exit(1)"], max_start_failures=2)
+    assert broken.parse(content="x") is None
+    assert broken.parse(content="x") is None
+    assert not broken.available
+
+
+def test_chunker_falls_back_to_heuristics_without_node(monkeypatch):
+    monkeypatch.setenv("MCP_NODE_COMMAND", "definitely-not-a-node-binary")
+    monkeypatch.setattr(js_parser_pool, "_pool", None)
+    chunks = CodeChunker.chunk_js_ts_file(
+        "import x from 'y'\nfunction add(a, b) {\n  return a + b\n}\n", "/nonexistent/add.js"
+    )
+    assert [c["function_name"] for c in chunks] == ["add"]
+    monkeypatch.setattr(js_parser_pool, "_pool", None)
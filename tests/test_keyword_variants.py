@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from enhanced_rag.core.config import Config
+from enhanced_rag.core.models import SearchIntent, SearchQuery
+from enhanced_rag.retrieval.multi_stage_pipeline import MultiStageRetriever, RetrievalContext
+
+
+class _FakeSearchOps:
+    """Returns canned hits per search text, sleeping to simulate latency"""
+
+    def __init__(self, responses, delay=0.1, delays=None):
+        self.responses = responses
+        self.delay = delay
+        self.delays = delays or {}
+        self.calls = []
+
+    async def search(self, index_name, query="*", timeout=None, **options):
+        self.calls.append(query)
+        await asyncio.sleep(self.delays.get(query, self.delay))
+        return {"value": list(self.responses.get(query, []))}
+
+
+def _retriever(client, **retrieval):
+    cfg = Config()
+    for key, value in retrieval.items():
+        setattr(cfg.retrieval, key, value)
+    retriever = MultiStageRetriever.__new__(MultiStageRetriever)
+    retriever.config = cfg
+    retriever.rest_ops = client
+    retriever.index_names = {"main": "codebase"}
+    return retriever
+
+
+@pytest.mark.asyncio
+async def test_keyword_variants_run_concurrently_and_merge_best_score():
+    client = _FakeSearchOps({
+        "a": [{"id": "1", "@search.score": 1.0}, {"id": "2", "@search.score": 0.5}],
+        "b": [{"id": "2", "@search.score": 3.0}],
+        "c": [{"id": "3", "@search.score": 2.0}],
+    })
+    retriever = _retriever(client)
+
+    started = time.perf_counter()
+    pairs = await retriever._execute_keyword_search(
+        SearchQuery(query="a", queries=["a", "b", "c"]), RetrievalContext()
+    )
+    elapsed = time.perf_counter() - started
+
+    assert sorted(client.calls) == ["a", "b", "c"]
+    assert elapsed < 0.25  # three 100ms calls overlapped
+    assert pairs == [("2", 3.0), ("3", 2.0), ("1", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_keyword_variants_respect_intent_override_and_or_mode():
+    client = _FakeSearchOps({"(a) | (b\\-c)": [{"id": "1", "@search.score": 1.0}]}, delay=0)
+    retriever = _retriever(
+        client,
+        keyword_intent_overrides={"debug": {"keyword_variant_mode": "or", "keyword_max_variants": 2}},
+    )
+
+    pairs = await retriever._execute_keyword_search(
+        SearchQuery(query="a", queries=["a", "b-c", "d"], intent=SearchIntent.DEBUG), RetrievalContext()
+    )
+
+    assert client.calls == ["(a) | (b\\-c)"]
+    assert pairs == [("1", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_keyword_stage_deadline_returns_partial_results():
+    client = _FakeSearchOps(
+        {"fast": [{"id": "1", "@search.score": 1.0}]}, delay=0, delays={"slow": 0.5}
+    )
+    retriever = _retriever(client, keyword_stage_timeout_ms=100)
+    ctx = RetrievalContext()
+
+    pairs = await retriever._execute_keyword_search(SearchQuery(query="fast", queries=["fast", "slow"]), ctx)
+
+    assert pairs == [("1", 1.0)]
+    assert "keyword_stage_deadline" in ctx.warnings
@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_importing_server_does_not_load_rag_stack():
+    result = _run(
+        "import json, sys, mcprag.server as s\n"
+        "heavy = ['enhanced_rag.pipeline', 'enhanced_rag.retrieval', 'enhanced_rag.learning', 'openai']\n"
+        "print(json.dumps({'loaded': [m for m in heavy if m in sys.modules],\n"
+        "                  'flag': s.PIPELINE_AVAILABLE,\n"
+        "                  'loaded_after_flag': 'enhanced_rag.pipeline' in sys.modules}))"
+    )
+    assert result["loaded"] == []
+    # Back-compat flags still resolve, importing only what they describe
+    assert isinstance(result["flag"], bool)
+    assert result["loaded_after_flag"] is result["flag"]
+
+
+def test_components_build_by_group_on_first_access():
+    pytest.importorskip("fastmcp")
+    from mcprag.server import MCPServer
+
+    built = []
+
+    class Server(MCPServer):
+        def _build_semantic(self):
+            built.append("semantic")
+            return {"intent_classifier": "ic", "query_enhancer": "qe", "query_rewriter": "qr"}
+
+        def _build_cache_manager(self):
+            built.append("cache")
+            return {"cache_manager": None}
+
+    server = Server()
+    assert built == []
+    assert server._built("query_enhancer") is None
+
+    assert server.intent_classifier == "ic"
+    assert server.query_rewriter == "qr"
+    assert server._built("query_enhancer") == "qe"
+    assert built == ["semantic"]
+
+    # A component that failed to build stays None without rebuilding
+    assert server.cache_manager is None
+    assert server.cache_manager is None
+    assert built == ["semantic", "cache"]
+
+    server.result_explainer = "explicit"
+    server.load_components(["result_explainer", "query_enhancer"])
+    assert server.result_explainer == "explicit"
+    assert built == ["semantic", "cache"]
@@ -0,0 +1,72 @@
+import re
+
+from enhanced_rag.pattern_registry import PatternType, _required_literal, get_pattern_registry
+
+
+def _reference(registry, code, context=None):
+    """Straightforward per-keyword / per-regex scoring the registry must match"""
+    out = []
+    code_lower = code.lower()
+    for pattern_type in PatternType:
+        for name, pattern_def in registry.patterns.get(pattern_type, {}).items():
+            keywords = pattern_def.get("keywords", [])
+            patterns = pattern_def.get("patterns", [])
+            confidence = 0.0
+            kw_hits = [kw for kw in keywords if kw.lower() in code_lower]
+            if keywords:
+                confidence += len(kw_hits) / len(keywords) * 0.4
+            re_hits = [p for p in patterns if re.search(p, code, re.IGNORECASE | re.DOTALL)]
+            if patterns:
+                confidence += len(re_hits) / len(patterns) * 0.5
+            if context and keywords:
+                ctx = str(context).lower()
+                confidence += len([kw for kw in keywords if kw.lower() in ctx]) / len(keywords) * 0.1
+            confidence = min(confidence, 1.0)
+            if confidence > 0.1:
+                out.append((name, confidence, kw_hits, re_hits))
+    out.sort(key=lambda m: m[1], reverse=True)
+    return out
+
+
+SNIPPETS = [
+    "class ConfigSingleton:\n    _instance = None\n    def getInstance(cls):\n        return cls._instance\n",
+    "import React from 'react'\nfunction AppComponent() { const [s, setS] = useState(0); useEffect(() => {}); }\n",
+    "@pytest.fixture\ndef client():\n    pass\n\ndef test_upload(client):\n    assert client.post('/x') == 200\n",
+    "try:\n    vec = embed(text)\nexcept ValueError as e:\n    raise EmbeddingError('dimension mismatch') from e\n",
+    "from fastapi import APIRouter, Depends\nrouter = APIRouter()\n@router.get('/items')\nasync def items(request):\n    ...\n",
+    # Non-ASCII text: Unicode case folding must not be short-circuited
+    "class ſingleton:  # long s folds to 's' under IGNORECASE\n    ſetUp = None\n",
+    "",
+]
+
+
+def test_recognize_patterns_matches_reference():
+    registry = get_pattern_registry()
+    for context in (None, {"file_type": "python"}):
+        for code in SNIPPETS:
+            got = [
+                (m.pattern_name, m.confidence, m.matched_keywords, m.matched_patterns)
+                for m in registry.recognize_patterns(code, context)
+            ]
+            assert got == _reference(registry, code, context)
+
+
+def test_recognition_is_memoized_by_content():
+    registry = get_pattern_registry()
+    code = SNIPPETS[0] + "# memo test\n"
+    before = registry.get_cache_stats()["hits"]
+
+    first = registry.recognize_patterns(code, {"file_type": "python"})
+    first[0].matched_keywords.append("mutated")
+    second = registry.recognize_patterns(code, {"file_type": "python"})
+
+    assert registry.get_cache_stats()["hits"] == before + 1
+    assert "mutated" not in second[0].matched_keywords
+    assert [m.confidence for m in first] == [m.confidence for m in second]
+
+
+def test_required_literal_is_conservative():
+    assert _required_literal(r"class.*\(models\.Model\)") == "(models.model)"
+    assert _required_literal(r"colou?r") == "colo"
+    assert _required_literal(r"a{2}bc") == "bc"
+    assert _required_literal(r"get|set") == ""
@@ -0,0 +1,89 @@
+import ast
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from enhanced_rag.azure_integration.processing import extract_python_chunks
+from enhanced_rag.code_understanding import python_chunker
+from enhanced_rag.code_understanding.ast_analyzer import ASTAnalyzer
+from enhanced_rag.code_understanding.chunkers import CodeChunker
+from enhanced_rag.code_understanding.python_chunker import analyze_python
+
+SOURCES = sorted((Path(__file__).resolve().parents[1] / "enhanced_rag").rglob("*.py"))
+
+
+def _legacy_boundaries(content):
+    """Chunk boundaries as produced by the previous ast.walk-based extractor"""
+    out = []
+    lines = content.split("\n")
+    for node in ast.walk(ast.parse(content)):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            out.append((node.name, node.lineno, node.end_lineno, "\n".join(lines[node.lineno - 1:node.end_lineno])))
+    return out
+
+
+def _legacy_calls(node):
+    calls = []
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            if isinstance(child.func, ast.Name):
+                calls.append(child.func.id)
+            elif isinstance(child.func, ast.Attribute):
+                calls.append(child.func.attr)
+    return list(dict.fromkeys(calls))
+
+
+def test_indexer_chunks_match_previous_boundaries():
+    checked = 0
+    for path in SOURCES:
+        content = path.read_text(encoding="utf-8")
+        if len(content) > 32000:
+            continue
+        chunks = extract_python_chunks(content, str(path))
+        got = [(c.get("function_name") or c.get("class_name"), c["start_line"], c["end_line"], c["content"])
+               for c in chunks]
+        assert got == _legacy_boundaries(content), path
+        checked += 1
+    assert checked > 20
+
+
+def test_code_chunker_matches_per_node_walks():
+    path = Path(python_chunker.__file__)
+    content = path.read_text(encoding="utf-8")
+    tree = ast.parse(content)
+    expected = [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.ClassDef))]
+    chunks = CodeChunker.chunk_python_file(content, str(path))
+
+    assert [c["start_line"] for c in chunks] == [n.lineno for n in expected]
+    assert [c["dependencies"] for c in chunks] == [_legacy_calls(n) for n in expected]
+    assert all(c["imports"] == CodeChunker._extract_imports(tree) for c in chunks)
+    methods = CodeChunker.chunk_python_file(content, str(path), include_methods=False)
+    assert {c["class_name"] for c in chunks} - {None} >= {"PythonModuleInfo"}
+    assert len(methods) < len(chunks)
+
+
+def test_parse_is_shared_by_content_hash():
+    python_chunker.clear_cache()
+    content = "import os\n\n\ndef f():\n    return os.getcwd()\n"
+    before = python_chunker.get_cache_stats()
+    first = analyze_python(content)
+    extract_python_chunks(content, "a.py")
+    CodeChunker.chunk_python_file(content, "a.py")
+    stats = python_chunker.get_cache_stats()
+    assert analyze_python(content).tree is first.tree
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["hits"] - before["hits"] == 2
+    assert first.segment(4, 5) == "def f():\n    return os.getcwd()"
+    assert first.segment(5, 99) == "    return os.getcwd()\n"
+
+
+def test_syntax_errors_name_the_file(tmp_path, caplog):
+    with pytest.raises(SyntaxError) as excinfo:
+        analyze_python("def broken(:\n", filename="pkg/broken.py")
+    assert excinfo.value.filename == "pkg/broken.py"
+
+    path = tmp_path / "broken.py"
+    path.write_text("def broken(:\n")
+    asyncio.run(ASTAnalyzer()._analyze_python_file(path))
+    assert "(broken.py, line 1)" in caplog.text
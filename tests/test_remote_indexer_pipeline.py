@@ -0,0 +1,189 @@
+import base64
+import io
+import json
+import os
+import tarfile
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import pytest
+
+# The package __init__ imports webhook_app, which refuses to load without these
+os.environ.setdefault("GITHUB_WEBHOOK_SECRET", "test-secret")
+os.environ.setdefault("WEBHOOK_ADMIN_TOKEN", "test-admin-token")
+
+web = pytest.importorskip("aiohttp.web")
+
+from enhanced_rag.github_integration.api_client import GitHubClient
+from enhanced_rag.github_integration.remote_indexer import RemoteIndexer, git_blob_sha
+
+
+class FakeGitHub:
+    """Local stand-in for the tree, blob, tarball and compare endpoints"""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.compare_files = []
+        self.hits = Counter()
+
+    def _blobs(self):
+        return {git_blob_sha(c.encode()): c.encode() for c in self.files.values()}
+
+    async def tree(self, request):
+        self.hits["tree"] += 1
+        assert request.query.get("recursive") == "1"
+        entries = [
+            {"path": p, "type": "blob", "sha": git_blob_sha(c.encode()), "size": len(c.encode())}
+            for p, c in self.files.items()
+        ]
+        return web.json_response({"sha": "head", "tree": entries, "truncated": False})
+
+    async def blob(self, request):
+        self.hits["blob"] += 1
+        content = self._blobs()[request.match_info["sha"]]
+        return web.json_response({"encoding": "base64", "content": base64.encodebytes(content).decode()})
+
+    async def tarball(self, request):
+        self.hits["tarball"] += 1
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+            for path, content in self.files.items():
+                data = content.encode()
+                info = tarfile.TarInfo(f"octo-demo-abc123/{path}")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return web.Response(body=buf.getvalue(), content_type="application/x-gzip")
+
+    async def compare(self, request):
+        self.hits["compare"] += 1
+        return web.json_response({"files": self.compare_files})
+
+    async def contents(self, request):
+        self.hits["contents"] += 1
+        return web.json_response({"message": "per-file content API should not be used"}, status=500)
+
+
+class FakeSearch:
+    def __init__(self):
+        self.docs = {}
+
+    async def get_index(self, request):
+        return web.json_response({"name": request.match_info["name"], "fields": []})
+
+    async def index(self, request):
+        results = []
+        for action in json.loads(await request.read())["value"]:
+            if action.pop("@search.action") == "delete":
+                self.docs.pop(action["id"], None)
+            else:
+                self.docs[action["id"]] = action
+            results.append({"key": action["id"], "status": True, "statusCode": 200})
+        return web.json_response({"value": results})
+
+
+@asynccontextmanager
+async def serve(github, search):
+    app = web.Application()
+    app.router.add_get("/repos/{owner}/{repo}/git/trees/{ref}", github.tree)
+    app.router.add_get("/repos/{owner}/{repo}/git/blobs/{sha}", github.blob)
+    app.router.add_get("/repos/{owner}/{repo}/tarball/{ref}", github.tarball)
+    app.router.add_get("/repos/{owner}/{repo}/compare/{spec}", github.compare)
+    app.router.add_get("/repos/{owner}/{repo}/contents/{path:.*}", github.contents)
+    app.router.add_get("/indexes/{name}", search.get_index)
+    app.router.add_post("/indexes/{name}/docs/index", search.index)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    finally:
+        await runner.cleanup()
+
+
+def _module(i, version=1):
+    return f"def handler_{i}():\n    return {i * version}\n\n\nclass Model{i}:\n    pass\n"
+
+
+@pytest.fixture
+def indexer_factory(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_REMOTE_MANIFEST_PATH", str(tmp_path / "remote_manifest.sqlite"))
+    monkeypatch.setenv("ACS_HTTP2", "false")
+
+    def make(url):
+        indexer = RemoteIndexer()
+        indexer.endpoint, indexer.admin_key, indexer.index_name = url, "test", "idx"
+        indexer.network_disabled = False
+        indexer.provider = None
+        indexer.github_client = GitHubClient(token="t", api_url=url)
+        indexer.archive_threshold = 50
+        return indexer
+    return make
+
+
+@pytest.mark.asyncio
+async def test_remote_index_uses_tree_tarball_then_changed_blobs_only(indexer_factory):
+    files = {f"pkg/mod_{i}.py": _module(i) for i in range(60)}
+    files["README.md"] = "# not code\n"
+    github, search = FakeGitHub(files), FakeSearch()
+
+    async with serve(github, search) as url:
+        indexer = indexer_factory(url)
+        first = await indexer.aindex_remote_repository("octo", "demo", "main")
+
+        assert first["fetch"] == "archive"
+        assert first["github_requests"] == 2
+        assert first["files_processed"] == 60
+        assert first["errors"] == 0
+        assert dict(github.hits) == {"tree": 1, "tarball": 1}
+        indexed = {d["file_path"] for d in search.docs.values()}
+        assert indexed == {p for p in files if p.endswith(".py")}
+
+        # Two edits, one deletion, one new file
+        github.files["pkg/mod_1.py"] = _module(1, version=2)
+        github.files["pkg/mod_2.py"] = _module(2, version=3)
+        del github.files["pkg/mod_3.py"]
+        github.files["pkg/new.py"] = _module(99)
+        github.hits.clear()
+
+        second = await indexer.aindex_remote_repository("octo", "demo", "main")
+
+        assert second["fetch"] == "blobs"
+        assert dict(github.hits) == {"tree": 1, "blob": 3}
+        assert second["incremental"]["files_unchanged"] == 57
+        assert second["incremental"]["files_deleted"] == 1
+        assert "pkg/mod_3.py" not in {d["file_path"] for d in search.docs.values()}
+        assert any("return 2" in d["content"] for d in search.docs.values() if d["file_path"] == "pkg/mod_1.py")
+
+        unchanged = await indexer.aindex_remote_repository("octo", "demo", "main")
+        assert unchanged["files_processed"] == 0
+        assert unchanged["chunks_indexed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_push_fetches_only_changed_blobs(indexer_factory):
+    files = {f"src/m{i}.py": _module(i) for i in range(5)}
+    github, search = FakeGitHub(files), FakeSearch()
+
+    async with serve(github, search) as url:
+        indexer = indexer_factory(url)
+        await indexer.aindex_remote_repository("octo", "demo", "main")
+        github.hits.clear()
+
+        github.files["src/m1.py"] = _module(1, version=5)
+        del github.files["src/m4.py"]
+        github.files["src/renamed.py"] = github.files.pop("src/m3.py")
+        github.compare_files = [
+            {"filename": "src/m1.py", "status": "modified", "sha": git_blob_sha(github.files["src/m1.py"].encode())},
+            {"filename": "src/m4.py", "status": "removed", "sha": None},
+            {"filename": "src/renamed.py", "status": "renamed", "previous_filename": "src/m3.py",
+             "sha": git_blob_sha(github.files["src/renamed.py"].encode())},
+            {"filename": "docs/guide.md", "status": "added", "sha": "0" * 40},
+        ]
+
+        result = await indexer.aindex_push("octo", "demo", "before", "after")
+
+        assert dict(github.hits) == {"compare": 1, "blob": 2}
+        assert result["errors"] == 0
+        paths = {d["file_path"] for d in search.docs.values()}
+        assert paths == {"src/m0.py", "src/m1.py", "src/m2.py", "src/renamed.py"}
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from enhanced_rag.ranking.cross_encoder_reranker import RerankerService
+
+
+@pytest.mark.asyncio
+async def test_reranker_service_coalesces_concurrent_requests():
+    service = RerankerService(max_batch_size=1000, max_wait_ms=50)
+    requests = [
+        ("parse config file", [("a", "def parse_config(path): ..."), ("b", "class Cache: ...")]),
+        ("cache eviction", [("c", "def evict(cache): lru eviction"), ("d", "print('x')")]),
+        ("http retry", [("e", "retry http request with backoff")]),
+    ]
+
+    results = await asyncio.gather(*(service.async_score(q, c) for q, c in requests))
+
+    # Batched scores match per-request scoring
+    for (query, candidates), result in zip(requests, results):
+        assert result == service.reranker.score(query, candidates)
+
+    stats = service.get_stats()
+    assert stats["counters"]["reranker_batches"] == 1
+    assert stats["counters"]["reranker_requests"] == 3
+    assert stats["metrics"]["reranker_batch_requests"]["latest"] == 3
+    assert stats["metrics"]["reranker_batch_pairs"]["latest"] == 5
+    assert "reranker_batch_latency_ms" in stats["metrics"]
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reranker_service_flushes_at_max_batch_size():
+    service = RerankerService(max_batch_size=2, max_wait_ms=50)
+    candidates = [("a", "alpha beta"), ("b", "gamma delta")]
+
+    await asyncio.gather(*(service.async_score("alpha", candidates) for _ in range(3)))
+
+    assert service.get_stats()["counters"]["reranker_batches"] == 3
+    assert await service.async_score("alpha", []) == {}
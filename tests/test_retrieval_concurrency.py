@@ -0,0 +1,103 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from enhanced_rag.core.config import Config
+from enhanced_rag.core.models import SearchQuery
+from enhanced_rag.utils.performance_monitor import PerformanceMonitor
+from enhanced_rag.retrieval.multi_stage_pipeline import (
+    MultiStageRetriever,
+    RetrievalContext,
+    SearchStage,
+)
+
+_LATENCY = 0.05
+
+
+def _doc(tag, n):
+    return {
+        "id": f"{tag}-{n}",
+        "@search.score": float(10 - n),
+        "content": f"def handler_{tag}_{n}(): return '{tag}'",
+        "file_path": f"src/{tag}/mod_{n}.py",
+        "repository": f"repo-{tag}",
+        "language": "python",
+    }
+
+
+class _FakeSearchOps:
+    """Keyword backend whose hits are derived from the query text"""
+
+    async def search(self, index_name, query="*", timeout=None, **options):
+        await asyncio.sleep(_LATENCY)
+        tag = query.split()[0]
+        return {"value": [_doc(tag, n) for n in range(5)]}
+
+
+class _FakeHybridSearcher:
+    async def vector_search(self, query, filter_expr=None, top_k=50, timeout=None):
+        await asyncio.sleep(_LATENCY)
+        tag = query.split()[0]
+        return [
+            SimpleNamespace(id=d["id"], score=d["@search.score"], content=d["content"], metadata=d)
+            for d in (_doc(tag, n) for n in range(3, 8))
+        ]
+
+
+@pytest.fixture
+def retriever():
+    r = MultiStageRetriever.__new__(MultiStageRetriever)
+    r.config = Config()
+    r.rest_ops = _FakeSearchOps()
+    r.index_names = {"main": "codebase"}
+    r.hybrid_searcher = _FakeHybridSearcher()
+    r._cache = {}
+    r._cache_index = None
+    r._semantic_fallback_cache = {}
+    r.stage_latency = PerformanceMonitor(max_history=200)
+    return r
+
+
+async def _run(retriever, tag):
+    ctx = RetrievalContext()
+    results = await retriever.retrieve(
+        SearchQuery(query=f"{tag} handler"),
+        stages=[SearchStage.VECTOR, SearchStage.KEYWORD],
+        ctx=ctx,
+    )
+    return tag, results, ctx
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retrievals_do_not_share_state(retriever):
+    tags = [f"q{i}" for i in range(24)]
+    outcomes = await asyncio.gather(*(_run(retriever, tag) for tag in tags))
+
+    for tag, results, ctx in outcomes:
+        assert len(results) == 8
+        for result in results:
+            assert result.id.startswith(f"{tag}-")
+            assert result.repository == f"repo-{tag}"
+            assert f"'{tag}'" in result.code_snippet
+        assert set(ctx.candidate_metadata) == {f"{tag}-{n}" for n in range(8)}
+        assert all(c["id"].startswith(f"{tag}-") for c in ctx.citations)
+        assert ctx.warnings == []
+
+
+@pytest.mark.asyncio
+async def test_retrieval_throughput_scales_with_concurrency(retriever):
+    n = 16
+
+    started = time.perf_counter()
+    for i in range(n):
+        await _run(retriever, f"s{i}")
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_run(retriever, f"c{i}") for i in range(n)))
+    concurrent = time.perf_counter() - started
+
+    # Stage latency overlaps across requests instead of queueing behind one another
+    assert serial / concurrent >= 3
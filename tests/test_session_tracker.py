@@ -0,0 +1,124 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from enhanced_rag.context.session_store import SessionStore
+from enhanced_rag.context.session_tracker import SessionTracker
+
+
+def _count(path, table):
+    with sqlite3.connect(path) as db:
+        return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_events_are_buffered_and_written_in_batches(tmp_path):
+    db_path = tmp_path / "sessions.sqlite"
+
+    async def scenario():
+        tracker = SessionTracker({"storage_path": str(tmp_path), "flush_batch_size": 3,
+                                  "flush_interval_seconds": 60})
+        await tracker.track_file_change("s1", "src/a.py", "open")
+        await tracker.track_file_change("s1", "src/a.py", "edit")
+        # Below the batch size and before the interval nothing is written
+        assert _count(db_path, "events") == 0
+
+        # Filling the batch writes in the background without waiting for the interval
+        await tracker.track_file_change("s1", "src/b.py", "open")
+        for _ in range(100):
+            if _count(db_path, "events"):
+                break
+            await asyncio.sleep(0.01)
+        assert _count(db_path, "events") == 3
+
+        await tracker.track_file_change("s2", "src/a.py", "edit")
+        await tracker.close()
+
+    asyncio.run(scenario())
+    assert _count(db_path, "events") == 4
+    assert _count(db_path, "sessions") == 2
+
+
+def test_restart_loads_only_active_sessions_with_counters(tmp_path):
+    now = datetime.now(timezone.utc)
+    store = SessionStore(tmp_path / "sessions.sqlite")
+    store.write(
+        [{"session_id": "old", "file_path": "x.py", "change_type": "edit", "timestamp": now.isoformat()}],
+        [{"id": "old", "started_at": now - timedelta(days=2), "last_activity": now - timedelta(days=1),
+          "interaction_count": 1, "current_files": []}],
+    )
+    store.close()
+
+    async def first_run():
+        tracker = SessionTracker({"storage_path": str(tmp_path), "max_history_size": 2})
+        for path, change in [("a.py", "open"), ("b.py", "open"), ("a.py", "edit"), ("b.py", "close")]:
+            await tracker.track_file_change("live", path, change)
+        await tracker.close()
+
+    async def second_run():
+        tracker = SessionTracker({"storage_path": str(tmp_path), "max_history_size": 2})
+        assert tracker.sessions == {}
+        context = await tracker.get_session_context("live")
+        stats = await tracker.get_session_stats()
+        old = await tracker.get_session_context("old")
+        await tracker.close()
+        return context, stats, old
+
+    asyncio.run(first_run())
+    context, stats, old = asyncio.run(second_run())
+
+    assert not old["exists"]
+    assert context["exists"]
+    assert context["current_files"] == ["a.py"]
+    assert context["interaction_count"] == 4
+    assert context["recent_files"] == ["b.py", "a.py"]
+    assert context["file_patterns"]["change_types"] == {"edit": 1, "close": 1}
+    assert stats["total_sessions"] == 1 and stats["active_sessions"] == 1
+    assert stats["average_session_duration"] >= 0
+
+
+def test_counters_are_maintained_incrementally():
+    async def scenario():
+        tracker = SessionTracker()
+        for _ in range(5):
+            await tracker.track_file_change("s1", "hot.py", "edit")
+        await tracker.track_file_change("s2", "cold.py", "edit")
+        stats = await tracker.get_session_stats()
+
+        expected = sum((s["last_activity"] - s["started_at"]).total_seconds() for s in tracker.sessions.values())
+        assert abs(tracker._total_duration_seconds - expected) < 1e-6
+
+        await tracker.clear_session("s1")
+        assert abs(tracker._total_duration_seconds - 0.0) < 1e-6
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["most_accessed_files"] == [("hot.py", 5), ("cold.py", 1)]
+    assert stats["total_interactions"] == 6
+
+
+def test_compaction_and_legacy_import(tmp_path):
+    now = datetime.now(timezone.utc)
+    legacy = {
+        "id": "legacy", "started_at": (now - timedelta(minutes=5)).isoformat(),
+        "last_activity": now.isoformat(), "interaction_count": 3, "current_files": ["a.py"],
+        "file_history": [
+            {"file_path": f"f{i}.py", "change_type": "edit", "timestamp": now.isoformat(), "metadata": {}}
+            for i in range(3)
+        ],
+    }
+    (tmp_path / "session_legacy.json").write_text(json.dumps(legacy))
+
+    store = SessionStore(tmp_path / "sessions.sqlite")
+    assert store.import_json_sessions(tmp_path) == 1
+    assert not (tmp_path / "session_legacy.json").exists()
+    store.write([], [{"id": "stale", "started_at": now - timedelta(days=60),
+                      "last_activity": now - timedelta(days=40), "interaction_count": 0, "current_files": []}])
+
+    result = store.compact(history_limit=2, retain_since=now - timedelta(days=30))
+    assert result == {"expired_sessions": 1, "deleted_events": 1}
+
+    [session] = store.load_active(now - timedelta(hours=1), history_limit=10)
+    assert session["id"] == "legacy" and session["current_files"] == {"a.py"}
+    assert [e["file_path"] for e in session["file_history"]] == ["f1.py", "f2.py"]
+    store.close()
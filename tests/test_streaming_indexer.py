@@ -0,0 +1,67 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from enhanced_rag.azure_integration.processing import FileProcessor, IndexingStats
+
+
+def _make_repo(root: Path, n_files: int = 40) -> None:
+    for i in range(n_files):
+        path = root / f"pkg{i % 4}" / f"mod_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"class C{i}:\n    def a(self):\n        return {i}\n\n\ndef f{i}():\n    return C{i}()\n",
+            encoding="utf-8",
+        )
+    (root / "README.md").write_text("# repo\n", encoding="utf-8")
+    (root / "node_modules" / "x").mkdir(parents=True)
+    (root / "node_modules" / "x" / "index.js").write_text("x()\n", encoding="utf-8")
+    (root / "image.png").write_bytes(b"\x89PNG")
+
+
+def _stable(docs):
+    return [{k: v for k, v in d.items() if k != "last_modified"} for d in docs]
+
+
+def test_parallel_stream_matches_serial_walk(tmp_path):
+    _make_repo(tmp_path)
+    fp = FileProcessor()
+
+    serial_stats, parallel_stats = IndexingStats(), IndexingStats()
+    serial = list(fp.iter_repository(str(tmp_path), "repo", workers=1, stats=serial_stats))
+    parallel = list(fp.iter_repository(str(tmp_path), "repo", workers=2, stats=parallel_stats))
+
+    assert _stable(parallel) == _stable(serial)
+    assert parallel_stats.workers == 2
+    # 40 modules x (class + method + function) plus the README
+    assert parallel_stats.files_processed == 41
+    assert parallel_stats.chunks == len(parallel) == 121
+    assert parallel_stats.skipped_ext == 1
+    assert parallel_stats.pruned_dirs == 1
+    assert parallel_stats.to_dict()["files_per_second"] > 0
+
+
+def test_max_index_files_caps_stream(tmp_path, monkeypatch):
+    _make_repo(tmp_path)
+    monkeypatch.setenv("MCP_MAX_INDEX_FILES", "5")
+    stats = IndexingStats()
+    docs = list(FileProcessor().iter_repository(str(tmp_path), "repo", workers=1, stats=stats))
+    assert stats.files_processed == 5
+    assert len({d["file_path"] for d in docs}) == 5
+
+
+@pytest.mark.asyncio
+async def test_async_stream_feeds_consumer_and_stops_early(tmp_path, monkeypatch):
+    _make_repo(tmp_path)
+    monkeypatch.setenv("MCP_INDEX_QUEUE_FILES", "2")
+    fp = FileProcessor()
+
+    docs = [d async for d in fp.aiter_repository(str(tmp_path), "repo", workers=2)]
+    assert len(docs) == 121
+
+    # Abandoning the stream must not leave the producer blocked on a full queue
+    stream = fp.aiter_repository(str(tmp_path), "repo", workers=2)
+    first = await stream.__anext__()
+    await asyncio.wait_for(stream.aclose(), timeout=5)
+    assert first["repository"] == "repo"
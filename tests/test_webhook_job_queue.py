@@ -0,0 +1,171 @@
+import asyncio
+import os
+from collections import Counter
+
+import pytest
+
+# The package __init__ imports webhook_app, which refuses to load without these
+os.environ.setdefault("GITHUB_WEBHOOK_SECRET", "test-secret")
+os.environ.setdefault("WEBHOOK_ADMIN_TOKEN", "test-admin-token")
+
+from enhanced_rag.github_integration import job_queue as jq
+from enhanced_rag.github_integration.job_queue import ZERO_SHA, IndexJobQueue, IndexJobWorkerPool
+
+
+def _sha(repo, ref, i):
+    return f"{repo}-{ref}-{i}"
+
+
+def _replay_burst(queue):
+    """30 pushes to a/main, 12 to b/main, 5 to a/dev and 3 syncs of one PR"""
+    events = [("octo/a", "main", 30), ("octo/b", "main", 12), ("octo/a", "dev", 5)]
+    for repo, ref, n in events:
+        for i in range(n):
+            queue.enqueue_push(repo, ref, _sha(repo, ref, i), _sha(repo, ref, i + 1), [f"src/{ref}_{i % 7}.py"])
+    for head in ("h1", "h2", "h3"):
+        queue.enqueue_pull_request("octo/a", 7, head)
+    return sum(n for _, _, n in events) + 3
+
+
+class RecordingHandler:
+    def __init__(self, delay=0.05, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.jobs = []
+        self.running = Counter()
+        self.overlap = False
+
+    async def __call__(self, job):
+        self.running[job.repository] += 1
+        self.overlap |= self.running[job.repository] > 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("search service unavailable")
+            self.jobs.append(job)
+            return {"chunks_indexed": len(job.paths)}
+        finally:
+            self.running[job.repository] -= 1
+
+
+async def _drain(queue, pool, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        status = queue.get_status()
+        if status["depth"] == 0 and status["running"] == 0:
+            return status
+        assert asyncio.get_running_loop().time() < deadline, status
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_event_burst_coalesces_per_branch_and_serializes_per_repo(tmp_path):
+    queue = IndexJobQueue(str(tmp_path / "jobs.sqlite"))
+    events = _replay_burst(queue)
+
+    status = queue.get_status()
+    assert (events, status["depth"]) == (50, 4)
+    assert status["events_coalesced"] == 46
+
+    handler = RecordingHandler()
+    pool = IndexJobWorkerPool(queue, handler, workers=4, poll_interval=0.05)
+    pool.start()
+    try:
+        status = await _drain(queue, pool)
+    finally:
+        await pool.stop()
+
+    jobs = {(j.repository, j.ref): j for j in handler.jobs}
+    assert len(handler.jobs) == 4
+    main = jobs[("octo/a", "main")]
+    assert (main.kind, main.before_sha, main.after_sha, main.events) == (
+        "push", _sha("octo/a", "main", 0), _sha("octo/a", "main", 30), 30)
+    assert main.paths == [f"src/main_{i}.py" for i in range(7)]
+    pr = jobs[("octo/a", "pull/7")]
+    assert (pr.kind, pr.after_sha, pr.events) == ("pull_request", "h3", 3)
+
+    # Repository a's jobs ran one at a time, in order; b ran alongside them
+    assert not handler.overlap
+    assert pool.peak_active == 2
+    a_order = [j.ref for j in handler.jobs if j.repository == "octo/a"]
+    assert a_order == ["main", "dev", "pull/7"]
+    assert status["done"] == 4
+    assert status["events_per_job"] == 12.5
+    assert status["latency_seconds"]["p95"] >= status["run_seconds"]["p95"]
+
+
+@pytest.mark.asyncio
+async def test_pushes_during_a_running_job_fold_into_one_follow_up(tmp_path):
+    queue = IndexJobQueue(str(tmp_path / "jobs.sqlite"))
+    handler = RecordingHandler(delay=0.5)
+    pool = IndexJobWorkerPool(queue, handler, workers=3, poll_interval=0.05)
+    pool.start()
+    try:
+        for i in range(30):
+            queue.enqueue_push("octo/a", "main", _sha("a", "main", i), _sha("a", "main", i + 1), ["a.py"])
+            pool.notify()
+            await asyncio.sleep(0.005)
+        await _drain(queue, pool)
+    finally:
+        await pool.stop()
+
+    assert len(handler.jobs) == 2
+    first, second = handler.jobs
+    assert (first.events, second.events) == (1, 29)
+    assert (second.before_sha, second.after_sha) == (_sha("a", "main", 1), _sha("a", "main", 30))
+
+
+def test_full_index_absorbs_pending_pushes(tmp_path):
+    queue = IndexJobQueue(str(tmp_path / "jobs.sqlite"))
+    first, _ = queue.enqueue_push("octo/a", "main", "c0", "c1", ["x.py"])
+    same, coalesced = queue.enqueue_full("octo/a", "main")
+    queue.enqueue_push("octo/a", "main", "c1", "c2", ["y.py"])
+    created, _ = queue.enqueue_push("octo/a", "feature", ZERO_SHA, "f1")
+
+    assert (same, coalesced) == (first, True)
+    job = queue.claim()
+    assert (job.kind, job.before_sha, job.after_sha, job.paths, job.events) == ("full", None, "c2", [], 3)
+    assert queue.claim() is None  # one job per repository at a time
+    queue.complete(job.id)
+    assert (queue.claim().id, created) == (created, created)
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_retry_and_survive_restart(tmp_path, monkeypatch):
+    monkeypatch.setattr(jq, "_RETRY_BASE_SECONDS", 0.2)
+    path = str(tmp_path / "jobs.sqlite")
+
+    # A worker that died mid-job leaves it running; reopening requeues it
+    crashed = IndexJobQueue(path)
+    crashed.enqueue_push("octo/a", "main", "c0", "c1")
+    assert crashed.claim().attempts == 1
+    crashed.close()
+
+    queue = IndexJobQueue(path, max_attempts=3)
+    assert queue.get_status()["jobs_recovered"] == 1
+
+    handler = RecordingHandler(delay=0.01, failures=1)
+    pool = IndexJobWorkerPool(queue, handler, workers=2, poll_interval=0.5)
+    pool.start()
+    try:
+        # Poll until the first failure is recorded instead of guessing how long it takes
+        deadline = asyncio.get_running_loop().time() + 5.0
+        retrying = queue.get_status()["retrying"]
+        while not any(r["error"] for r in retrying):
+            assert asyncio.get_running_loop().time() < deadline, retrying
+            await asyncio.sleep(0.005)
+            retrying = queue.get_status()["retrying"]
+        assert [(r["attempts"], r["error"]) for r in retrying] == [(2, "search service unavailable")]
+        await _drain(queue, pool)
+    finally:
+        await pool.stop()
+
+    assert [j.attempts for j in handler.jobs] == [3]
+
+    exhausted = IndexJobQueue(str(tmp_path / "other.sqlite"), max_attempts=1)
+    exhausted.enqueue_push("octo/b", "main", "c0", "c1")
+    assert exhausted.fail(exhausted.claim().id, "boom") == "failed"
+    status = exhausted.get_status()
+    assert (status["failed"], status["depth"]) == (1, 0)
+    assert status["failed_jobs"][0]["error"] == "boom"